@@ -86,14 +86,16 @@ def register():
 
         # WorkSpaceTools need to be registered after normal modules so the keymaps
         # detect the registered operators
-        from . import sollumz_tool
-        sollumz_tool.register_tools()
+        if not auto_load.is_headless():
+            from . import sollumz_tool
+            sollumz_tool.register_tools()
 
 
 def unregister():
     if dependencies.has_required_dependencies():
-        from . import sollumz_tool
-        sollumz_tool.unregister_tools()
+        if not auto_load.is_headless():
+            from . import sollumz_tool
+            sollumz_tool.unregister_tools()
 
         auto_load.unregister()
 
@@ -0,0 +1,219 @@
+"""
+Cache of loaded assets shared during an import session.
+
+Importing many files from the same folder often loads the same external dependencies for each of them, e.g. the .yft
+skeleton of ped component .ydd files. Within an import session, each file is loaded once and reused as long as it is not
+modified on disk (entries are keyed by path, modification time and size). The cache is bounded by a memory budget,
+estimated from the loaded values, and evicts the least recently used entries first.
+
+The session can also hold other values built during the import, keyed by anything hashable, with
+``get_session_value``/``set_session_value`` (e.g. armatures built from the same skeleton).
+
+Import operators start a session with ``asset_cache_session()``. Outside of a session, ``load_asset`` and
+``list_directory_files`` do not cache anything.
+"""
+
+import os
+import sys
+import numpy as np
+from contextlib import contextmanager
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from pathlib import Path
+from types import FunctionType, ModuleType
+from typing import Any, NamedTuple, Optional
+from szio.gta5 import Asset, try_load_asset
+from . import logger
+
+DEFAULT_MEMORY_BUDGET = 1024 * 1024 * 1024  # 1 GiB
+
+
+class FileStamp(NamedTuple):
+    mtime_ns: int
+    size: int
+
+
+def get_file_stamp(path: str | os.PathLike) -> Optional[FileStamp]:
+    """Gets the modification time and size of ``path``, or ``None`` if it is not a file on disk."""
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+
+    return FileStamp(st.st_mtime_ns, st.st_size)
+
+
+def estimate_memory_size(value: Any) -> int:
+    """Estimates the memory used by ``value`` and all the objects it references. NumPy arrays count the size of their
+    buffer, other objects their ``sys.getsizeof``. Objects referenced more than once are only counted once.
+    """
+    size = 0
+    visited = set()
+    pending = [value]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in visited or isinstance(obj, (type, ModuleType, FunctionType)):
+            continue
+
+        visited.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            size += obj.nbytes
+            continue
+
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (str, bytes, bytearray, int, float)):
+            continue
+
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+
+        obj_dict = getattr(obj, "__dict__", None)
+        if obj_dict is not None:
+            pending.append(obj_dict)
+
+    return size
+
+
+class AssetCacheEntry(NamedTuple):
+    stamp: FileStamp
+    value: Any
+    size: int
+
+
+class AssetCache:
+    """LRU cache of loaded files and directory listings."""
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[Callable, str], AssetCacheEntry] = OrderedDict()
+        self._directory_listings: dict[str, tuple[int, tuple[Path, ...]]] = {}
+        self.values: dict[Hashable, Any] = {}
+
+    def get_or_load(self, path: str | os.PathLike, loader: Callable[[Any], Any]) -> Any:
+        """Gets the result of ``loader(path)``, loading it only if not cached or if the file changed since it was cached.
+        Paths that are not files on disk (e.g. paths inside archives) are always loaded.
+        """
+        stamp = get_file_stamp(path)
+        if stamp is None:
+            return loader(path)
+
+        key = (loader, os.path.normcase(os.path.abspath(path)))
+        entry = self._entries.get(key, None)
+        if entry is not None:
+            if entry.stamp == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+            self._remove(key)
+
+        self.misses += 1
+        value = loader(path)
+        # Size in memory after loading, which can be quite different from the file size (e.g. XML text parsed to arrays)
+        size = estimate_memory_size(value)
+        if size <= self.memory_budget:
+            self._entries[key] = AssetCacheEntry(stamp, value, size)
+            self.memory_used += size
+            self._evict()
+
+        return value
+
+    def list_directory_files(self, directory: str | os.PathLike) -> tuple[Path, ...]:
+        """Gets the files in ``directory``, listing it again only if it was modified since the last call."""
+        directory = Path(directory)
+        key = os.path.normcase(os.path.abspath(directory))
+        mtime_ns = os.stat(directory).st_mtime_ns
+        listing = self._directory_listings.get(key, None)
+        if listing is not None and listing[0] == mtime_ns:
+            return listing[1]
+
+        files = tuple(file for file in directory.iterdir() if file.is_file())
+        self._directory_listings[key] = (mtime_ns, files)
+        return files
+
+    def clear(self):
+        self._entries.clear()
+        self._directory_listings.clear()
+        self.values.clear()
+        self.memory_used = 0
+
+    def _remove(self, key: tuple[Callable, str]):
+        entry = self._entries.pop(key)
+        self.memory_used -= entry.size
+
+    def _evict(self):
+        while self.memory_used > self.memory_budget and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.memory_used -= entry.size
+
+
+_session: Optional[AssetCache] = None
+
+
+@contextmanager
+def asset_cache_session(memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Iterator[AssetCache]:
+    """Starts an asset cache session. The cache is released when the session ends. Nested sessions reuse the outer
+    session cache.
+    """
+    global _session
+    if _session is not None:
+        yield _session
+        return
+
+    _session = AssetCache(memory_budget)
+    try:
+        yield _session
+    finally:
+        cache = _session
+        _session = None
+        if cache.hits > 0:
+            logger.info(f"Reused {cache.hits} already loaded file(s).")
+        cache.clear()
+
+
+def is_session_active() -> bool:
+    return _session is not None
+
+
+def load_cached(path: str | os.PathLike, loader: Callable[[Any], Any]) -> Any:
+    """Calls ``loader(path)``, reusing the result of a previous call if an asset cache session is active."""
+    if _session is None:
+        return loader(path)
+
+    return _session.get_or_load(path, loader)
+
+
+def load_asset(path: str | os.PathLike) -> Optional[Asset]:
+    """Same as ``try_load_asset(path)``, reusing the loaded asset if an asset cache session is active."""
+    return load_cached(path, try_load_asset)
+
+
+def list_directory_files(directory: str | os.PathLike) -> tuple[Path, ...]:
+    """Gets the files in ``directory``, reusing the listing if an asset cache session is active."""
+    if _session is None:
+        directory = Path(directory)
+        return tuple(file for file in directory.iterdir() if file.is_file())
+
+    return _session.list_directory_files(directory)
+
+
+def get_session_value(key: Hashable) -> Any:
+    """Gets the value stored with ``set_session_value`` in the active asset cache session, or ``None``."""
+    if _session is None:
+        return None
+
+    return _session.values.get(key, None)
+
+
+def set_session_value(key: Hashable, value: Any):
+    """Stores a value until the asset cache session ends. Does nothing if there is no active session."""
+    if _session is None:
+        return
+
+    _session.values[key] = value
@@ -0,0 +1,418 @@
+"""
+Conversion of asset files between formats and game versions without importing them into the scene.
+
+Converting a file from the UI imports it into the scene and exports it again, building Blender objects only to discard
+them. Here the loaded asset is copied directly into new assets of the target formats, through the same
+``create_asset_*`` and ``save_asset`` functions used by the exporters, so no scene is constructed at all. Supports .ybn,
+.ydr, .ydd, .yft, .yld and .ytyp files, in both native and CW XML formats.
+
+The add-on does not need to be enabled. ``batch_convert`` starts this module as a worker process in a bare Blender
+instance, where it imports the add-on modules it uses without registering the add-on::
+
+    blender --background --factory-startup --python-use-system-env --python asset_conversion.py --
+            --queue <queue.json> --manifest <manifest.jsonl> --format NATIVE --version GEN9
+
+where the queue is a JSON list of ``conversion_manifest.ConversionJob`` objects. A JSON line is appended to the
+manifest for each converted file (see ``conversion_manifest``).
+"""
+
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import dataclasses
+import traceback
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+if __name__ == "__main__":
+    # Running as a worker process, setup szio with the Blender math types before importing anything else from it, same
+    # as the add-on does on register. Then run this module again as part of the add-on package, so the relative imports
+    # below work. The add-on modules are only imported, nothing is registered.
+    import importlib
+    import mathutils
+    import szio.types
+    szio.types.use_math_types(mathutils.Vector, mathutils.Quaternion, mathutils.Matrix)
+
+    _addon_directory = Path(__file__).resolve().parent
+    sys.path.insert(0, str(_addon_directory.parent))
+    sys.exit(importlib.import_module(f"{_addon_directory.name}.asset_conversion").main())
+
+from szio.gta5 import (
+    Asset,
+    AssetBound,
+    AssetDrawable,
+    AssetDrawableDictionary,
+    AssetFragment,
+    AssetClothDictionary,
+    AssetMapTypes,
+    AssetFormat,
+    AssetVersion,
+    AssetTarget,
+    AssetType,
+    BoundType,
+    ShaderGroup,
+    create_asset_bound,
+    create_asset_drawable,
+    create_asset_drawable_dictionary,
+    create_asset_fragment,
+    create_asset_cloth_dictionary,
+    create_asset_map_types,
+    try_load_asset,
+)
+from . import logger
+from .asset_cache import get_file_stamp
+from .conversion_manifest import (
+    STATUS_OK,
+    STATUS_WARNINGS,
+    STATUS_FAILED,
+    ConversionJob,
+    ConversionRecord,
+    append_manifest,
+)
+from .iecontext import ExportBundle
+from .yft.yftexport_io import create_bone_transforms_set
+
+DIRECT_CONVERTIBLE_EXTENSIONS = (
+    ".ybn", ".ydr", ".ydd", ".yft", ".yld", ".ytyp",
+    ".ybn.xml", ".ydr.xml", ".ydd.xml", ".yft.xml", ".yld.xml", ".ytyp.xml",
+)
+
+# Properties are copied in the same order as the exporters set them. Some setters depend on previous values, e.g. the
+# geometry vertices are stored relative to the center of the extent.
+BOUND_BASE_PROPERTIES = ("extent", "material")
+BOUND_COMPOSITE_CHILD_PROPERTIES = (
+    "composite_transform",
+    "composite_collision_type_flags",
+    "composite_collision_include_flags",
+)
+BOUND_GEOMETRY_PROPERTIES = ("geometry_vertices", "geometry_primitives")
+BOUND_PHYSICS_PROPERTIES = ("centroid", "radius_around_centroid", "volume", "cg", "inertia", "margin")
+DRAWABLE_PROPERTIES = ("name", "lod_thresholds")
+FRAG_DRAWABLE_PROPERTIES = ("frag_bound_matrix", "frag_extra_bound_matrices")
+FRAGMENT_PROPERTIES = (
+    "name",
+    "flags",
+    "template_asset",
+    "unbroken_elasticity",
+    "gravity_factor",
+    "buoyancy_factor",
+)
+FRAGMENT_WINDOW_PROPERTIES = ("glass_windows", "vehicle_windows", "lights")
+
+
+def get_asset_name(path: Path) -> str:
+    """Gets the asset name from a file path, the file name without extensions (e.g. ``prop.ydr.xml`` -> ``prop``)."""
+    name = path.name
+    i = name.find(".")
+    return name[:i] if 0 < i < len(name) - 1 else name
+
+
+def get_asset_target(asset: Asset) -> AssetTarget:
+    return AssetTarget(asset.ASSET_FORMAT, asset.ASSET_VERSION)
+
+
+class AssetConverter:
+    """Copies loaded assets into new assets of the given targets. Nested assets (embedded bounds, fragment drawables,
+    physics bounds, cloth bounds...) are converted too, as each target backend only accepts its own assets.
+    """
+
+    def __init__(self, targets: Sequence[AssetTarget], texture_directory: Optional[Path] = None):
+        self.targets = tuple(targets)
+        self.texture_directory = texture_directory
+        self.files_to_copy: list[Path] = []
+        self.missing_textures: list[str] = []
+
+    def convert(self, asset: Asset) -> Asset:
+        match asset.ASSET_TYPE:
+            case AssetType.BOUND:
+                return self.convert_bound(asset)
+            case AssetType.DRAWABLE:
+                return self.convert_drawable(asset)
+            case AssetType.DRAWABLE_DICTIONARY:
+                return self.convert_drawable_dictionary(asset)
+            case AssetType.FRAGMENT:
+                return self.convert_fragment(asset)
+            case AssetType.CLOTH_DICTIONARY:
+                return self.convert_cloth_dictionary(asset)
+            case AssetType.MAP_TYPES:
+                return self.convert_map_types(asset)
+            case _:
+                raise ValueError(f"Unsupported asset type '{asset.ASSET_TYPE}'")
+
+    def convert_bound(self, src: Optional[AssetBound], is_composite_child: bool = False) -> Optional[AssetBound]:
+        if src is None:
+            return None
+
+        bound_type = src.bound_type
+        dst = create_asset_bound(self.targets, bound_type)
+        _copy_properties(src, dst, BOUND_BASE_PROPERTIES)
+        if is_composite_child:
+            # Only set on composite children, the root bound may not have them
+            _copy_properties(src, dst, BOUND_COMPOSITE_CHILD_PROPERTIES)
+        if bound_type in {BoundType.GEOMETRY, BoundType.BVH}:
+            _copy_properties(src, dst, BOUND_GEOMETRY_PROPERTIES)
+        elif bound_type == BoundType.COMPOSITE:
+            dst.children = [self.convert_bound(child, is_composite_child=True) for child in src.children]
+        _copy_properties(src, dst, BOUND_PHYSICS_PROPERTIES)
+        return dst
+
+    def convert_drawable(
+        self,
+        src: Optional[AssetDrawable],
+        is_frag: bool = False,
+        parent_drawable: Optional[AssetDrawable] = None,
+    ) -> Optional[AssetDrawable]:
+        if src is None:
+            return None
+
+        dst = create_asset_drawable(self.targets, is_frag, parent_drawable)
+        _copy_properties(src, dst, DRAWABLE_PROPERTIES)
+        if parent_drawable is None:
+            shader_group = src.shader_group
+            dst.shader_group = self.resolve_embedded_textures(shader_group) if shader_group is not None else None
+            dst.skeleton = src.skeleton
+        else:
+            # Shaders are shared with the parent drawable
+            dst.shader_group = None
+            dst.skeleton = None
+        models = src.models
+        if any(models.values()):
+            # Leave the bounding box of empty physics children drawables unset, like the exporter does
+            dst.models = models
+        if is_frag:
+            # Fragment lights and bounds are stored in the fragment instead
+            _copy_properties(src, dst, FRAG_DRAWABLE_PROPERTIES)
+        else:
+            dst.lights = src.lights
+            dst.bounds = self.convert_bound(src.bounds)
+        return dst
+
+    def convert_drawable_dictionary(self, src: AssetDrawableDictionary) -> AssetDrawableDictionary:
+        dst = create_asset_drawable_dictionary(self.targets)
+        dst.drawables = {name: self.convert_drawable(d) for name, d in src.drawables.items()}
+        return dst
+
+    def convert_fragment(self, src: AssetFragment) -> AssetFragment:
+        dst = create_asset_fragment(self.targets)
+        _copy_properties(src, dst, FRAGMENT_PROPERTIES)
+
+        drawable = self.convert_drawable(src.drawable, is_frag=True)
+        dst.drawable = drawable
+        dst.extra_drawables = [
+            self.convert_drawable(d, is_frag=True, parent_drawable=drawable) for d in src.extra_drawables
+        ]
+        # Neither format can read back the matrix set, rebuild it from the skeleton like the exporter does
+        dst.matrix_set = create_bone_transforms_set(src.drawable) if src.drawable is not None else None
+
+        physics = src.physics
+        if physics is not None:
+            lod = physics.lod1
+            damaged_archetype = lod.damaged_archetype
+            if damaged_archetype is not None and (
+                damaged_archetype.bounds is None or not damaged_archetype.bounds.children
+            ):
+                # Empty damaged archetype, the importer ignores it as well
+                damaged_archetype = None
+            physics = dataclasses.replace(physics, lod1=dataclasses.replace(
+                lod,
+                archetype=self.convert_phys_archetype(lod.archetype),
+                damaged_archetype=self.convert_phys_archetype(damaged_archetype),
+                children=[
+                    dataclasses.replace(
+                        child,
+                        drawable=self.convert_drawable(child.drawable, is_frag=True, parent_drawable=drawable),
+                        damaged_drawable=self.convert_drawable(
+                            child.damaged_drawable, is_frag=True, parent_drawable=drawable
+                        ) if damaged_archetype is not None else None,
+                    )
+                    for child in lod.children
+                ],
+            ))
+        dst.physics = physics
+        _copy_properties(src, dst, FRAGMENT_WINDOW_PROPERTIES)
+
+        dst.cloths = [
+            dataclasses.replace(
+                cloth,
+                drawable=self.convert_drawable(cloth.drawable, is_frag=True),
+                controller=self.convert_cloth_controller(cloth.controller),
+            )
+            for cloth in src.cloths
+        ]
+        return dst
+
+    def convert_phys_archetype(self, archetype):
+        if archetype is None:
+            return None
+
+        return dataclasses.replace(archetype, bounds=self.convert_bound(archetype.bounds))
+
+    def convert_cloth_controller(self, controller):
+        if controller is None or controller.cloth_high is None:
+            return controller
+
+        cloth_high = dataclasses.replace(controller.cloth_high, bounds=self.convert_bound(controller.cloth_high.bounds))
+        return dataclasses.replace(controller, cloth_high=cloth_high)
+
+    def convert_cloth_dictionary(self, src: AssetClothDictionary) -> AssetClothDictionary:
+        dst = create_asset_cloth_dictionary(self.targets)
+        dst.cloths = {
+            name: dataclasses.replace(
+                cloth,
+                bounds=self.convert_bound(cloth.bounds),
+                controller=self.convert_cloth_controller(cloth.controller),
+            )
+            for name, cloth in src.cloths.items()
+        }
+        return dst
+
+    def convert_map_types(self, src: AssetMapTypes) -> AssetMapTypes:
+        dst = create_asset_map_types(self.targets)
+        dst.name = src.name
+        dst.archetypes = src.archetypes
+        return dst
+
+    def resolve_embedded_textures(self, shader_group: ShaderGroup) -> ShaderGroup:
+        """Points the embedded textures to their .dds files. Loaded assets do not know where their textures are, CW XML
+        stores them in a directory with the same name as the asset and native resources store the texture data inside
+        the file, which cannot be extracted.
+        """
+        if not shader_group.embedded_textures:
+            return shader_group
+
+        embedded_textures = {}
+        for name, tex in shader_group.embedded_textures.items():
+            path = self.texture_directory / f"{tex.name}.dds" if self.texture_directory is not None else None
+            if tex.source_filepath is None and path is not None and path.is_file():
+                tex = tex._replace(source_filepath=path)
+
+            if tex.source_filepath is None:
+                self.missing_textures.append(tex.name)
+            else:
+                self.files_to_copy.append(tex.source_filepath)
+            embedded_textures[name] = tex
+
+        return dataclasses.replace(shader_group, embedded_textures=embedded_textures)
+
+
+def _copy_properties(src: Asset, dst: Asset, property_names: Iterable[str]):
+    for name in property_names:
+        setattr(dst, name, getattr(src, name))
+
+
+class ConvertedFile(NamedTuple):
+    load_s: float
+    save_s: float
+    warnings: list[str]
+
+
+def convert_asset_file(
+    path: Path,
+    output_directory: Path,
+    targets: Sequence[AssetTarget],
+) -> ConvertedFile:
+    """Converts the asset file at ``path`` to ``targets`` and writes the result to ``output_directory``. When converting
+    to both game versions, each is written to its own ``gen8/`` or ``gen9/`` subdirectory, same as export.
+    """
+    start = time.perf_counter()
+    asset = try_load_asset(path)
+    if asset is None:
+        raise ValueError(f"Could not load '{path}'. Unsupported file format.")
+
+    name = get_asset_name(path)
+    converter = AssetConverter(targets, path.parent / name)
+    is_same_target = tuple(targets) == (get_asset_target(asset),)
+    converted = asset if is_same_target else converter.convert(asset)
+    load_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    output_directory.mkdir(parents=True, exist_ok=True)
+    if is_same_target:
+        # Nothing to convert, copy the file as is
+        if not (output_directory / path.name).exists() or not (output_directory / path.name).samefile(path):
+            shutil.copy(path, output_directory / path.name)
+        texture_directory = path.parent / name
+        if texture_directory.is_dir():
+            shutil.copytree(texture_directory, output_directory / name, dirs_exist_ok=True)
+    else:
+        ExportBundle(name, converted, (), tuple(converter.files_to_copy)).save(output_directory)
+    save_s = time.perf_counter() - start
+
+    warnings = []
+    if converter.missing_textures:
+        warnings.append(
+            f"Embedded textures not found, placeholders or texture references are used instead: "
+            f"{', '.join(sorted(set(converter.missing_textures)))}"
+        )
+    return ConvertedFile(load_s, save_s, warnings)
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages: list[str] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.messages.append(f"{record.levelname}: {self.format(record)}")
+
+
+def run_queue(
+    jobs: Iterable[dict],
+    targets: Sequence[AssetTarget],
+    manifest_path: Path,
+):
+    """Converts each job and appends its record to the manifest as soon as it is done."""
+    szio_logger = logging.getLogger("szio")
+    for job in jobs:
+        job = ConversionJob(**job)
+        path = Path(job.path)
+        stamp = get_file_stamp(path)
+        record = ConversionRecord(job.path, STATUS_FAILED, *(stamp or (0, 0)), settings=job.settings)
+
+        handler = _RecordingHandler()
+        szio_logger.addHandler(handler)
+        try:
+            converted = convert_asset_file(path, Path(job.output_directory), targets)
+            record.messages = handler.messages + [f"WARNING: {w}" for w in converted.warnings]
+            record.status = STATUS_WARNINGS if record.messages else STATUS_OK
+            record.import_s = converted.load_s
+            record.export_s = converted.save_s
+        except Exception:
+            record.messages = handler.messages + [f"ERROR: {traceback.format_exc()}"]
+        finally:
+            szio_logger.removeHandler(handler)
+
+        append_manifest(manifest_path, (record,))
+        logger.info(f"[{record.status.upper()}] {job.path} ({record.total_s:.2f} s)")
+
+
+def get_targets(formats: Iterable[str], versions: Iterable[str]) -> tuple[AssetTarget, ...]:
+    return tuple(AssetTarget(AssetFormat[f], AssetVersion[v]) for f in sorted(formats) for v in sorted(versions))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    if argv is None:
+        # Arguments after '--' when running inside Blender
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="Worker process of the batch conversion without Blender.")
+    parser.add_argument("--queue", type=Path, required=True, help="JSON file with the list of files to convert")
+    parser.add_argument("--manifest", type=Path, required=True, help="JSON lines file where the results are appended")
+    parser.add_argument("--format", nargs="+", choices=("NATIVE", "CWXML"), default=["NATIVE"])
+    parser.add_argument("--version", nargs="+", choices=("GEN8", "GEN9"), default=["GEN8"])
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with open(args.queue, "r", encoding="utf-8") as f:
+        jobs = json.load(f)
+
+    run_queue(jobs, get_targets(args.format, args.version), args.manifest)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
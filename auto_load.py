@@ -1,4 +1,6 @@
+import os
 import bpy
+import time
 import typing
 import inspect
 import pkgutil
@@ -8,10 +10,32 @@ from pathlib import Path
 __all__ = (
     "register",
     "unregister",
+    "is_headless",
 )
 
 modules = None
 ordered_classes = None
+# Seconds spent importing each module, recorded on register. Includes the imports of other modules not imported yet
+module_import_times: dict[str, float] = {}
+
+# Modules only needed to draw in the viewport, skipped when running headless
+HEADLESS_SKIPPED_MODULES = (
+    "editor_tools.vertex_paint",
+    "shared.viewport_overlays",
+    "sollumz_tool",
+    "ydr.cable_overlays",
+    "ydr.cloth_overlays",
+    "ydr.gizmos",
+    "ytyp.gizmos",
+    "ytyp.tools",
+)
+
+
+def is_headless() -> bool:
+    """Whether the UI-only modules should be skipped. Set the ``SOLLUMZ_HEADLESS`` environment variable to ``true`` to
+    enable it, only applies when Blender runs in background mode.
+    """
+    return bpy.app.background and os.environ.get("SOLLUMZ_HEADLESS", "false") == "true"
 
 
 def register():
@@ -52,24 +76,31 @@ def get_all_submodules(directory, package_name):
 
 
 def iter_submodules(path, package_name):
-    for name in sorted(iter_submodule_names(path)):
-        yield importlib.import_module("." + name, package_name)
+    skipped_modules = HEADLESS_SKIPPED_MODULES if is_headless() else ()
+    for name in sorted(iter_submodule_names(path, skipped_modules=skipped_modules)):
+        start = time.perf_counter()
+        module = importlib.import_module("." + name, package_name)
+        module_import_times.setdefault(name, time.perf_counter() - start)
+        yield module
 
 
-def iter_submodule_names(path, root=""):
+def iter_submodule_names(path, root="", skipped_modules=()):
     for _, module_name, is_package in pkgutil.iter_modules([str(path)]):
         if module_name == "io":
             # io can be lazy loaded, there is no blender register/unregister stuff in this package
             # Also io/gta5/native modules shouldn't be loaded if pymateria is not installed
             continue
 
+        if root + module_name in skipped_modules:
+            continue
+
         yield root + module_name
         if is_package:
             if module_name == "tests":
                 continue  # avoid importing `tests/` directory
             sub_path = path / module_name
             sub_root = root + module_name + "."
-            yield from iter_submodule_names(sub_path, sub_root)
+            yield from iter_submodule_names(sub_path, sub_root, skipped_modules)
 
 
 # Find classes to register
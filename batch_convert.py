@@ -0,0 +1,564 @@
+"""
+Headless batch conversion of asset files.
+
+Run Blender in background mode, with Sollumz enabled in the preferences::
+
+    blender --background --command sollumz_convert <files or directories...> --output <directory>
+            [--jobs N] [--format NATIVE CWXML] [--version GEN8 GEN9] [--report report.json]
+
+Each input file is imported and exported again with the selected target formats and versions, the same as importing
+and exporting it from the UI. The files are split into one queue per worker and each worker is a separate Blender
+process, so the conversion scales with the number of cores. Files in input directories are written to the same
+relative directories inside the output directory. Workers are started with ``SOLLUMZ_HEADLESS=true``, so the UI-only
+modules of the add-on are not loaded (see ``auto_load.is_headless``).
+
+Files are imported and exported with the import and export settings of the add-on preferences, except for the target
+formats and versions given in the command line. The export always includes all the objects of the imported file and
+the import never creates library assets.
+
+Every converted file is recorded in a manifest (JSON lines, by default ``sollumz_convert_manifest.jsonl`` in the output
+directory) with its status, timings and conversion settings. Running the same command again skips the files that were
+already converted with the same settings, unless they were modified since, so an interrupted conversion can be resumed.
+
+With ``--direct``, .ybn, .ydr, .ydd, .yft, .yld and .ytyp files are converted without importing them into Blender
+(see ``asset_conversion``) and the workers are bare Blender processes without the add-on. This is much faster, but the
+assets are written as they were loaded, without any of the processing done on export.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+import traceback
+from contextlib import ExitStack
+from dataclasses import dataclass, asdict
+from collections.abc import Sequence, Iterable, Callable
+from functools import partial
+from pathlib import Path
+from typing import Optional
+import bpy
+from . import logger
+from .asset_cache import get_file_stamp, asset_cache_session
+from .conversion_manifest import (
+    STATUS_OK,
+    STATUS_WARNINGS,
+    STATUS_FAILED,
+    STATUS_CRASHED,
+    ConversionJob,
+    ConversionRecord,
+    read_manifest,
+    append_manifest,
+)
+from .sollumz_preferences import get_import_settings, get_export_settings
+from . import asset_conversion
+
+CLI_COMMAND_ID = "sollumz_convert"
+MANIFEST_FILENAME = "sollumz_convert_manifest.jsonl"
+
+# Formats that can be both imported and exported
+CONVERTIBLE_EXTENSIONS = (
+    ".ybn", ".ydr", ".ydd", ".yft",
+    ".ybn.xml", ".ydr.xml", ".ydd.xml", ".yft.xml", ".ycd.xml", ".ymap.xml",
+)
+
+# Number of files listed in the summary report
+SUMMARY_SLOWEST_FILES = 10
+SUMMARY_MAX_MESSAGES = 3
+
+
+def get_settings_values(settings) -> dict:
+    """Gets the values of the properties of an import or export settings property group. Enum flags are stored as
+    sorted lists so the values can be written to JSON and compared.
+    """
+    values = {}
+    for prop in settings.bl_rna.properties:
+        if prop.identifier == "rna_type":
+            continue
+
+        value = getattr(settings, prop.identifier)
+        values[prop.identifier] = sorted(value) if isinstance(value, set) else value
+
+    return values
+
+
+def get_conversion_settings(formats: set[str], versions: set[str], direct: bool) -> dict:
+    """Gets the settings that affect the output of a conversion. Files converted with different settings are converted
+    again.
+    """
+    settings = {"formats": sorted(formats), "versions": sorted(versions), "direct": direct}
+    if not direct:
+        settings["import"] = get_settings_values(get_import_settings()) | {"import_as_asset": False}
+        settings["export"] = get_settings_values(get_export_settings()) | {
+            "target_formats": sorted(formats),
+            "target_versions": sorted(versions),
+            "limit_to_selected": False,
+        }
+
+    return settings
+
+
+def _to_operator_settings(values: dict) -> dict:
+    """Converts settings values from ``get_settings_values`` back to the values expected by the operators."""
+    return {name: set(value) if isinstance(value, list) else value for name, value in values.items()}
+
+
+def is_convertible_file(path: Path, extensions: tuple[str, ...] = CONVERTIBLE_EXTENSIONS) -> bool:
+    return path.name.lower().endswith(extensions)
+
+
+def collect_jobs(
+    inputs: Iterable[str | os.PathLike],
+    output_directory: Path,
+    extensions: tuple[str, ...] = CONVERTIBLE_EXTENSIONS,
+    settings: Optional[dict] = None,
+) -> list[ConversionJob]:
+    """Gets the files to convert. Directories are searched recursively and their files are output to the same relative
+    directory inside ``output_directory``. ``settings`` are the conversion settings of the jobs.
+    """
+    jobs = []
+    seen = set()
+
+    def _add(path: Path, out_dir: Path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key in seen:
+            return
+
+        seen.add(key)
+        stamp = get_file_stamp(path)
+        jobs.append(ConversionJob(str(path), str(out_dir), stamp.size if stamp else 0, settings or {}))
+
+    for input_path in map(Path, inputs):
+        if input_path.is_dir():
+            for path in sorted(input_path.rglob("*")):
+                if path.is_file() and is_convertible_file(path, extensions):
+                    _add(path, output_directory / path.parent.relative_to(input_path))
+        elif input_path.is_file():
+            if is_convertible_file(input_path, extensions):
+                _add(input_path, output_directory)
+            else:
+                logger.warning(f"Skipping '{input_path}'. Unsupported file format.")
+        else:
+            logger.warning(f"Skipping '{input_path}'. File not found.")
+
+    return jobs
+
+
+def split_jobs(jobs: Sequence[ConversionJob], num_queues: int) -> list[list[ConversionJob]]:
+    """Splits the jobs into ``num_queues`` queues of similar total file size. Largest files are assigned first, each to
+    the queue with the least work so far.
+    """
+    queues = [[] for _ in range(num_queues)]
+    queue_sizes = [0] * num_queues
+    for job in sorted(jobs, key=lambda j: j.size, reverse=True):
+        i = queue_sizes.index(min(queue_sizes))
+        queues[i].append(job)
+        # Count empty files too, so they are still distributed between the queues
+        queue_sizes[i] += max(job.size, 1)
+
+    return [q for q in queues if q]
+
+
+def is_job_done(job: ConversionJob, records: dict[str, ConversionRecord]) -> bool:
+    """Checks whether ``job`` was already converted, with the same settings, and the file was not modified since."""
+    record = records.get(os.path.normcase(os.path.abspath(job.path)), None)
+    if record is None or not record.is_converted or record.settings != job.settings:
+        return False
+
+    stamp = get_file_stamp(job.path)
+    return stamp is not None and (record.mtime_ns, record.size) == stamp
+
+
+def _worker_manifest_paths(manifest_path: Path) -> list[Path]:
+    return sorted(manifest_path.parent.glob(f"{manifest_path.name}.worker*"))
+
+
+def merge_worker_manifests(manifest_path: Path):
+    """Appends the records written by the workers to the main manifest and deletes the worker manifests. Also picks up
+    the worker manifests left by an interrupted run.
+    """
+    for worker_manifest_path in _worker_manifest_paths(manifest_path):
+        append_manifest(manifest_path, read_manifest(worker_manifest_path).values())
+        worker_manifest_path.unlink()
+
+
+class RecordingLogger(logger.LoggerBase):
+    """Keeps the warnings and errors logged during the conversion of a file."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+        self.num_warnings = 0
+        self.num_errors = 0
+
+    def do_log(self, msg: str, level: str):
+        if level == "WARNING":
+            self.num_warnings += 1
+        elif level == "ERROR":
+            self.num_errors += 1
+        else:
+            return
+
+        self.messages.append(f"{level}: {msg}")
+
+
+def _reset_scene():
+    bpy.ops.wm.read_homefile(use_empty=True)
+
+
+def convert_file(job: ConversionJob, formats: set[str], versions: set[str]) -> ConversionRecord:
+    """Imports and exports a single file in the current Blender session. The scene is cleared before the import."""
+    path = Path(job.path)
+    stamp = get_file_stamp(path)
+    record = ConversionRecord(job.path, STATUS_FAILED, *(stamp or (0, 0)), settings=job.settings)
+    log = RecordingLogger()
+    with logger.use_logger(log):
+        try:
+            _reset_scene()
+
+            start = time.perf_counter()
+            bpy.ops.sollumz.import_assets(
+                directory=str(path.parent),
+                files=[{"name": path.name}],
+                use_custom_settings=True,
+                custom_settings=_to_operator_settings(job.settings.get("import", {})),
+            )
+            record.import_s = time.perf_counter() - start
+
+            Path(job.output_directory).mkdir(parents=True, exist_ok=True)
+            start = time.perf_counter()
+            result = bpy.ops.sollumz.export_assets(
+                directory=job.output_directory,
+                direct_export=True,
+                use_custom_settings=True,
+                custom_settings=_to_operator_settings(job.settings.get("export", {})) | {
+                    "target_formats": formats,
+                    "target_versions": versions,
+                    "limit_to_selected": False,
+                },
+            )
+            record.export_s = time.perf_counter() - start
+
+            if "FINISHED" in result and log.num_errors == 0:
+                record.status = STATUS_WARNINGS if log.num_warnings > 0 else STATUS_OK
+            elif "FINISHED" not in result and not log.messages:
+                log.messages.append("ERROR: Nothing to export, the file did not import any asset.")
+        except Exception:
+            log.messages.append(f"ERROR: {traceback.format_exc()}")
+
+    record.messages = log.messages
+    return record
+
+
+def run_worker(jobs: Sequence[ConversionJob], formats: set[str], versions: set[str], manifest_path: Path):
+    """Converts ``jobs`` in order. Each record is written to the manifest as soon as its file is done, so the progress
+    is not lost if the process is interrupted.
+    """
+    # Converted files are independent of each other, but they can share dependencies (e.g. the .yft skeleton of ped
+    # .ydd files)
+    with asset_cache_session():
+        for job in jobs:
+            record = convert_file(job, formats, versions)
+            append_manifest(manifest_path, (record,))
+            logger.info(f"[{record.status.upper()}] {job.path} ({record.total_s:.2f} s)")
+
+
+def _count_lines(path: Path) -> int:
+    try:
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+    except OSError:
+        return 0
+
+
+def get_worker_args(formats: set[str], versions: set[str], queue_path: Path, manifest_path: Path) -> list[str]:
+    return [
+        bpy.app.binary_path, "--background", "--command", CLI_COMMAND_ID,
+        "--format", *formats, "--version", *versions,
+        "--worker-queue", str(queue_path), "--worker-manifest", str(manifest_path),
+    ]
+
+
+def get_direct_worker_args(formats: set[str], versions: set[str], queue_path: Path, manifest_path: Path) -> list[str]:
+    return [
+        bpy.app.binary_path, "--background", "--factory-startup", "--python-use-system-env",
+        "--python", asset_conversion.__file__, "--",
+        "--format", *formats, "--version", *versions,
+        "--queue", str(queue_path), "--manifest", str(manifest_path),
+    ]
+
+
+def run_workers(
+    queues: Sequence[Sequence[ConversionJob]],
+    make_worker_args: Callable[[Path, Path], list[str]],
+    manifest_path: Path,
+    log_directory: Path,
+    env: Optional[dict[str, str]] = None,
+):
+    """Runs one worker process per queue and waits for all of them to finish. ``make_worker_args`` gets the command line
+    of a worker from its queue file and manifest file.
+    """
+    total = sum(len(q) for q in queues)
+    workers = []
+    with (
+        tempfile.TemporaryDirectory(prefix="sollumz_convert_") as queue_directory,
+        ExitStack() as log_files,
+    ):
+        for i, queue in enumerate(queues):
+            queue_path = Path(queue_directory) / f"queue{i}.json"
+            with open(queue_path, "w", encoding="utf-8") as f:
+                json.dump([asdict(job) for job in queue], f)
+
+            worker_manifest_path = manifest_path.with_name(f"{manifest_path.name}.worker{i}")
+            log_path = log_directory / f"sollumz_convert_worker{i}.log"
+            log_file = log_files.enter_context(open(log_path, "w", encoding="utf-8"))
+            proc = subprocess.Popen(
+                make_worker_args(queue_path, worker_manifest_path), stdout=log_file, stderr=subprocess.STDOUT, env=env
+            )
+            workers.append((proc, queue, worker_manifest_path, log_path))
+
+        logger.info(f"Started {len(workers)} worker(s), logs in '{log_directory}'")
+
+        last_done = -1
+        while any(proc.poll() is None for proc, *_ in workers):
+            done = sum(_count_lines(worker_manifest_path) for _, _, worker_manifest_path, *_ in workers)
+            if done != last_done:
+                logger.info(f"Processed {done}/{total} file(s)")
+                last_done = done
+            time.sleep(1.0)
+
+        log_files.close()
+        for proc, queue, worker_manifest_path, log_path in workers:
+            if proc.returncode == 0:
+                continue
+
+            # The file after the last recorded one is the file the worker was converting when it exited. The remaining
+            # files are left unrecorded to be converted in the next run.
+            logger.error(f"Worker exited with code {proc.returncode}, see '{log_path}'")
+            num_recorded = _count_lines(worker_manifest_path)
+            if num_recorded < len(queue):
+                job = queue[num_recorded]
+                stamp = get_file_stamp(job.path)
+                append_manifest(worker_manifest_path, (ConversionRecord(
+                    job.path, STATUS_CRASHED, *(stamp or (0, 0)),
+                    messages=[f"ERROR: Worker exited with code {proc.returncode} while converting this file."],
+                    settings=job.settings,
+                ),))
+
+
+@dataclass(slots=True)
+class ConversionSummary:
+    num_files: int
+    num_skipped: int
+    num_workers: int
+    wall_s: float
+    records: list[ConversionRecord]
+
+    def count(self, status: str) -> int:
+        return sum(1 for r in self.records if r.status == status)
+
+    @property
+    def num_unprocessed(self) -> int:
+        return self.num_files - self.num_skipped - len(self.records)
+
+    @property
+    def import_s(self) -> float:
+        return sum(r.import_s for r in self.records)
+
+    @property
+    def export_s(self) -> float:
+        return sum(r.export_s for r in self.records)
+
+    @property
+    def speedup(self) -> float:
+        """Total conversion time of the files relative to the elapsed time, i.e. how much faster than converting them
+        one after another. Does not include the startup time of the workers.
+        """
+        return (self.import_s + self.export_s) / self.wall_s if self.wall_s > 0.0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "num_files": self.num_files,
+            "num_skipped": self.num_skipped,
+            "num_unprocessed": self.num_unprocessed,
+            "num_workers": self.num_workers,
+            "counts": {s: self.count(s) for s in (STATUS_OK, STATUS_WARNINGS, STATUS_FAILED, STATUS_CRASHED)},
+            "wall_s": self.wall_s,
+            "import_s": self.import_s,
+            "export_s": self.export_s,
+            "speedup": self.speedup,
+            "records": [asdict(r) for r in self.records],
+        }
+
+    def format(self) -> str:
+        lines = [
+            f"Processed {len(self.records)} of {self.num_files} file(s) in {self.wall_s:.2f} s with "
+            f"{self.num_workers} worker(s): {self.count(STATUS_OK)} ok, {self.count(STATUS_WARNINGS)} with warnings, "
+            f"{self.count(STATUS_FAILED)} failed, {self.count(STATUS_CRASHED)} crashed, "
+            f"{self.num_skipped} skipped (already converted).",
+            f"Total conversion time {self.import_s + self.export_s:.2f} s (import {self.import_s:.2f} s, export "
+            f"{self.export_s:.2f} s), {self.speedup:.2f}x faster than a single process.",
+        ]
+        if self.num_unprocessed > 0:
+            lines.append(f"{self.num_unprocessed} file(s) were not processed. Run the same command again to resume.")
+
+        slowest = sorted(self.records, key=lambda r: r.total_s, reverse=True)[:SUMMARY_SLOWEST_FILES]
+        if slowest:
+            lines.append("Slowest files:")
+            lines.extend(f"  {r.total_s:8.2f} s  {r.path}" for r in slowest)
+
+        failed = [r for r in self.records if not r.is_converted]
+        if failed:
+            lines.append("Failed files:")
+            for r in failed:
+                lines.append(f"  {r.path}")
+                lines.extend(f"    {m.strip().splitlines()[-1]}" for m in r.messages[:SUMMARY_MAX_MESSAGES])
+
+        return "\n".join(lines)
+
+
+def convert(
+    inputs: Sequence[str | os.PathLike],
+    output_directory: Path,
+    formats: set[str],
+    versions: set[str],
+    num_jobs: int,
+    manifest_path: Path,
+    force: bool = False,
+    direct: bool = False,
+) -> ConversionSummary:
+    """Converts the files in ``inputs``, skipping the files already converted according to the manifest unless
+    ``force`` is set. If ``direct`` is set, the files are converted without importing them into Blender.
+    """
+    start = time.perf_counter()
+
+    output_directory.mkdir(parents=True, exist_ok=True)
+    merge_worker_manifests(manifest_path)
+    done_records = {} if force else read_manifest(manifest_path)
+
+    extensions = asset_conversion.DIRECT_CONVERTIBLE_EXTENSIONS if direct else CONVERTIBLE_EXTENSIONS
+    jobs = collect_jobs(inputs, output_directory, extensions, get_conversion_settings(formats, versions, direct))
+    pending_jobs = [job for job in jobs if not is_job_done(job, done_records)]
+    num_skipped = len(jobs) - len(pending_jobs)
+    if num_skipped > 0:
+        logger.info(f"Skipping {num_skipped} file(s) already converted.")
+
+    queues = split_jobs(pending_jobs, max(1, num_jobs))
+    if len(queues) == 1:
+        # Not worth starting another process
+        worker_manifest_path = manifest_path.with_name(f"{manifest_path.name}.worker0")
+        if direct:
+            asset_conversion.run_queue(
+                [asdict(job) for job in queues[0]],
+                asset_conversion.get_targets(formats, versions),
+                worker_manifest_path,
+            )
+        else:
+            run_worker(queues[0], formats, versions, worker_manifest_path)
+    elif queues:
+        if direct:
+            # Workers run without the add-on, so they do not know where its dependencies are installed
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+            make_worker_args = partial(get_direct_worker_args, formats, versions)
+        else:
+            # Workers do not need the viewport tools, overlays and gizmos of the add-on
+            env = dict(os.environ, SOLLUMZ_HEADLESS="true")
+            make_worker_args = partial(get_worker_args, formats, versions)
+
+        run_workers(queues, make_worker_args, manifest_path, manifest_path.parent, env)
+
+    pending_keys = {os.path.normcase(os.path.abspath(job.path)) for job in pending_jobs}
+    records = [
+        r for worker_manifest_path in _worker_manifest_paths(manifest_path)
+        for key, r in read_manifest(worker_manifest_path).items() if key in pending_keys
+    ]
+    merge_worker_manifests(manifest_path)
+
+    return ConversionSummary(len(jobs), num_skipped, len(queues), time.perf_counter() - start, records)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog=f"blender --background --command {CLI_COMMAND_ID}",
+        description="Convert asset files between formats and game versions by importing and exporting them again.",
+    )
+    parser.add_argument(
+        "inputs", nargs="*", help="Files or directories to convert. Directories are searched recursively"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="Output directory")
+    parser.add_argument(
+        "-f", "--format", nargs="+", choices=("NATIVE", "CWXML"), default=["NATIVE"], help="Target formats"
+    )
+    parser.add_argument(
+        "-v", "--version", nargs="+", choices=("GEN8", "GEN9"), default=["GEN8"], help="Target game versions"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="Number of worker processes, default is one per core"
+    )
+    parser.add_argument(
+        "--manifest", type=Path,
+        help=f"Manifest file used to resume the conversion, default is '<output>/{MANIFEST_FILENAME}'"
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Convert again the files already in the manifest. Files converted with different formats, versions, "
+             "--direct mode or add-on import/export settings are always converted again"
+    )
+    parser.add_argument(
+        "--direct", action="store_true",
+        help="Convert .ybn, .ydr, .ydd, .yft, .yld and .ytyp files without importing them into Blender. Much faster, "
+             "but the assets are not processed as on export"
+    )
+    parser.add_argument("--report", type=Path, help="Write the summary and the records of every file to this JSON file")
+    # Internal, used by the main process to start the workers
+    parser.add_argument("--worker-queue", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-manifest", type=Path, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str]) -> int:
+    parser = create_argument_parser()
+    args = parser.parse_args(argv)
+    formats = set(args.format)
+    versions = set(args.version)
+
+    if args.worker_queue is not None:
+        with open(args.worker_queue, "r", encoding="utf-8") as f:
+            jobs = [ConversionJob(**job) for job in json.load(f)]
+        run_worker(jobs, formats, versions, args.worker_manifest)
+        return 0
+
+    if not args.inputs or args.output is None:
+        parser.print_usage()
+        print("error: the input files and the --output directory are required", file=sys.stderr)
+        return 2
+
+    output_directory = args.output.resolve()
+    manifest_path = (args.manifest or output_directory / MANIFEST_FILENAME).resolve()
+    summary = convert(
+        args.inputs, output_directory, formats, versions, args.jobs, manifest_path, args.force, args.direct
+    )
+    logger.info(summary.format())
+
+    if args.report is not None:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+
+    return 0 if summary.count(STATUS_FAILED) + summary.count(STATUS_CRASHED) == 0 else 1
+
+
+_cli_command_handle = None
+
+
+def register():
+    global _cli_command_handle
+    _cli_command_handle = bpy.utils.register_cli_command(CLI_COMMAND_ID, main)
+
+
+def unregister():
+    global _cli_command_handle
+    if _cli_command_handle is not None:
+        bpy.utils.unregister_cli_command(_cli_command_handle)
+        _cli_command_handle = None
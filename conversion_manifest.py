@@ -0,0 +1,76 @@
+"""
+Manifest of the batch conversion, shared by ``batch_convert`` and the ``asset_conversion`` workers.
+
+The manifest is a JSON lines file with a ``ConversionRecord`` per converted file. Records are appended as soon as each
+file is done, so the progress is not lost if the conversion is interrupted. This module does not depend on ``bpy``.
+"""
+
+import os
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+
+STATUS_OK = "ok"
+STATUS_WARNINGS = "warnings"
+STATUS_FAILED = "failed"
+STATUS_CRASHED = "crashed"
+CONVERTED_STATUSES = {STATUS_OK, STATUS_WARNINGS}
+
+
+@dataclass(slots=True)
+class ConversionJob:
+    path: str
+    output_directory: str
+    size: int = 0
+    settings: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ConversionRecord:
+    path: str
+    status: str
+    mtime_ns: int = 0
+    size: int = 0
+    import_s: float = 0.0
+    export_s: float = 0.0
+    messages: list[str] = field(default_factory=list)
+    settings: dict = field(default_factory=dict)
+
+    @property
+    def total_s(self) -> float:
+        return self.import_s + self.export_s
+
+    @property
+    def is_converted(self) -> bool:
+        return self.status in CONVERTED_STATUSES
+
+
+def read_manifest(path: Path) -> dict[str, ConversionRecord]:
+    """Reads the records of a manifest file by file path. If a file appears more than once, the last record is used."""
+    records = {}
+    if not path.is_file():
+        return records
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                record = ConversionRecord(**json.loads(line))
+            except (ValueError, TypeError):
+                # Partially written line from an interrupted run
+                continue
+
+            records[os.path.normcase(os.path.abspath(record.path))] = record
+
+    return records
+
+
+def append_manifest(path: Path, records: Iterable[ConversionRecord]):
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(asdict(record)) + "\n")
+        f.flush()
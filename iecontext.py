@@ -6,6 +6,7 @@ from pathlib import Path
 from collections.abc import Sequence
 from szio.gta5 import Asset, AssetFormat, AssetTarget, save_asset
 from .ydr.vertex_buffer_builder_domain import VBBuilderDomain
+from . import profiler
 
 
 @dataclass(slots=True, frozen=True)
@@ -57,9 +58,11 @@ class ExportBundle:
         gen8_directory = directory / "gen8"
         gen9_directory = directory / "gen9"
         main_asset = self.main_asset
-        save_asset(main_asset, directory, self.asset_name, tool_metadata, gen8_directory, gen9_directory)
+        with profiler.scope("save_asset"):
+            save_asset(main_asset, directory, self.asset_name, tool_metadata, gen8_directory, gen9_directory)
         for suffix, asset in self.secondary_assets:
-            save_asset(asset, directory, self.asset_name + suffix, tool_metadata, gen8_directory, gen9_directory)
+            with profiler.scope("save_asset"):
+                save_asset(asset, directory, self.asset_name + suffix, tool_metadata, gen8_directory, gen9_directory)
 
         do_copy_files = self.files_to_copy and (
             # We only use files_to_copy for embedded textures, which are only really needed for CWXML. Initially, these
@@ -72,6 +75,7 @@ class ExportBundle:
         )
 
         if do_copy_files:
+            profiler.count("save.files_to_copy", len(self.files_to_copy))
             if main_asset.ASSET_FORMAT == AssetFormat.MULTI_TARGET and len(main_asset.target_versions()) > 1:
                 output_dirs = (gen8_directory, gen9_directory)
             else:
@@ -102,6 +106,8 @@ class ExportSettings:
     apply_transforms: bool = False
     exclude_skeleton: bool = False
     mesh_domain: VBBuilderDomain = VBBuilderDomain.FACE_CORNER
+    optimize_vertex_cache: bool = False
+    """Reorder the index and vertex buffers of the exported meshes for the GPU vertex cache."""
 
 
 @dataclass(slots=True, frozen=True)
@@ -0,0 +1,258 @@
+"""
+Lightweight profiler for the import/export hot paths.
+
+Code is instrumented with scoped timers and counters::
+
+    with profiler.scope("ydr.vertex_buffer"):
+        ...
+    profiler.count("ydr.vertices", len(vert_buffer))
+
+When no profiling session is active, ``scope`` returns a shared no-op context manager and ``count`` returns
+immediately, so the instrumentation can stay in the hot paths. A session collects every scope as an event, which can be
+written to a Chrome trace file (open it in ``chrome://tracing`` or https://ui.perfetto.dev) or aggregated into a
+summary.
+
+Profiling is enabled from the add-on preferences or with the ``SOLLUMZ_PROFILE=true`` environment variable.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from collections import defaultdict
+from collections.abc import Iterator, Callable
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+_NULL_SCOPE = nullcontext()
+
+
+@dataclass(slots=True)
+class ProfilerEvent:
+    name: str
+    start_ns: int
+    duration_ns: int
+    depth: int
+    thread_id: int
+
+
+@dataclass(slots=True)
+class ProfilerScopeSummary:
+    name: str
+    calls: int
+    total_ns: int
+    self_ns: int
+    max_ns: int
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_ns / 1_000_000
+
+    @property
+    def self_ms(self) -> float:
+        return self.self_ns / 1_000_000
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_ns / 1_000_000
+
+
+@dataclass(slots=True)
+class ProfilerSession:
+    name: str
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    end_ns: int = 0
+    events: list[ProfilerEvent] = field(default_factory=list)
+    counters: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    _depth: int = 0
+
+    @property
+    def duration_ns(self) -> int:
+        end_ns = self.end_ns or time.perf_counter_ns()
+        return end_ns - self.start_ns
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[None]:
+        depth = self._depth
+        self._depth += 1
+        start_ns = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration_ns = time.perf_counter_ns() - start_ns
+            self._depth = depth
+            self.events.append(ProfilerEvent(name, start_ns, duration_ns, depth, threading.get_ident()))
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def summary(self) -> list[ProfilerScopeSummary]:
+        """Aggregates the events by scope name. Sorted by total time, descending."""
+        summaries: dict[str, ProfilerScopeSummary] = {}
+        children_ns: dict[int, int] = defaultdict(int)  # depth -> time spent in children of the open scope
+        # Events are appended when the scope ends, so children always come before their parent
+        for e in self.events:
+            child_ns = children_ns.pop(e.depth + 1, 0)
+            children_ns[e.depth] += e.duration_ns
+
+            s = summaries.get(e.name, None)
+            if s is None:
+                s = summaries[e.name] = ProfilerScopeSummary(e.name, 0, 0, 0, 0)
+            s.calls += 1
+            s.total_ns += e.duration_ns
+            s.self_ns += e.duration_ns - child_ns
+            s.max_ns = max(s.max_ns, e.duration_ns)
+
+        return sorted(summaries.values(), key=lambda s: s.total_ns, reverse=True)
+
+    def to_chrome_trace(self) -> dict:
+        """Gets the session in the Chrome Trace Event format."""
+        pid = os.getpid()
+        trace_events = [
+            {
+                "name": e.name,
+                "ph": "X",
+                "ts": (e.start_ns - self.start_ns) / 1000,
+                "dur": e.duration_ns / 1000,
+                "pid": pid,
+                "tid": e.thread_id,
+            }
+            for e in self.events
+        ]
+        end_ts = self.duration_ns / 1000
+        trace_events.extend(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": end_ts,
+                "pid": pid,
+                "args": {"value": value},
+            }
+            for name, value in self.counters.items()
+        )
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "session": self.name,
+                "duration_ms": self.duration_ns / 1_000_000,
+                "counters": dict(self.counters),
+            },
+        }
+
+    def write_chrome_trace(self, path: str | os.PathLike):
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def format_summary(self, max_scopes: int = 20) -> str:
+        lines = [f"Profile '{self.name}': {self.duration_ns / 1_000_000:.1f} ms"]
+        for s in self.summary()[:max_scopes]:
+            lines.append(f"  {s.name}: {s.total_ms:.1f} ms total, {s.self_ms:.1f} ms self, {s.calls} call(s)")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  #{name}: {value}")
+        return "\n".join(lines)
+
+
+_session: Optional[ProfilerSession] = None
+_last_session: Optional[ProfilerSession] = None
+
+
+def is_enabled_by_env() -> bool:
+    return os.environ.get("SOLLUMZ_PROFILE", "false") == "true"
+
+
+def is_active() -> bool:
+    """Gets whether a profiling session is currently active."""
+    return _session is not None
+
+
+def scope(name: str):
+    """Times the code inside the returned context manager. No-op if profiling is not active."""
+    session = _session
+    if session is None:
+        return _NULL_SCOPE
+    return session.scope(name)
+
+
+def count(name: str, value: int = 1):
+    """Adds ``value`` to the counter ``name``. No-op if profiling is not active."""
+    session = _session
+    if session is None:
+        return
+    session.count(name, value)
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator that times every call to the function. The scope name defaults to the function qualified name."""
+    def _decorator(func: Callable) -> Callable:
+        scope_name = name or f"{func.__module__.rpartition('.')[2]}.{func.__qualname__}"
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs):
+            session = _session
+            if session is None:
+                return func(*args, **kwargs)
+            with session.scope(scope_name):
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
+
+
+@contextmanager
+def profile_session(
+    name: str,
+    enabled: bool = True,
+    trace_directory: Optional[Path] = None,
+) -> Iterator[Optional[ProfilerSession]]:
+    """Starts a profiling session. If ``enabled`` is false, nothing is profiled. If a session is already active, the
+    events go to the already active session.
+
+    When the session finishes, a summary is logged and, if ``trace_directory`` is given, the Chrome trace is written to
+    it.
+    """
+    global _session, _last_session
+    if not enabled or _session is not None:
+        yield _session
+        return
+
+    session = ProfilerSession(name)
+    _session = session
+    try:
+        yield session
+    finally:
+        session.end_ns = time.perf_counter_ns()
+        _session = None
+        _last_session = session
+        _report_session(session, trace_directory)
+
+
+def _report_session(session: ProfilerSession, trace_directory: Optional[Path]):
+    from . import logger
+
+    logger.info(session.format_summary())
+    if trace_directory is None:
+        return
+
+    trace_path = trace_file_path(trace_directory, session.name)
+    try:
+        session.write_chrome_trace(trace_path)
+    except OSError as e:
+        logger.warning(f"Failed to write profiling trace to '{trace_path}': {e}")
+        return
+
+    logger.info(f"Profiling trace written to '{trace_path}'")
+
+
+def last_session() -> Optional[ProfilerSession]:
+    """Gets the last finished profiling session."""
+    return _last_session
+
+
+def trace_file_path(directory: Path, name: str) -> Path:
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return directory / f"sollumz_{name}_profile_{timestamp}.json"
@@ -0,0 +1,99 @@
+"""
+Minimum bounding sphere of a set of points.
+
+Uses the pivoting variant of Welzl's algorithm (Gärtner, "Fast and Robust Smallest Enclosing Balls", 1999): starting
+from a ball through two far apart points (Ritter's initialisation), the point farthest from the current ball is found
+with a vectorized pass over all points and the exact smallest ball of the current support points plus that point is
+computed. This repeats until no point is outside the ball. The support never has more than 4 points, so each step is
+cheap, and there is no recursion or list slicing over the whole point set.
+
+Duplicated points do not need to be removed beforehand: a point equal to a support point is never outside the ball, so
+it is never added to the support.
+"""
+
+from itertools import combinations
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_EPSILON = 1e-7
+MAX_ITERATIONS = 1000
+
+
+def get_bounding_sphere(
+    points: NDArray,
+    epsilon: float = DEFAULT_EPSILON,
+    seed: int = 0,
+) -> tuple[NDArray[np.float64], float]:
+    """Computes the smallest sphere enclosing ``points``, a (N, 3) array.
+
+    ``epsilon`` is the relative tolerance used to decide if a point is inside the sphere. ``seed`` selects the point
+    used to start the search, the result is the same for the same points and seed.
+
+    Returns ``(C, r2)``, the center and the squared radius of the sphere, same as ``miniball.get_bounding_ball``.
+    Raises ``np.linalg.LinAlgError`` if the sphere could not be computed.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if len(points) == 0:
+        return np.zeros(points.shape[1] if points.ndim == 2 else 3), 0.0
+
+    # Ritter's initialisation: the two points farthest apart along the farthest-from-start direction
+    start = np.random.default_rng(seed).integers(len(points))
+    a = points[np.argmax(np.square(points - points[start]).sum(axis=1))]
+    b = points[np.argmax(np.square(points - a).sum(axis=1))]
+    support = [a, b] if np.any(a != b) else [a]
+    C, r2 = _get_circumsphere(np.array(support))
+
+    for _ in range(MAX_ITERATIONS):
+        d2 = np.square(points - C).sum(axis=1)
+        farthest = np.argmax(d2)
+        if d2[farthest] <= r2 * (1.0 + epsilon) + epsilon * epsilon:
+            return C, r2
+
+        support, C, r2 = _get_smallest_ball_with_point(support, points[farthest], epsilon)
+
+    # Did not converge, return a sphere that still encloses every point
+    return C, float(np.square(points - C).sum(axis=1).max())
+
+
+def _get_smallest_ball_with_point(
+    support: list[NDArray[np.float64]],
+    p: NDArray[np.float64],
+    epsilon: float,
+) -> tuple[list[NDArray[np.float64]], NDArray[np.float64], float]:
+    """Gets the smallest ball enclosing the support points and ``p``, with ``p`` on its boundary. Returns the new
+    support, the center and the squared radius.
+    """
+    candidates = np.array(support + [p])
+    best = None
+    # At most 4 points can be on the boundary of a sphere in general position
+    for num_others in range(1, min(len(support), 3) + 1):
+        for others in combinations(support, num_others):
+            boundary = np.array(others + (p,))
+            try:
+                C, r2 = _get_circumsphere(boundary)
+            except np.linalg.LinAlgError:
+                continue  # degenerate, points are coplanar or collinear
+
+            if not np.all(np.square(candidates - C).sum(axis=1) <= r2 * (1.0 + epsilon) + epsilon * epsilon):
+                continue
+
+            # The smallest ball enclosing all candidates is the smallest one of them
+            if best is None or r2 < best[2]:
+                best = (list(boundary), C, r2)
+
+    if best is None:
+        raise np.linalg.LinAlgError("Failed to compute bounding sphere")
+
+    return best
+
+
+def _get_circumsphere(S: NDArray[np.float64]) -> tuple[NDArray[np.float64], float]:
+    """Gets the smallest sphere with all the points of ``S`` (at most 4) on its boundary."""
+    if len(S) == 1:
+        return S[0].copy(), 0.0
+
+    U = S[1:] - S[0]
+    B = np.square(U).sum(axis=1) / 2
+    C = np.linalg.solve(np.inner(U, U), B) @ U
+    r2 = float(np.square(C).sum())
+    return C + S[0], r2
@@ -6,6 +6,8 @@ from numpy.typing import NDArray
 from mathutils import Vector
 from typing import NamedTuple
 from collections.abc import Sequence
+from itertools import combinations
+from .math import normalize_vectors
 
 
 class Centroid(NamedTuple):
@@ -152,13 +154,10 @@ def get_mass_properties_of_box(box_min: Vector, box_max: Vector) -> MassProperti
 
 
 def get_centroid_of_mesh(mesh_vertices) -> Centroid:
-    from . import miniball
-
-    # miniball may throw errors if there are duplicated vertices, so remove them first
-    mesh_vertices = np.unique(mesh_vertices, axis=0)
+    from .bounding_sphere import get_bounding_sphere
 
     try:
-        C, r2 = miniball.get_bounding_ball(mesh_vertices)
+        C, r2 = get_bounding_sphere(mesh_vertices)
     except np.linalg.LinAlgError:
         # Fallback to sphere enclosing the bounding box
         bb_min = np.min(mesh_vertices, axis=0)
@@ -193,40 +192,35 @@ def get_mass_properties_of_mesh(mesh_vertices, mesh_faces):
         tri_cgs *= tri_areas[:, np.newaxis]
         cg = tri_cgs.sum(axis=0) / tri_areas.sum()
 
-    cg = Vector(cg)
-
-    ixx = 0.0
-    iyy = 0.0
-    izz = 0.0
-    for tri_idx, (v0, v1, v2) in enumerate(triangles):
-        # Based on https://github.com/bulletphysics/bullet3/blob/e9c461b0ace140d5c73972760781d94b7b5eee53/src/BulletCollision/CollisionShapes/btConvexTriangleMeshShape.cpp#L236
-        # TODO: vectorize with numpy
-        a = Vector(v0) - cg
-        b = Vector(v1) - cg
-        c = Vector(v2) - cg
-
-        i = [0.0, 0.0, 0.0]
-        vol_neg = -tri_tetrahedron_volumes[tri_idx]
-        for j in range(3):
-            i[j] = vol_neg * (
-                0.1 * (a[j] * a[j] + b[j] * b[j] + c[j] * c[j]) +
-                0.05 * (a[j] * b[j] + a[j] * b[j] + a[j] * c[j] + a[j] * c[j] + b[j] * c[j] + b[j] * c[j])
-            )
-
-        i00 = -i[0]
-        i11 = -i[1]
-        i22 = -i[2]
-
-        ixx += i11 + i22
-        iyy += i22 + i00
-        izz += i00 + i11
-
-    ixx /= volume
-    iyy /= volume
-    izz /= volume
+    inertia_tensor = get_inertia_tensor_of_mesh(triangles - cg, tri_tetrahedron_volumes, volume)
+    inertia = Vector(np.diag(inertia_tensor))
+    return MassProperties(volume, Vector(cg), inertia)
 
-    inertia = Vector((ixx, iyy, izz))
-    return MassProperties(volume, cg, inertia)
+
+def get_inertia_tensor_of_mesh(
+    triangles: NDArray[np.float64],
+    tri_tetrahedron_volumes: NDArray[np.float64],
+    volume: float,
+) -> NDArray[np.float64]:
+    """Gets the 3x3 inertia tensor of a mesh with unit mass.
+
+    ``triangles`` is a (N, 3, 3) array with the vertices of each triangle, relative to the center of gravity.
+    ``tri_tetrahedron_volumes`` are the signed volumes of the tetrahedrons formed by each triangle and the origin. Each
+    tetrahedron contributes its covariance ``vol / 20 * (a a^T + b b^T + c c^T + (a + b + c) (a + b + c)^T)``.
+
+    Based on https://github.com/bulletphysics/bullet3/blob/e9c461b0ace140d5c73972760781d94b7b5eee53/src/BulletCollision/CollisionShapes/btConvexTriangleMeshShape.cpp#L236
+    but also computes the off-diagonal products. The principal axes are the eigenvectors of the tensor.
+    """
+    corners = triangles.reshape((-1, 3))
+    corners_volumes = np.repeat(tri_tetrahedron_volumes, 3)
+    corners_sum = triangles.sum(axis=1)
+    covariance = (
+        (corners * corners_volumes[:, np.newaxis]).T @ corners +
+        (corners_sum * tri_tetrahedron_volumes[:, np.newaxis]).T @ corners_sum
+    ) / 20
+
+    inertia_tensor = np.eye(3) * np.trace(covariance) - covariance
+    return inertia_tensor / volume
 
 
 def is_mesh_solid(mesh_vertices, mesh_faces) -> bool:
@@ -310,6 +304,9 @@ def calculate_composite_inertia(
 
 NO_NEIGHBOR = -1
 
+# Broad phase grid used to find the polygons close to each shrunk vertex
+SHRINK_GRID_MAX_CELLS_PER_AXIS = 32
+
 
 def shrink_mesh(mesh_vertices, mesh_faces):
     margin = 0.04
@@ -320,11 +317,14 @@ def shrink_mesh(mesh_vertices, mesh_faces):
 
     margin = min(margin, *half_size)
 
+    mesh_faces = np.asarray(mesh_faces, dtype=np.int64)
     neighbors = _compute_neighbors(mesh_vertices, mesh_faces)
+    # The shrink direction of each vertex does not depend on the margin, only compute it once
+    shrink_offsets = _compute_shrink_offsets(mesh_vertices, mesh_faces, neighbors)
 
     shrunk_vertices = None
     while margin > 0.000001:
-        shrunk_vertices = _try_shrink_mesh(mesh_vertices, mesh_faces, neighbors, margin)
+        shrunk_vertices = _try_shrink_mesh(mesh_vertices, mesh_faces, shrink_offsets, margin)
         if shrunk_vertices is not None:
             break
 
@@ -335,214 +335,274 @@ def shrink_mesh(mesh_vertices, mesh_faces):
     return shrunk_vertices, margin
 
 
-def _try_shrink_mesh(mesh_vertices, mesh_faces, neighbors, margin: float):
-    shrunk_vertices = _shrink_polys(mesh_vertices, mesh_faces, neighbors, margin)
-
-    num_polys = len(mesh_faces)
-    num_verts = len(mesh_vertices)
+def _try_shrink_mesh(mesh_vertices, mesh_faces, shrink_offsets, margin: float):
+    shrunk_vertices = (mesh_vertices - shrink_offsets * margin).astype(mesh_vertices.dtype)
 
-    # Make sure that no polygons collide with each other
-    for vert_idx in range(num_verts):
-        vertex = mesh_vertices[vert_idx]
-        shrunk_vertex = shrunk_vertices[vert_idx]
+    # Make sure that no polygons collide with each other. For each vertex, the segment from the shrunk vertex to the
+    # original vertex must not hit any polygon, original or shrunk, not connected to the vertex.
+    vertices = mesh_vertices.astype(np.float64)
+    shrunk = shrunk_vertices.astype(np.float64)
+    segment_dir = vertices - shrunk
+    segment_length = np.linalg.norm(segment_dir, axis=1)
+    segment_verts = np.flatnonzero(segment_length > 0.0)
+    if len(segment_verts) == 0:
+        return shrunk_vertices
 
-        segment_pos = Vector(shrunk_vertex)
-        segment_dir = Vector(vertex - shrunk_vertex)
-        segment_length = segment_dir.length
-        segment_dir /= segment_length
+    segment_pos = shrunk[segment_verts]
+    segment_length = segment_length[segment_verts]
+    segment_dir = segment_dir[segment_verts] / segment_length[:, None]
+    segment_end = vertices[segment_verts]
 
-        max_distance = segment_length
-
-        def _intersect_test(v1, v2, v3):
-            from mathutils import geometry
-            intersect_pos = geometry.intersect_ray_tri(v1, v2, v3, segment_dir, segment_pos)
-            if intersect_pos is None:
-                return False
-
-            distance = (intersect_pos - segment_pos).length
-            return distance <= max_distance
-
-        for poly_idx in range(num_polys):
-            poly_verts = mesh_faces[poly_idx]
-
-            # Intersection test is done against other polygons, so we must exclude polygons that share current vertex
-            if (poly_verts == vert_idx).any():
-                continue
-
-            v1, v2, v3 = [Vector(mesh_vertices[vi]) for vi in poly_verts]
-            if _intersect_test(v1, v2, v3):
-                return None
-
-            vs1, vs2, vs3 = [Vector(shrunk_vertices[vi]) for vi in poly_verts]
-            if _intersect_test(vs1, vs2, vs3):
-                return None
+    num_polys = len(mesh_faces)
+    triangles = np.concatenate((vertices[mesh_faces], shrunk[mesh_faces]))
+    overlapping_boxes = _iter_overlapping_boxes(
+        np.minimum(segment_pos, segment_end), np.maximum(segment_pos, segment_end),
+        triangles.min(axis=1), triangles.max(axis=1),
+    )
+    for segment_indices, triangle_indices in overlapping_boxes:
+        # Intersection test is done against other polygons, so we must exclude polygons that share current vertex
+        poly_indices = triangle_indices % num_polys
+        shares_vertex = (mesh_faces[poly_indices] == segment_verts[segment_indices, None]).any(axis=1)
+        segment_indices = segment_indices[~shares_vertex]
+        triangle_indices = triangle_indices[~shares_vertex]
+
+        distances = _intersect_rays_triangles(
+            segment_pos[segment_indices], segment_dir[segment_indices], triangles[triangle_indices]
+        )
+        if np.any(distances <= segment_length[segment_indices]):
+            return None
 
     return shrunk_vertices
 
 
-def _shrink_polys(mesh_vertices, mesh_faces, neighbors, margin):
-    # TODO: copied from rageAm's C++ code, very unoptimized Python code, vectorize with Numpy somehow
-    from mathutils import geometry
-
-    output_vertices = np.empty_like(mesh_vertices)
-    processed_verts = set()
+def _compute_shrink_offsets(mesh_vertices, mesh_faces, neighbors):
+    """Gets the direction each vertex moves in when shrinking the mesh, scaled such that moving a vertex by
+    ``offset * margin`` moves the surrounding polygons inwards by ``margin``.
+    """
+    # Based on rageAm's C++ code
+    vertices = mesh_vertices.astype(np.float64)
+    poly_normals = _compute_poly_normals(vertices, mesh_faces)
+    verts, first_polys, fans = _compute_vertex_fans(len(vertices), mesh_faces, neighbors)
+
+    # Compute average normal from all surrounding polygons (that share at least one vertex)
+    normal = poly_normals[first_polys]
+    fan_mask = fans != NO_NEIGHBOR
+    num_neighbors = fan_mask.sum(axis=1)
+    neighbor_normals = np.where(fan_mask[..., None], poly_normals[fans], 0.0)
+    average_normal = normalize_vectors(normal + neighbor_normals.sum(axis=1))
+
+    # Default shrink by base normal when there are no neighbors, otherwise by average normal
+    offsets = np.where((num_neighbors == 0)[:, None], normal, average_normal)
+
+    # The weighted normals are computed from the base normal and the neighbor normals. With a single neighbor, the
+    # cross product of both normals is used as third normal, unless the angle between them is very small in which
+    # case just shrink using the base normal
+    normals = np.concatenate((normal[:, None], neighbor_normals, np.zeros((len(verts), 2, 3))), axis=1)
+    num_normals = num_neighbors + 1
+    single = np.flatnonzero(num_neighbors == 1)
+    cross = np.cross(normal[single], neighbor_normals[single, 0])
+    cross_mag2 = np.square(cross).sum(axis=1)
+    small_angle = cross_mag2 < 0.1
+    offsets[single[small_angle]] = normal[single[small_angle]]
+    single = single[~small_angle]
+    normals[single, 2] = cross[~small_angle] / np.sqrt(cross_mag2[~small_angle])[:, None]
+    num_normals[single] = 3
+
+    # Check every combination of three normals, vertices are grouped by the number of normals to do it in batches
+    for n in np.unique(num_normals[num_normals >= 3]):
+        group = np.flatnonzero(num_normals == n)
+        combos = np.array(list(combinations(range(n), 3)), dtype=np.int64)
+        group_normals = normals[group, :n]
+        normal1 = group_normals[:, combos[:, 0]]
+        normal2 = group_normals[:, combos[:, 1]]
+        normal3 = group_normals[:, combos[:, 2]]
+
+        cross23 = np.cross(normal2, normal3)
+        dot = np.einsum("gki,gki->gk", normal1, cross23)
+
+        # Check out neighbors whose normals direction is too similar (small angle between neighbor normals & polygon
+        # normal). More neighbors normals are aligned with polygon normal, less weight will be applied. Normals with
+        # higher angle (closer to 0.25) will contribute more to weighted normal
+        is_weighted = np.abs(dot) > 0.25
+        safe_dot = np.where(is_weighted, dot, 1.0)
+        new_normals = (cross23 + np.cross(normal3, normal1) + np.cross(normal1, normal2)) / safe_dot[..., None]
+        new_normals_mag2 = np.where(is_weighted, np.square(new_normals).sum(axis=2), -np.inf)
+
+        # Pick shrunk vertex that's more distant from original vertex
+        best = np.argmax(new_normals_mag2, axis=1)
+        best_mag2 = new_normals_mag2[np.arange(len(group)), best]
+        replace = best_mag2 > np.square(offsets[group]).sum(axis=1)
+        offsets[group[replace]] = new_normals[replace, best[replace]]
+
+    vertex_offsets = np.zeros_like(vertices)
+    vertex_offsets[verts] = offsets
+    return vertex_offsets
+
+
+def _compute_vertex_fans(num_verts: int, mesh_faces, neighbors):
+    """Walks the polygons around each vertex through the polygon neighbors. Returns the vertices used by polygons, the
+    first polygon of each vertex and the neighbors found walking around the vertex from that polygon, as a
+    (N, max_neighbors) array padded with ``NO_NEIGHBOR``.
+    """
     num_polys = len(mesh_faces)
-    poly_normals = [geometry.normal([mesh_vertices[vi] for vi in poly_verts]) for poly_verts in mesh_faces]
-    neighbor_normals = []
-    for poly_idx in range(num_polys):
-        poly_verts = mesh_faces[poly_idx]
-        normal = poly_normals[poly_idx]
-        for poly_vert_idx, vert_idx in enumerate(poly_verts):
-            if vert_idx in processed_verts:
-                continue
-            processed_verts.add(vert_idx)
-
-            vertex = mesh_vertices[vert_idx]
-
-            neighbor_normals.clear()
-
-            # Compute average normal from all surrounding polygons (that share at least one vertex)
-            # and all them in normal list for further weighted normal computation
-            average_normal = Vector(normal)
-            prev_neighbor_poly_idx = poly_idx
-
-            # Find starting neighbor index
-            neighbor_poly_idx = neighbors[poly_idx][(poly_vert_idx + 2) % 3]
-            if neighbor_poly_idx == NO_NEIGHBOR:
-                neighbor_poly_idx = neighbors[poly_idx][poly_vert_idx]
-
-            # Search for neighbors and accumulate normal...
-            while neighbor_poly_idx != NO_NEIGHBOR:
-                neighbor_normal = poly_normals[neighbor_poly_idx]
-                average_normal += neighbor_normal
-                neighbor_normals.append(neighbor_normal)
-
-                # Lookup for new neighbor
-                new_neighbor_poly_idx = NO_NEIGHBOR
-                for j in range(3):
-                    next_idx = (j + 1) % 3
-                    if mesh_faces[neighbor_poly_idx][next_idx] == vert_idx:
-                        new_neighbor_poly_idx = neighbors[neighbor_poly_idx][j]
-                        if new_neighbor_poly_idx == prev_neighbor_poly_idx:
-                            new_neighbor_poly_idx = neighbors[neighbor_poly_idx][next_idx]
-                        prev_neighbor_poly_idx = neighbor_poly_idx
-                        neighbor_poly_idx = new_neighbor_poly_idx
-                        break
-                else:
-                    break
-
-                # Check if we've closed circle and iterated through all neighbors
-                if new_neighbor_poly_idx == poly_idx:
-                    break
-
-            # After adding bunch of normals together we have to re-normalize it
-            average_normal.normalize()
-
-            if len(neighbor_normals) == 0:
-                output_vertices[vert_idx] = vertex - normal * margin
-            elif len(neighbor_normals) == 1:
-                cross = normal.cross(neighbor_normals[0])
-                cross_mag2 = cross.length_squared
-
-                # Very small angle between two normals, just shrink using base normal
-                if cross_mag2 < 0.1:
-                    output_vertices[vert_idx] = vertex - normal * margin
-                    continue
-
-                # Insert new normal in weighted set
-                neighbor_normals.append(cross.normalized())
-
-            if len(neighbor_normals) < 2:
-                continue
-
-            # Default shrink by average normal
-            shrunk = vertex - average_normal * margin
-
-            # Traverse all normal & compute weighted normals
-            normals = [normal]
-            normals.extend(neighbor_normals)
-            for i in range(len(neighbor_normals) - 1):
-                for j in range(len(neighbor_normals) - i - 1):
-                    for k in range(len(neighbor_normals) - j - i - 1):
-                        normal1 = normals[i]
-                        normal2 = normals[i + j + 1]
-                        normal3 = normals[i + j + k + 2]
+    face_indices = np.repeat(np.arange(num_polys), 3)
+    first_polys = np.full(num_verts, num_polys, dtype=np.int64)
+    np.minimum.at(first_polys, mesh_faces.ravel(), face_indices)
+    verts = np.flatnonzero(first_polys < num_polys)
+    first_polys = first_polys[verts]
+    first_corners = np.argmax(mesh_faces[first_polys] == verts[:, None], axis=1)
+    # Limit the walk to the polygons connected to the vertex, in case the topology makes it go around in circles
+    max_neighbors = np.bincount(mesh_faces.ravel(), minlength=num_verts)[verts] - 1
+
+    fans = np.full((len(verts), max(max_neighbors.max(initial=0), 0)), NO_NEIGHBOR, dtype=np.int64)
+
+    # Find starting neighbor index
+    current = neighbors[first_polys, (first_corners + 2) % 3]
+    current = np.where(current == NO_NEIGHBOR, neighbors[first_polys, first_corners], current)
+    previous = first_polys.copy()
+    active = current != NO_NEIGHBOR
+
+    # Search for neighbors of all vertices at once, one step around the vertex at a time
+    for step in range(fans.shape[1]):
+        walking = np.flatnonzero(active & (step < max_neighbors))
+        if len(walking) == 0:
+            break
 
-                        cross23 = normal2.cross(normal3)
-                        dot = normal1.dot(cross23)
+        poly_indices = current[walking]
+        fans[walking, step] = poly_indices
 
-                        # Check out neighbors whose normals direction is too similar (small angle between neighbor normals & polygon normal)
-                        if abs(dot) > 0.25:
-                            # More neighbors normals are aligned with polygon normal, less weight will be applied
-                            # Normals with higher angle (closer to 0.25) will contribute more to weighted normal
+        # Lookup for new neighbor, through the edge that ends in the vertex, or the other edge of the vertex if that
+        # is where we came from
+        ends_in_vertex = mesh_faces[poly_indices][:, (1, 2, 0)] == verts[walking, None]
+        edge = np.argmax(ends_in_vertex, axis=1)
+        new_poly_indices = neighbors[poly_indices, edge]
+        went_back = new_poly_indices == previous[walking]
+        new_poly_indices[went_back] = neighbors[poly_indices[went_back], (edge[went_back] + 1) % 3]
+        new_poly_indices[~ends_in_vertex.any(axis=1)] = NO_NEIGHBOR
 
-                            # Compute new weighted normal
-                            cross31 = normal3.cross(normal1)
-                            cross12 = normal1.cross(normal2)
-                            new_normal = (cross23 + cross31 + cross12) / dot
-                            new_shrunk = vertex - new_normal * margin
+        previous[walking] = poly_indices
+        current[walking] = new_poly_indices
+        # Check if we've closed circle and iterated through all neighbors
+        active[walking] = (new_poly_indices != NO_NEIGHBOR) & (new_poly_indices != first_polys[walking])
 
-                            # Pick shrunk vertex that's more distant from original vertex
-                            if Vector(new_shrunk - vertex).length_squared > Vector(shrunk - vertex).length_squared:
-                                shrunk = new_shrunk
+    return verts, first_polys, fans
 
-            # Insert final shrunk vertex in out buffer
-            output_vertices[vert_idx] = shrunk
 
-    return output_vertices
+def _compute_poly_normals(vertices, mesh_faces):
+    triangles = vertices[mesh_faces]
+    return normalize_vectors(np.cross(triangles[:, 0] - triangles[:, 1], triangles[:, 1] - triangles[:, 2]))
 
 
 def _compute_neighbors(mesh_vertices, mesh_faces):
-    # Each triangle has up to 3 neighbors, so same shape as the mesh_faces array
-    neighbors = np.full_like(mesh_faces, NO_NEIGHBOR, dtype=int)
-
+    """Gets the polygon on the other side of each polygon edge. Edge ``i`` of a polygon goes from its vertex ``i`` to
+    vertex ``i + 1``. Each triangle has up to 3 neighbors, so same shape as the mesh_faces array.
+    """
+    mesh_faces = np.asarray(mesh_faces, dtype=np.int64)
+    num_verts = len(mesh_vertices)
     num_polys = len(mesh_faces)
 
-    vertex_to_polys = [[] for _ in range(len(mesh_vertices))]
-    for i, poly_verts in enumerate(mesh_faces):
-        for vi in poly_verts:
-            vertex_to_polys[vi].append(i)
-
-    def _get_next_l(idx):
-        return (idx + 1) % 3
-
-    def _get_next_r(idx):
-        return 2 if idx == 0 else idx - 1
-
-    for lhs_poly_idx in range(num_polys):
-        lhs_poly_verts = mesh_faces[lhs_poly_idx]
-        for lhs_poly_vert_idx, lhs_vert_idx in enumerate(lhs_poly_verts):
-            lhs_vert_idx_next = lhs_poly_verts[_get_next_l(lhs_poly_vert_idx)]
-
-            adjacent_polys = vertex_to_polys[lhs_vert_idx]
-            for rhs_poly_idx in adjacent_polys:
-                if lhs_poly_idx == rhs_poly_idx:
-                    continue
-
-                if rhs_poly_idx <= lhs_poly_idx:
-                    continue
+    # Neighbors share the edge in the opposite direction
+    edge_keys = mesh_faces.ravel() * num_verts + mesh_faces[:, (1, 2, 0)].ravel()
+    reversed_edge_keys = mesh_faces[:, (1, 2, 0)].ravel() * num_verts + mesh_faces.ravel()
 
-                found = False
-                rhs_poly_verts = mesh_faces[rhs_poly_idx]
-                for rhs_poly_vert_idx, rhs_vert_idx in enumerate(rhs_poly_verts):
-                    if lhs_vert_idx != rhs_vert_idx:
-                        continue
+    order = np.argsort(edge_keys, kind="stable")
+    sorted_edge_keys = edge_keys[order]
+    found_indices = np.minimum(np.searchsorted(sorted_edge_keys, reversed_edge_keys), len(edge_keys) - 1)
+    found = sorted_edge_keys[found_indices] == reversed_edge_keys
+    neighbors = np.where(found, order[found_indices] // 3, NO_NEIGHBOR)
+    neighbors[neighbors == np.repeat(np.arange(num_polys), 3)] = NO_NEIGHBOR
 
-                    rhs_poly_vert_idx_next = _get_next_r(rhs_poly_vert_idx)
-                    rhs_vert_idx_next = rhs_poly_verts[rhs_poly_vert_idx_next]
+    return neighbors.reshape((num_polys, 3))
 
-                    if lhs_vert_idx_next != rhs_vert_idx_next:
-                        continue
 
-                    neighbors[lhs_poly_idx][lhs_poly_vert_idx] = rhs_poly_idx
-                    neighbors[rhs_poly_idx][rhs_poly_vert_idx_next] = lhs_poly_idx
-                    found = True
-                    break
-
-                if found:
-                    break
-
-    return neighbors
+def _iter_overlapping_boxes(a_min, a_max, b_min, b_max, chunk_size: int = 1024):
+    """Finds the pairs of overlapping boxes between the boxes A and B, using a uniform grid as broad phase. Yields
+    the indices of the boxes of each pair, in A and in B, for chunks of ``chunk_size`` boxes of A at a time so callers
+    can stop early.
+    """
+    bounds_min = np.minimum(a_min.min(axis=0), b_min.min(axis=0))
+    bounds_max = np.maximum(a_max.max(axis=0), b_max.max(axis=0))
+    # Cells of half the typical B box size, so each B box is in a few cells only
+    cell_size = max(
+        np.median((b_max - b_min).max(axis=1)) * 0.5,
+        (bounds_max - bounds_min).max() / SHRINK_GRID_MAX_CELLS_PER_AXIS,
+        1e-6,
+    )
+    grid_size = np.floor((bounds_max - bounds_min) / cell_size).astype(np.int64) + 1
+
+    def _get_cells(points):
+        return np.minimum(np.floor((points - bounds_min) / cell_size).astype(np.int64), grid_size - 1)
+
+    def _get_cell_keys(cells):
+        return (cells[:, 0] * grid_size[1] + cells[:, 1]) * grid_size[2] + cells[:, 2]
+
+    def _get_box_cells(boxes_min, boxes_max):
+        cell_min = _get_cells(boxes_min)
+        cell_counts = _get_cells(boxes_max) - cell_min + 1
+        num_cells = cell_counts.prod(axis=1)
+
+        box_indices = np.repeat(np.arange(len(boxes_min)), num_cells)
+        local_indices = np.arange(num_cells.sum()) - np.repeat(np.cumsum(num_cells) - num_cells, num_cells)
+        counts = cell_counts[box_indices]
+        cells = cell_min[box_indices] + np.column_stack((
+            local_indices % counts[:, 0],
+            local_indices // counts[:, 0] % counts[:, 1],
+            local_indices // (counts[:, 0] * counts[:, 1]),
+        ))
+        return box_indices, _get_cell_keys(cells)
+
+    b_indices, b_cells = _get_box_cells(b_min, b_max)
+    order = np.argsort(b_cells, kind="stable")
+    b_indices = b_indices[order]
+    b_cells = b_cells[order]
+
+    for chunk_start in range(0, len(a_min), chunk_size):
+        chunk_a_min = a_min[chunk_start:chunk_start + chunk_size]
+        chunk_a_max = a_max[chunk_start:chunk_start + chunk_size]
+        a_indices, a_cells = _get_box_cells(chunk_a_min, chunk_a_max)
+
+        # Pair each A cell with all the B boxes in the same cell
+        starts = np.searchsorted(b_cells, a_cells, side="left")
+        counts = np.searchsorted(b_cells, a_cells, side="right") - starts
+        pair_a = np.repeat(a_indices, counts)
+        pair_cells = np.repeat(a_cells, counts)
+        pair_b = b_indices[
+            np.repeat(starts, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        ]
+
+        overlap = np.all((chunk_a_min[pair_a] <= b_max[pair_b]) & (b_min[pair_b] <= chunk_a_max[pair_a]), axis=1)
+        pair_a = pair_a[overlap]
+        pair_b = pair_b[overlap]
+        pair_cells = pair_cells[overlap]
+
+        # Boxes in multiple cells produce duplicated pairs, only keep the pair in the cell with the minimum corner of
+        # the overlap of both boxes
+        overlap_min = np.maximum(chunk_a_min[pair_a], b_min[pair_b])
+        unique = pair_cells == _get_cell_keys(_get_cells(overlap_min))
+        yield pair_a[unique] + chunk_start, pair_b[unique]
+
+
+def _intersect_rays_triangles(rays_pos, rays_dir, triangles):
+    """Möller–Trumbore intersection of rays with triangles, same as ``mathutils.geometry.intersect_ray_tri``. Returns
+    the distance along each ray to the intersection, or ``inf`` if it doesn't intersect.
+    """
+    v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    edge1 = v1 - v0
+    edge2 = v2 - v0
+    p = np.cross(rays_dir, edge2)
+    det = np.einsum("ij,ij->i", edge1, p)
+    parallel = np.abs(det) < 0.000001
+    inv_det = 1.0 / np.where(parallel, 1.0, det)
+
+    t = rays_pos - v0
+    u = np.einsum("ij,ij->i", t, p) * inv_det
+    q = np.cross(t, edge1)
+    v = np.einsum("ij,ij->i", rays_dir, q) * inv_det
+    distances = np.einsum("ij,ij->i", edge2, q) * inv_det
+
+    miss = parallel | (u < 0.0) | (u > 1.0) | (v < 0.0) | (u + v > 1.0) | (distances < 0.0)
+    distances[miss] = np.inf
+    return distances
 
 
 def grow_sphere(center: Vector, radius: float, point: Vector, point_radius: float) -> float:
@@ -1,6 +1,23 @@
 from mathutils import Vector
+import numpy as np
+from numpy.typing import NDArray
 
 def distance_point_to_line(start: Vector, end: Vector, point: Vector) -> float:
     A = (point - start).cross(point - end).length
     L = (end - start).length
     return A / L
+
+
+def distances_points_to_lines(starts: NDArray, ends: NDArray, points: NDArray) -> NDArray:
+    """Vectorized version of ``distance_point_to_line``. Takes arrays of shape (N, 3). Degenerate lines (``start`` equal
+    to ``end``) have a distance of 0.
+    """
+    A = np.linalg.norm(np.cross(points - starts, points - ends), axis=1)
+    L = np.linalg.norm(ends - starts, axis=1)
+    return np.divide(A, L, out=np.zeros_like(A), where=L != 0.0)
+
+
+def normalize_vectors(vectors: NDArray) -> NDArray:
+    """Normalizes each row of ``vectors``. Zero-length vectors are left as zero, same as ``Vector.normalized``."""
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths != 0.0)
@@ -30,6 +30,14 @@ import numpy as np
 
 _BITFLAG_FILTER_ITEM = (1 << 30)  # same as UIList.bitflag_filter_item
 
+# dtypes used to read and write the selected items in bulk with ``foreach_get``/``foreach_set``
+_BULK_ACCESS_DTYPES = {
+    BoolProperty: np.bool_,
+    IntProperty: np.int32,
+    FloatProperty: np.float32,
+    FloatVectorProperty: np.float32,
+}
+
 
 class SelectionIndex(PropertyGroup):
     index: IntProperty(name="Index")
@@ -135,12 +143,23 @@ def _define_multiselect_access(cls: type, collection_name: str, item_cls: type,
     def _active_item(s: bpy_struct) -> bpy_struct:
         return _resolve_nested(_coll(s).active_item)
 
-    def _wrap_basic_property(prop_fn, attr_name: str, **kwargs):
+    def _wrap_basic_property(prop_fn, attr_name: str, use_bulk_access: bool, **kwargs):
+        # Nested properties cannot be accessed with foreach_get/foreach_set from the collection
+        bulk_dtype = _BULK_ACCESS_DTYPES.get(prop_fn, None) if use_bulk_access and not nested_path else None
+        bulk_size = kwargs.get("size", 3) if prop_fn is FloatVectorProperty else 1
+        if not isinstance(bulk_size, int):
+            bulk_dtype = None
+
         def _getter(self: bpy_struct):
             return getattr(_active_item(self), attr_name)
 
         def _setter(self: bpy_struct, value):
-            for item in _coll(self).iter_selected_items():
+            coll = _coll(self)
+            if bulk_dtype is not None and len(coll.selected_indices_array) > 1:
+                coll.foreach_set_selected(attr_name, value, bulk_dtype, bulk_size)
+                return
+
+            for item in coll.iter_selected_items():
                 setattr(_resolve_nested(item), attr_name, value)
 
         return prop_fn(**kwargs, get=_getter, set=_setter)
@@ -245,6 +264,9 @@ def _define_multiselect_access(cls: type, collection_name: str, item_cls: type,
             fn = src_annotation.function
             kwargs = dict(src_annotation.keywords)
 
+            # Properties with callbacks need to be set one item at a time, foreach_set doesn't invoke them
+            has_callbacks = any(callback in kwargs for callback in ("get", "set", "update"))
+
             # Do not copy the callbacks to the wrapper property
             for callback in ("get", "set", "update"):
                 if callback in kwargs:
@@ -253,7 +275,7 @@ def _define_multiselect_access(cls: type, collection_name: str, item_cls: type,
             if fn is EnumProperty:
                 wrapper_prop = _wrap_enum_property(name, **kwargs)
             elif fn in {BoolProperty, IntProperty, FloatProperty, StringProperty, FloatVectorProperty}:
-                wrapper_prop = _wrap_basic_property(fn, name, **kwargs)
+                wrapper_prop = _wrap_basic_property(fn, name, not has_callbacks, **kwargs)
             elif fn in {PointerProperty}:
                 property_group_cls = kwargs["type"]
                 assert not issubclass(property_group_cls, ID) and issubclass(property_group_cls, PropertyGroup), \
@@ -294,6 +316,17 @@ TItem = TypeVar("TItem", bound=PropertyGroup)
 TItemAccess = TypeVar("TItemAccess", bound=MultiSelectAccess)
 
 
+class _SelectionCacheEntry(NamedTuple):
+    validation_key: tuple[int, int, int]
+    indices: np.ndarray
+    indices_set: frozenset[int]
+
+
+# Selected indices of each MultiSelectCollection, keyed by (owner pointer, selection indices property name).
+# MultiSelectCollection instances are created on each property access, so the cache needs to live outside of them.
+_selection_cache: dict[tuple[int, str], _SelectionCacheEntry] = {}
+
+
 class MultiSelectCollection(Generic[TItem, TItemAccess]):
     __slots__ = (
         "_owner", "_collection_propname", "_active_index_propname", "_active_index_for_ui_propname",
@@ -338,11 +371,13 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
 
     def remove(self, index: int):
         self.collection.remove(index)
+        self._invalidate_selection_cache()
 
     def clear(self):
         self.collection.clear()
         self.selection_indices.clear()
         self.active_index = 0
+        self._invalidate_selection_cache()
 
     def _on_active_index_update_from_ui(self, value):
         # This callback is only triggered when clicking on the active item in the list once it switched to a textfield
@@ -369,31 +404,84 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
     def active_item(self) -> TItem:
         return self[self.active_index]
 
-    def iter_selected_items_indices(self) -> Iterator[int]:
-        found_active_item = False
-        active_index = self.active_index
-        for s in self.selection_indices:
-            if s.index == active_index:
-                found_active_item = True
-            yield s.index
+    @property
+    def _selection_cache_key(self) -> tuple[int, str]:
+        return self._owner.as_pointer(), self._selection_indices_propname
 
-        if not found_active_item:
+    def _get_selection_cache(self) -> _SelectionCacheEntry:
+        selection_indices = self.selection_indices
+        active_index = self.active_index
+        indices = np.empty(len(selection_indices), dtype=np.int32)
+        selection_indices.foreach_get("index", indices)
+        # Also validate with the selection contents and active index in case the selection was modified without going
+        # through this class (e.g. undo or scripts). Reading the indices with foreach_get and hashing them is cheap
+        # compared to building the selection set
+        validation_key = (len(indices), active_index, hash(indices.tobytes()))
+        cache_key = self._selection_cache_key
+        entry = _selection_cache.get(cache_key, None)
+        if entry is not None and entry.validation_key == validation_key:
+            return entry
+
+        if not np.any(indices == active_index):
             # in some edge-cases cases where the active item may not appear in the selection list
-            yield active_index
+            indices = np.append(indices, np.int32(active_index))
+        indices.flags.writeable = False
+
+        entry = _SelectionCacheEntry(validation_key, indices, frozenset(indices.tolist()))
+        _selection_cache[cache_key] = entry
+        return entry
+
+    def _invalidate_selection_cache(self):
+        _selection_cache.pop(self._selection_cache_key, None)
+
+    def _set_selection_indices(self, indices: Sequence[int]):
+        selection_indices = self.selection_indices
+        selection_indices.clear()
+        for _ in range(len(indices)):
+            selection_indices.add()
+        selection_indices.foreach_set("index", np.asarray(indices, dtype=np.int32))
+        self._invalidate_selection_cache()
+
+    @property
+    def selected_indices_array(self) -> np.ndarray:
+        """Read-only array with the indices of the selected items, including the active item. Cached until the
+        selection changes.
+        """
+        return self._get_selection_cache().indices
+
+    def is_selected(self, index: int) -> bool:
+        return index in self._get_selection_cache().indices_set
+
+    def iter_selected_items_indices(self) -> Iterator[int]:
+        yield from self.selected_indices_array.tolist()
 
     def iter_selected_items(self) -> Iterator[TItem]:
-        found_active_item = False
-        active_index = self.active_index
-        for s in self.selection_indices:
-            item = self[s.index]
-            if item is not None:
-                if s.index == active_index:
-                    found_active_item = True
-                yield item
-
-        if not found_active_item:
-            # in some edge-cases cases where the active item may not appear in the selection list
-            yield self.active_item
+        collection = self.collection
+        for index in self.selected_indices_array.tolist():
+            yield collection[index]
+
+    def foreach_get_selected(self, attr_name: str, dtype: type, size: int = 1) -> np.ndarray:
+        """Read the property ``attr_name`` of all selected items at once. Returns an array of shape ``(N,)``, or
+        ``(N, size)`` for vector properties.
+        """
+        collection = self.collection
+        values = np.empty(len(collection) * size, dtype=dtype)
+        collection.foreach_get(attr_name, values)
+        if size > 1:
+            values = values.reshape((-1, size))
+        return values[self.selected_indices_array]
+
+    def foreach_set_selected(self, attr_name: str, value, dtype: type, size: int = 1):
+        """Write ``value`` to the property ``attr_name`` of all selected items at once. ``value`` can be a single value
+        or an array with one value per selected item. Update callbacks of the property are not invoked.
+        """
+        collection = self.collection
+        values = np.empty(len(collection) * size, dtype=dtype)
+        collection.foreach_get(attr_name, values)
+        if size > 1:
+            values = values.reshape((-1, size))
+        values[self.selected_indices_array] = value
+        collection.foreach_set(attr_name, values.ravel())
 
     @property
     def selected_items_indices(self) -> list[int]:
@@ -416,10 +504,10 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
                 self.selection_indices.clear()
                 self.active_index = index
                 self.selection_indices.add().index = index
+                self._invalidate_selection_cache()
                 if ui_callbacks:
                     self.on_active_index_update_from_ui(bpy.context)
             case SelectMode.EXTEND:
-                self.selection_indices.clear()
                 if reorder_items:
                     assert len(reorder_items) == len(self)
                     actual_to_reordered_index_map = np.array(reorder_items)
@@ -432,15 +520,15 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
                     start_index = min(self.active_index, index)
                     end_index = max(self.active_index, index)
 
+                indices = np.arange(start_index, end_index + 1)
+                if reorder_items:
+                    indices = reordered_to_actual_index_map[indices]
+
                 if filtered_items:
                     assert len(filtered_items) == len(self)
+                    indices = indices[np.asarray(filtered_items, dtype=bool)[indices]]
 
-                for i in range(start_index, end_index + 1):
-                    if reorder_items:
-                        i = reordered_to_actual_index_map[i]
-                    is_filtered_out = filtered_items and not filtered_items[i]
-                    if not is_filtered_out:
-                        self.selection_indices.add().index = i
+                self._set_selection_indices(indices)
 
                 if ui_callbacks:
                     self.on_active_index_update_from_ui(bpy.context)
@@ -456,11 +544,13 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
                     # select
                     self.active_index = index
                     self.selection_indices.add().index = index
+                    self._invalidate_selection_cache()
                     if ui_callbacks:
                         self.on_active_index_update_from_ui(bpy.context)
                 else:
                     # deselect
                     self.selection_indices.remove(index_in_selection)
+                    self._invalidate_selection_cache()
 
     def select_all(
         self,
@@ -469,16 +559,15 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
     ):
         if filtered_items:
             assert len(filtered_items) == len(self)
+            indices = np.flatnonzero(np.asarray(filtered_items, dtype=bool))
+        else:
+            indices = np.arange(len(self))
 
-        self.selection_indices.clear()
-        for i in range(len(self)):
-            is_filtered_out = filtered_items and not filtered_items[i]
-            if not is_filtered_out:
-                self.selection_indices.add().index = i
+        self._set_selection_indices(indices)
 
         is_active_item_filtered_out = filtered_items and not filtered_items[self.active_index]
-        if is_active_item_filtered_out and len(self.selection_indices) > 0:
-            self.active_index = self.selection_indices[0].index
+        if is_active_item_filtered_out and len(indices) > 0:
+            self.active_index = int(indices[0])
 
         if ui_callbacks:
             self.on_active_index_update_from_ui(bpy.context)
@@ -491,25 +580,25 @@ class MultiSelectCollection(Generic[TItem, TItemAccess]):
         if filtered_items:
             assert len(filtered_items) == len(self)
 
-        prev_selection = {s.index for s in self.selection_indices}
-        self.selection_indices.clear()
-        for i in range(len(self)):
-            is_filtered_out = filtered_items and not filtered_items[i]
-            if not is_filtered_out and i not in prev_selection:
-                self.selection_indices.add().index = i
+        prev_selection = np.empty(len(self.selection_indices), dtype=np.int32)
+        self.selection_indices.foreach_get("index", prev_selection)
+
+        mask = np.asarray(filtered_items, dtype=bool) if filtered_items else np.ones(len(self), dtype=bool)
+        mask[prev_selection[prev_selection < len(mask)]] = False
+        indices = np.flatnonzero(mask)
+        self._set_selection_indices(indices)
 
         is_active_item_filtered_out = filtered_items and not filtered_items[self.active_index]
-        if (is_active_item_filtered_out or self.active_index in prev_selection) and len(self.selection_indices) > 0:
-            self.active_index = self.selection_indices[0].index
+        is_active_item_prev_selected = np.any(prev_selection == self.active_index)
+        if (is_active_item_filtered_out or is_active_item_prev_selected) and len(indices) > 0:
+            self.active_index = int(indices[0])
 
         if ui_callbacks:
             self.on_active_index_update_from_ui(bpy.context)
 
     def select_many(self, item_indices: Sequence[int]):
         """Select multiple items by index. First item becomes the active item."""
-        self.selection_indices.clear()
-        for i in item_indices:
-            self.selection_indices.add().index = i
+        self._set_selection_indices(item_indices)
         self.active_index = self.selection_indices[0].index
 
 
@@ -661,7 +750,7 @@ class MultiSelectUIListMixin:
                 raise ValueError(f"Invalid item icon. Only str or int supported, got '{icon}'")
 
         selection_indices = collection.selection_indices
-        is_selected = len(selection_indices) > 1 and any(i.index == index for i in selection_indices)
+        is_selected = len(selection_indices) > 1 and collection.is_selected(index)
         is_active = index == collection.active_index
         layout.active = len(selection_indices) <= 1 or is_selected
 
@@ -805,3 +894,21 @@ class MultiSelectUITimeFlagsPanel(MultiSelectUIFlagsPanel):
         row.prop(selection.owner, selection.propnames.time_flags_end, text="to")
         row = self.layout.row()
         row.operator(self.clear_operator)
+
+
+@bpy.app.handlers.persistent
+def invalidate_selection_cache_handler(*args):
+    # Undo/redo and file loads replace the selection without going through MultiSelectCollection
+    _selection_cache.clear()
+
+
+def register():
+    bpy.app.handlers.undo_post.append(invalidate_selection_cache_handler)
+    bpy.app.handlers.redo_post.append(invalidate_selection_cache_handler)
+    bpy.app.handlers.load_post.append(invalidate_selection_cache_handler)
+
+
+def unregister():
+    bpy.app.handlers.undo_post.remove(invalidate_selection_cache_handler)
+    bpy.app.handlers.redo_post.remove(invalidate_selection_cache_handler)
+    bpy.app.handlers.load_post.remove(invalidate_selection_cache_handler)
@@ -0,0 +1,41 @@
+import bpy
+from bpy.app.handlers import persistent
+from collections.abc import Callable
+from ..auto_load import is_headless
+
+
+class UICollections:
+    """Window manager collections shown in the UI (e.g. material lists or presets), filled by ``loader`` on register and
+    when a .blend file is loaded. When running headless there is no UI to show them, so filling them is deferred until
+    ``ensure_loaded`` is called by something that reads them.
+    """
+
+    def __init__(self, loader: Callable[[], None]):
+        self._loader = loader
+        self._loaded = False
+
+        @persistent
+        def _on_blend_file_loaded(_):
+            if is_headless():
+                self._loaded = False
+                return
+
+            self.refresh()
+
+        self._on_blend_file_loaded = _on_blend_file_loaded
+
+    def refresh(self):
+        self._loader()
+        self._loaded = True
+
+    def ensure_loaded(self):
+        if not self._loaded:
+            self.refresh()
+
+    def register(self):
+        bpy.app.handlers.load_post.append(self._on_blend_file_loaded)
+        self._on_blend_file_loaded(None)
+
+    def unregister(self):
+        bpy.app.handlers.load_post.remove(self._on_blend_file_loaded)
+        self._loaded = False
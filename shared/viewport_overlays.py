@@ -0,0 +1,170 @@
+"""
+Helpers shared by the viewport overlays that display per-vertex data (cloth and cable overlays).
+
+Overlays are redrawn very often, so anything derived from the mesh data (coordinates, attribute values, GPU batches)
+is cached and only rebuilt when the mesh changes. Changes are detected with a per-mesh update tick that is bumped from
+a depsgraph handler.
+"""
+
+import bpy
+from bpy.types import (
+    ID,
+    Scene,
+    Depsgraph,
+    Region,
+    RegionView3D,
+)
+from mathutils import Matrix
+from collections.abc import Callable, Hashable, Sequence
+import numpy as np
+import bmesh
+
+_mesh_update_ticks: dict[int, int] = {}
+_global_update_tick = 0
+
+
+def mesh_update_tick(mesh: ID) -> int:
+    """Gets a number that changes every time the geometry or attributes of the mesh are updated."""
+    return _mesh_update_ticks.get(mesh.session_uid, 0) + _global_update_tick
+
+
+class OverlayCache:
+    """Small cache for data derived from a mesh. Stores a single entry per mesh, older entries are replaced when the
+    key changes, so the cache doesn't grow with the number of edits.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, tuple[Hashable, object]] = {}
+
+    def get(self, mesh: ID, key: Hashable, build: Callable[[], object]) -> object:
+        uid = mesh.session_uid
+        entry = self._entries.get(uid, None)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = build()
+        self._entries[uid] = (key, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+def read_attribute_values(
+    mesh: ID,
+    attrs: Sequence,
+    is_edit: bool,
+    get_mesh_attribute_values: Callable[[ID, object], np.ndarray],
+) -> tuple[np.ndarray, list]:
+    """Reads the local-space vertex positions and the values of ``attrs`` at each vertex. In edit mode the values are
+    read from the edit mesh, otherwise ``get_mesh_attribute_values(mesh, attr)`` is used to get them.
+    """
+    if is_edit:
+        edit_mesh = bmesh.from_edit_mesh(mesh)
+        try:
+            coords = np.array([v.co for v in edit_mesh.verts], dtype=np.float32).reshape((-1, 3))
+            attr_layers = [(
+                edit_mesh.verts.layers.float_vector if attr.type == "FLOAT_VECTOR"
+                else edit_mesh.verts.layers.int if attr.type == "INT"
+                else edit_mesh.verts.layers.float_color if attr.type == "FLOAT_COLOR"
+                else edit_mesh.verts.layers.float
+            ).get(attr, None) for attr in attrs]
+            all_attr_values = [
+                np.array([attr.default_value] * len(edit_mesh.verts)) if layer is None
+                else np.array([v[layer] for v in edit_mesh.verts])
+                for attr, layer in zip(attrs, attr_layers)
+            ]
+        finally:
+            edit_mesh.free()
+    else:
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape((-1, 3))
+        all_attr_values = [get_mesh_attribute_values(mesh, attr) for attr in attrs]
+
+    return coords, all_attr_values
+
+
+def project_points_to_region(
+    region: Region,
+    rv3d: RegionView3D,
+    matrix_world: Matrix,
+    coords: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Projects local-space points to 2D region coordinates, equivalent to ``location_3d_to_region_2d`` but for all
+    points at once. Points behind the view or outside the region are discarded.
+
+    Returns a tuple with the 2D positions of the visible points and their indices in ``coords``.
+    """
+    if len(coords) == 0:
+        return np.empty((0, 2), dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    m = np.array(rv3d.perspective_matrix @ matrix_world, dtype=np.float64)
+    clip = coords @ m[:3, :3].T + m[:3, 3]
+    w = coords @ m[3, :3] + m[3, 3]
+
+    in_front = w > 0.0
+    indices = np.flatnonzero(in_front)
+    ndc = clip[in_front, :2] / w[in_front, None]
+
+    inside = np.all(np.abs(ndc) <= 1.0, axis=1)
+    indices = indices[inside]
+    ndc = ndc[inside]
+
+    half_size = np.array((region.width * 0.5, region.height * 0.5))
+    return half_size + ndc * half_size, indices
+
+
+def cull_labels(
+    positions: np.ndarray,
+    indices: np.ndarray,
+    cell_size: float,
+    max_labels: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Reduces the number of labels to draw so they don't overlap. The region is split in a grid of ``cell_size``
+    pixels and only one label is kept per cell. At most ``max_labels`` are returned.
+    """
+    if len(indices) == 0 or max_labels <= 0:
+        return positions[:0], indices[:0]
+
+    cells = np.floor(positions / cell_size).astype(np.int64)
+    _, keep = np.unique(cells, axis=0, return_index=True)
+    keep.sort()
+    keep = keep[:max_labels]
+    return positions[keep], indices[keep]
+
+
+@bpy.app.handlers.persistent
+def depsgraph_update_post_handler(scene: Scene, depsgraph: Depsgraph):
+    for update in depsgraph.updates:
+        id = update.id.original
+        if isinstance(id, bpy.types.Object):
+            if id.type != "MESH" or not update.is_updated_geometry:
+                continue
+            id = id.data
+        elif not isinstance(id, bpy.types.Mesh):
+            continue
+
+        uid = id.session_uid
+        _mesh_update_ticks[uid] = _mesh_update_ticks.get(uid, 0) + 1
+
+
+@bpy.app.handlers.persistent
+def invalidate_all_handler(*args):
+    # Undo/redo and file loads replace the mesh data without going through the depsgraph updates we track
+    global _global_update_tick
+    _global_update_tick += 1
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post_handler)
+    bpy.app.handlers.undo_post.append(invalidate_all_handler)
+    bpy.app.handlers.redo_post.append(invalidate_all_handler)
+    bpy.app.handlers.load_post.append(invalidate_all_handler)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_post_handler)
+    bpy.app.handlers.undo_post.remove(invalidate_all_handler)
+    bpy.app.handlers.redo_post.remove(invalidate_all_handler)
+    bpy.app.handlers.load_post.remove(invalidate_all_handler)
@@ -0,0 +1,125 @@
+"""
+Incremental loading of CodeWalker XML files.
+
+``Element.from_xml_file`` parses the whole DOM before converting it, so with huge files every text blob (vertex buffers,
+index buffers, sequence data...) is in memory at the same time, in addition to the converted data. Here the file is
+parsed with ``iterparse`` and each item of the root lists (drawable models, animations, clips, polygons, entities...) is
+converted as soon as its element is complete and then removed from the tree. Vertex and index buffers inside the items
+are parsed into NumPy arrays as soon as their own element is complete, so their text is released before the rest of the
+item is read. Peak memory is bounded by the size of the converted data plus the largest single item, without its
+buffers text.
+"""
+
+from pathlib import Path
+from typing import IO, NamedTuple, TypeVar
+from xml.etree import ElementTree as ET
+from szio.xml import ElementTree, ListProperty
+from szio.gta5.cwxml import VertexBuffer, IndexBuffer
+
+TElementTree = TypeVar("TElementTree", bound=ElementTree)
+
+# Elements converted as soon as they are complete, instead of when the root list item containing them is converted
+EAGER_ELEMENT_TYPES: dict[str, type[ElementTree]] = {
+    VertexBuffer.tag_name: VertexBuffer,
+    IndexBuffer.tag_name: IndexBuffer,
+}
+
+
+class StreamableList(NamedTuple):
+    prop_name: str
+    list_cls: type[ListProperty]
+
+
+def get_streamable_lists(root_cls: type[ElementTree]) -> dict[str, StreamableList]:
+    """Get the list properties of ``root_cls`` whose items are converted while parsing, by tag name."""
+    return {
+        prop.tag_name: StreamableList(prop_name, type(prop))
+        for prop_name, prop in vars(root_cls()).items()
+        if isinstance(prop, ListProperty)
+    }
+
+
+def stream_xml_file(root_cls: type[TElementTree], filepath: Path | IO[bytes]) -> TElementTree:
+    """Read XML from a path or an open binary stream, converting the items of the root lists one at a time. The result
+    is the same as ``root_cls.from_xml_file(filepath)``.
+    """
+    streamable_lists = get_streamable_lists(root_cls)
+    list_items = {tag: [] for tag in streamable_lists}
+    list_elems = {}
+    root = None
+    open_elems = []
+    # Elements of the current item converted while parsing, by id of their (now empty) XML element
+    eager_converted = {}
+    for event, elem in ET.iterparse(filepath, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            elif len(open_elems) == 1 and elem.tag in streamable_lists:
+                # Only the first element with a given tag is read, same as ElementTree.from_xml
+                list_elems.setdefault(elem.tag, elem)
+
+            open_elems.append(elem)
+            continue
+
+        open_elems.pop()
+        if len(open_elems) > 2 and elem.tag in EAGER_ELEMENT_TYPES:
+            list_elem = open_elems[1]
+            if list_elems.get(list_elem.tag, None) is list_elem:
+                eager_converted[id(elem)] = EAGER_ELEMENT_TYPES[elem.tag].from_xml(elem)
+                # Release the buffer text. The element is kept so it can be matched when the item is converted
+                elem.clear()
+            continue
+
+        if len(open_elems) != 2:
+            continue
+
+        list_elem = open_elems[1]
+        if list_elems.get(list_elem.tag, None) is not list_elem:
+            continue
+
+        # Convert the item through the list class so lists that choose the item type based on the element (e.g. by
+        # its 'type' attribute) still work. The converted list only contains this item.
+        single_item_list_elem = ET.Element(list_elem.tag, list_elem.attrib)
+        single_item_list_elem.append(elem)
+        list_cls = streamable_lists[list_elem.tag].list_cls
+        items = list_cls.from_xml(single_item_list_elem).value
+        if eager_converted:
+            for item in items:
+                _replace_eager_converted(item, elem, eager_converted)
+            eager_converted.clear()
+        list_items[list_elem.tag].extend(items)
+
+        # Release the item element and all its text
+        list_elem.remove(elem)
+
+    new = root_cls.from_xml(root)
+    for tag in list_elems.keys():
+        setattr(new, streamable_lists[tag].prop_name, list_items[tag])
+
+    return new
+
+
+def _replace_eager_converted(obj: ElementTree, element: ET.Element, eager_converted: dict[int, ElementTree]):
+    """Replace the child elements of ``obj`` that were converted while parsing. ``element`` is the XML element ``obj``
+    was converted from, its children are looked up the same way ``ElementTree.from_xml`` does.
+    """
+    for prop_name, prop in vars(obj).items():
+        if isinstance(prop, ElementTree):
+            child = element.find(prop.tag_name)
+            if child is None:
+                continue
+
+            converted = eager_converted.get(id(child), None)
+            if converted is not None:
+                setattr(obj, prop_name, converted)
+            else:
+                _replace_eager_converted(prop, child, eager_converted)
+        elif isinstance(prop, ListProperty):
+            child = element.find(prop.tag_name)
+            if child is None:
+                continue
+
+            item_elems = child.findall(prop.item_tag_name or prop.list_type.tag_name)
+            for item, item_elem in zip(prop.value, item_elems):
+                if isinstance(item, ElementTree):
+                    _replace_eager_converted(item, item_elem, eager_converted)
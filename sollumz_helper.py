@@ -106,15 +106,17 @@ def duplicate_object_with_children(obj):
         new_obj = o.copy()
         new_obj.animation_data_clear()
         new_objs.append(new_obj)
+    new_objs_by_name = {o.name: new_obj for o, new_obj in zip(objs, new_objs)}
     new_objs[0].parent = None
     for i in range(1, len(objs)):
         if objs[i].parent:
-            new_objs[i].parent = new_objs[objs.index(objs[i].parent)]
+            new_objs[i].parent = new_objs_by_name[objs[i].parent.name]
     for new_obj in new_objs:
         bpy.context.scene.collection.objects.link(new_obj)
         for constraint in new_obj.constraints:
-            if hasattr(constraint, "target") and constraint.target in objs:
-                constraint.target = new_objs[objs.index(constraint.target)]
+            target = getattr(constraint, "target", None)
+            if target is not None and target.name in new_objs_by_name:
+                constraint.target = new_objs_by_name[target.name]
     return new_objs[0]
 
 
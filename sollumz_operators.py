@@ -13,6 +13,7 @@ from bpy.props import (
 )
 import time
 import re
+from pathlib import Path
 from mathutils import Quaternion
 from .sollumz_helper import SOLLUMZ_OT_base, find_sollumz_parent
 from .sollumz_properties import SollumType, SOLLUMZ_UI_NAMES, TimeFlagsMixin
@@ -46,6 +47,8 @@ from .meta import DEV_MODE
 from .dependencies import IS_SZIO_NATIVE_AVAILABLE, PYMATERIA_REQUIRED_MSG
 
 from . import logger
+from . import profiler
+from .asset_cache import asset_cache_session, load_asset
 
 
 class TimedOperator:
@@ -108,32 +111,33 @@ class SOLLUMZ_OT_import_assets_legacy(TimedOperator, Operator):
             filenames, ytyp_filenames = self._separate_ytyp_filenames(filenames)
             filenames = self._dedupe_hi_yft_filenames(filenames)
 
-            for filename in filenames:
-                filepath = os.path.join(self.directory, filename)
-
-                try:
-
-                    if YDR.file_extension in filepath:
-                        import_ydr(filepath)
-                    elif YDD.file_extension in filepath:
-                        import_ydd(filepath)
-                    elif YFT.file_extension in filepath:
-                        import_yft(filepath)
-                    elif YBN.file_extension in filepath:
-                        import_ybn(filepath)
-                    elif YNV.file_extension in filepath:
-                        import_ynv(filepath)
-                    elif YCD.file_extension in filepath:
-                        import_ycd(filepath)
-                    elif YMAP.file_extension in filepath:
-                        import_ymap(filepath)
-                    else:
-                        continue
+            with asset_cache_session():
+                for filename in filenames:
+                    filepath = os.path.join(self.directory, filename)
+
+                    try:
+
+                        if YDR.file_extension in filepath:
+                            import_ydr(filepath)
+                        elif YDD.file_extension in filepath:
+                            import_ydd(filepath)
+                        elif YFT.file_extension in filepath:
+                            import_yft(filepath)
+                        elif YBN.file_extension in filepath:
+                            import_ybn(filepath)
+                        elif YNV.file_extension in filepath:
+                            import_ynv(filepath)
+                        elif YCD.file_extension in filepath:
+                            import_ycd(filepath)
+                        elif YMAP.file_extension in filepath:
+                            import_ymap(filepath)
+                        else:
+                            continue
 
-                    logger.info(f"Successfully imported '{filepath}'")
-                except:
-                    logger.error(f"Error importing: {filepath} \n {traceback.format_exc()}")
-                    return {"CANCELLED"}
+                        logger.info(f"Successfully imported '{filepath}'")
+                    except:
+                        logger.error(f"Error importing: {filepath} \n {traceback.format_exc()}")
+                        return {"CANCELLED"}
 
             # Import the .ytyps after all the assets to ensure that the archetypes get linked to their object in case
             # they are imported together
@@ -211,8 +215,7 @@ class ImportAssetsOperatorImpl(TimedOperator):
             filenames, ytyp_filenames = self._separate_ytyp_filenames(filenames)
             filenames = self._dedupe_hi_yft_filenames(filenames)
 
-            from pathlib import Path
-            from szio.gta5 import try_load_asset, AssetType, AssetWithDependencies
+            from szio.gta5 import AssetType, AssetWithDependencies
             from .ybn.ybnimport_io import import_ybn as import_ybn_asset
             from .ydr.ydrimport_io import import_ydr as import_ydr_asset
             from .ydd.yddimport_io import import_ydd as import_ydd_asset, find_ydd_external_dependencies
@@ -250,7 +253,7 @@ class ImportAssetsOperatorImpl(TimedOperator):
                     if _import_asset_legacy(str(filepath)):
                         return True
 
-                    asset = try_load_asset(filepath)
+                    asset = load_asset(filepath)
                     if asset is None:
                         if not IS_SZIO_NATIVE_AVAILABLE and filepath.suffix in {".ybn", ".ydr", ".ydd", ".yft", ".ytyp"}:
                             logger.warning(f"Could not import '{filepath}'. {PYMATERIA_REQUIRED_MSG}")
@@ -305,13 +308,14 @@ class ImportAssetsOperatorImpl(TimedOperator):
                     logger.error(f"Error importing: {filepath} \n {traceback.format_exc()}")
                     return False
 
-            for filename in filenames:
-                _import_asset(filename)
+            with asset_cache_session():
+                for filename in filenames:
+                    _import_asset(filename)
 
-            # Import the .ytyps after all the assets to ensure that the archetypes get linked to their object in case
-            # they are imported together
-            for filename in ytyp_filenames:
-                _import_asset(filename)
+                # Import the .ytyps after all the assets to ensure that the archetypes get linked to their object in
+                # case they are imported together
+                for filename in ytyp_filenames:
+                    _import_asset(filename)
 
             logger.info(f"Imported in {self.time_elapsed} seconds")
             return {"FINISHED"}
@@ -455,51 +459,59 @@ class SOLLUMZ_OT_export_assets_legacy(TimedOperator, Operator):
                 return {"CANCELLED"}
 
             any_warnings_or_errors = False
-            for obj in objs:
-                op_log.clear_log_counts()
-                filepath = None
-                try:
-                    success = False
-                    if obj.sollum_type == SollumType.DRAWABLE:
-                        filepath = self.get_filepath(obj, YDR.file_extension)
-                        success = export_ydr(obj, filepath)
-                    elif obj.sollum_type == SollumType.DRAWABLE_DICTIONARY:
-                        filepath = self.get_filepath(obj, YDD.file_extension)
-                        success = export_ydd(obj, filepath)
-                    elif obj.sollum_type == SollumType.FRAGMENT:
-                        filepath = self.get_filepath(obj, YFT.file_extension)
-                        success = export_yft(obj, filepath)
-                    elif obj.sollum_type == SollumType.CLIP_DICTIONARY:
-                        filepath = self.get_filepath(obj, YCD.file_extension)
-                        success = export_ycd(obj, filepath)
-                    elif obj.sollum_type == SollumType.BOUND_COMPOSITE:
-                        filepath = self.get_filepath(obj, YBN.file_extension)
-                        success = export_ybn(obj, filepath)
-                    elif obj.sollum_type == SollumType.YMAP:
-                        filepath = self.get_filepath(obj, YMAP.file_extension)
-                        success = export_ymap(obj, filepath)
-                    else:
-                        continue
-
-                    if success:
-                        if op_log.has_warnings_or_errors:
-                            logger.info(
-                                f"Exported '{filepath}' with WARNINGS or ERRORS! Please check the Info Log for details.")
-                            any_warnings_or_errors = True
+            profiling_enabled = (
+                get_addon_preferences(context).export_profiling_enabled or profiler.is_enabled_by_env()
+            )
+            with profiler.profile_session("export", profiling_enabled, trace_directory=Path(self.directory)):
+                for obj in objs:
+                    op_log.clear_log_counts()
+                    filepath = None
+                    try:
+                        success = False
+                        if obj.sollum_type == SollumType.DRAWABLE:
+                            filepath = self.get_filepath(obj, YDR.file_extension)
+                            success = export_ydr(obj, filepath)
+                        elif obj.sollum_type == SollumType.DRAWABLE_DICTIONARY:
+                            filepath = self.get_filepath(obj, YDD.file_extension)
+                            success = export_ydd(obj, filepath)
+                        elif obj.sollum_type == SollumType.FRAGMENT:
+                            filepath = self.get_filepath(obj, YFT.file_extension)
+                            success = export_yft(obj, filepath)
+                        elif obj.sollum_type == SollumType.CLIP_DICTIONARY:
+                            filepath = self.get_filepath(obj, YCD.file_extension)
+                            success = export_ycd(obj, filepath)
+                        elif obj.sollum_type == SollumType.BOUND_COMPOSITE:
+                            filepath = self.get_filepath(obj, YBN.file_extension)
+                            success = export_ybn(obj, filepath)
+                        elif obj.sollum_type == SollumType.YMAP:
+                            filepath = self.get_filepath(obj, YMAP.file_extension)
+                            success = export_ymap(obj, filepath)
                         else:
-                            logger.info(f"Successfully exported '{filepath}'")
-                    else:
-                        if op_log.has_warnings_or_errors:
-                            logger.info(
-                                f"Failed to export '{obj.name}', ERRORS found! Please check the Info Log for details.")
-                            any_warnings_or_errors = True
-                except:
-                    logger.error(f"Error exporting: {filepath or obj.name} \n {traceback.format_exc()}")
-                    any_warnings_or_errors = True
-                    return {"CANCELLED"}
+                            continue
+
+                        if success:
+                            if op_log.has_warnings_or_errors:
+                                logger.info(
+                                    f"Exported '{filepath}' with WARNINGS or ERRORS! "
+                                    "Please check the Info Log for details."
+                                )
+                                any_warnings_or_errors = True
+                            else:
+                                logger.info(f"Successfully exported '{filepath}'")
+                        else:
+                            if op_log.has_warnings_or_errors:
+                                logger.info(
+                                    f"Failed to export '{obj.name}', ERRORS found! "
+                                    "Please check the Info Log for details."
+                                )
+                                any_warnings_or_errors = True
+                    except:
+                        logger.error(f"Error exporting: {filepath or obj.name} \n {traceback.format_exc()}")
+                        any_warnings_or_errors = True
+                        return {"CANCELLED"}
 
             logger.info(f"Exported in {self.time_elapsed} seconds")
-            if any_warnings_or_errors:
+            if any_warnings_or_errors and not bpy.app.background:
                 bpy.ops.screen.info_log_show()
             return {"FINISHED"}
 
@@ -572,7 +584,6 @@ class SOLLUMZ_OT_export_assets(TimedOperator, Operator):
                     logger.info("No Sollumz objects in the scene to export!")
                 return {"CANCELLED"}
 
-            from pathlib import Path
             from .ybn.ybnexport_io import export_ybn as export_ybn_asset
             from .ydr.ydrexport_io import export_ydr as export_ydr_asset
             from .ydd.yddexport_io import export_ydd as export_ydd_asset
@@ -591,60 +602,70 @@ class SOLLUMZ_OT_export_assets(TimedOperator, Operator):
             directory = Path(self.directory)
 
             any_warnings_or_errors = False
-            for obj in objs:
-                op_log.clear_log_counts()
-                try:
-                    asset_name = remove_number_suffix(obj.name.lower())
-                    export_bundle = None
-                    legacy_success = False
-                    with export_context_scope(ExportContext(asset_name, export_settings)):
-                        match obj.sollum_type:
-                            case SollumType.BOUND_COMPOSITE:
-                                export_bundle = export_ybn_asset(obj)
-                            case SollumType.DRAWABLE:
-                                export_bundle = export_ydr_asset(obj)
-                            case SollumType.DRAWABLE_DICTIONARY:
-                                export_bundle = export_ydd_asset(obj)
-                            case SollumType.FRAGMENT:
-                                export_bundle = export_yft_asset(obj)
-
-                            # These assets still need legacy export
-                            case SollumType.CLIP_DICTIONARY:
-                                filepath = SOLLUMZ_OT_export_assets_legacy.get_filepath(self, obj, YCD.file_extension)
-                                legacy_success = export_ycd(obj, filepath)
-                            case SollumType.YMAP:
-                                filepath = SOLLUMZ_OT_export_assets_legacy.get_filepath(self, obj, YMAP.file_extension)
-                                legacy_success = export_ymap(obj, filepath)
-
-                            case _:
-                                assert False, f"Unsupported asset type '{obj.sollum_type}'"
-
-                    success = export_bundle or legacy_success
-
-                    if success:
-                        if export_bundle:
-                            export_bundle.save(directory)
-
-                        if op_log.has_warnings_or_errors:
-                            logger.info(
-                                f"Exported '{obj.name}' with WARNINGS or ERRORS! Please check the Info Log for details."
-                            )
-                            any_warnings_or_errors = True
+            profiling_enabled = (
+                get_addon_preferences(context).export_profiling_enabled or profiler.is_enabled_by_env()
+            )
+            with profiler.profile_session("export", profiling_enabled, trace_directory=directory):
+                for obj in objs:
+                    op_log.clear_log_counts()
+                    try:
+                        asset_name = remove_number_suffix(obj.name.lower())
+                        export_bundle = None
+                        legacy_success = False
+                        with export_context_scope(ExportContext(asset_name, export_settings)):
+                            match obj.sollum_type:
+                                case SollumType.BOUND_COMPOSITE:
+                                    export_bundle = export_ybn_asset(obj)
+                                case SollumType.DRAWABLE:
+                                    export_bundle = export_ydr_asset(obj)
+                                case SollumType.DRAWABLE_DICTIONARY:
+                                    export_bundle = export_ydd_asset(obj)
+                                case SollumType.FRAGMENT:
+                                    export_bundle = export_yft_asset(obj)
+
+                                # These assets still need legacy export
+                                case SollumType.CLIP_DICTIONARY:
+                                    filepath = SOLLUMZ_OT_export_assets_legacy.get_filepath(
+                                        self, obj, YCD.file_extension
+                                    )
+                                    legacy_success = export_ycd(obj, filepath)
+                                case SollumType.YMAP:
+                                    filepath = SOLLUMZ_OT_export_assets_legacy.get_filepath(
+                                        self, obj, YMAP.file_extension
+                                    )
+                                    legacy_success = export_ymap(obj, filepath)
+
+                                case _:
+                                    assert False, f"Unsupported asset type '{obj.sollum_type}'"
+
+                        success = export_bundle or legacy_success
+
+                        if success:
+                            if export_bundle:
+                                export_bundle.save(directory)
+
+                            if op_log.has_warnings_or_errors:
+                                logger.info(
+                                    f"Exported '{obj.name}' with WARNINGS or ERRORS! "
+                                    "Please check the Info Log for details."
+                                )
+                                any_warnings_or_errors = True
+                            else:
+                                logger.info(f"Successfully exported '{obj.name}'")
                         else:
-                            logger.info(f"Successfully exported '{obj.name}'")
-                    else:
-                        if op_log.has_warnings_or_errors:
-                            logger.info(
-                                f"Failed to export '{obj.name}', ERRORS found! Please check the Info Log for details."
-                            )
-                            any_warnings_or_errors = True
-                except:
-                    logger.error(f"Error exporting: {obj.name} \n {traceback.format_exc()}")
-                    any_warnings_or_errors = True
-                    return {"CANCELLED"}
+                            if op_log.has_warnings_or_errors:
+                                logger.info(
+                                    f"Failed to export '{obj.name}', ERRORS found! "
+                                    "Please check the Info Log for details."
+                                )
+                                any_warnings_or_errors = True
+                    except:
+                        logger.error(f"Error exporting: {obj.name} \n {traceback.format_exc()}")
+                        any_warnings_or_errors = True
+                        return {"CANCELLED"}
 
             logger.info(f"Exported in {self.time_elapsed} seconds")
-            if any_warnings_or_errors:
+            if any_warnings_or_errors and not bpy.app.background:
                 bpy.ops.screen.info_log_show()
             return {"FINISHED"}
 
@@ -670,7 +691,6 @@ if DEV_MODE:
             return {"RUNNING_MODAL"}
 
         def execute(self, context: Context):
-            from pathlib import Path
             d = Path(self.directory)
             io_dir = d / "io"
             io_dir.mkdir(exist_ok=True)
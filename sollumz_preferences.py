@@ -156,6 +156,16 @@ class ExportSettingsBase:
         update=_on_update_thunk,
     )
 
+    optimize_vertex_cache: BoolProperty(
+        name="Optimize Vertex Cache",
+        description=(
+            "Reorder triangles and vertices of the exported meshes to improve GPU vertex cache usage. "
+            "Not applied when the mesh domain is Vertex, to keep the vertex order"
+        ),
+        default=False,
+        update=_on_update_thunk,
+    )
+
     def to_export_context_settings(self) -> "ExportSettings":
         import itertools
         from .iecontext import ExportSettings, VBBuilderDomain
@@ -169,6 +179,7 @@ class ExportSettingsBase:
             apply_transforms=self.apply_transforms,
             exclude_skeleton=self.exclude_skeleton,
             mesh_domain=VBBuilderDomain[self.mesh_domain],
+            optimize_vertex_cache=self.optimize_vertex_cache,
         )
 
 
@@ -183,6 +194,16 @@ class ImportSettingsBase:
         update=_on_update_thunk,
     )
 
+    stream_xml_files: BoolProperty(
+        name="Stream XML Files",
+        description=(
+            "Read .ydr.xml, .ycd.xml, .ymap.xml and .ynv.xml files incrementally, converting and releasing each part "
+            "as soon as it is read. Greatly reduces the memory usage when importing very large files"
+        ),
+        default=False,
+        update=_on_update_thunk,
+    )
+
     split_by_group: BoolProperty(
         name="Split Mesh by Vertex Group",
         description="Splits the mesh by the vertex groups",
@@ -249,6 +270,24 @@ class ImportSettingsBase:
         update=_on_update_thunk,
     )
 
+    ymap_instance_mode: EnumProperty(
+        name="Instance Mode",
+        description="How entities are instanced when 'Instance Entities' is enabled",
+        default="OBJECT",
+        items=(
+            (
+                "OBJECT", "Object Copies",
+                "Each entity is a copy of the archetype object hierarchy. The mesh data is shared between copies"
+            ),
+            (
+                "COLLECTION", "Collection Instances",
+                "Each entity is an empty instancing a collection with the archetype object hierarchy. Recommended for "
+                "large ymaps with many entities"
+            ),
+        ),
+        update=_on_update_thunk,
+    )
+
     ytyp_mlo_instance_entities: BoolProperty(
         name="Instance MLO Entities",
         description=(
@@ -310,12 +349,22 @@ class SollumzThemeSettings(PropertyGroup):
     mlo_gizmo_tcm_selected: RGBAProperty("Timecycle Modifier Selected", (0.93, 1.0, 1.0, 0.7))
 
     cable_overlay_radius: RGBAProperty("Radius", (1.0, 0.0, 0.0, 1.0))
+    cable_overlay_max_labels: IntProperty(
+        name="Max Labels", default=1000, min=0, max=100000,
+        description="Maximum number of vertex attribute labels drawn at the same time",
+        update=_save_preferences_on_update,
+    )
 
     cloth_overlay_pinned: RGBAProperty("Pinned", (1.0, 0.65, 0.0, 0.5))
     cloth_overlay_pinned_size: IntProperty(name="Pinned Size", default=12, min=1, max=50)
     cloth_overlay_material_errors: RGBAProperty("Material Errors", (1.0, 0.05, 0.025, 0.45))
     cloth_overlay_binding_errors: RGBAProperty("Binding Errors", (1.0, 0.05, 0.025, 0.75))
     cloth_overlay_binding_errors_size: IntProperty(name="Binding Errors Size", default=12, min=1, max=50)
+    cloth_overlay_max_labels: IntProperty(
+        name="Max Labels", default=1000, min=0, max=100000,
+        description="Maximum number of vertex attribute labels drawn at the same time",
+        update=_save_preferences_on_update,
+    )
 
     def reset(self):
         for prop_name, annotation in SollumzThemeSettings.__annotations__.items():
@@ -698,6 +747,17 @@ class SollumzAddonPreferences(AddonPreferences):
         update=_save_preferences_on_update
     )
 
+    export_profiling_enabled: BoolProperty(
+        name="Profile Exports",
+        description=(
+            "Time each stage of the export process and write the results to a Chrome trace file (.json) in the "
+            "export directory. A summary is also shown in the Sollumz Tools panel. Useful to find out why an export "
+            "is slow"
+        ),
+        default=False,
+        update=_save_preferences_on_update
+    )
+
     popup_shown_install_dependencies: BoolProperty(
         default=False,
         update=_save_preferences_on_update
@@ -867,6 +927,7 @@ class SollumzAddonPreferences(AddonPreferences):
         if body:
             # intentionally not using `body` here because it makes the panel look weird inside the prefs default box layout
             layout.prop(self, "custom_procids_path")
+            layout.prop(self, "export_profiling_enabled")
 
     def draw_import_export(self, context, layout: UILayout):
         def _section_header(layout: UILayout, text: str):
@@ -888,6 +949,7 @@ class SollumzAddonPreferences(AddonPreferences):
         box.label(text="Import", icon="IMPORT")
         settings = self.import_settings
         box.prop(settings, "import_as_asset")
+        box.prop(settings, "stream_xml_files")
         _section_header(box, text="Fragment")
         box.prop(settings, "split_by_group")
         box.prop(settings, "frag_import_vehicle_windows")
@@ -901,6 +963,9 @@ class SollumzAddonPreferences(AddonPreferences):
         box.prop(settings, "ymap_skip_missing_entities")
         box.prop(settings, "ymap_exclude_entities")
         box.prop(settings, "ymap_instance_entities")
+        row = box.row()
+        row.enabled = settings.ymap_instance_entities
+        row.prop(settings, "ymap_instance_mode")
         box.prop(settings, "ymap_box_occluders")
         box.prop(settings, "ymap_model_occluders")
         box.prop(settings, "ymap_car_generators")
@@ -942,6 +1007,7 @@ class SollumzAddonPreferences(AddonPreferences):
         _section_header(box, "Drawable")
         box.prop(settings, "apply_transforms")
         box.prop(settings, "mesh_domain", expand=True)
+        box.prop(settings, "optimize_vertex_cache")
 
         _section_header(box, "Drawable Dictionary")
         box.prop(settings, "exclude_skeleton")
@@ -1017,6 +1083,7 @@ class SollumzAddonPreferences(AddonPreferences):
 
         _section_header(layout, "Cable Overlays", "OUTLINER_DATA_GREASEPENCIL")
         layout.prop(theme, "cable_overlay_radius")
+        layout.prop(theme, "cable_overlay_max_labels")
 
         _section_header(layout, "Cloth Overlays", "MATCLOTH")
         layout.prop(theme, "cloth_overlay_pinned")
@@ -1024,6 +1091,7 @@ class SollumzAddonPreferences(AddonPreferences):
         layout.prop(theme, "cloth_overlay_material_errors")
         layout.prop(theme, "cloth_overlay_binding_errors")
         layout.prop(theme, "cloth_overlay_binding_errors_size")
+        layout.prop(theme, "cloth_overlay_max_labels")
 
     def draw_about(self, context, layout: UILayout):
         row = layout.row()
@@ -22,6 +22,7 @@ from .lods import (
 )
 from .icons import icon_manager
 from .meta import DEV_MODE
+from . import profiler
 
 
 def draw_list_with_add_remove(layout: bpy.types.UILayout, add_operator: str, remove_operator: str, *temp_list_args, **temp_list_kwargs):
@@ -158,6 +159,7 @@ class SOLLUMZ_PT_import_asset(bpy.types.Panel, SollumzImportSettingsPanel):
 
     def draw_settings(self, layout: bpy.types.UILayout, settings: SollumzImportSettings):
         layout.prop(settings, "import_as_asset")
+        layout.prop(settings, "stream_xml_files")
 
 
 class SOLLUMZ_PT_import_fragment(bpy.types.Panel, SollumzImportSettingsPanel):
@@ -185,6 +187,9 @@ class SOLLUMZ_PT_import_ymap(bpy.types.Panel, SollumzImportSettingsPanel):
         layout.prop(settings, "ymap_skip_missing_entities")
         layout.prop(settings, "ymap_exclude_entities")
         layout.prop(settings, "ymap_instance_entities")
+        row = layout.row()
+        row.enabled = settings.ymap_instance_entities
+        row.prop(settings, "ymap_instance_mode")
         layout.prop(settings, "ymap_box_occluders")
         layout.prop(settings, "ymap_model_occluders")
         layout.prop(settings, "ymap_car_generators")
@@ -463,6 +468,48 @@ class SOLLUMZ_PT_EXPORT_PATH_PANEL(GeneralToolChildPanel, bpy.types.Panel):
         self.layout.prop(context.scene, "sollumz_export_path", text="")
 
 
+class SOLLUMZ_PT_EXPORT_PROFILE_PANEL(GeneralToolChildPanel, bpy.types.Panel):
+    bl_label = "Export Profile"
+    bl_idname = "SOLLUMZ_PT_EXPORT_PROFILE_PANEL"
+    bl_order = 5
+
+    MAX_SCOPES = 15
+
+    @classmethod
+    def poll(cls, context):
+        return profiler.last_session() is not None
+
+    def draw_header(self, context):
+        self.layout.label(text="", icon="TIME")
+
+    def draw(self, context):
+        layout = self.layout
+        session = profiler.last_session()
+
+        layout.label(text=f"Total: {session.duration_ns / 1_000_000:.1f} ms")
+
+        col = layout.column(align=True)
+        row = col.row(align=True)
+        row.label(text="Stage")
+        row.label(text="Total (ms)")
+        row.label(text="Self (ms)")
+        row.label(text="Calls")
+        for s in session.summary()[:self.MAX_SCOPES]:
+            row = col.row(align=True)
+            row.label(text=s.name)
+            row.label(text=f"{s.total_ms:.1f}")
+            row.label(text=f"{s.self_ms:.1f}")
+            row.label(text=str(s.calls))
+
+        if session.counters:
+            layout.separator()
+            col = layout.column(align=True)
+            for name, value in sorted(session.counters.items()):
+                row = col.row(align=True)
+                row.label(text=name)
+                row.label(text=str(value))
+
+
 class SOLLUMZ_PT_OBJECT_PANEL(bpy.types.Panel):
     bl_label = "Sollumz"
     bl_idname = "SOLLUMZ_PT_MAIN_PANEL"
@@ -0,0 +1,268 @@
+"""
+Helpers for the performance benchmarks in ``test_benchmarks.py``.
+
+Benchmarks are disabled by default. Set the ``SOLLUMZ_TEST_BENCHMARK_DIR`` environment variable to an existing directory
+to enable them, the results are written there as JSON. To check for regressions, set
+``SOLLUMZ_TEST_BENCHMARK_BASELINE`` to the results JSON of a previous run.
+"""
+
+import os
+import time
+import platform
+import json
+import subprocess
+import tempfile
+import bpy
+import bmesh
+import numpy as np
+from typing import Callable, Optional, Any
+from pathlib import Path
+from collections import defaultdict
+from mathutils import Vector, Quaternion
+from .shared import get_env_path
+from ..sollumz_properties import SollumType
+from ..tools.blenderhelper import create_blender_object, create_empty_object
+from ..tools.drawablehelper import convert_obj_to_drawable
+from ..tools.meshhelper import get_uv_map_name, get_color_attr_name
+from ..ydr.shader_materials import create_shader
+from ..ydr.cloth import ClothAttr, mesh_add_cloth_attribute
+from ..ybn.collision_materials import create_collision_material_from_index
+
+SOLLUMZ_TEST_BENCHMARK_DIR = get_env_path("SOLLUMZ_TEST_BENCHMARK_DIR")
+SOLLUMZ_TEST_BENCHMARK_BASELINE = get_env_path("SOLLUMZ_TEST_BENCHMARK_BASELINE")
+
+# Number of grid segments per side of the synthetic meshes, each step is ~16x more vertices
+BENCHMARK_MESH_SIZES = (16, 64, 256)
+BENCHMARK_BONE_COUNTS = (16, 64, 256)
+BENCHMARK_FRAME_COUNTS = (100, 1000, 10000)
+BENCHMARK_REPEAT = 3
+# Slowdown relative to the baseline that is reported as a regression
+BENCHMARK_REGRESSION_TOLERANCE = 1.25
+
+
+def is_benchmark_enabled() -> bool:
+    return SOLLUMZ_TEST_BENCHMARK_DIR is not None
+
+
+class BenchmarkRecorder:
+    """Collects the timings of the benchmarks. Each benchmark is measured at different input sizes to get the scaling
+    curve of the operation.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, dict[int, list[float]]] = defaultdict(dict)
+
+    def measure(
+        self,
+        name: str,
+        n: int,
+        func: Callable[[], Any],
+        repeat: int = BENCHMARK_REPEAT,
+    ) -> Any:
+        """Times ``func`` ``repeat`` times. ``n`` is the input size (number of vertices, bones, frames...) used for the
+        scaling curve. Returns the result of the last run.
+        """
+        times = []
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            times.append(time.perf_counter() - start)
+
+        self.timings[name][n] = times
+        return result
+
+    def record(self, name: str, n: int, seconds: float):
+        """Records a timing measured elsewhere, e.g. in another process."""
+        self.timings[name].setdefault(n, []).append(seconds)
+
+    def to_dict(self) -> dict:
+        benchmarks = {}
+        for name, timings_by_n in self.timings.items():
+            sizes = sorted(timings_by_n.keys())
+            min_s = [min(timings_by_n[n]) for n in sizes]
+            median_s = [float(np.median(timings_by_n[n])) for n in sizes]
+            benchmarks[name] = {
+                "n": sizes,
+                "min_s": min_s,
+                "median_s": median_s,
+                "scaling_exponent": scaling_exponent(sizes, median_s),
+            }
+
+        return {
+            "blender_version": bpy.app.version_string,
+            "python_version": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "benchmarks": benchmarks,
+        }
+
+    def write(self, directory: Path) -> Path:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        path = directory / f"sollumz_benchmark_{timestamp}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def scaling_exponent(sizes: list[int], times: list[float]) -> Optional[float]:
+    """Gets the exponent ``k`` of the best fit ``time ~ n^k``. ~1 is linear scaling, ~2 quadratic."""
+    sizes = np.asarray(sizes, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    valid = (sizes > 0) & (times > 0)
+    if np.count_nonzero(valid) < 2:
+        return None
+
+    k, _ = np.polyfit(np.log(sizes[valid]), np.log(times[valid]), 1)
+    return float(k)
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float = BENCHMARK_REGRESSION_TOLERANCE) -> list[str]:
+    """Compares two benchmark results dictionaries. Returns a description of each benchmark that got slower than the
+    baseline by more than ``tolerance``.
+    """
+    regressions = []
+    baseline_benchmarks = baseline.get("benchmarks", {})
+    for name, result in results["benchmarks"].items():
+        base = baseline_benchmarks.get(name, None)
+        if base is None:
+            continue
+
+        base_median_by_n = dict(zip(base["n"], base["median_s"]))
+        for n, median in zip(result["n"], result["median_s"]):
+            base_median = base_median_by_n.get(n, None)
+            if base_median is None or base_median <= 0.0:
+                continue
+
+            ratio = median / base_median
+            if ratio > tolerance:
+                regressions.append(f"{name} [n={n}]: {base_median * 1000:.2f} ms -> {median * 1000:.2f} ms ({ratio:.2f}x)")
+
+    return regressions
+
+
+def create_grid_mesh(segments: int, name: str = "benchmark_grid", seed: int = 0) -> bpy.types.Mesh:
+    """Creates a subdivided plane with some noise in the heights, one UV map and one color attribute."""
+    bm = bmesh.new()
+    bm.loops.layers.uv.new(get_uv_map_name(0))
+    bmesh.ops.create_grid(bm, x_segments=segments, y_segments=segments, size=1.0, calc_uvs=True)
+
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+
+    rng = np.random.default_rng(seed)
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape((-1, 3))
+    positions[:, 2] = rng.uniform(-0.1, 0.1, len(positions))
+    mesh.vertices.foreach_set("co", positions.ravel())
+
+    color_attr = mesh.color_attributes.new(get_color_attr_name(0), "BYTE_COLOR", "CORNER")
+    color_attr.data.foreach_set("color", rng.uniform(0.0, 1.0, len(mesh.loops) * 4).astype(np.float32))
+
+    mesh.update()
+    return mesh
+
+
+def create_drawable_obj(segments: int) -> bpy.types.Object:
+    mesh = create_grid_mesh(segments, "benchmark_drawable")
+    mesh.materials.append(create_shader("default.sps"))
+    model_obj = bpy.data.objects.new("benchmark_drawable", mesh)
+    bpy.context.collection.objects.link(model_obj)
+    return convert_obj_to_drawable(model_obj)
+
+
+def create_bound_composite_obj(segments: int) -> bpy.types.Object:
+    """Creates a bound composite with a single BVH bound made of a grid mesh."""
+    composite_obj = create_empty_object(SollumType.BOUND_COMPOSITE, "benchmark_composite")
+    mesh = create_grid_mesh(segments, "benchmark_bvh")
+    mesh.materials.append(create_collision_material_from_index(0))
+    bvh_obj = create_blender_object(SollumType.BOUND_GEOMETRYBVH, "benchmark_bvh", mesh)
+    bvh_obj.parent = composite_obj
+    return composite_obj
+
+
+def create_cloth_mesh(segments: int) -> bpy.types.Mesh:
+    """Creates a grid mesh with cloth attributes. The first row of vertices is pinned."""
+    mesh = create_grid_mesh(segments, "benchmark_cloth")
+    pinned = np.zeros(len(mesh.vertices), dtype=np.int32)
+    pinned[:segments + 1] = 1
+    mesh_add_cloth_attribute(mesh, ClothAttr.PINNED).data.foreach_set("value", pinned)
+    mesh_add_cloth_attribute(mesh, ClothAttr.VERTEX_WEIGHT)
+    mesh.calc_loop_triangles()
+    return mesh
+
+
+def create_armature_obj(num_bones: int) -> bpy.types.Object:
+    """Creates an armature with a chain of bones, branching every 8 bones."""
+    armature = bpy.data.armatures.new("benchmark_skel")
+    armature_obj = bpy.data.objects.new("benchmark_skel", armature)
+    bpy.context.collection.objects.link(armature_obj)
+
+    bpy.context.view_layer.objects.active = armature_obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    edit_bones = []
+    for i in range(num_bones):
+        bone = armature.edit_bones.new(f"bone{i}")
+        bone.head = (i * 0.1, (i % 8) * 0.1, 0.0)
+        bone.tail = (i * 0.1, (i % 8) * 0.1, 0.1)
+        if i > 0:
+            bone.parent = edit_bones[i - 1 if i % 8 else i - 8]
+        edit_bones.append(bone)
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    for i, bone in enumerate(armature.bones):
+        bone.bone_properties.tag = i
+
+    return armature_obj
+
+
+def create_vector_frames(num_frames: int, seed: int = 0) -> list[Vector]:
+    rng = np.random.default_rng(seed)
+    # Random walk, so consecutive frames are similar like in real animations
+    values = np.cumsum(rng.normal(0.0, 0.01, (num_frames, 3)), axis=0)
+    return [Vector(v) for v in values]
+
+
+def create_quaternion_frames(num_frames: int, seed: int = 0) -> list[Quaternion]:
+    rng = np.random.default_rng(seed)
+    values = np.cumsum(rng.normal(0.0, 0.01, (num_frames, 4)), axis=0) + (1.0, 0.0, 0.0, 0.0)
+    values /= np.linalg.norm(values, axis=1)[:, None]
+    return [Quaternion(v) for v in values]
+
+
+def delete_mesh(mesh: bpy.types.Mesh):
+    bpy.data.meshes.remove(mesh)
+
+
+# Runs in a new Blender process, Sollumz has to be enabled from scratch to measure the import times
+_ADDON_STARTUP_SCRIPT = """
+import sys, json, time, importlib, bpy
+addon_module, results_path = sys.argv[sys.argv.index("--") + 1:]
+start = time.perf_counter()
+bpy.ops.preferences.addon_enable(module=addon_module)
+enable_s = time.perf_counter() - start
+auto_load = importlib.import_module(addon_module + ".auto_load")
+with open(results_path, "w") as f:
+    json.dump({"enable_s": enable_s, "module_import_s": auto_load.module_import_times}, f)
+"""
+
+
+def measure_addon_startup(headless: bool = False) -> dict:
+    """Enables Sollumz in a new background Blender process. Returns the time it took to enable it (``enable_s``) and the
+    time to import each of its modules (``module_import_s``).
+    """
+    addon_module = __name__.rsplit(".", 2)[0]
+    env = dict(os.environ, SOLLUMZ_HEADLESS="true" if headless else "false")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results_path = os.path.join(tmp_dir, "startup.json")
+        subprocess.run(
+            [
+                bpy.app.binary_path, "--background", "--factory-startup",
+                "--python-expr", _ADDON_STARTUP_SCRIPT, "--", addon_module, results_path,
+            ],
+            env=env, check=True, stdout=subprocess.DEVNULL,
+        )
+        with open(results_path) as f:
+            return json.load(f)
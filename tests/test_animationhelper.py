@@ -0,0 +1,117 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from mathutils import Matrix, Quaternion, Vector
+from ..tools.animationhelper import (
+    action_fcurves,
+    transform_location_fcurves,
+    transform_rotation_quaternion_fcurves,
+    read_fcurves_keyframes,
+)
+
+TRANSFORM_MATRIX = Matrix.LocRotScale(
+    Vector((1.0, -2.0, 0.5)), Quaternion(Vector((1.0, 2.0, 3.0)).normalized(), 0.7), Vector((1.0, 1.0, 1.0))
+)
+
+
+@pytest.fixture()
+def animated_obj(context):
+    obj = bpy.data.objects.new("test_animationhelper", None)
+    context.collection.objects.link(obj)
+    obj.rotation_mode = "QUATERNION"
+    obj_name = obj.name
+
+    yield obj
+
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj:
+        action = obj.animation_data.action if obj.animation_data else None
+        bpy.data.objects.remove(obj)
+        if action:
+            bpy.data.actions.remove(action)
+
+
+def _insert_keyframes(obj: bpy.types.Object, data_path: str, frames_values: list[tuple[int, tuple[float, ...]]]):
+    for frame, value in frames_values:
+        setattr(obj, data_path, value)
+        obj.keyframe_insert(data_path, frame=frame)
+
+
+def _get_fcurves(obj: bpy.types.Object, data_path: str) -> list[bpy.types.FCurve]:
+    fcurves = [fcurve for fcurve in action_fcurves(obj.animation_data.action) if fcurve.data_path == data_path]
+    return sorted(fcurves, key=lambda fcurve: fcurve.array_index)
+
+
+def test_transform_location_fcurves(animated_obj):
+    rng = np.random.default_rng(0)
+    locations = [tuple(rng.uniform(-1.0, 1.0, 3)) for _ in range(16)]
+    _insert_keyframes(animated_obj, "location", list(enumerate(locations)))
+    fcurves = _get_fcurves(animated_obj, "location")
+
+    transform_location_fcurves(fcurves, TRANSFORM_MATRIX)
+
+    frames, values = read_fcurves_keyframes(fcurves)
+    assert_allclose(frames, np.arange(len(locations)))
+    expected = [tuple(TRANSFORM_MATRIX @ Vector(location)) for location in locations]
+    assert_allclose(values, expected, atol=1e-5)
+
+
+def test_transform_rotation_quaternion_fcurves(animated_obj):
+    rng = np.random.default_rng(0)
+    rotations = [tuple(Quaternion(rng.normal(size=4)).normalized()) for _ in range(16)]
+    transform_quat = TRANSFORM_MATRIX.to_quaternion()
+    # The first rotated quaternion has a negative W, its sign should be kept
+    if (transform_quat @ Quaternion(rotations[0])).w > 0.0:
+        rotations[0] = tuple(-Quaternion(rotations[0]))
+    _insert_keyframes(animated_obj, "rotation_quaternion", list(enumerate(rotations)))
+    fcurves = _get_fcurves(animated_obj, "rotation_quaternion")
+
+    transform_rotation_quaternion_fcurves(fcurves, TRANSFORM_MATRIX)
+
+    _, values = read_fcurves_keyframes(fcurves)
+    expected = []
+    prev_quat = None
+    for rotation in rotations:
+        quat = transform_quat @ Quaternion(rotation)
+        if prev_quat is not None and prev_quat.dot(quat) < 0:
+            quat *= -1
+        expected.append(tuple(quat))
+        prev_quat = quat
+
+    assert_allclose(values, expected, atol=1e-5)
+    assert np.all(np.einsum("ij,ij->i", values[:-1], values[1:]) >= 0.0)
+
+
+def test_transform_location_fcurves_with_different_keyframe_times(animated_obj):
+    _insert_keyframes(animated_obj, "location", [(0, (0.0, 0.0, 0.0)), (10, (1.0, 2.0, 3.0))])
+    animated_obj.location.x = 0.25
+    animated_obj.keyframe_insert("location", index=0, frame=5)
+    fcurves = _get_fcurves(animated_obj, "location")
+    expected_y = fcurves[1].evaluate(5.0)
+    expected_z = fcurves[2].evaluate(5.0)
+
+    transform_location_fcurves(fcurves, Matrix.Identity(4))
+
+    assert [len(fcurve.keyframe_points) for fcurve in fcurves] == [3, 3, 3]
+    frames, values = read_fcurves_keyframes(fcurves)
+    assert_allclose(frames, (0.0, 5.0, 10.0))
+    assert_allclose(values, ((0.0, 0.0, 0.0), (0.25, expected_y, expected_z), (1.0, 2.0, 3.0)), atol=1e-5)
+
+
+def test_transform_location_fcurves_with_duplicated_keyframe_times(animated_obj):
+    _insert_keyframes(animated_obj, "location", [(0, (0.0, 0.0, 0.0)), (10, (1.0, 2.0, 3.0))])
+    fcurves = _get_fcurves(animated_obj, "location")
+    # Two keyframes at frame 5 in the X F-curve, the last one is the one used
+    kfps = fcurves[0].keyframe_points
+    kfps.add(2)
+    kfps.foreach_set("co", np.array((0.0, 0.0, 5.0, 0.5, 5.0, 0.25, 10.0, 1.0), dtype=np.float32))
+    expected_y = fcurves[1].evaluate(5.0)
+    expected_z = fcurves[2].evaluate(5.0)
+
+    transform_location_fcurves(fcurves, Matrix.Identity(4))
+
+    assert [len(fcurve.keyframe_points) for fcurve in fcurves] == [3, 3, 3]
+    frames, values = read_fcurves_keyframes(fcurves)
+    assert_allclose(frames, (0.0, 5.0, 10.0))
+    assert_allclose(values, ((0.0, 0.0, 0.0), (0.25, expected_y, expected_z), (1.0, 2.0, 3.0)), atol=1e-5)
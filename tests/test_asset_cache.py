@@ -0,0 +1,99 @@
+import os
+import sys
+import numpy as np
+from ..asset_cache import AssetCache, asset_cache_session, load_cached, is_session_active, estimate_memory_size
+
+
+def _counting_loader():
+    calls = []
+
+    def _loader(path):
+        calls.append(path)
+        with open(path) as f:
+            return f.read()
+
+    return _loader, calls
+
+
+def test_asset_cache_reuses_loaded_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    loader, calls = _counting_loader()
+    cache = AssetCache()
+
+    assert cache.get_or_load(path, loader) == "a"
+    assert cache.get_or_load(str(path), loader) == "a"
+    assert len(calls) == 1
+    assert cache.hits == 1
+
+
+def test_asset_cache_reloads_modified_file(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    loader, calls = _counting_loader()
+    cache = AssetCache()
+
+    cache.get_or_load(path, loader)
+    path.write_text("bb")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert cache.get_or_load(path, loader) == "bb"
+    assert len(calls) == 2
+
+
+def test_asset_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.txt"
+        path.write_text(name * 10)
+        paths.append(path)
+    a, b, c = paths
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return np.frombuffer(path.read_bytes(), dtype=np.uint8).copy()
+
+    cache = AssetCache(memory_budget=25)
+
+    cache.get_or_load(a, loader)
+    cache.get_or_load(b, loader)
+    cache.get_or_load(a, loader)  # 'b' is now the least recently used
+    cache.get_or_load(c, loader)  # over budget, evicts 'b'
+    assert cache.memory_used == 20
+
+    cache.get_or_load(a, loader)
+    cache.get_or_load(b, loader)
+    assert calls == [a, b, c, b]
+
+
+def test_asset_cache_session(tmp_path):
+    path = tmp_path / "a.txt"
+    path.write_text("a")
+    loader, calls = _counting_loader()
+
+    load_cached(path, loader)
+    load_cached(path, loader)
+    assert len(calls) == 2
+
+    with asset_cache_session():
+        assert is_session_active()
+        load_cached(path, loader)
+        load_cached(path, loader)
+    assert len(calls) == 3
+    assert not is_session_active()
+
+
+def test_estimate_memory_size():
+    arr = np.zeros(1000, dtype=np.float32)
+    # Arrays count their buffer, shared objects are counted once
+    assert estimate_memory_size(arr) == arr.nbytes
+    assert estimate_memory_size([arr, arr]) == sys.getsizeof([arr, arr]) + arr.nbytes
+
+    class Item:
+        def __init__(self):
+            self.data = np.zeros(100, dtype=np.uint32)
+
+    item = Item()
+    assert estimate_memory_size(item) >= sys.getsizeof(item) + item.data.nbytes
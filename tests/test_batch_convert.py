@@ -0,0 +1,165 @@
+import os
+import pytest
+from pathlib import Path
+from ..batch_convert import (
+    ConversionJob,
+    ConversionRecord,
+    ConversionSummary,
+    collect_jobs,
+    split_jobs,
+    read_manifest,
+    append_manifest,
+    merge_worker_manifests,
+    is_job_done,
+    get_conversion_settings,
+    STATUS_OK,
+    STATUS_FAILED,
+)
+from ..asset_cache import get_file_stamp
+from ..asset_conversion import convert_asset_file, get_targets
+from szio.gta5 import AssetFormat, AssetVersion, AssetType, is_provider_available, try_load_asset
+from .shared import asset_path
+
+
+def _write(path: Path, size: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+    return path
+
+
+def test_batch_convert_collect_jobs(tmp_path):
+    in_dir = tmp_path / "in"
+    _write(in_dir / "a.ydr", 10)
+    _write(in_dir / "sub" / "b.ybn.xml", 20)
+    _write(in_dir / "sub" / "c.txt", 30)
+    single = _write(tmp_path / "d.yft", 40)
+    out_dir = tmp_path / "out"
+
+    jobs = collect_jobs([in_dir, single, in_dir / "a.ydr"], out_dir)
+
+    assert [(Path(j.path).name, Path(j.output_directory), j.size) for j in jobs] == [
+        ("a.ydr", out_dir, 10),
+        ("b.ybn.xml", out_dir / "sub", 20),
+        ("d.yft", out_dir, 40),
+    ]
+
+
+def test_batch_convert_split_jobs():
+    sizes = [100, 90, 60, 50, 40, 30, 20, 10]
+    jobs = [ConversionJob(f"f{i}", "out", size) for i, size in enumerate(sizes)]
+
+    queues = split_jobs(jobs, 3)
+
+    assert len(queues) == 3
+    assert sorted(j.path for q in queues for j in q) == sorted(j.path for j in jobs)
+    queue_sizes = [sum(j.size for j in q) for q in queues]
+    assert max(queue_sizes) - min(queue_sizes) <= max(sizes) // 2
+
+    assert len(split_jobs(jobs[:2], 8)) == 2
+    assert split_jobs([], 4) == []
+
+
+def test_batch_convert_manifest_resume(tmp_path):
+    converted = _write(tmp_path / "converted.ydr", 10)
+    modified = _write(tmp_path / "modified.ydr", 10)
+    failed = _write(tmp_path / "failed.ydr", 10)
+    new = _write(tmp_path / "new.ydr", 10)
+
+    manifest_path = tmp_path / "manifest.jsonl"
+    worker_manifest_path = tmp_path / "manifest.jsonl.worker0"
+    append_manifest(manifest_path, [
+        ConversionRecord(str(converted), STATUS_FAILED, *get_file_stamp(converted)),
+        ConversionRecord(str(modified), STATUS_OK, *get_file_stamp(modified)),
+    ])
+    append_manifest(worker_manifest_path, [
+        ConversionRecord(str(converted), STATUS_OK, *get_file_stamp(converted), import_s=1.0, export_s=2.0),
+        ConversionRecord(str(failed), STATUS_FAILED, *get_file_stamp(failed), messages=["ERROR: test"]),
+    ])
+    with open(worker_manifest_path, "a") as f:
+        f.write('{"path": "interrupt')
+
+    _write(modified, 20)
+
+    merge_worker_manifests(manifest_path)
+    assert not worker_manifest_path.exists()
+
+    records = read_manifest(manifest_path)
+    record = records[os.path.normcase(os.path.abspath(converted))]
+    assert record.status == STATUS_OK
+    assert record.total_s == 3.0
+
+    done = {Path(p).name for p in (converted, modified, failed, new) if is_job_done(ConversionJob(str(p), ""), records)}
+    assert done == {"converted.ydr"}
+
+
+@pytest.mark.parametrize("direct", (False, True))
+def test_batch_convert_manifest_resume_with_changed_settings(tmp_path, direct):
+    in_dir = tmp_path / "in"
+    _write(in_dir / "a.ydr", 10)
+    _write(in_dir / "b.ydr", 10)
+    out_dir = tmp_path / "out"
+    manifest_path = tmp_path / "manifest.jsonl"
+
+    # First run with '--version GEN8'
+    gen8_settings = get_conversion_settings({"NATIVE"}, {"GEN8"}, direct)
+    jobs = collect_jobs([in_dir], out_dir, settings=gen8_settings)
+    append_manifest(manifest_path, [
+        ConversionRecord(job.path, STATUS_OK, *get_file_stamp(job.path), settings=job.settings) for job in jobs
+    ])
+    records = read_manifest(manifest_path)
+    assert all(is_job_done(job, records) for job in collect_jobs([in_dir], out_dir, settings=gen8_settings))
+
+    # Second run with '--version GEN9', nothing is skipped
+    gen9_settings = get_conversion_settings({"NATIVE"}, {"GEN9"}, direct)
+    assert not any(is_job_done(job, records) for job in collect_jobs([in_dir], out_dir, settings=gen9_settings))
+
+    # Same versions in a different order are the same settings
+    both_settings = get_conversion_settings({"NATIVE"}, {"GEN8", "GEN9"}, direct)
+    assert both_settings == get_conversion_settings({"NATIVE"}, {"GEN9", "GEN8"}, direct)
+
+    # Switching '--direct' mode converts the files again too
+    other_mode_settings = get_conversion_settings({"NATIVE"}, {"GEN8"}, not direct)
+    assert not any(is_job_done(job, records) for job in collect_jobs([in_dir], out_dir, settings=other_mode_settings))
+
+
+def test_batch_convert_summary():
+    records = [
+        ConversionRecord("a.ydr", STATUS_OK, import_s=1.0, export_s=1.0),
+        ConversionRecord("b.ydr", STATUS_OK, import_s=3.0, export_s=1.0),
+        ConversionRecord("c.ydr", STATUS_FAILED, messages=["ERROR: Traceback\n  ...\nValueError: bad"]),
+    ]
+
+    summary = ConversionSummary(num_files=5, num_skipped=1, num_workers=2, wall_s=3.0, records=records)
+
+    assert summary.count(STATUS_OK) == 2
+    assert summary.num_unprocessed == 1
+    assert summary.speedup == 2.0
+    text = summary.format()
+    assert "ValueError: bad" in text
+    assert text.index("b.ydr") < text.index("a.ydr")
+    assert summary.to_dict()["counts"][STATUS_FAILED] == 1
+
+
+@pytest.mark.parametrize("target_format", (
+    "CWXML",
+    pytest.param("NATIVE", marks=pytest.mark.skipif(
+        not is_provider_available(AssetFormat.NATIVE), reason="Native format backend not available"
+    )),
+))
+def test_batch_convert_direct_asset_conversion(tmp_path, target_format):
+    targets = get_targets([target_format], ["GEN8", "GEN9"])
+    assert [(t.format, t.version) for t in targets] == [
+        (AssetFormat[target_format], AssetVersion.GEN8),
+        (AssetFormat[target_format], AssetVersion.GEN9),
+    ]
+
+    extension = ".xml" if target_format == "CWXML" else ""
+    for file_name, asset_type in (("sollumz_cube.ydr.xml", AssetType.DRAWABLE),
+                                  ("sollumz_cube.yft.xml", AssetType.FRAGMENT)):
+        convert_asset_file(asset_path(file_name), tmp_path, targets)
+
+        output_file_name = file_name.removesuffix(".xml") + extension
+        for version in ("gen8", "gen9"):
+            asset = try_load_asset(tmp_path / version / output_file_name)
+            assert asset is not None
+            assert asset.ASSET_TYPE == asset_type
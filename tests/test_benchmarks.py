@@ -0,0 +1,180 @@
+import json
+import warnings
+import pytest
+import numpy as np
+from .benchmark import (
+    is_benchmark_enabled,
+    BenchmarkRecorder,
+    find_regressions,
+    create_grid_mesh,
+    create_drawable_obj,
+    create_bound_composite_obj,
+    create_cloth_mesh,
+    create_armature_obj,
+    create_vector_frames,
+    create_quaternion_frames,
+    delete_mesh,
+    measure_addon_startup,
+    SOLLUMZ_TEST_BENCHMARK_DIR,
+    SOLLUMZ_TEST_BENCHMARK_BASELINE,
+    BENCHMARK_MESH_SIZES,
+    BENCHMARK_BONE_COUNTS,
+    BENCHMARK_FRAME_COUNTS,
+)
+from ..tools.animationhelper import Track
+from ..tools.blenderhelper import delete_hierarchy
+from ..ydr.vertex_buffer_builder import VertexBufferBuilder, VBBuilderDomain, dedupe_and_get_indices
+from ..ydr.ydrexport_io import split_vert_buffers
+from ..ydr.ydrexport import export_ydr, create_skeleton_xml
+from ..ydr.ydrimport import import_ydr
+from ..ydr.cloth_mesh_export import cloth_mesh_read_data, cloth_mesh_pinned_first_vertex_map, cloth_mesh_get_edges
+from ..ybn.ybnexport import export_ybn, create_bound_xml
+from ..ybn.ybnimport import import_ybn
+from ..shared.geometry import shrink_mesh
+from ..ycd.ycdexport import sequence_data_from_frames_data
+from ..ycd.ycdimport import get_vector3_from_sequence_data, get_quaternion_from_sequence_data
+
+
+if is_benchmark_enabled():
+    @pytest.fixture(scope="module")
+    def benchmark():
+        recorder = BenchmarkRecorder()
+        yield recorder
+
+        results_path = recorder.write(SOLLUMZ_TEST_BENCHMARK_DIR)
+        print(f"Benchmark results written to '{results_path}'")
+
+        if SOLLUMZ_TEST_BENCHMARK_BASELINE is not None:
+            with open(SOLLUMZ_TEST_BENCHMARK_BASELINE) as f:
+                baseline = json.load(f)
+
+            regressions = find_regressions(recorder.to_dict(), baseline)
+            if regressions:
+                warnings.warn("Benchmark regressions found:\n" + "\n".join(regressions))
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    @pytest.mark.parametrize("domain", (VBBuilderDomain.FACE_CORNER, VBBuilderDomain.VERTEX))
+    def test_benchmark_vertex_buffer(benchmark, segments: int, domain: VBBuilderDomain):
+        if domain == VBBuilderDomain.VERTEX and segments == BENCHMARK_MESH_SIZES[-1]:
+            pytest.skip("Vertex domain builder scales quadratically, too slow for the largest mesh")
+
+        mesh = create_grid_mesh(segments)
+        n = len(mesh.loops)
+
+        vert_buffer = benchmark.measure(
+            f"vertex_buffer_build[{domain.name}]", n, lambda: VertexBufferBuilder(mesh, domain=domain).build()
+        )
+        vert_buffer, ind_buffer = benchmark.measure(
+            f"dedupe_and_get_indices[{domain.name}]", n, lambda: dedupe_and_get_indices(vert_buffer)
+        )
+        benchmark.measure(
+            f"split_vert_buffers[{domain.name}]", n, lambda: split_vert_buffers(vert_buffer, ind_buffer)
+        )
+
+        delete_mesh(mesh)
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    def test_benchmark_ybn_bvh_welding(benchmark, segments: int):
+        composite_obj = create_bound_composite_obj(segments)
+        bvh_obj = composite_obj.children[0]
+        n = len(bvh_obj.data.loops) // 4 * 2  # triangles
+
+        bound_xml = benchmark.measure("ybn_bvh_welding", n, lambda: create_bound_xml(bvh_obj))
+        assert bound_xml is not None
+
+        delete_hierarchy(composite_obj)
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    def test_benchmark_shrink_mesh(benchmark, segments: int):
+        mesh = create_grid_mesh(segments)
+        mesh.calc_loop_triangles()
+        vertices = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", vertices)
+        faces = np.empty(len(mesh.loop_triangles) * 3, dtype=np.uint32)
+        mesh.loop_triangles.foreach_get("vertices", faces)
+        n = len(mesh.loop_triangles)
+
+        benchmark.measure("shrink_mesh", n, lambda: shrink_mesh(vertices.reshape((-1, 3)), faces.reshape((-1, 3))))
+
+        delete_mesh(mesh)
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    def test_benchmark_cloth_edges(benchmark, segments: int):
+        mesh = create_cloth_mesh(segments)
+        n = len(mesh.vertices)
+
+        def _read_and_get_edges():
+            data = cloth_mesh_read_data(mesh)
+            _, mesh_to_cloth = cloth_mesh_pinned_first_vertex_map(data.pinned)
+            return cloth_mesh_get_edges(data, mesh_to_cloth)
+
+        benchmark.measure("cloth_mesh_edges", n, _read_and_get_edges)
+
+        delete_mesh(mesh)
+
+    @pytest.mark.parametrize("num_bones", BENCHMARK_BONE_COUNTS)
+    def test_benchmark_skeleton(benchmark, num_bones: int):
+        armature_obj = create_armature_obj(num_bones)
+
+        skeleton_xml = benchmark.measure("skeleton_export", num_bones, lambda: create_skeleton_xml(armature_obj))
+        assert len(skeleton_xml.bones) == num_bones
+
+        delete_hierarchy(armature_obj)
+
+    @pytest.mark.parametrize("num_frames", BENCHMARK_FRAME_COUNTS)
+    @pytest.mark.parametrize("track, create_frames, decode", (
+        (Track.BonePosition, create_vector_frames, get_vector3_from_sequence_data),
+        (Track.BoneRotation, create_quaternion_frames, get_quaternion_from_sequence_data),
+    ))
+    def test_benchmark_ycd_sequence_data(benchmark, num_frames: int, track: Track, create_frames, decode):
+        frames = create_frames(num_frames)
+
+        sequence_data = benchmark.measure(
+            f"ycd_encode[{track.name}]", num_frames, lambda: sequence_data_from_frames_data(track, frames)
+        )
+        decoded = benchmark.measure(
+            f"ycd_decode[{track.name}]", num_frames,
+            lambda: [decode(sequence_data, frame_id) for frame_id in range(num_frames)]
+        )
+        assert len(decoded) == num_frames
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    def test_benchmark_ydr_roundtrip(benchmark, tmp_path, segments: int):
+        drawable_obj = create_drawable_obj(segments)
+        n = len(drawable_obj.children[0].data.loops)
+        out_path = str(tmp_path / f"benchmark_{segments}.ydr.xml")
+
+        success = benchmark.measure("ydr_export", n, lambda: export_ydr(drawable_obj, out_path), repeat=1)
+        assert success
+
+        imported_obj = benchmark.measure("ydr_import", n, lambda: import_ydr(out_path), repeat=1)
+        assert imported_obj is not None
+
+        delete_hierarchy(drawable_obj)
+        delete_hierarchy(imported_obj)
+
+    @pytest.mark.parametrize("segments", BENCHMARK_MESH_SIZES)
+    def test_benchmark_ybn_roundtrip(benchmark, tmp_path, segments: int):
+        composite_obj = create_bound_composite_obj(segments)
+        n = len(composite_obj.children[0].data.vertices)
+        out_path = str(tmp_path / f"benchmark_{segments}.ybn.xml")
+
+        success = benchmark.measure("ybn_export", n, lambda: export_ybn(composite_obj, out_path), repeat=1)
+        assert success
+
+        imported_obj = benchmark.measure("ybn_import", n, lambda: import_ybn(out_path), repeat=1)
+        assert imported_obj is not None
+
+        delete_hierarchy(composite_obj)
+        delete_hierarchy(imported_obj)
+
+    @pytest.mark.parametrize("headless", (False, True))
+    def test_benchmark_addon_startup(benchmark, headless: bool):
+        startup = measure_addon_startup(headless)
+
+        benchmark.record("addon_enable[headless]" if headless else "addon_enable", 1, startup["enable_s"])
+        if not headless:
+            for module_name, import_s in startup["module_import_s"].items():
+                benchmark.record(f"module_import[{module_name}]", 1, import_s)
+
+        assert startup["module_import_s"]
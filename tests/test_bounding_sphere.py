@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from ..shared.bounding_sphere import get_bounding_sphere
+from ..shared import miniball
+
+
+def create_points(kind: str, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    match kind:
+        case "normal":
+            return rng.normal(size=(300, 3))
+        case "planar":
+            points = rng.uniform(-1.0, 1.0, (300, 3))
+            points[:, 2] = 0.5
+            return points
+        case "collinear":
+            return np.outer(rng.uniform(-1.0, 1.0, 300), (1.0, 2.0, 3.0))
+        case "grid":
+            return rng.integers(-3, 3, (300, 3)).astype(np.float64)
+
+
+def assert_encloses(points, C, r2):
+    assert np.all(np.square(points - C).sum(axis=1) <= r2 * (1.0 + 1e-6) + 1e-12)
+
+
+@pytest.mark.parametrize("kind", ("normal", "planar", "collinear", "grid"))
+@pytest.mark.parametrize("seed", range(4))
+def test_bounding_sphere_encloses_points(kind, seed):
+    points = create_points(kind, seed)
+
+    C, r2 = get_bounding_sphere(points)
+
+    assert_encloses(points, C, r2)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_bounding_sphere_matches_miniball(seed):
+    points = create_points("normal", seed)
+
+    C, r2 = get_bounding_sphere(points)
+
+    expected_C, expected_r2 = miniball.get_bounding_ball(points)
+    assert_allclose(C, expected_C, atol=1e-6)
+    assert r2 == pytest.approx(expected_r2)
+
+
+def test_bounding_sphere_with_duplicated_points():
+    points = create_points("normal", 0)
+
+    C, r2 = get_bounding_sphere(np.repeat(points, 4, axis=0))
+
+    expected_C, expected_r2 = get_bounding_sphere(points)
+    assert_allclose(C, expected_C)
+    assert r2 == pytest.approx(expected_r2)
+
+
+def test_bounding_sphere_is_deterministic():
+    points = create_points("normal", 0)
+
+    assert_allclose(get_bounding_sphere(points, seed=3)[0], get_bounding_sphere(points, seed=3)[0], rtol=0, atol=0)
+
+
+@pytest.mark.parametrize("points, expected_C, expected_r2", (
+    (((1.0, 2.0, 3.0),), (1.0, 2.0, 3.0), 0.0),
+    (((1.0, 2.0, 3.0),) * 5, (1.0, 2.0, 3.0), 0.0),
+    (((-1.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 0.5, 0.0)), (0.0, 0.0, 0.0), 1.0),
+))
+def test_bounding_sphere_of_few_points(points, expected_C, expected_r2):
+    C, r2 = get_bounding_sphere(np.array(points))
+
+    assert_allclose(C, expected_C, atol=1e-12)
+    assert r2 == pytest.approx(expected_r2)
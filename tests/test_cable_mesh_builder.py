@@ -0,0 +1,152 @@
+import pytest
+import bpy
+import numpy as np
+from numpy.testing import assert_array_equal, assert_allclose
+from mathutils import Vector
+from bpy_extras.mesh_utils import edge_loops_from_edges
+from ..ydr.cable import CableAttr, mesh_add_cable_attribute, mesh_get_cable_attribute_values
+from ..ydr.cable_mesh_builder import CableMeshBuilder
+from ..ydr.cable_vertex_buffer_builder import CableVertexBufferBuilder
+from ..ydr.vertex_buffer_builder import dedupe_and_get_indices
+from ..ydr.shader_materials import create_shader
+from ..shared.math import distance_point_to_line
+from szio.gta5 import STANDARD_VERTEX_ATTR_DTYPES
+
+
+def _cable_buffers(pieces: list[list[tuple[float, float, float]]]):
+    """Builds the vertex and index buffers of the given cable pieces, the same way the game meshes are built: each
+    segment is made of two triangles, (p0 -r -> p1 -r -> p0 +r) and (p0 +r -> p1 -r -> p1 +r).
+    """
+    struct_dtype = [STANDARD_VERTEX_ATTR_DTYPES[name] for name in ("Position", "Normal", "Colour0", "TexCoord0")]
+    verts = []
+    for points in pieces:
+        for p0, p1 in zip(points[:-1], points[1:]):
+            tangent = np.subtract(p1, p0)
+            tangent /= np.linalg.norm(tangent)
+            for p, sign in ((p0, -1), (p1, -1), (p0, 1), (p0, 1), (p1, -1), (p1, 1)):
+                verts.append((p, tangent, (255, 0, 0, 255), (sign * 0.05, 0.0)))
+
+    vertex_arr = np.array(verts, dtype=struct_dtype)
+    ind_arr = np.arange(len(vertex_arr), dtype=np.uint32)
+    mat_inds = np.zeros(len(ind_arr) // 3, dtype=np.uint32)
+    return vertex_arr, ind_arr, mat_inds
+
+
+def test_cable_mesh_builder_gather_pieces():
+    # Straight pieces so every point has the same tangent and is only deduplicated with itself
+    piece_a = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (2.0, 0.0, 0.0)]
+    piece_b = [(0.0, 5.0, 0.0), (0.0, 6.0, 0.0)]
+    vertex_arr, ind_arr, mat_inds = _cable_buffers([piece_a, piece_b])
+
+    pieces = CableMeshBuilder("cable", vertex_arr, ind_arr, mat_inds, [None])._gather_pieces()
+
+    pieces_points = np.split(pieces.positions, np.cumsum(pieces.pieces_num_points)[:-1])
+    pieces_points = sorted((p.tolist() for p in pieces_points), key=len, reverse=True)
+    assert_allclose(pieces_points[0], piece_a)
+    assert_allclose(pieces_points[1], piece_b)
+    assert_allclose(pieces.radius, 0.05)
+    assert_allclose(pieces.diffuse_factor, 1.0)
+    assert_allclose(pieces.phase_offset, [[1.0, 0.0]] * 5)
+    assert_array_equal(pieces.material_index, 0)
+
+
+@pytest.fixture()
+def cable_mesh():
+    # Three pieces, the last one branches off the first one sharing its point 2
+    vertices = [
+        (0.0, 0.0, 0.0), (1.0, 0.2, -0.1), (2.0, 0.3, -0.3), (3.0, 0.0, 0.0),
+        (0.0, 5.0, 0.0), (0.5, 6.0, -0.2), (0.0, 7.0, 0.0),
+        (2.5, 1.0, -0.5), (3.0, 2.0, -0.2),
+    ]
+    edges = [(0, 1), (1, 2), (2, 3), (4, 5), (5, 6), (2, 7), (7, 8)]
+
+    mesh = bpy.data.meshes.new("test_cable_mesh")
+    mesh.from_pydata(vertices, edges, [])
+    mesh.materials.append(create_shader("cable.sps"))
+    mesh.materials.append(create_shader("cable.sps"))
+
+    rng = np.random.default_rng(0)
+    num_verts = len(vertices)
+    for attr in CableAttr:
+        mesh_add_cable_attribute(mesh, attr)
+    mesh.attributes[CableAttr.RADIUS].data.foreach_set("value", rng.uniform(0.01, 0.1, num_verts))
+    mesh.attributes[CableAttr.DIFFUSE_FACTOR].data.foreach_set("value", rng.uniform(-0.5, 1.5, num_verts))
+    mesh.attributes[CableAttr.UM_SCALE].data.foreach_set("value", rng.uniform(0.0, 2.0, num_verts))
+    mesh.attributes[CableAttr.PHASE_OFFSET].data.foreach_set("vector", rng.uniform(0.0, 1.0, num_verts * 3))
+    mesh.attributes[CableAttr.MATERIAL_INDEX].data.foreach_set("value", rng.integers(0, 2, num_verts))
+    mesh_name = mesh.name
+    material_names = [m.name for m in mesh.materials]
+
+    yield mesh
+
+    mesh = bpy.data.meshes.get(mesh_name, None)
+    if mesh:
+        bpy.data.meshes.remove(mesh)
+    for material_name in material_names:
+        material = bpy.data.materials.get(material_name, None)
+        if material:
+            bpy.data.materials.remove(material)
+
+
+def _build_cable_vertex_buffer_per_point(mesh: bpy.types.Mesh):
+    """Per-point implementation used by previous versions of ``CableVertexBufferBuilder.build``, to compare with."""
+    verts_position = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+    mesh.attributes["position"].data.foreach_get("vector", verts_position.ravel())
+    verts_radius = mesh_get_cable_attribute_values(mesh, CableAttr.RADIUS)
+    verts_diffuse_factor = mesh_get_cable_attribute_values(mesh, CableAttr.DIFFUSE_FACTOR).clip(0.0, 1.0)
+    verts_um_scale = mesh_get_cable_attribute_values(mesh, CableAttr.UM_SCALE)
+    verts_phase_offset = mesh_get_cable_attribute_values(mesh, CableAttr.PHASE_OFFSET).clip(0.0, 1.0)
+    verts_material = mesh_get_cable_attribute_values(mesh, CableAttr.MATERIAL_INDEX).clip(0, len(mesh.materials) - 1)
+
+    struct_dtype = [STANDARD_VERTEX_ATTR_DTYPES[name] for name in ("Position", "Normal", "Colour0", "TexCoord0")]
+    verts = []
+    materials = []
+    for piece_vertices in edge_loops_from_edges(mesh):
+        num_vertices = len(piece_vertices)
+        if num_vertices <= 1:
+            continue
+
+        points = [Vector(verts_position[v]) for v in piece_vertices]
+        tangents = []
+        for i in range(num_vertices):
+            prev_point = points[max(i - 1, 0)]
+            next_point = points[min(i + 1, num_vertices - 1)]
+            tangents.append((next_point - prev_point).normalized())
+        distances = [distance_point_to_line(points[0], points[-1], p) for p in points]
+
+        def _vertex(i: int, sign: float):
+            v = piece_vertices[i]
+            color = (
+                int(verts_phase_offset[v][0] * 255),
+                int(verts_phase_offset[v][1] * 255),
+                0,
+                int(verts_diffuse_factor[v] * 255),
+            )
+            materials.append(verts_material[v])
+            return verts_position[v], tangents[i], color, (sign * verts_radius[v], distances[i] * verts_um_scale[v])
+
+        for i0 in range(num_vertices - 1):
+            i1 = i0 + 1
+            # (v0 -r -> v1 -r -> v0 +r) and (v0 +r -> v1 -r -> v1 +r)
+            for i, sign in ((i0, -1.0), (i1, -1.0), (i0, 1.0), (i0, 1.0), (i1, -1.0), (i1, 1.0)):
+                verts.append(_vertex(i, sign))
+
+    return np.array(verts, dtype=struct_dtype), np.array(materials, dtype=np.int32)
+
+
+def test_cable_vertex_buffer_builder_matches_per_point_build(cable_mesh):
+    expected_vertex_arr, expected_materials = _build_cable_vertex_buffer_per_point(cable_mesh)
+
+    vertex_arr, materials = CableVertexBufferBuilder(cable_mesh).build()
+
+    assert len(vertex_arr) == len(expected_vertex_arr)
+    assert_allclose(vertex_arr["Position"], expected_vertex_arr["Position"])
+    assert_allclose(vertex_arr["Normal"], expected_vertex_arr["Normal"], atol=1e-6)
+    assert_array_equal(vertex_arr["Colour0"], expected_vertex_arr["Colour0"])
+    assert_allclose(vertex_arr["TexCoord0"], expected_vertex_arr["TexCoord0"], atol=1e-6)
+    assert_array_equal(materials, expected_materials)
+
+    for material_index in range(len(cable_mesh.materials)):
+        _, ind_arr = dedupe_and_get_indices(vertex_arr[materials == material_index])
+        _, expected_ind_arr = dedupe_and_get_indices(expected_vertex_arr[expected_materials == material_index])
+        assert_array_equal(ind_arr, expected_ind_arr)
@@ -0,0 +1,122 @@
+import pytest
+import bpy
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+from mathutils import Vector
+from ..ydr.cloth import ClothAttr, mesh_add_cloth_attribute
+from ..ydr.cloth_mesh_export import (
+    cloth_mesh_read_data,
+    cloth_mesh_pinned_first_vertex_map,
+    cloth_mesh_get_edges,
+    create_verlet_edges,
+)
+
+GRID_SIZE = 5
+
+
+@pytest.fixture()
+def pinned_grid_mesh():
+    rng = np.random.default_rng(0)
+    vertices = [(x, y, rng.uniform(-0.1, 0.1)) for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+    faces = [
+        (y * GRID_SIZE + x, y * GRID_SIZE + x + 1, (y + 1) * GRID_SIZE + x + 1, (y + 1) * GRID_SIZE + x)
+        for y in range(GRID_SIZE - 1) for x in range(GRID_SIZE - 1)
+    ]
+    # Loose edge, exported as a custom edge
+    edges = [(0, GRID_SIZE * GRID_SIZE - 1)]
+
+    mesh = bpy.data.meshes.new("test_cloth_mesh_export")
+    mesh.from_pydata(vertices, edges, faces)
+    pinned = np.zeros(len(vertices), dtype=np.int32)
+    pinned[GRID_SIZE * 2:GRID_SIZE * 3] = 1  # a row in the middle, so pinned vertices need to be moved to the start
+    pinned[[1, GRID_SIZE * GRID_SIZE - 2]] = 1
+    mesh_add_cloth_attribute(mesh, ClothAttr.PINNED).data.foreach_set("value", pinned)
+    mesh.calc_loop_triangles()
+    mesh_name = mesh.name
+
+    yield mesh
+
+    mesh = bpy.data.meshes.get(mesh_name, None)
+    if mesh:
+        bpy.data.meshes.remove(mesh)
+
+
+def _export_cloth_mesh_per_element(mesh: bpy.types.Mesh):
+    """Per-vertex/per-triangle implementation used by previous versions, to compare with."""
+    pinned = [v != 0 for v in (a.value for a in mesh.attributes[ClothAttr.PINNED].data)]
+    num_vertices = len(mesh.vertices)
+
+    mesh_to_cloth = list(range(num_vertices))
+    cloth_to_mesh = list(range(num_vertices))
+    vertices = [Vector(v.co) for v in mesh.vertices]
+    cloth_pin_index = 0
+    for v in mesh.vertices:
+        if pinned[v.index]:
+            if v.index != cloth_pin_index:
+                vertices[cloth_pin_index], vertices[v.index] = vertices[v.index], vertices[cloth_pin_index]
+                mesh_to_cloth[cloth_to_mesh[cloth_pin_index]] = mesh_to_cloth[v.index]
+                cloth_to_mesh[v.index] = cloth_to_mesh[cloth_pin_index]
+                mesh_to_cloth[v.index] = cloth_pin_index
+                cloth_to_mesh[cloth_pin_index] = v.index
+            cloth_pin_index += 1
+
+    def _create_edge(mesh_v0: int, mesh_v1: int) -> tuple:
+        vertex0 = mesh_to_cloth[mesh_v0]
+        vertex1 = mesh_to_cloth[mesh_v1]
+        return (
+            vertex0,
+            vertex1,
+            (vertices[vertex0] - vertices[vertex1]).length_squared,
+            0.0 if pinned[mesh_v0] else 1.0 if pinned[mesh_v1] else 0.5,
+        )
+
+    edges = []
+    edges_added = set()
+    for tri in mesh.loop_triangles:
+        v0, v1, v2 = tri.vertices
+        for edge_v0, edge_v1 in ((v0, v1), (v1, v2), (v2, v0)):
+            if (edge_v0, edge_v1) in edges_added or (edge_v1, edge_v0) in edges_added:
+                continue
+            if pinned[edge_v0] and pinned[edge_v1]:
+                continue
+            edges.append(_create_edge(edge_v0, edge_v1))
+            edges_added.add((edge_v0, edge_v1))
+
+    custom_edges = []
+    for edge in mesh.edges:
+        v0, v1 = edge.vertices
+        if (v0, v1) in edges_added or (v1, v0) in edges_added:
+            continue
+        if pinned[v0] and pinned[v1]:
+            continue
+        custom_edges.append(_create_edge(v0, v1))
+        edges_added.add((v0, v1))
+
+    return vertices, cloth_to_mesh, mesh_to_cloth, edges, custom_edges
+
+
+def _assert_edges_equal(verlet_edges, expected_edges):
+    assert len(verlet_edges) == len(expected_edges)
+    for verlet_edge, (vertex0, vertex1, length_sqr, weight0) in zip(verlet_edges, expected_edges):
+        assert verlet_edge.vertex0 == vertex0
+        assert verlet_edge.vertex1 == vertex1
+        assert verlet_edge.length_sqr == pytest.approx(length_sqr, rel=1e-5)
+        assert verlet_edge.weight0 == weight0
+
+
+def test_cloth_mesh_export_matches_per_element_export(pinned_grid_mesh):
+    mesh = pinned_grid_mesh
+    expected_vertices, expected_cloth_to_mesh, expected_mesh_to_cloth, expected_edges, expected_custom_edges = (
+        _export_cloth_mesh_per_element(mesh)
+    )
+
+    data = cloth_mesh_read_data(mesh)
+    cloth_to_mesh, mesh_to_cloth = cloth_mesh_pinned_first_vertex_map(data.pinned)
+    edges_data, custom_edges_data = cloth_mesh_get_edges(data, mesh_to_cloth)
+
+    assert_array_equal(cloth_to_mesh, expected_cloth_to_mesh)
+    assert_array_equal(mesh_to_cloth, expected_mesh_to_cloth)
+    assert_allclose(data.positions[cloth_to_mesh], expected_vertices)
+    assert len(expected_custom_edges) == 1
+    _assert_edges_equal(create_verlet_edges(edges_data), expected_edges)
+    _assert_edges_equal(create_verlet_edges(custom_edges_data), expected_custom_edges)
@@ -1,6 +1,8 @@
 import pytest
 import numpy as np
-from ..shared.geometry import shrink_mesh
+from numpy.testing import assert_allclose
+from mathutils import Vector, Matrix
+from ..shared.geometry import shrink_mesh, get_mass_properties_of_mesh, get_inertia_tensor_of_mesh
 from .shared import SOLLUMZ_TEST_ASSETS_DIR
 
 def read_shrink_mesh_test_data(file_path):
@@ -41,3 +43,114 @@ def test_geometry_shrink_mesh(test_data_file_name):
                   f"   diff={output_vertex - expected_vertex}\n")
 
     assert n == 0, f"{n} / {len(output_vertices)}{s}"
+
+
+@pytest.mark.parametrize("size", ((1.0, 1.0, 1.0), (1.0, 2.0, 3.0)))
+def test_geometry_shrink_mesh_box(size):
+    vertices, faces = create_box_mesh(size)
+    vertices = vertices.astype(np.float32)
+
+    output_vertices, output_margin = shrink_mesh(vertices, faces)
+
+    # Each corner moves inwards by the margin along each axis, so the faces move inwards by the margin
+    assert output_margin == pytest.approx(0.04)
+    assert_allclose(output_vertices, vertices - np.sign(vertices) * 0.04, atol=1e-6)
+
+
+def create_box_mesh(size=(1.0, 1.0, 1.0)):
+    vertices = np.array([(x, y, z) for x in (-0.5, 0.5) for y in (-0.5, 0.5) for z in (-0.5, 0.5)]) * size
+    quads = ((0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3))
+    faces = np.array([tri for q in quads for tri in ((q[0], q[1], q[2]), (q[0], q[2], q[3]))])
+    return vertices, faces
+
+
+def create_random_closed_mesh(seed, segments=16, rings=8):
+    """UV sphere with random radius per vertex."""
+    rng = np.random.default_rng(seed)
+    vertices = [(0.0, 0.0, 1.0)]
+    for ring in range(1, rings):
+        phi = np.pi * ring / rings
+        for segment in range(segments):
+            theta = 2.0 * np.pi * segment / segments
+            vertices.append((np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta), np.cos(phi)))
+    vertices.append((0.0, 0.0, -1.0))
+    vertices = np.array(vertices) * rng.uniform(0.5, 1.5, (len(vertices), 1)) + rng.uniform(-1.0, 1.0, 3)
+
+    def _ring_vertex(ring, segment):
+        return 1 + (ring - 1) * segments + segment % segments
+
+    faces = []
+    for segment in range(segments):
+        faces.append((0, _ring_vertex(1, segment), _ring_vertex(1, segment + 1)))
+        for ring in range(1, rings - 1):
+            a, b = _ring_vertex(ring, segment), _ring_vertex(ring, segment + 1)
+            c, d = _ring_vertex(ring + 1, segment), _ring_vertex(ring + 1, segment + 1)
+            faces.append((a, c, d))
+            faces.append((a, d, b))
+        faces.append((len(vertices) - 1, _ring_vertex(rings - 1, segment + 1), _ring_vertex(rings - 1, segment)))
+    return vertices, np.array(faces)
+
+
+def get_inertia_of_mesh_reference(mesh_vertices, mesh_faces, cg):
+    """Previous per-triangle implementation, to compare against."""
+    triangles = mesh_vertices[mesh_faces]
+    tri_tetrahedron_volumes = (triangles[:, 0] * np.cross(triangles[:, 1], triangles[:, 2], axis=1)).sum(axis=1) / 6
+    volume = abs(tri_tetrahedron_volumes.sum())
+
+    ixx = iyy = izz = 0.0
+    for tri_idx, (v0, v1, v2) in enumerate(triangles):
+        a = Vector(v0) - cg
+        b = Vector(v1) - cg
+        c = Vector(v2) - cg
+
+        i = [0.0, 0.0, 0.0]
+        vol_neg = -tri_tetrahedron_volumes[tri_idx]
+        for j in range(3):
+            i[j] = vol_neg * (
+                0.1 * (a[j] * a[j] + b[j] * b[j] + c[j] * c[j]) +
+                0.05 * (a[j] * b[j] + a[j] * b[j] + a[j] * c[j] + a[j] * c[j] + b[j] * c[j] + b[j] * c[j])
+            )
+
+        ixx += -i[1] - i[2]
+        iyy += -i[2] - i[0]
+        izz += -i[0] - i[1]
+
+    return np.array((ixx, iyy, izz)) / volume
+
+
+@pytest.mark.parametrize("mesh", (
+    create_box_mesh(),
+    create_box_mesh((1.0, 2.0, 3.0)),
+    *(create_random_closed_mesh(seed) for seed in range(4)),
+))
+def test_geometry_mass_properties_of_mesh_inertia_matches_reference(mesh):
+    vertices, faces = mesh
+
+    volume, cg, inertia = get_mass_properties_of_mesh(vertices, faces)
+
+    expected_inertia = get_inertia_of_mesh_reference(vertices, faces, cg)
+    assert_allclose(np.array(inertia), expected_inertia, rtol=1e-9, atol=1e-12)
+
+
+def test_geometry_mass_properties_of_box():
+    vertices, faces = create_box_mesh((1.0, 2.0, 3.0))
+
+    volume, cg, inertia = get_mass_properties_of_mesh(vertices, faces)
+
+    assert volume == pytest.approx(6.0)
+    assert_allclose(np.array(cg), (0.0, 0.0, 0.0), atol=1e-12)
+    assert_allclose(np.array(inertia), np.array((4.0 + 9.0, 1.0 + 9.0, 1.0 + 4.0)) / 12)
+
+
+def test_geometry_inertia_tensor_of_rotated_box():
+    vertices, faces = create_box_mesh((1.0, 2.0, 3.0))
+    rotation = np.array(Matrix.Rotation(0.5, 3, Vector((1.0, 2.0, 3.0)).normalized()))
+    vertices = vertices @ rotation.T
+
+    triangles = vertices[faces]
+    tri_tetrahedron_volumes = (triangles[:, 0] * np.cross(triangles[:, 1], triangles[:, 2], axis=1)).sum(axis=1) / 6
+    inertia_tensor = get_inertia_tensor_of_mesh(triangles, tri_tetrahedron_volumes, abs(tri_tetrahedron_volumes.sum()))
+
+    expected_principal_moments = np.array((4.0 + 9.0, 1.0 + 9.0, 1.0 + 4.0)) / 12
+    assert_allclose(inertia_tensor, rotation @ np.diag(expected_principal_moments) @ rotation.T, atol=1e-12)
+    assert_allclose(np.linalg.eigvalsh(inertia_tensor), np.sort(expected_principal_moments))
@@ -0,0 +1,79 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from types import SimpleNamespace
+from ..sollumz_properties import SollumType, LightType
+from ..ydr.gizmos.lights import SOLLUMZ_GGT_lights
+
+
+class _FakeGizmos:
+    def __init__(self):
+        self.items = []
+
+    def new(self, idname: str):
+        gz = SimpleNamespace(idname=idname, target_set_operator=lambda idname: SimpleNamespace(object_name=""))
+        self.items.append(gz)
+        return gz
+
+    def remove(self, gz):
+        self.items.remove(gz)
+
+
+class _FakeLightsGizmoGroup:
+    """Runs the ``SOLLUMZ_GGT_lights`` gizmo logic without a 3D viewport, where gizmo groups cannot be created."""
+
+    draw_prepare = SOLLUMZ_GGT_lights.draw_prepare
+    new_light_gizmo = SOLLUMZ_GGT_lights.new_light_gizmo
+    update_light_gizmo = SOLLUMZ_GGT_lights.update_light_gizmo
+    get_culling_plane_matrix = staticmethod(SOLLUMZ_GGT_lights.get_culling_plane_matrix)
+
+    def __init__(self):
+        self.gizmos = _FakeGizmos()
+        self.active_light_obj = None
+        self.capsule_gizmos = {}
+        self.culling_plane_gizmos = {}
+        self.capsule_manipulator = SimpleNamespace(draw_prepare=lambda context, active_light_obj: None)
+        self.culling_plane_manipulator = SimpleNamespace(draw_prepare=lambda context, active_light_obj: None)
+
+
+@pytest.fixture()
+def animated_capsule_light_obj(context):
+    light = bpy.data.lights.new("test_light_gizmos", "SPOT")
+    light.sollum_type = LightType.CAPSULE
+    obj = bpy.data.objects.new("test_light_gizmos", light)
+    obj.sollum_type = SollumType.LIGHT
+    context.collection.objects.link(obj)
+    for frame, location in ((1, (0.0, 0.0, 0.0)), (10, (5.0, 2.0, 1.0))):
+        obj.location = location
+        obj.keyframe_insert("location", frame=frame)
+    # Inactive lights are the ones whose gizmos are only updated when the light changes
+    context.view_layer.objects.active = None
+    obj_name = obj.name
+    frame_current = context.scene.frame_current
+
+    yield obj
+
+    context.scene.frame_set(frame_current)
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj:
+        action = obj.animation_data.action if obj.animation_data else None
+        light = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.lights.remove(light)
+        if action:
+            bpy.data.actions.remove(action)
+
+
+def test_light_gizmos_follow_animation(context, animated_capsule_light_obj):
+    group = _FakeLightsGizmoGroup()
+
+    context.scene.frame_set(1)
+    group.draw_prepare(context)
+    gz, _, _ = group.capsule_gizmos[animated_capsule_light_obj.session_uid]
+    assert_allclose(np.array(gz.matrix_basis), np.array(animated_capsule_light_obj.matrix_world), atol=1e-5)
+
+    context.scene.frame_set(10)
+    group.draw_prepare(context)
+    assert group.capsule_gizmos[animated_capsule_light_obj.session_uid][0] is gz
+    assert_allclose(gz.matrix_basis.translation, (5.0, 2.0, 1.0), atol=1e-5)
@@ -0,0 +1,157 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from mathutils import Euler, Vector
+from szio.gta5 import Light, LightType, LightFlashiness
+from ..ydr.lights_io import create_light_objs, export_lights
+
+
+def _create_light(light_type: LightType, position, direction, tangent, intensity: float, bone_id: int = 0) -> Light:
+    return Light(
+        light_type=light_type,
+        position=Vector(position),
+        direction=Vector(direction),
+        tangent=Vector(tangent),
+        extent=Vector((1.0, 1.0, 1.0)),
+        color=(255, 128, 0),
+        flashiness=LightFlashiness.CONSTANT,
+        intensity=intensity,
+        flags=0,
+        time_flags=16777215,
+        bone_id=bone_id,
+        group_id=0,
+        light_hash=0,
+        falloff=5.0,
+        falloff_exponent=8.0,
+        culling_plane_normal=Vector((0.0, 0.0, 1.0)),
+        culling_plane_offset=0.5,
+        volume_intensity=1.0,
+        volume_size_scale=1.0,
+        volume_outer_color=(255, 255, 255),
+        volume_outer_intensity=1.0,
+        volume_outer_exponent=1.0,
+        corona_size=0.0,
+        corona_intensity=0.0,
+        corona_z_bias=0.0,
+        projected_texture_hash="",
+        light_fade_distance=0,
+        shadow_fade_distance=0,
+        specular_fade_distance=0,
+        volumetric_fade_distance=0,
+        shadow_near_clip=0.01,
+        shadow_blur=0,
+        cone_inner_angle=10.0 if light_type == LightType.SPOT else 0.0,
+        cone_outer_angle=45.0 if light_type == LightType.SPOT else 0.0,
+    )
+
+
+@pytest.fixture()
+def light_objs_factory(context):
+    lights_parent_names = []
+
+    def _create_light_objs(lights, armature_obj=None):
+        lights_parent = create_light_objs(lights, armature_obj, name="test_lights_io")
+        lights_parent_names.append(lights_parent.name)
+        return lights_parent
+
+    yield _create_light_objs
+
+    for lights_parent_name in lights_parent_names:
+        lights_parent = bpy.data.objects.get(lights_parent_name, None)
+        if lights_parent:
+            light_objs = list(lights_parent.children)
+            light_datas = {light_obj.data for light_obj in light_objs}
+            for light_obj in light_objs:
+                bpy.data.objects.remove(light_obj)
+            for light_data in light_datas:
+                bpy.data.lights.remove(light_data)
+            bpy.data.objects.remove(lights_parent)
+
+
+@pytest.fixture()
+def armature_obj(context):
+    armature = bpy.data.armatures.new("test_lights_io.skel")
+    obj = bpy.data.objects.new("test_lights_io.skel", armature)
+    context.collection.objects.link(obj)
+    context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode="EDIT")
+    root = armature.edit_bones.new("root")
+    root.tail = (0.0, 0.2, 0.0)
+    bone = armature.edit_bones.new("light_bone")
+    bone.head = (1.0, 2.0, 0.5)
+    bone.tail = (1.0, 2.0, 1.0)
+    bone.parent = root
+    bpy.ops.object.mode_set(mode="OBJECT")
+    armature.bones["root"].bone_properties.tag = 0
+    armature.bones["light_bone"].bone_properties.tag = 1234
+    # Away from the origin, lights attached to bones are exported relative to the bone in the armature space
+    obj.location = (10.0, -5.0, 3.0)
+    obj.rotation_euler = Euler((0.0, 0.0, 0.8))
+    obj_name = obj.name
+
+    yield obj
+
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj:
+        armature = obj.data
+        bpy.data.objects.remove(obj)
+        bpy.data.armatures.remove(armature)
+
+
+def _create_random_lights(num_lights: int, bone_ids: tuple[int, ...] = (0,)) -> list[Light]:
+    rng = np.random.default_rng(0)
+    lights = []
+    for i in range(num_lights):
+        direction = Vector(rng.normal(size=3)).normalized()
+        tangent = direction.orthogonal().normalized()
+        light_type = LightType.SPOT if i % 2 == 0 else LightType.POINT
+        intensity = 10.0 if i < num_lights // 2 else 20.0
+        bone_id = bone_ids[i % len(bone_ids)]
+        lights.append(_create_light(light_type, rng.uniform(-5.0, 5.0, 3), direction, tangent, intensity, bone_id))
+    return lights
+
+
+def _assert_lights_equal(lights: list[Light], exported_lights: list[Light]):
+    assert len(exported_lights) == len(lights)
+    # The order of the objects in the hierarchy is not guaranteed, match them by position
+    lights = sorted(lights, key=lambda light: light.position.x)
+    exported_lights = sorted(exported_lights, key=lambda light: light.position.x)
+    for light, exported_light in zip(lights, exported_lights):
+        assert exported_light.light_type == light.light_type
+        assert exported_light.intensity == light.intensity
+        assert exported_light.color == light.color
+        assert exported_light.bone_id == light.bone_id
+        assert_allclose(exported_light.position, light.position, atol=1e-4)
+        assert_allclose(exported_light.direction, light.direction, atol=1e-5)
+        assert_allclose(exported_light.tangent, light.tangent, atol=1e-5)
+        assert_allclose(exported_light.cone_outer_angle, light.cone_outer_angle, atol=1e-4)
+
+
+def test_lights_io_share_light_data(light_objs_factory):
+    lights = _create_random_lights(16)
+
+    lights_parent = light_objs_factory(lights)
+
+    light_objs = list(lights_parent.children)
+    assert len(light_objs) == len(lights)
+    # Two light types and two intensities
+    assert len({light_obj.data for light_obj in light_objs}) == 4
+
+    _assert_lights_equal(lights, export_lights(lights_parent))
+
+
+def test_lights_io_bone_constraint(context, light_objs_factory, armature_obj):
+    lights = _create_random_lights(8, bone_ids=(0, 1234))
+
+    lights_parent = light_objs_factory(lights, armature_obj)
+    lights_parent.parent = armature_obj
+    context.view_layer.update()
+
+    bone_light_objs = [
+        light_obj for light_obj in lights_parent.children
+        if light_obj.constraints and light_obj.constraints[0].subtarget == "light_bone"
+    ]
+    assert len(bone_light_objs) == 4
+
+    _assert_lights_equal(lights, export_lights(armature_obj))
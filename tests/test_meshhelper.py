@@ -0,0 +1,61 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from mathutils import Matrix, Vector
+from ..tools.meshhelper import get_combined_bound_box, get_combined_bound_box_tight
+
+
+@pytest.fixture()
+def parent_and_child_mesh_objs(context):
+    rng = np.random.default_rng(0)
+    objs = []
+    for name in ("test_combined_bound_box_parent", "test_combined_bound_box_child"):
+        mesh = bpy.data.meshes.new(name)
+        mesh.from_pydata(rng.uniform(-1.0, 1.0, (16, 3)), [], [])
+        obj = bpy.data.objects.new(name, mesh)
+        context.collection.objects.link(obj)
+        objs.append(obj)
+    parent_obj, child_obj = objs
+    child_obj.parent = parent_obj
+    child_obj.matrix_basis = Matrix.LocRotScale(Vector((2.0, 0.0, 1.0)), Vector((0.3, 0.2, 0.1)).to_track_quat(),
+                                                Vector((1.0, 2.0, 3.0)))
+    objs_names = [o.name for o in objs]
+
+    yield parent_obj, child_obj
+
+    for obj_name in objs_names:
+        obj = bpy.data.objects.get(obj_name, None)
+        if obj:
+            mesh = obj.data
+            bpy.data.objects.remove(obj)
+            bpy.data.meshes.remove(mesh)
+
+
+def _get_expected_bounds(points) -> tuple[Vector, Vector]:
+    points = np.array([tuple(p) for p in points])
+    return Vector(points.min(axis=0)), Vector(points.max(axis=0))
+
+
+def test_combined_bound_box(parent_and_child_mesh_objs):
+    parent_obj, child_obj = parent_and_child_mesh_objs
+    matrix = Matrix.Rotation(0.5, 4, "Z")
+
+    bbmin, bbmax = get_combined_bound_box_tight(parent_obj, matrix=matrix)
+
+    expected_bbmin, expected_bbmax = _get_expected_bounds(
+        [matrix @ v.co for v in parent_obj.data.vertices] +
+        [matrix @ child_obj.matrix_basis @ v.co for v in child_obj.data.vertices]
+    )
+    assert_allclose(bbmin, expected_bbmin, atol=1e-5)
+    assert_allclose(bbmax, expected_bbmax, atol=1e-5)
+
+    bbmin, bbmax = get_combined_bound_box(parent_obj, matrix=matrix)
+
+    expected_bbmin, expected_bbmax = _get_expected_bounds(
+        [matrix @ Vector(c) for c in parent_obj.bound_box] +
+        [matrix @ child_obj.matrix_basis @ Vector(c) for c in child_obj.bound_box]
+    )
+    assert_allclose(bbmin, expected_bbmin, atol=1e-5)
+    assert_allclose(bbmax, expected_bbmax, atol=1e-5)
+
@@ -0,0 +1,46 @@
+import pytest
+from ..sollumz_properties import ArchetypeType
+from ..ytyp.gizmos.mlo import MloGizmoGeometryCache
+
+
+@pytest.fixture()
+def mlo_archetype(context):
+    ytyp = context.scene.ytyps.add()
+    ytyp.name = "test_mlo_gizmos"
+    archetype = ytyp.new_archetype(ArchetypeType.MLO)
+    for _ in range(3):
+        archetype.new_room()
+
+    yield archetype
+
+    ytyps = context.scene.ytyps
+    index = next((i for i, ytyp in enumerate(ytyps) if ytyp.name == "test_mlo_gizmos"), None)
+    if index is not None:
+        ytyps.remove(index)
+
+
+def test_mlo_gizmo_geometry_cache_rebuilds_modified_items(mlo_archetype):
+    built = []
+
+    def _build_room(room):
+        built.append(room.name)
+        return tuple(room.bb_max)
+
+    cache = MloGizmoGeometryCache("rooms", _build_room)
+    rooms = mlo_archetype.rooms
+
+    assert cache.get(mlo_archetype) == [(0.0, 0.0, 0.0)] * 3
+    assert cache.get(mlo_archetype) == [(0.0, 0.0, 0.0)] * 3
+    assert built == [room.name for room in rooms]
+
+    # Only the modified room is rebuilt
+    built.clear()
+    rooms[1].bb_max = (1.0, 2.0, 3.0)
+    assert cache.get(mlo_archetype) == [(0.0, 0.0, 0.0), (1.0, 2.0, 3.0), (0.0, 0.0, 0.0)]
+    assert built == [rooms[1].name]
+
+    # Adding a room rebuilds all of them
+    built.clear()
+    mlo_archetype.new_room()
+    assert len(cache.get(mlo_archetype)) == 4
+    assert built == [room.name for room in rooms]
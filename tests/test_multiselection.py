@@ -1,6 +1,8 @@
 import bpy
 import pytest
+import numpy as np
 from bpy.props import (
+    IntProperty,
     PointerProperty,
     StringProperty,
 )
@@ -22,10 +24,12 @@ from ..shared.multiselection import (
 
 class SzTestItem(PropertyGroup):
     name: StringProperty(name="Name")
+    value: IntProperty(name="Value")
 
 
 class SzTestItemSelectionAccess(MultiSelectAccess):
     name: MultiSelectProperty()
+    value: MultiSelectProperty()
 
 
 @define_multiselect_collection("coll", {"name": "Test Collection"})
@@ -103,3 +107,47 @@ def test_multiselection_ops_invert_with_filter(test_collection):
 
     bpy.ops.sollumz_test.multiselect_test_data_invert(apply_filter=True, filter_name="ItemA")
     assert_equal(list(coll.iter_selected_items_indices()), [0])
+
+
+def test_multiselection_selected_indices_array(test_collection):
+    coll = test_collection
+    for i in range(4):
+        coll.add().name = f"Item{i}"
+    coll.select_many([2, 0])
+
+    assert_equal(coll.selected_indices_array, [2, 0])
+    assert coll.is_selected(0)
+    assert not coll.is_selected(1)
+
+    coll.select(3)
+    assert_equal(coll.selected_indices_array, [3])
+
+
+def test_multiselection_selected_indices_array_external_change(test_collection):
+    coll = test_collection
+    for i in range(4):
+        coll.add().name = f"Item{i}"
+    coll.select_many([2, 0])
+    assert_equal(np.sort(coll.selected_indices_array), [0, 2])
+
+    # Modify the selection without going through the collection, keeping the same length and active index
+    for item in coll.selection_indices:
+        if item.index != coll.active_index:
+            item.index = 3
+
+    assert_equal(np.sort(coll.selected_indices_array), np.sort([coll.active_index, 3]))
+    assert coll.is_selected(3)
+
+
+def test_multiselection_bulk_set(test_collection):
+    coll = test_collection
+    for i in range(4):
+        coll.add().name = f"Item{i}"
+    coll.select_many([1, 3])
+
+    coll.selection.value = 5
+    assert_equal([item.value for item in coll.collection], [0, 5, 0, 5])
+    assert_equal(coll.foreach_get_selected("value", np.int32), [5, 5])
+
+    coll.selection.name = "Renamed"
+    assert_equal([item.name for item in coll.collection], ["Item0", "Renamed", "Item2", "Renamed"])
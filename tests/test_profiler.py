@@ -0,0 +1,56 @@
+import json
+from .. import profiler
+
+
+def test_profiler_scope_is_noop_without_session():
+    assert not profiler.is_active()
+    with profiler.scope("a"):
+        profiler.count("n", 5)
+    assert not profiler.is_active()
+
+
+def test_profiler_session_summary():
+    with profiler.profile_session("test") as session:
+        assert profiler.is_active()
+        with profiler.scope("outer"):
+            for _ in range(3):
+                with profiler.scope("inner"):
+                    profiler.count("n", 2)
+
+    assert not profiler.is_active()
+    assert profiler.last_session() is session
+    assert session.counters == {"n": 6}
+
+    summary = {s.name: s for s in session.summary()}
+    assert summary["outer"].calls == 1
+    assert summary["inner"].calls == 3
+    assert summary["outer"].total_ns >= summary["inner"].total_ns
+    assert summary["outer"].self_ns == summary["outer"].total_ns - summary["inner"].total_ns
+
+
+def test_profiler_profiled_decorator():
+    @profiler.profiled("decorated")
+    def _func(a, b):
+        return a + b
+
+    assert _func(1, 2) == 3
+    with profiler.profile_session("test") as session:
+        assert _func(3, 4) == 7
+
+    assert [e.name for e in session.events] == ["decorated"]
+
+
+def test_profiler_write_chrome_trace(tmp_path):
+    with profiler.profile_session("test", trace_directory=tmp_path) as session:
+        with profiler.scope("a"):
+            profiler.count("n")
+
+    trace_files = list(tmp_path.glob("*.json"))
+    assert len(trace_files) == 1
+
+    with open(trace_files[0]) as f:
+        trace = json.load(f)
+
+    events = trace["traceEvents"]
+    assert [(e["name"], e["ph"]) for e in events] == [("a", "X"), ("n", "C")]
+    assert events[0]["dur"] == session.events[0].duration_ns / 1000
@@ -0,0 +1,78 @@
+import bpy
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from mathutils import Matrix, Quaternion, Vector
+from ..ydr.skeleton_builder import SkeletonBuilder
+from ..asset_cache import asset_cache_session
+
+
+def _create_random_skeleton(num_bones: int, seed: int = 0) -> SkeletonBuilder:
+    rng = np.random.default_rng(seed)
+    builder = SkeletonBuilder()
+    for i in range(num_bones):
+        rotation = Quaternion(rng.normal(size=4)).normalized()
+        position = Vector(rng.uniform(-1.0, 1.0, 3))
+        parent_index = int(rng.integers(0, i)) if i > 0 else -1
+        builder.add_bone(f"bone{i}", 1000 + i, parent_index, position, rotation, ("RotX", "TransY"))
+    return builder
+
+
+@pytest.fixture()
+def armature_objs(context):
+    objs = []
+    for name in ("test_skeleton_builder_a", "test_skeleton_builder_b"):
+        armature_obj = bpy.data.objects.new(name, bpy.data.armatures.new(f"{name}.skel"))
+        context.collection.objects.link(armature_obj)
+        objs.append(armature_obj)
+    objs_names = [o.name for o in objs]
+
+    yield objs
+
+    for obj_name in objs_names:
+        armature_obj = bpy.data.objects.get(obj_name, None)
+        if armature_obj:
+            # The builder may have replaced the armature created here, delete whichever it has now
+            armature = armature_obj.data
+            bpy.data.objects.remove(armature_obj)
+            bpy.data.armatures.remove(armature)
+
+
+def test_skeleton_builder_matches_edit_bone_matrices(armature_objs):
+    builder = _create_random_skeleton(32)
+    armature_obj = armature_objs[0]
+
+    bones_by_name = builder.build(armature_obj)
+
+    expected_matrices = []
+    for position, rotation, parent_index in zip(builder.positions, builder.rotations, builder.parent_indices):
+        matrix = Matrix.Translation(position) @ Quaternion(rotation).to_matrix().to_4x4()
+        if parent_index != -1:
+            matrix = expected_matrices[parent_index] @ matrix
+        expected_matrices.append(matrix)
+
+    assert len(armature_obj.data.bones) == builder.num_bones
+    for name, tag, parent_index, expected in zip(
+        builder.names, builder.tags, builder.parent_indices, expected_matrices
+    ):
+        bone = bones_by_name[name]
+        assert bone.bone_properties.tag == tag
+        assert [f.name for f in bone.bone_properties.flags] == ["RotX", "TransY"]
+        if parent_index != -1:
+            assert bone.parent.name == builder.names[parent_index]
+        assert_allclose(np.array(bone.matrix_local), np.array(expected), atol=1e-4)
+
+
+def test_skeleton_builder_reuses_identical_skeletons(armature_objs):
+    armature_obj_a, armature_obj_b = armature_objs
+    with asset_cache_session():
+        _create_random_skeleton(8).build(armature_obj_a)
+        bones_by_name = _create_random_skeleton(8).build(armature_obj_b)
+
+    assert armature_obj_a.data != armature_obj_b.data
+    assert armature_obj_b.data.name == "test_skeleton_builder_b.skel"
+    assert len(armature_obj_b.data.bones) == 8
+    assert bones_by_name["bone3"].bone_properties.tag == 1003
+    for bone_a, bone_b in zip(armature_obj_a.data.bones, armature_obj_b.data.bones):
+        assert bone_a.name == bone_b.name
+        assert_allclose(np.array(bone_a.matrix_local), np.array(bone_b.matrix_local))
@@ -0,0 +1,45 @@
+import bpy
+import pytest
+import numpy as np
+from ..ydr.skeleton_builder import SkeletonBuilder
+from ..ydr.skeleton_tables import SkeletonTables
+
+
+def test_skeleton_tables_match_bone_hierarchy():
+    rng = np.random.default_rng(0)
+    builder = SkeletonBuilder()
+    for i in range(64):
+        parent_index = int(rng.integers(0, i)) if i > 0 else -1
+        builder.add_bone(f"bone{i}", i, parent_index, rng.uniform(-1.0, 1.0, 3), (1.0, 0.0, 0.0, 0.0), ())
+
+    armature_obj = bpy.data.objects.new("test_skeleton_tables", bpy.data.armatures.new("test_skeleton_tables.skel"))
+    bpy.context.collection.objects.link(armature_obj)
+    builder.build(armature_obj)
+    armature = armature_obj.data
+
+    tables = SkeletonTables(armature)
+
+    bones = armature.bones
+    assert tables.num_bones == len(bones)
+    for bone_index, bone in enumerate(bones):
+        assert tables.get_bone_index(bone.name) == bone_index
+
+        expected_parent_index = bones.find(bone.parent.name) if bone.parent else -1
+        assert tables.parent_indices[bone_index] == expected_parent_index
+
+        expected_first_child_index = bones.find(bone.children[0].name) if bone.children else -1
+        assert tables.first_child_indices[bone_index] == expected_first_child_index
+        assert tables.has_children(bone_index) == bool(bone.children)
+
+        siblings = list(bone.parent.children) if bone.parent else [bone]
+        sibling_position = siblings.index(bone)
+        expected_sibling_index = (
+            bones.find(siblings[sibling_position + 1].name) if sibling_position + 1 < len(siblings) else -1
+        )
+        assert tables.next_sibling_indices[bone_index] == expected_sibling_index
+
+    with pytest.raises(KeyError):
+        tables.get_bone_index("missing_bone")
+
+    bpy.data.objects.remove(armature_obj)
+    bpy.data.armatures.remove(armature)
@@ -0,0 +1,55 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ydr.vertex_buffer_join import join_vert_arrs, join_ind_arrs
+from szio.gta5 import STANDARD_VERTEX_ATTR_DTYPES
+
+
+def _vert_arr(num_verts: int, attr_names: list[str], value: int):
+    vert_arr = np.empty(num_verts, dtype=[STANDARD_VERTEX_ATTR_DTYPES[name] for name in attr_names])
+    for name in attr_names:
+        vert_arr[name] = value
+    return vert_arr
+
+
+def test_join_vert_arrs_same_layout():
+    a = _vert_arr(2, ["Position", "Normal"], 1)
+    b = _vert_arr(3, ["Position", "Normal"], 2)
+
+    joined = join_vert_arrs([a, b])
+
+    assert joined.dtype.names == ("Position", "Normal")
+    assert_array_equal(joined[:2], a)
+    assert_array_equal(joined[2:], b)
+
+
+def test_join_vert_arrs_different_layouts():
+    a = _vert_arr(2, ["Position", "Normal"], 1)
+    b = _vert_arr(3, ["Position"], 2)
+    c = _vert_arr(4, ["Position", "Normal", "Colour0"], 3)
+
+    joined = join_vert_arrs([a, b, c])
+
+    assert joined.dtype.names == ("Position", "Normal", "Colour0")
+    assert len(joined) == 9
+    assert_array_equal(joined["Position"][:2], a["Position"])
+    assert_array_equal(joined["Position"][2:5], b["Position"])
+    assert_array_equal(joined["Position"][5:], c["Position"])
+    assert_array_equal(joined["Normal"][:2], a["Normal"])
+    assert_array_equal(joined["Normal"][2:5], 0)  # missing attributes are zero-filled
+    assert_array_equal(joined["Normal"][5:], c["Normal"])
+    assert_array_equal(joined["Colour0"][:5], 0)
+    assert_array_equal(joined["Colour0"][5:], c["Colour0"])
+
+
+def test_join_ind_arrs():
+    ind_arrs = [
+        np.array([0, 1, 2], dtype=np.uint32),
+        np.array([0, 2, 1, 1, 2, 3], dtype=np.uint32),
+        np.array([1, 0, 2], dtype=np.uint32),
+    ]
+    vert_counts = [3, 4, 3]
+
+    joined = join_ind_arrs(ind_arrs, vert_counts)
+
+    assert joined.dtype == np.uint32
+    assert_array_equal(joined, [0, 1, 2, 3, 5, 4, 4, 5, 6, 8, 7, 9])
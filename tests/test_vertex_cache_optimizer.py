@@ -0,0 +1,63 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from szio.gta5 import STANDARD_VERTEX_ATTR_DTYPES
+from ..ydr.vertex_cache_optimizer import get_vertex_cache_stats, optimize_vertex_cache, optimize_vertex_fetch
+
+
+def _create_shuffled_grid(size: int, seed: int = 0) -> tuple[np.ndarray, int]:
+    grid = np.arange((size + 1) ** 2).reshape((size + 1, size + 1))
+    a, b = grid[:-1, :-1].ravel(), grid[:-1, 1:].ravel()
+    c, d = grid[1:, :-1].ravel(), grid[1:, 1:].ravel()
+    triangles = np.concatenate((np.stack((a, b, c), axis=1), np.stack((b, d, c), axis=1)))
+    triangles = triangles[np.random.default_rng(seed).permutation(len(triangles))]
+    return triangles.ravel().astype(np.uint32), (size + 1) ** 2
+
+
+def _get_triangles_set(indices: np.ndarray) -> set[tuple[int, int, int]]:
+    """Gets the triangles rotated so the smallest index is first, keeping their winding."""
+    triangles = indices.reshape((-1, 3))
+    first = np.argmin(triangles, axis=1)
+    return {tuple(int(v) for v in np.roll(tri, -k)) for tri, k in zip(triangles, first)}
+
+
+def test_optimize_vertex_cache_preserves_triangles():
+    indices, num_vertices = _create_shuffled_grid(32)
+
+    new_indices = optimize_vertex_cache(indices, num_vertices)
+
+    assert new_indices.dtype == indices.dtype
+    assert len(new_indices) == len(indices)
+    assert _get_triangles_set(new_indices) == _get_triangles_set(indices)
+
+
+def test_optimize_vertex_cache_reduces_cache_misses():
+    indices, num_vertices = _create_shuffled_grid(32)
+    acmr_before, atvr_before = get_vertex_cache_stats(indices, num_vertices)
+
+    new_indices = optimize_vertex_cache(indices, num_vertices)
+
+    acmr_after, atvr_after = get_vertex_cache_stats(new_indices, num_vertices)
+    assert acmr_after < acmr_before
+    assert atvr_after < atvr_before
+    assert acmr_after < 1.0
+
+
+def test_optimize_vertex_cache_empty():
+    indices = np.empty(0, dtype=np.uint32)
+    assert len(optimize_vertex_cache(indices, 0)) == 0
+    assert get_vertex_cache_stats(indices, 0) == (0.0, 0.0)
+
+
+def test_optimize_vertex_fetch():
+    indices, num_vertices = _create_shuffled_grid(8)
+    indices = optimize_vertex_cache(indices, num_vertices)
+    vertex_arr = np.empty(num_vertices + 1, dtype=[STANDARD_VERTEX_ATTR_DTYPES["Position"]])
+    vertex_arr["Position"] = np.random.default_rng(0).uniform(-1.0, 1.0, (num_vertices + 1, 3))
+
+    new_vertex_arr, new_indices = optimize_vertex_fetch(vertex_arr, indices)
+
+    assert_array_equal(new_vertex_arr[new_indices], vertex_arr[indices])
+    # Vertices in first-use order, unused vertex at the end
+    _, first_use = np.unique(new_indices, return_index=True)
+    assert_array_equal(np.argsort(first_use), np.arange(num_vertices))
+    assert_array_equal(new_vertex_arr[-1], vertex_arr[-1])
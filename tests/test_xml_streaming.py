@@ -0,0 +1,40 @@
+import pytest
+import numpy as np
+from numpy.testing import assert_array_equal
+from xml.etree import ElementTree as ET
+from pathlib import Path
+from szio.gta5.cwxml import Drawable, ClipDictionary, CMapData, Navmesh
+from .shared import glob_assets
+from ..shared.xml_streaming import stream_xml_file
+
+
+def _to_xml_str(obj) -> bytes:
+    return ET.tostring(obj.to_xml())
+
+
+@pytest.mark.parametrize("root_cls, path, path_str", (
+    *((Drawable, *asset) for asset in glob_assets("ydr")),
+    *((ClipDictionary, *asset) for asset in glob_assets("ycd")),
+    *((CMapData, *asset) for asset in glob_assets("ymap")),
+    *((Navmesh, *asset) for asset in glob_assets("ynv")),
+))
+def test_stream_xml_file(root_cls: type, path: Path, path_str: str):
+    expected = root_cls.from_xml_file(path)
+    actual = stream_xml_file(root_cls, path)
+    assert _to_xml_str(actual) == _to_xml_str(expected)
+
+
+@pytest.mark.parametrize("path, path_str", glob_assets("ydr"))
+def test_stream_xml_file_parses_geometry_buffers(path: Path, path_str: str):
+    expected = Drawable.from_xml_file(path)
+    actual = stream_xml_file(Drawable, path)
+
+    expected_geoms = [g for m in expected.drawable_models_high for g in m.geometries]
+    actual_geoms = [g for m in actual.drawable_models_high for g in m.geometries]
+    assert len(actual_geoms) == len(expected_geoms)
+    for actual_geom, expected_geom in zip(actual_geoms, expected_geoms):
+        assert isinstance(actual_geom.vertex_buffer.data, np.ndarray)
+        assert isinstance(actual_geom.index_buffer.data, np.ndarray)
+        assert actual_geom.vertex_buffer.data.dtype == expected_geom.vertex_buffer.data.dtype
+        assert_array_equal(actual_geom.vertex_buffer.data, expected_geom.vertex_buffer.data)
+        assert_array_equal(actual_geom.index_buffer.data, expected_geom.index_buffer.data)
@@ -0,0 +1,132 @@
+import pytest
+import bpy
+from mathutils import Vector, Quaternion, Matrix
+from szio.gta5.cwxml import CMapData, Entity
+from ..sollumz_properties import SollumType
+from ..sollumz_preferences import get_import_settings
+from ..tools.blenderhelper import create_blender_object, create_empty_object, delete_hierarchy
+from ..ymap.ymapimport import instanced_entity_to_obj
+
+ENTITIES_TRANSFORMS = (
+    (Vector((10.0, 0.0, 0.0)), Quaternion((1.0, 0.0, 0.0, 0.0)), 1.0, 1.0),
+    (Vector((0.0, 20.0, 5.0)), Quaternion((0.0, 0.0, 1.0), 1.2), 2.0, 0.5),
+    (Vector((-5.0, -5.0, 0.0)), Quaternion((1.0, 1.0, 0.0), -0.7), 1.0, 3.0),
+)
+
+
+@pytest.fixture(params=["OBJECT", "COLLECTION"])
+def ymap_instance_mode(request):
+    import_settings = get_import_settings()
+    prev_instance_entities = import_settings.ymap_instance_entities
+    prev_instance_mode = import_settings.ymap_instance_mode
+    import_settings.ymap_instance_entities = True
+    import_settings.ymap_instance_mode = request.param
+
+    yield request.param
+
+    import_settings.ymap_instance_entities = prev_instance_entities
+    import_settings.ymap_instance_mode = prev_instance_mode
+
+
+@pytest.fixture(params=["TRANSLATED", "ROTATED"])
+def archetype_obj(request):
+    obj = create_empty_object(SollumType.DRAWABLE, "test_ymap_archetype")
+    obj.location = (100.0, 50.0, 0.0)
+    if request.param == "ROTATED":
+        obj.rotation_euler = (0.0, 0.0, 0.5)
+    model_obj = create_blender_object(SollumType.DRAWABLE_MODEL, "test_ymap_archetype_model")
+    model_obj.parent = obj
+    model_obj.location = (0.0, 0.0, 1.0)
+    bpy.context.view_layer.update()
+    obj_name = obj.name
+
+    yield obj
+
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj:
+        delete_hierarchy(obj)
+    collection = bpy.data.collections.get(f"{obj_name}.instance", None)
+    if collection:
+        bpy.data.collections.remove(collection)
+
+
+@pytest.fixture()
+def ymap_obj():
+    obj = create_empty_object(SollumType.YMAP, "test_ymap")
+    obj_name = obj.name
+
+    yield obj
+
+    obj = bpy.data.objects.get(obj_name, None)
+    if obj:
+        delete_hierarchy(obj)
+
+
+def _create_ymap(archetype_name: str) -> CMapData:
+    ymap = CMapData()
+    ymap.name = "test_ymap"
+    for position, rotation, scale_xy, scale_z in ENTITIES_TRANSFORMS:
+        entity = Entity()
+        entity.archetype_name = archetype_name
+        entity.position = position.copy()
+        entity.rotation = rotation.copy()
+        entity.scale_xy = scale_xy
+        entity.scale_z = scale_z
+        entity.lod_level = "LODTYPES_DEPTH_HD"
+        entity.priority_level = "PRI_REQUIRED"
+        ymap.entities.append(entity)
+    return ymap
+
+
+def _entity_matrix(position: Vector, rotation: Quaternion, scale_xy: float, scale_z: float) -> Matrix:
+    # Entities in YMAPs have their rotation inverted
+    return Matrix.LocRotScale(position, rotation.inverted(), Vector((scale_xy, scale_xy, scale_z)))
+
+
+def _assert_matrix_equal(a: Matrix, b: Matrix):
+    for row_a, row_b in zip(a, b):
+        assert tuple(row_a) == pytest.approx(tuple(row_b), abs=1e-4)
+
+
+def test_ymap_instanced_entities(ymap_instance_mode, archetype_obj, ymap_obj):
+    archetype_is_rotated = archetype_obj.rotation_euler.z != 0.0
+    model_offset = archetype_obj.matrix_world.inverted() @ archetype_obj.children[0].matrix_world
+    ymap = _create_ymap(archetype_obj.name)
+
+    group_obj = instanced_entity_to_obj(ymap_obj, ymap)
+    bpy.context.view_layer.update()
+
+    assert group_obj
+    entity_objs = sorted(group_obj.children, key=lambda o: tuple(o.matrix_world.translation))
+    expected_matrices = sorted(
+        (_entity_matrix(*transform) for transform in ENTITIES_TRANSFORMS),
+        key=lambda m: tuple(m.translation)
+    )
+    assert len(entity_objs) == len(ENTITIES_TRANSFORMS)
+
+    scene_objs = set(bpy.context.scene.objects)
+    uses_collection_instances = ymap_instance_mode == "COLLECTION" and not archetype_is_rotated
+    for entity_obj, expected_matrix in zip(entity_objs, expected_matrices):
+        assert entity_obj in scene_objs
+        assert entity_obj.sollum_type == SollumType.DRAWABLE
+        _assert_matrix_equal(entity_obj.matrix_world, expected_matrix)
+
+        if uses_collection_instances:
+            assert entity_obj.instance_type == "COLLECTION"
+            collection = entity_obj.instance_collection
+            assert collection is not None
+            # The instanced model is placed relative to the instance the same way it is placed relative to the
+            # archetype
+            model_obj = next(o for o in collection.objects if o.parent == archetype_obj)
+            instanced_model_matrix = (
+                entity_obj.matrix_world @
+                Matrix.Translation(-collection.instance_offset) @
+                model_obj.matrix_world
+            )
+            _assert_matrix_equal(instanced_model_matrix, expected_matrix @ model_offset)
+        else:
+            assert entity_obj.instance_type == "NONE"
+            assert len(entity_obj.children) == 1
+            model_obj = entity_obj.children[0]
+            assert model_obj in scene_objs
+            _assert_matrix_equal(model_obj.matrix_world, expected_matrix @ model_offset)
@@ -0,0 +1,35 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+from ..ymap.ymapexport import occlusion_model_split_triangles, OCCLUDE_MODEL_MAX_VERTS
+
+
+def _grid_triangles(segments: int) -> np.ndarray:
+    """Triangles of a grid with ``segments`` quads per side, two triangles per quad."""
+    row = segments + 1
+    x, y = np.meshgrid(np.arange(segments), np.arange(segments))
+    v0 = (y * row + x).ravel()
+    v1, v2, v3 = v0 + 1, v0 + row + 1, v0 + row
+    return np.stack((np.stack((v0, v1, v2), axis=1), np.stack((v0, v2, v3), axis=1)), axis=1).reshape((-1, 3))
+
+
+def test_occlusion_model_split_triangles_small_mesh():
+    tris = _grid_triangles(4).astype(np.uint32)
+
+    chunks = occlusion_model_split_triangles(tris)
+
+    assert len(chunks) == 1
+    assert_array_equal(chunks[0], tris)
+
+
+def test_occlusion_model_split_triangles_large_mesh():
+    tris = _grid_triangles(32).astype(np.uint32)
+
+    chunks = occlusion_model_split_triangles(tris)
+
+    assert len(chunks) > 1
+    assert all(len(np.unique(chunk)) <= OCCLUDE_MODEL_MAX_VERTS for chunk in chunks)
+    assert_array_equal(np.concatenate(chunks), tris)
+
+
+def test_occlusion_model_split_triangles_empty():
+    assert occlusion_model_split_triangles(np.empty((0, 3), dtype=np.uint32)) == []
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import bpy
 import math
+import numpy as np
+from numpy.typing import NDArray
 from sys import float_info
 from mathutils import Quaternion, Vector, Euler, Matrix
 from enum import IntFlag, IntEnum
@@ -270,30 +272,11 @@ def transform_bone_location_space(fcurves, old_pose_bone, new_pose_bone):
     Converts the vector3 F-curves from the old pose bone's space to the new pose bone's space.
     Either bone can be None, meaning convert from/to the original local space (as stored in the animation channels).
     """
-    x = fcurves[0]
-    y = fcurves[1]
-    z = fcurves[2]
-
-    if x is None:
+    if fcurves[0] is None:
         return
 
-    assert len(x.keyframe_points) == len(y.keyframe_points) and len(x.keyframe_points) == len(z.keyframe_points), "TODO: Handle different number of keyframes for each axis"
-
     transform_mat = calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone)
-
-    for x_kfp, y_kfp, z_kfp in zip(x.keyframe_points, y.keyframe_points, z.keyframe_points):
-        x_co, y_co, z_co = x_kfp.co, y_kfp.co, z_kfp.co
-        assert x_co[0] == y_co[0] and x_co[0] == z_co[0], "TODO: Handle different keyframe times"
-
-        old_vec = Vector((x_co[1], y_co[1], z_co[1]))
-        new_vec = transform_mat @ old_vec
-        x_co[1], y_co[1], z_co[1] = new_vec[0], new_vec[1], new_vec[2]
-
-        x_kfp.co, y_kfp.co, z_kfp.co = x_co, y_co, z_co
-
-    x.update()
-    y.update()
-    z.update()
+    transform_location_fcurves(fcurves, transform_mat)
 
 
 def transform_bone_rotation_quaternion_space(fcurves, old_pose_bone, new_pose_bone):
@@ -301,40 +284,130 @@ def transform_bone_rotation_quaternion_space(fcurves, old_pose_bone, new_pose_bo
     Converts the quaternion F-curves from the old pose bone's space to the new pose bone's space.
     Either bone can be None, meaning convert from/to the original local space (as stored in the animation channels).
     """
-    w = fcurves[0]
-    x = fcurves[1]
-    y = fcurves[2]
-    z = fcurves[3]
-
-    if w is None:
+    if fcurves[0] is None:
         return
 
-    assert len(x.keyframe_points) == len(y.keyframe_points) and len(x.keyframe_points) == len(z.keyframe_points) and len(x.keyframe_points) == len(w.keyframe_points), "TODO: Handle different number of keyframes for each axis"
-
     transform_mat = calculate_bone_space_transform_matrix(old_pose_bone, new_pose_bone)
+    transform_rotation_quaternion_fcurves(fcurves, transform_mat)
 
-    prev_quat = None
-    for w_kfp, x_kfp, y_kfp, z_kfp in zip(w.keyframe_points, x.keyframe_points, y.keyframe_points, z.keyframe_points):
-        w_co, x_co, y_co, z_co = w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co
-        assert x_co[0] == y_co[0] and x_co[0] == z_co[0] and x_co[0] == w_co[0], "TODO: Handle different keyframe times"
 
-        quat = Quaternion((w_co[1], x_co[1], y_co[1], z_co[1]))
-        quat.rotate(transform_mat)
-        if prev_quat is not None and prev_quat.dot(quat) < 0:
-            # Blender interpolates quaternions linearly and component-wise which can cause flickering
-            # when there is a sign change. See longer rant in ycdexport.py
-            quat *= -1
+def transform_location_fcurves(fcurves, transform_mat: Matrix):
+    """Applies ``transform_mat`` to the keyframes of the X, Y and Z location F-curves."""
+    frames, locations = read_fcurves_keyframes(fcurves)
 
-        w_co[1], x_co[1], y_co[1], z_co[1] = quat[0], quat[1], quat[2], quat[3]
+    mat = np.array(transform_mat, dtype=np.float64)
+    locations = locations @ mat[:3, :3].T + mat[:3, 3]
 
-        w_kfp.co, x_kfp.co, y_kfp.co, z_kfp.co = w_co, x_co, y_co, z_co
+    write_fcurves_keyframes(fcurves, frames, locations)
 
-        prev_quat = quat
 
-    w.update()
-    x.update()
-    y.update()
-    z.update()
+def transform_rotation_quaternion_fcurves(fcurves, transform_mat: Matrix):
+    """Rotates the keyframes of the W, X, Y and Z quaternion F-curves by the rotation of ``transform_mat``."""
+    frames, quats = read_fcurves_keyframes(fcurves)
+
+    # Keeps the length of the quaternion like Quaternion.rotate(transform_mat), but also its sign
+    rotation = np.array(transform_mat.to_3x3().normalized().to_quaternion(), dtype=np.float64)
+    quats = quaternions_multiply(rotation, quats)
+
+    # Blender interpolates quaternions linearly and component-wise which can cause flickering
+    # when there is a sign change. See longer rant in ycdexport.py
+    quats = quaternions_make_continuous(quats)
+
+    write_fcurves_keyframes(fcurves, frames, quats)
+
+
+def quaternions_multiply(a: NDArray[np.float64], b: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Multiplies WXYZ quaternions, ``a`` and ``b`` can be a single quaternion or (N, 4) arrays."""
+    aw, ax, ay, az = np.moveaxis(np.asarray(a), -1, 0)
+    bw, bx, by, bz = np.moveaxis(np.asarray(b), -1, 0)
+    return np.stack((
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    ), axis=-1)
+
+
+def quaternions_make_continuous(quats: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Flips the sign of the quaternions that are in the opposite hemisphere of the previous one, after any previous
+    flips. ``quats`` is a (N, 4) array.
+    """
+    if len(quats) < 2:
+        return quats
+
+    signs = np.ones(len(quats), dtype=np.float64)
+    signs[1:] = np.where(np.einsum("ij,ij->i", quats[:-1], quats[1:]) < 0.0, -1.0, 1.0)
+    return quats * np.cumprod(signs)[:, None]
+
+
+def get_unique_keyframe_indices(frames: NDArray) -> NDArray[np.intp]:
+    """Gets the indices of the last keyframe at each time in ``frames``, sorted by time."""
+    _, reversed_indices = np.unique(frames[::-1], return_index=True)
+    return len(frames) - 1 - reversed_indices
+
+
+def read_fcurves_keyframes(fcurves) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Reads the keyframes of the F-curves of each component of a property. Returns the keyframe times and a
+    (num_frames, num_fcurves) array with the value of each F-curve at those times.
+
+    If the F-curves have keyframes at different times, the values are sampled at the union of all the keyframe times.
+    If an F-curve has multiple keyframes at the same time, only the last one is used.
+    """
+    cos = []
+    for fcurve in fcurves:
+        kfps = fcurve.keyframe_points
+        co = np.empty(len(kfps) * 2, dtype=np.float32)
+        kfps.foreach_get("co", co)
+        co = co.reshape((-1, 2)).astype(np.float64)
+        cos.append(co[get_unique_keyframe_indices(co[:, 0])])
+
+    frames = cos[0][:, 0]
+    if all(np.array_equal(co[:, 0], frames) for co in cos[1:]):
+        return frames, np.column_stack([co[:, 1] for co in cos])
+
+    frames = np.unique(np.concatenate([co[:, 0] for co in cos]))
+    values = np.empty((len(frames), len(fcurves)), dtype=np.float64)
+    for i, (fcurve, co) in enumerate(zip(fcurves, cos)):
+        has_key = np.isin(frames, co[:, 0])
+        values[has_key, i] = co[:, 1]
+        for frame_index in np.flatnonzero(~has_key):
+            values[frame_index, i] = fcurve.evaluate(frames[frame_index])
+
+    return frames, values
+
+
+def write_fcurves_keyframes(fcurves, frames: NDArray[np.float64], values: NDArray[np.float64]):
+    """Writes the values returned by ``read_fcurves_keyframes`` back to the F-curves, inserting keyframes in the
+    F-curves that didn't have a keyframe at some of the times and removing the keyframes that were ignored because
+    there was a later keyframe at the same time.
+    """
+    for i, fcurve in enumerate(fcurves):
+        kfps = fcurve.keyframe_points
+        co = np.empty(len(kfps) * 2, dtype=np.float32)
+        kfps.foreach_get("co", co)
+        existing_frames = co[0::2]
+        if not np.array_equal(existing_frames, frames):
+            keyframe_indices = get_unique_keyframe_indices(existing_frames)
+            if len(keyframe_indices) != len(kfps):
+                duplicate_indices = np.setdiff1d(np.arange(len(kfps)), keyframe_indices)
+                for index in duplicate_indices[::-1]:
+                    kfps.remove(kfps[int(index)], fast=True)
+                existing_frames = existing_frames[np.sort(keyframe_indices)]
+
+            missing_frame_indices = np.flatnonzero(~np.isin(frames, existing_frames))
+            # The new keyframes interpolate like the keyframe before them
+            interpolations = [
+                kfps[max(np.searchsorted(existing_frames, frames[frame_index]) - 1, 0)].interpolation
+                if len(kfps) != 0 else None
+                for frame_index in missing_frame_indices
+            ]
+            for frame_index, interpolation in zip(missing_frame_indices, interpolations):
+                kfp = kfps.insert(frames[frame_index], values[frame_index, i], options={"FAST"})
+                if interpolation is not None:
+                    kfp.interpolation = interpolation
+
+        kfps.foreach_set("co", np.column_stack((frames, values[:, i])).astype(np.float32).ravel())
+        fcurve.update()
 
 
 def transform_camera_rotation_quaternion(fcurves, old_camera, new_camera):
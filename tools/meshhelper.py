@@ -424,16 +424,14 @@ def get_extents(obj: bpy.types.Object):
     """
     corners = get_total_bounds(obj)
 
-    if not corners:
+    if len(corners) == 0:
         return Vector(), Vector()
 
-    min = get_min_vector_list(corners)
-    max = get_max_vector_list(corners)
+    return _get_points_extents(corners)
 
-    return min, max
 
-
-def get_total_bounds(obj):
+def get_total_bounds(obj) -> NDArray[np.float32]:
+    """Gets the ``bound_box`` corners of ``obj`` and all of its child mesh objects, as a (N, 3) array."""
     corners = []
 
     # Ensure all objects are meshes
@@ -446,35 +444,22 @@ def get_total_bounds(obj):
         if obj.sollum_type == SollumType.BOUND_COMPOSITE and child.parent.sollum_type != SollumType.BOUND_COMPOSITE:
             matrix = child.parent.matrix_basis @ matrix
 
-        corners.extend([matrix @ Vector(pos)
-                       for pos in child.bound_box])
+        corners.append(_transform_points(_get_bound_box_corners(child), matrix))
 
-    return corners
+    return np.concatenate(corners) if corners else np.empty((0, 3), dtype=np.float32)
 
 
 def get_combined_bound_box(obj: bpy.types.Object, use_world: bool = False, matrix: Matrix = Matrix()):
     """Adds the ``bound_box`` of ``obj`` and all of it's child mesh objects. Returhs bbmin, bbmax"""
-    total_bounds: list[Vector] = []
-
-    for child in [obj, *obj.children_recursive]:
-        if child.type != "MESH":
-            continue
-
-        if use_world:
-            child_matrix = matrix @ child.matrix_world
-        else:
-            if child == obj:
-                child_matrix = matrix
-            else:
-                child_matrix = matrix @ child.matrix_basis
-
-        total_bounds.extend([child_matrix @ Vector(v)
-                            for v in child.bound_box])
+    total_bounds = [
+        _transform_points(_get_bound_box_corners(child), child_matrix)
+        for child, child_matrix in _iter_child_meshes_with_matrix(obj, use_world, matrix)
+    ]
 
     if not total_bounds:
         return Vector(), Vector()
 
-    return get_min_vector_list(total_bounds), get_max_vector_list(total_bounds)
+    return _get_points_extents(np.concatenate(total_bounds))
 
 
 def get_combined_bound_box_tight(obj: bpy.types.Object, use_world: bool = False, matrix: Matrix = Matrix()):
@@ -484,8 +469,19 @@ def get_combined_bound_box_tight(obj: bpy.types.Object, use_world: bool = False,
     """
     # TODO: for now this is separate from get_combined_bound_box because it was needed to fix an issue with bound BVH
     # export, and I'm not sure if the other usages of get_combined_bound_box would keep working with this change
-    total_bounds: list[Vector] = []
+    total_bounds = [
+        _transform_points(_get_mesh_positions(child.data), child_matrix)
+        for child, child_matrix in _iter_child_meshes_with_matrix(obj, use_world, matrix)
+    ]
+
+    total_bounds = [b for b in total_bounds if len(b) != 0]
+    if not total_bounds:
+        return Vector(), Vector()
 
+    return _get_points_extents(np.concatenate(total_bounds))
+
+
+def _iter_child_meshes_with_matrix(obj: bpy.types.Object, use_world: bool, matrix: Matrix):
     for child in [obj, *obj.children_recursive]:
         if child.type != "MESH":
             continue
@@ -498,13 +494,26 @@ def get_combined_bound_box_tight(obj: bpy.types.Object, use_world: bool = False,
             else:
                 child_matrix = matrix @ child.matrix_basis
 
-        total_bounds.extend([child_matrix @ Vector(v.co)
-                            for v in child.data.vertices])
+        yield child, child_matrix
+
+
+def _get_bound_box_corners(obj: bpy.types.Object) -> NDArray[np.float32]:
+    return np.array(obj.bound_box, dtype=np.float32)
+
+
+def _get_mesh_positions(mesh: bpy.types.Mesh) -> NDArray[np.float32]:
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    return positions.reshape((-1, 3))
+
+
+def _transform_points(points: NDArray[np.float32], matrix: Matrix) -> NDArray[np.float32]:
+    matrix = np.array(matrix, dtype=np.float32)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
 
-    if not total_bounds:
-        return Vector(), Vector()
 
-    return get_min_vector_list(total_bounds), get_max_vector_list(total_bounds)
+def _get_points_extents(points: NDArray[np.float32]) -> tuple[Vector, Vector]:
+    return Vector(np.min(points, axis=0)), Vector(np.max(points, axis=0))
 
 
 def get_bound_center(obj):
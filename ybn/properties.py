@@ -4,11 +4,11 @@ from bpy.props import (
 )
 from typing import TYPE_CHECKING
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
-from bpy.app.handlers import persistent
 from .collision_materials import collisionmats
 from .flag_preset import FlagPresetsFile
 from ..tools.meshhelper import create_disc, create_cylinder, create_sphere, create_capsule, create_box
 from ..tools.blenderhelper import tag_redraw
+from ..shared.ui_collections import UICollections
 from ..sollumz_preferences import get_addon_preferences
 from mathutils import Vector, Matrix
 import os
@@ -517,9 +517,7 @@ def refresh_ui_collections():
     load_flag_presets()
 
 
-@persistent
-def on_blend_file_loaded(_):
-    refresh_ui_collections()
+ui_collections = UICollections(refresh_ui_collections)
 
 
 def register():
@@ -613,8 +611,7 @@ def register():
         type=bpy.types.Object
     )
 
-    bpy.app.handlers.load_post.append(on_blend_file_loaded)
-    refresh_ui_collections()
+    ui_collections.register()
 
 
 def unregister():
@@ -633,7 +630,7 @@ def unregister():
     del bpy.types.Scene.center_composite_to_selection
     del bpy.types.WindowManager.sz_create_bound_box_parent
 
-    bpy.app.handlers.load_post.remove(on_blend_file_loaded)
+    ui_collections.unregister()
 
     _collision_material_room_items_refs.clear()
     _collision_material_mlo_archetype_cache.clear()
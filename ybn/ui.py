@@ -3,7 +3,7 @@ from bpy.props import (
     BoolProperty
 )
 import os
-from .properties import BoundFlags, CollisionMatFlags, ProceduralIdEnumItems
+from .properties import BoundFlags, CollisionMatFlags, ProceduralIdEnumItems, ui_collections
 from ..sollumz_properties import MaterialType, SollumType, BOUND_TYPES, BOUND_POLYGON_TYPES
 from .collision_materials import collisionmats
 from ..sollumz_ui import SOLLUMZ_PT_OBJECT_PANEL, SOLLUMZ_PT_MAT_PANEL
@@ -332,6 +332,7 @@ class SOLLUMZ_PT_CREATE_MATERIAL_PANEL(CollisionToolChildPanel, bpy.types.Panel)
         self.layout.label(text="", icon="NODE_MATERIAL")
 
     def draw(self, context):
+        ui_collections.ensure_loaded()
         layout = self.layout
         layout.template_list(
             SOLLUMZ_UL_COLLISION_MATERIALS_LIST.bl_idname, "",
@@ -359,6 +360,7 @@ class SOLLUMZ_PT_FLAG_PRESETS_PANEL(CollisionToolChildPanel, bpy.types.Panel):
         self.layout.label(text="", icon="ALIGN_TOP")
 
     def draw(self, context):
+        ui_collections.ensure_loaded()
         layout = self.layout
 
         row = layout.row()
@@ -32,15 +32,19 @@ from ..tools.meshhelper import (
 from ..sollumz_properties import MaterialType, SOLLUMZ_UI_NAMES, SollumType, BOUND_POLYGON_TYPES
 from ..iecontext import export_context, ExportBundle
 from .. import logger
+from .. import profiler
 from .properties import CollisionMatFlags, get_collision_mat_raw_flags, BoundFlags
 
 MAX_VERTICES = 32767
 
 
 def export_ybn(obj: Object) -> ExportBundle:
-    return export_context().make_bundle(create_bound_composite_asset(obj))
+    with profiler.scope("ybn.export"):
+        composite = create_bound_composite_asset(obj)
+    return export_context().make_bundle(composite)
 
 
+@profiler.profiled("ybn.composite")
 def create_bound_composite_asset(
     obj: Object,
     out_child_obj_to_index: dict[Object, int] = None
@@ -451,6 +455,7 @@ def init_bound_geometry_primitives(
     return vertices, primitives
 
 
+@profiler.profiled("ybn.geometry")
 def create_bound_geometry_vertices_and_primitives(
     bound: AssetBound,
     obj: Object
@@ -515,6 +520,9 @@ def create_bound_geometry_vertices_and_primitives(
 
             primitives.extend(create_bound_geometry_primitive(child, bound, _get_vert_index, _get_mat_data))
 
+    profiler.count("ybn.vertices", len(vertices))
+    profiler.count("ybn.primitives", len(primitives))
+
     has_colors = bool(vertex_colors)
     vertices = [BoundVertex(v, vertex_colors[i] if has_colors else None) for i, v in enumerate(vertices)]
     return vertices, primitives
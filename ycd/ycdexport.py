@@ -24,6 +24,7 @@ from ..tools.animationhelper import (
 from .properties import ClipAttribute, ClipTag, calculate_final_uv_transform_matrix
 
 from .. import logger
+from .. import profiler
 
 
 def parse_uv_transform_data_path(data_path: str) -> tuple[int, str]:
@@ -340,6 +341,7 @@ def sequence_data_from_frames_data(
     return sequence_data
 
 
+@profiler.profiled("ycd.animation")
 def animation_from_object(animation_obj: bpy.types.Object) -> Optional[ycdxml.Animation]:
     animation_properties = animation_obj.animation_properties
     action = animation_properties.action
@@ -469,6 +471,7 @@ def clip_tag_calc_signature(tag: ClipTag) -> int:
     return signature
 
 
+@profiler.profiled("ycd.clip")
 def clip_from_object(clip_obj: bpy.types.Object) -> ycdxml.Clip:
     clip_properties = clip_obj.clip_properties
 
@@ -567,9 +570,14 @@ def clip_dictionary_from_object(obj: bpy.types.Object) -> Optional[ycdxml.ClipDi
 
 
 def export_ycd(obj: bpy.types.Object, filepath: str) -> bool:
-    clip_dict = clip_dictionary_from_object(obj)
+    with profiler.scope("ycd.export"):
+        clip_dict = clip_dictionary_from_object(obj)
     if clip_dict is None:
         return False
 
-    clip_dict.write_xml(filepath)
+    profiler.count("ycd.animations", len(clip_dict.animations))
+    profiler.count("ycd.clips", len(clip_dict.clips))
+
+    with profiler.scope("ycd.write_xml"):
+        clip_dict.write_xml(filepath)
     return True
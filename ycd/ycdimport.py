@@ -12,6 +12,8 @@ from ..tools.animationhelper import (
     get_scene_fps
 )
 from ..tools.utils import color_hash
+from ..sollumz_preferences import get_import_settings
+from ..shared.xml_streaming import stream_xml_file
 
 
 def create_anim_obj(sollum_type: SollumType) -> bpy.types.Object:
@@ -370,7 +372,10 @@ def clip_dictionary_to_obj(clip_dictionary: ycdxml.ClipDictionary, name: str) ->
 
 
 def import_ycd(filepath: str) -> bpy.types.Object:
-    ycd_xml = ycdxml.YCD.from_xml_file(filepath)
+    if get_import_settings().stream_xml_files:
+        ycd_xml = stream_xml_file(ycdxml.ClipDictionary, filepath)
+    else:
+        ycd_xml = ycdxml.YCD.from_xml_file(filepath)
 
     return clip_dictionary_to_obj(
         ycd_xml,
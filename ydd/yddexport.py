@@ -2,6 +2,7 @@ import bpy
 from typing import Optional
 from szio.gta5.cwxml import DrawableDictionary, ClothDictionary
 from ..ydr.ydrexport import create_drawable_xml, write_embedded_textures
+from ..ydr.skeleton_tables import SkeletonTables
 from ..ydr.cloth_char import cloth_char_export_dictionary
 from ..ydr.cloth_diagnostics import (
     cloth_enter_export_context,
@@ -43,6 +44,8 @@ def create_ydd_xml(
     ydd_xml = DrawableDictionary()
 
     ydd_armature = find_ydd_armature(ydd_obj) if ydd_obj.type != "ARMATURE" else ydd_obj
+    # All drawables share the same armature, only build its bone hierarchy tables once
+    skeleton_tables = SkeletonTables(ydd_armature.data) if ydd_armature is not None else None
 
     for child in ydd_obj.children:
         if child.sollum_type != SollumType.DRAWABLE:
@@ -61,7 +64,12 @@ def create_ydd_xml(
             cloth = None
 
         with cloth_export_context().enter_drawable_context(child):
-            drawable_xml = create_drawable_xml(child, armature_obj=armature_obj, char_cloth_xml=cloth)
+            drawable_xml = create_drawable_xml(
+                child,
+                armature_obj=armature_obj,
+                char_cloth_xml=cloth,
+                skeleton_tables=skeleton_tables if (armature_obj or child) == ydd_armature else None,
+            )
 
         if exclude_skeleton or child.type != "ARMATURE":
             drawable_xml.skeleton = None
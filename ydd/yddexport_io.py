@@ -9,6 +9,7 @@ from szio.gta5 import (
     create_asset_drawable_dictionary,
 )
 from ..ydr.ydrexport_io import create_drawable_asset
+from ..ydr.skeleton_tables import SkeletonTables
 from ..ydr.cloth_char_io import cloth_char_export_dictionary
 from ..ydr.cloth_diagnostics import (
     cloth_export_context,
@@ -34,6 +35,10 @@ def create_drawable_dictionary_asset(
     out_embedded_textures: list[EmbeddedTexture] | None = None,
 ) -> AssetDrawableDictionary | None:
     dwd_armature = find_ydd_armature(dwd_obj) if dwd_obj.type != "ARMATURE" else dwd_obj
+    # All drawables share the same armature, only build its bone hierarchy tables once
+    skeleton_tables = SkeletonTables(dwd_armature.data) if dwd_armature is not None else None
+    # Drawables can share light datablocks, only read their properties once
+    light_params_cache = {}
 
     exclude_skeleton = export_context().settings.exclude_skeleton
 
@@ -57,6 +62,8 @@ def create_drawable_dictionary_asset(
                 armature_obj=armature_obj,
                 out_embedded_textures=out_embedded_textures,
                 char_cloth=cloth,
+                skeleton_tables=skeleton_tables if (armature_obj or child) == dwd_armature else None,
+                light_params_cache=light_params_cache,
             )
 
         if exclude_skeleton or child.type != "ARMATURE":
@@ -23,6 +23,7 @@ from ..sollumz_preferences import get_import_settings
 from ..tools.blenderhelper import create_empty_object, create_blender_object, add_child_of_bone_constraint
 from ..tools.utils import get_filename
 
+from ..asset_cache import load_cached, list_directory_files
 from .. import logger
 
 
@@ -33,7 +34,7 @@ def import_ydd(filepath: str):
 
     # Import the cloth .yld.xml if it exists
     yld_filepath = make_yld_filepath(filepath)
-    yld_xml = YLD.from_xml_file(yld_filepath) if os.path.exists(yld_filepath) else None
+    yld_xml = load_cached(yld_filepath, YLD.from_xml_file) if os.path.exists(yld_filepath) else None
 
     if import_settings.import_ext_skeleton:
         skel_yft = load_external_skeleton(filepath)
@@ -56,13 +57,13 @@ def load_external_skeleton(ydd_filepath: str) -> Optional[Fragment]:
 
     logger.info(f"Using '{yft_filepath}' as external skeleton...")
 
-    return YFT.from_xml_file(yft_filepath)
+    return load_cached(yft_filepath, YFT.from_xml_file)
 
 
 def get_first_yft_path(directory: str) -> Optional[str]:
-    for filepath in os.listdir(directory):
-        if filepath.endswith(".yft.xml"):
-            return os.path.join(directory, filepath)
+    for file in list_directory_files(directory):
+        if file.name.endswith(".yft.xml"):
+            return str(file)
 
     return None
 
@@ -10,7 +10,6 @@ from szio.gta5 import (
     AssetDrawableDictionary,
     AssetFragment,
     AssetClothDictionary,
-    try_load_asset,
     Skeleton,
     jenkhash,
 )
@@ -22,6 +21,7 @@ from ..ydr.cloth_char_io import (
 from ..sollumz_properties import SollumType
 from ..tools.blenderhelper import create_empty_object, create_blender_object
 from ..iecontext import import_context
+from ..asset_cache import load_asset, list_directory_files
 from .. import logger
 
 
@@ -55,7 +55,7 @@ def try_load_cloth_dictionary(name: str, prefers_xml: bool) -> AssetClothDiction
     for ext in possible_exts:
         cloth_dictionary_path = d / f"{name}{ext}"
         if cloth_dictionary_path.is_file():
-            cloth_dictionary = try_load_asset(cloth_dictionary_path)
+            cloth_dictionary = load_asset(cloth_dictionary_path)
             if cloth_dictionary:
                 break
 
@@ -72,7 +72,7 @@ def try_load_external_skeleton() -> Optional[AssetFragment]:
         logger.warning(f"Could not find external skeleton yft in directory '{directory}'.")
         return None
 
-    yft = try_load_asset(yft_filepath)
+    yft = load_asset(yft_filepath)
     if yft is None:
         logger.warning(f"Could not load external skeleton yft '{yft_filepath}'.")
         return None
@@ -82,8 +82,8 @@ def try_load_external_skeleton() -> Optional[AssetFragment]:
 
 
 def get_first_yft_path(directory: Path) -> Optional[Path]:
-    for file in directory.iterdir():
-        if file.is_file() and ((name := file.name).endswith(".yft") or name.endswith(".yft.xml")):
+    for file in list_directory_files(directory):
+        if (name := file.name).endswith(".yft") or name.endswith(".yft.xml"):
             return file
 
     return None
@@ -6,26 +6,20 @@ from bpy.types import (
 import numpy as np
 from numpy.typing import NDArray
 from typing import NamedTuple
-from mathutils import Vector
 from .cable import CableAttr, mesh_add_cable_attribute
-from ..shared.math import distance_point_to_line
+from ..shared.math import distances_points_to_lines
 
-class CablePoint:
-    point_index: int
-    position: Vector
-    radius: float = CableAttr.RADIUS.default_value
-    diffuse_factor: float = CableAttr.DIFFUSE_FACTOR.default_value
-    um_scale: float = CableAttr.UM_SCALE.default_value
-    phase_offset: (float, float) = CableAttr.PHASE_OFFSET.default_value
-    material_index: int = 0
-
-    def __init__(self, point_index: int, position: Vector):
-        self.point_index = point_index
-        self.position = position
-
-class CablePiece(NamedTuple):
-    """A series of connected points of a cable mesh, aka a single cable."""
-    points: list[CablePoint]
+class CablePieces(NamedTuple):
+    """The points of all the cables (pieces) of a cable mesh. Points of the same piece are stored consecutively, in
+    order from the start of the cable to the end.
+    """
+    positions: NDArray[np.float32]
+    radius: NDArray[np.float32]
+    diffuse_factor: NDArray[np.float32]
+    um_scale: NDArray[np.float32]
+    phase_offset: NDArray[np.float32]
+    material_index: NDArray[np.int64]
+    pieces_num_points: NDArray[np.intp]
 
 
 class CableMeshBuilder:
@@ -50,45 +44,38 @@ class CableMeshBuilder:
     def build(self) -> Mesh:
         mesh = bpy.data.meshes.new(self.name)
 
-        verts = []
-        verts_radius = []
-        verts_diffuse_factor = []
-        verts_um_scale = []
-        verts_phase_offset = []
-        verts_material_index = []
-        edges = []
-
         pieces = self._gather_pieces()
-        for piece in pieces:
-            first_idx = len(verts)
-            last_idx = first_idx + len(piece.points) - 1
+        num_points = len(pieces.positions)
+
+        # Connect each point to the next one, except the last point of each piece
+        pieces_last = np.cumsum(pieces.pieces_num_points) - 1
+        edges_start = np.delete(np.arange(num_points), pieces_last)
+        edges = np.column_stack((edges_start, edges_start + 1)).astype(np.int32)
 
-            verts.extend(p.position for p in piece.points)
-            verts_radius.extend(p.radius for p in piece.points)
-            verts_diffuse_factor.extend(p.diffuse_factor for p in piece.points)
-            verts_um_scale.extend(p.um_scale for p in piece.points)
-            # NOTE: phase offset actually stored as FLOAT_VECTOR
-            verts_phase_offset.extend((p.phase_offset[0], p.phase_offset[1], 0.0) for p in piece.points)
-            if self.has_multiple_materials:
-                verts_material_index.extend(p.material_index for p in piece.points)
-            edges.extend(zip(range(first_idx, last_idx), range(first_idx + 1, last_idx + 1)))
+        mesh.vertices.add(num_points)
+        mesh.vertices.foreach_set("co", pieces.positions.ravel())
+        mesh.edges.add(len(edges))
+        mesh.edges.foreach_set("vertices", edges.ravel())
+        mesh.update()
 
-        mesh.from_pydata(verts, edges, [])
+        self._create_mesh_materials(mesh, pieces.material_index)
 
-        self._create_mesh_materials(mesh, verts_material_index)
+        # NOTE: phase offset actually stored as FLOAT_VECTOR
+        phase_offset = np.zeros((num_points, 3), dtype=np.float32)
+        phase_offset[:, :2] = pieces.phase_offset
 
         mesh_add_cable_attribute(mesh, CableAttr.RADIUS)
         mesh_add_cable_attribute(mesh, CableAttr.DIFFUSE_FACTOR)
         mesh_add_cable_attribute(mesh, CableAttr.UM_SCALE)
         mesh_add_cable_attribute(mesh, CableAttr.PHASE_OFFSET)
-        mesh.attributes[CableAttr.RADIUS].data.foreach_set("value", verts_radius)
-        mesh.attributes[CableAttr.DIFFUSE_FACTOR].data.foreach_set("value", verts_diffuse_factor)
-        mesh.attributes[CableAttr.UM_SCALE].data.foreach_set("value", verts_um_scale)
-        mesh.attributes[CableAttr.PHASE_OFFSET].data.foreach_set("vector", np.array(verts_phase_offset).ravel())
+        mesh.attributes[CableAttr.RADIUS].data.foreach_set("value", pieces.radius)
+        mesh.attributes[CableAttr.DIFFUSE_FACTOR].data.foreach_set("value", pieces.diffuse_factor)
+        mesh.attributes[CableAttr.UM_SCALE].data.foreach_set("value", pieces.um_scale)
+        mesh.attributes[CableAttr.PHASE_OFFSET].data.foreach_set("vector", phase_offset.ravel())
 
         return mesh
 
-    def _create_mesh_materials(self, mesh: bpy.types.Mesh, verts_material_index: list[int]):
+    def _create_mesh_materials(self, mesh: bpy.types.Mesh, verts_material_index: NDArray[np.int64]):
         if not self.has_multiple_materials:
             # Just a single material, 
             mesh.materials.append(self.materials[0])
@@ -112,9 +99,7 @@ class CableMeshBuilder:
         # mesh.attributes["material_index"].data.foreach_set(
         #     "value", model_mat_inds[self.mat_inds])
 
-    def _gather_pieces(self) -> list[CablePiece]:
-        pieces = []
-
+    def _gather_pieces(self) -> CablePieces:
         # Get the unique vertex positions to simplify finding the cable pieces as the same vertex can appear multiple
         # times with positive/negative radius attribute within the two triangles that connect each segment.
         # We also take the tangent into account for the cases where two or more cables share a point. In these cases,
@@ -122,6 +107,7 @@ class CableMeshBuilder:
         # vertices in Blender.
         _, uniq_index, uniq_inverse_index = np.unique(self.vertex_arr[["Position", "Normal"]],
                                                       return_index=True, return_inverse=True, axis=0)
+        uniq_inverse_index = uniq_inverse_index.ravel()
 
         # Remap index array to indices in the unique vertex positions array
         ind_arr = uniq_inverse_index[self.ind_arr]
@@ -129,62 +115,75 @@ class CableMeshBuilder:
 
         num_points = len(uniq_index)
 
-        material_index_per_vert = [0] * num_points
-
         # Find which point is the next one connected to each point. The game mesh connects two points with two
         # triangles, one going forward and the next one back. Here, we simplify the repesentation to a list of
         # points instead of triangles.
-        next_map = [-1] * num_points
-        prev_map = [-1] * num_points
-        for face_index, (v0, v1, v2) in enumerate(faces):
-            if v0 == v2: # forward tri
-                assert next_map[v0] == -1, "Point already connected!"
-                assert prev_map[v1] == -1, "Point already connected!"
-                next_map[v0] = v1
-                prev_map[v1] = v0
-                material_index_per_vert[v0] = self.mat_inds[face_index]
-                material_index_per_vert[v1] = self.mat_inds[face_index]
-            else:
-                pass
-
-        uniq_pos = self.vertex_arr["Position"][uniq_index]
-        uniq_col = self.vertex_arr["Colour0"][uniq_index]
-        uniq_tc = self.vertex_arr["TexCoord0"][uniq_index]
-
-        added = [False] * num_points
-        for i in range(num_points):
-            if added[i]:
-                # Already added to a piece, skip
-                continue
-
-            # Make sure we start at the first point of this piece, go back if we are in the middle
-            point_idx = i
-            while prev_map[point_idx] != -1:
-                point_idx = prev_map[point_idx]
-
-            # Build the list of points of this piece
-            piece_points = [CablePoint(point_idx, Vector(uniq_pos[point_idx]))]
-            added[point_idx] = True
-            while next_map[point_idx] != -1:
-                point_idx = next_map[point_idx]
-                piece_points.append(CablePoint(point_idx, Vector(uniq_pos[point_idx])))
-                added[point_idx] = True
-
-            # Collect attributes for every point
-            start = piece_points[0]
-            end = piece_points[-1]
-            for point in piece_points:
-                r, g, _, a = uniq_col[point.point_index]
-                x, y = uniq_tc[point.point_index]
-                D = distance_point_to_line(start.position, end.position, point.position)
-
-                point.phase_offset = (r / 255, g / 255)
-                point.diffuse_factor = a / 255
-                point.radius = abs(x)
-                point.um_scale = y / D if D != 0.0 else 0.0
-                point.material_index = material_index_per_vert[point.point_index]
-
-            pieces.append(CablePiece(piece_points))
-
-        return pieces
-
+        forward_faces_mask = faces[:, 0] == faces[:, 2]
+        forward_faces = faces[forward_faces_mask]
+        forward_faces_mat_inds = np.asarray(self.mat_inds)[forward_faces_mask]
+        points_from = forward_faces[:, 0]
+        points_to = forward_faces[:, 1]
+        assert np.bincount(points_from, minlength=num_points).max(initial=0) <= 1, "Point already connected!"
+        assert np.bincount(points_to, minlength=num_points).max(initial=0) <= 1, "Point already connected!"
+
+        next_map = np.full(num_points, -1, dtype=np.intp)
+        prev_map = np.full(num_points, -1, dtype=np.intp)
+        next_map[points_from] = points_to
+        prev_map[points_to] = points_from
+
+        # Each point takes the material of the last forward triangle it is part of
+        faces_points = np.column_stack((points_from, points_to)).ravel()
+        faces_points_mat_inds = np.repeat(forward_faces_mat_inds, 2)
+        _, last_occurrence = np.unique(faces_points[::-1], return_index=True)
+        last_occurrence = len(faces_points) - 1 - last_occurrence
+        material_index_per_vert = np.zeros(num_points, dtype=np.int64)
+        material_index_per_vert[faces_points[last_occurrence]] = faces_points_mat_inds[last_occurrence]
+
+        # Find the first point of the piece and the position within the piece of every point, by pointer jumping on
+        # the previous point links (list ranking).
+        points_head = np.where(prev_map == -1, np.arange(num_points), prev_map)
+        points_rank = (prev_map != -1).astype(np.intp)
+        for _ in range(max(num_points, 1).bit_length() + 1):
+            next_head = points_head[points_head]
+            if np.array_equal(next_head, points_head):
+                break
+            points_rank += points_rank[points_head]
+            points_head = next_head
+
+        # Points in a loop don't have a first point, they are not part of a valid cable
+        valid_points = prev_map[points_head] == -1
+
+        # Pieces are sorted by their lowest point index, points sorted by position within the piece
+        piece_min_point = np.full(num_points, num_points, dtype=np.intp)
+        np.minimum.at(piece_min_point, points_head, np.arange(num_points))
+        order = np.lexsort((points_rank, piece_min_point[points_head]))
+        order = order[valid_points[order]]
+
+        ordered_head = points_head[order]
+        pieces_first = np.flatnonzero(np.r_[True, ordered_head[1:] != ordered_head[:-1]]) if len(order) else order
+        pieces_num_points = np.diff(np.r_[pieces_first, len(order)])
+        points_piece = np.repeat(np.arange(len(pieces_first)), pieces_num_points)
+        pieces_last = pieces_first + pieces_num_points - 1
+
+        uniq_pos = self.vertex_arr["Position"][uniq_index][order]
+        uniq_col = self.vertex_arr["Colour0"][uniq_index][order]
+        uniq_tc = self.vertex_arr["TexCoord0"][uniq_index][order]
+
+        # Collect attributes for every point
+        points_position = uniq_pos.astype(np.float64)
+        distances = distances_points_to_lines(
+            points_position[pieces_first[points_piece]],
+            points_position[pieces_last[points_piece]],
+            points_position,
+        )
+        um_scale = np.divide(uniq_tc[:, 1], distances, out=np.zeros_like(distances), where=distances != 0.0)
+
+        return CablePieces(
+            positions=uniq_pos.astype(np.float32),
+            radius=np.abs(uniq_tc[:, 0]).astype(np.float32),
+            diffuse_factor=(uniq_col[:, 3] / 255).astype(np.float32),
+            um_scale=um_scale.astype(np.float32),
+            phase_offset=(uniq_col[:, :2] / 255).astype(np.float32),
+            material_index=material_index_per_vert[order],
+            pieces_num_points=pieces_num_points,
+        )
@@ -6,16 +6,23 @@ from bpy.types import (
 import gpu
 from gpu_extras.batch import batch_for_shader
 import blf
+import numpy as np
 from mathutils import Vector
 from collections.abc import Sequence
 from typing import NamedTuple
 from ..sollumz_preferences import get_theme_settings
+from ..shared.viewport_overlays import (
+    OverlayCache,
+    mesh_update_tick,
+    read_attribute_values,
+    project_points_to_region,
+    cull_labels,
+)
 from .cable import (
     CableAttr,
     is_cable_mesh_object,
     mesh_get_cable_attribute_values,
 )
-from bpy_extras.view3d_utils import location_3d_to_region_2d
 from bpy_extras.mesh_utils import edge_loops_from_edges
 import bmesh
 
@@ -26,6 +33,8 @@ class CableOverlaysDrawHandler:
     def __init__(self):
         self.handler_text = None
         self.handler_geometry = None
+        self.cache_attribute_values = OverlayCache()
+        self.cache_radius_batch = OverlayCache()
 
     def register(self):
         self.handler_text = SpaceView3D.draw_handler_add(self.draw_text, (), "WINDOW", "POST_PIXEL")
@@ -34,6 +43,8 @@ class CableOverlaysDrawHandler:
     def unregister(self):
         SpaceView3D.draw_handler_remove(self.handler_text, "WINDOW")
         SpaceView3D.draw_handler_remove(self.handler_geometry, "WINDOW")
+        self.cache_attribute_values.clear()
+        self.cache_radius_batch.clear()
 
     def can_draw_anything(self) -> bool:
         context = bpy.context
@@ -85,11 +96,26 @@ class CableOverlaysDrawHandler:
         if wm.sz_ui_cable_radius_visualize:
             self.draw_radius_geometry(obj)
 
+    def get_attribute_values(self, cable_obj: Object, attrs: Sequence[CableAttr]) -> tuple[np.ndarray, list]:
+        """Gets the local-space vertex positions and the values of ``attrs`` at each vertex. Cached until the mesh
+        changes.
+        """
+        mesh = cable_obj.data
+        is_edit = cable_obj.mode == "EDIT"
+        key = (mesh_update_tick(mesh), is_edit, tuple(attrs))
+        return self.cache_attribute_values.get(
+            mesh, key, lambda: read_attribute_values(mesh, attrs, is_edit, mesh_get_cable_attribute_values)
+        )
+
     def draw_attribute_values(self, cable_obj: Object, attrs: Sequence[CableAttr]):
         context = bpy.context
         region = context.region
         rv3d = context.region_data
-        mesh = cable_obj.data
+
+        coords, all_attr_values = self.get_attribute_values(cable_obj, attrs)
+        positions, indices = project_points_to_region(region, rv3d, cable_obj.matrix_world, coords)
+        if len(indices) == 0:
+            return
 
         font_id = 0
         blf.size(font_id, 11)
@@ -98,71 +124,69 @@ class CableOverlaysDrawHandler:
         blf.shadow(font_id, 3, 0.0, 0.0, 0.0, 1.0)
         blf.shadow_offset(font_id, 2, -2)
 
-        matrix_world = cable_obj.matrix_world
-
-        def _draw_vertex_attributes(pos: Vector, attr_values):
-            pos = matrix_world @ pos
-            pos = location_3d_to_region_2d(region, rv3d, pos)
-            if pos:
-                for i, attr_value in enumerate(attr_values):
-                    attr_type = attrs[i].type
-                    if attr_type == "FLOAT_VECTOR":
-                        attr_str = f"{attr_value[0]:.2f}  {attr_value[1]:.2f}"
-                    elif attr_type == "INT":
-                        attr_str = f"{attr_value}"
-                    else:  # FLOAT
-                        attr_str = f"{attr_value:.2f}"
-                    w, h = blf.dimensions(font_id, attr_str)
-                    attr_pos = pos - Vector((w * 0.5, h * i * 2 - (h * len(attr_values) / 2)))
-                    blf.position(font_id, attr_pos.x, attr_pos.y, 0.0)
-                    blf.draw(font_id, attr_str)
-
-        if cable_obj.mode == "EDIT":
-            edit_mesh = bmesh.from_edit_mesh(mesh)
-            try:
-                attr_layers = [(edit_mesh.verts.layers.float_vector if attr.type == "FLOAT_VECTOR" else edit_mesh.verts.layers.int if attr.type == "INT" else edit_mesh.verts.layers.float).get(attr, None) for attr in attrs]
-                for v in edit_mesh.verts:
-                    attr_values = [attr.default_value if attr_layers[i] is None else v[attr_layers[i]]
-                                   for i, attr in enumerate(attrs)]
-                    _draw_vertex_attributes(v.co, attr_values)
-            finally:
-                edit_mesh.free()
-        else:
-            all_attr_values = [mesh_get_cable_attribute_values(mesh, attr) for attr in attrs]
-            for v in mesh.vertices:
-                attr_values = [all_attr_values[i][v.index] for i, attr in enumerate(attrs)]
-                _draw_vertex_attributes(v.co, attr_values)
+        _, line_height = blf.dimensions(font_id, "0")
+        num_attrs = len(attrs)
+        positions, indices = cull_labels(
+            positions, indices,
+            cell_size=line_height * 2 * num_attrs,
+            max_labels=get_theme_settings().cable_overlay_max_labels
+        )
+
+        for pos, vertex_index in zip(positions.tolist(), indices.tolist()):
+            x, y = pos
+            for i, attr in enumerate(attrs):
+                attr_value = all_attr_values[i][vertex_index]
+                attr_type = attr.type
+                if attr_type == "FLOAT_VECTOR":
+                    attr_str = f"{attr_value[0]:.2f}  {attr_value[1]:.2f}"
+                elif attr_type == "INT":
+                    attr_str = f"{attr_value}"
+                else:  # FLOAT
+                    attr_str = f"{attr_value:.2f}"
+                w, h = blf.dimensions(font_id, attr_str)
+                blf.position(font_id, x - w * 0.5, y - (h * i * 2 - (h * num_attrs / 2)), 0.0)
+                blf.draw(font_id, attr_str)
 
         blf.disable(font_id, blf.SHADOW)
 
     def draw_radius_geometry(self, cable_obj: Object):
         mesh = cable_obj.data
-        if cable_obj.mode == "EDIT":
-            edit_mesh = bmesh.from_edit_mesh(mesh)
-            try:
-                edit_edges = [TempEditEdge((e.verts[0].index, e.verts[1].index))for e in edit_mesh.edges]
-                pieces = edge_loops_from_edges(None, edges=edit_edges)
-            finally:
-                edit_mesh.free()
-        else:
-            pieces = edge_loops_from_edges(mesh)
-
-        coords = []
-        for piece in pieces:
-            coords.extend(self.build_radius_geometry_for_cable_piece(cable_obj, piece))
+        is_edit = cable_obj.mode == "EDIT"
 
         shader = gpu.shader.from_builtin("UNIFORM_COLOR")
-        batch = batch_for_shader(shader, "LINES", {"pos": coords})
-        shader.uniform_float("color", get_theme_settings().cable_overlay_radius)
-        batch.draw(shader)
+
+        def _build_batch():
+            if is_edit:
+                edit_mesh = bmesh.from_edit_mesh(mesh)
+                try:
+                    edit_edges = [TempEditEdge((e.verts[0].index, e.verts[1].index))for e in edit_mesh.edges]
+                    pieces = edge_loops_from_edges(None, edges=edit_edges)
+                finally:
+                    edit_mesh.free()
+            else:
+                pieces = edge_loops_from_edges(mesh)
+
+            coords = []
+            for piece in pieces:
+                coords.extend(self.build_radius_geometry_for_cable_piece(cable_obj, piece))
+
+            return batch_for_shader(shader, "LINES", {"pos": coords})
+
+        # The radius lines are built in local space, so moving the object doesn't require rebuilding the batch
+        key = (mesh_update_tick(mesh), is_edit)
+        radius_batch = self.cache_radius_batch.get(mesh, key, _build_batch)
+
+        with gpu.matrix.push_pop():
+            gpu.matrix.multiply_matrix(cable_obj.matrix_world)
+            shader.uniform_float("color", get_theme_settings().cable_overlay_radius)
+            radius_batch.draw(shader)
 
     def build_radius_geometry_for_cable_piece(self, cable_obj: Object, piece: list[int]) -> list[Vector]:
-        """Builds the geometry to visualize the radius of this cable piece. The radius is represented with 4 lines
-        around the cable mesh.
+        """Builds the local-space geometry to visualize the radius of this cable piece. The radius is represented with
+        4 lines around the cable mesh.
         """
         num_piece_verts = len(piece)
         mesh = cable_obj.data
-        matrix_world = cable_obj.matrix_world
 
         num_verts_per_line = (num_piece_verts * 2 - 2)
         num_lines = 4
@@ -172,7 +196,6 @@ class CableOverlaysDrawHandler:
             world_up = Vector((0.0, 0.0, 1.0))
             right = tangent.cross(world_up).normalized()
             up = tangent.cross(right).normalized()
-            pos = matrix_world @ pos
             va = pos + up * radius
             vb = pos - up * radius
             vc = pos + right * radius
@@ -1,13 +1,13 @@
 from bpy.types import (
     Mesh
 )
-from mathutils import Vector
 from bpy_extras.mesh_utils import edge_loops_from_edges
+from itertools import chain
 import numpy as np
 from numpy.typing import NDArray
 
 from szio.gta5.cwxml import VertexBuffer
-from ..shared.math import distance_point_to_line
+from ..shared.math import distances_points_to_lines, normalize_vectors
 from .cable import CableAttr, is_cable_mesh, mesh_get_cable_attribute_values
 
 
@@ -31,10 +31,44 @@ class CableVertexBufferBuilder:
         verts_diffuse_factor.clip(0.0, 1.0, out=verts_diffuse_factor)
         verts_material.clip(0, len(self.mesh.materials) - 1, out=verts_material)
 
-        pieces = edge_loops_from_edges(self.mesh)
-
-        # Each segment between two points is composed of 2 triangles (6 vertices)
-        num_output_verts = sum((len(piece_vertices) - 1) * 6 for piece_vertices in pieces)
+        # Cannot have a cable with just 1 vertex
+        pieces = [piece_vertices for piece_vertices in edge_loops_from_edges(self.mesh) if len(piece_vertices) > 1]
+        pieces_num_points = np.array([len(piece_vertices) for piece_vertices in pieces], dtype=np.intp)
+        num_points = int(pieces_num_points.sum())
+
+        # All the points of all pieces concatenated, `points_vertex` maps them to mesh vertex indices
+        points_vertex = np.fromiter(chain.from_iterable(pieces), dtype=np.intp, count=num_points)
+        pieces_first = np.zeros(len(pieces), dtype=np.intp)
+        np.cumsum(pieces_num_points[:-1], out=pieces_first[1:])
+        pieces_last = pieces_first + pieces_num_points - 1
+        points_piece = np.repeat(np.arange(len(pieces)), pieces_num_points)
+        points_position = verts_position[points_vertex].astype(np.float64)
+
+        # Tangent of each point is the direction from the previous point to the next one. The first and last points
+        # of each piece don't have a previous/next point, so the point itself is used instead.
+        points_prev = np.arange(num_points) - 1
+        points_next = np.arange(num_points) + 1
+        points_prev[pieces_first] = pieces_first
+        points_next[pieces_last] = pieces_last
+        points_tangent = normalize_vectors(points_position[points_next] - points_position[points_prev])
+
+        # Distance from each point to the line connecting the start and end points of its piece
+        points_distance = distances_points_to_lines(
+            points_position[pieces_first[points_piece]],
+            points_position[pieces_last[points_piece]],
+            points_position,
+        )
+
+        # Each segment between two points is composed of 2 triangles (6 vertices):
+        #   (p0 -r -> p1 -r -> p0 +r) and (p0 +r -> p1 -r -> p1 +r)
+        segments_p0 = np.delete(np.arange(num_points), pieces_last)
+        segments_p1 = segments_p0 + 1
+        out_points = np.column_stack(
+            (segments_p0, segments_p1, segments_p0, segments_p0, segments_p1, segments_p1)
+        ).ravel()
+        out_radius_sign = np.tile(np.array((-1.0, -1.0, 1.0, 1.0, -1.0, 1.0)), len(segments_p0))
+        out_verts = points_vertex[out_points]
+        num_output_verts = len(out_points)
 
         # Vertex Layout:
         #   Position
@@ -50,90 +84,18 @@ class CableVertexBufferBuilder:
         struct_dtype = [VertexBuffer.VERT_ATTR_DTYPES[attr_name]
                         for attr_name in ("Position", "Normal", "Colour0", "TexCoord0")]
         output_vertex_arr = np.empty(num_output_verts, dtype=struct_dtype)
-        output_vertex_materials_arr = np.empty(num_output_verts, dtype=np.int32)
-        v_pos = output_vertex_arr["Position"]
-        v_tan = output_vertex_arr["Normal"]
         v_col = output_vertex_arr["Colour0"]
         v_tex = output_vertex_arr["TexCoord0"]
 
-        out_vi = 0  # Current output vertex index
-        for piece_vertices in pieces:
-            num_vertices = len(piece_vertices)
-            if num_vertices <= 1:
-                # Cannot have a cable with just 1 vertex
-                continue
-
-            # Calculate tangents and distances (distance from vertex to line connecting start and end vertices)
-            tangents = [None] * num_vertices
-            distances = [None] * num_vertices
-            start = Vector(verts_position[piece_vertices[0]])
-            end = Vector(verts_position[piece_vertices[-1]])
-            for i in range(num_vertices):
-                vcurr = piece_vertices[i]
-                pcurr = Vector(verts_position[vcurr])
-                if i == 0:
-                    # For the first vertex, tangent is just the direction to the next vertex
-                    vnext = piece_vertices[i + 1]
-                    pnext = Vector(verts_position[vnext])
-                    tangent = (pnext - pcurr).normalized()
-                elif i + 1 < num_vertices:
-                    # For the middle points, tangent is the direction from the previous vertex to the next one
-                    vprev = piece_vertices[i - 1]
-                    vnext = piece_vertices[i + 1]
-                    pprev = Vector(verts_position[vprev])
-                    pnext = Vector(verts_position[vnext])
-                    tangent = (pnext - pprev).normalized()
-                else:
-                    # For the last, use the direction from the previous vertex to this one
-                    vprev = piece_vertices[i - 1]
-                    pprev = Vector(verts_position[vprev])
-                    tangent = (pcurr - pprev).normalized()
-
-                tangents[i] = tangent
-
-                distances[i] = distance_point_to_line(start, end, pcurr)
-
-            # Build output vertices
-            for i0 in range(num_vertices - 1):
-                i1 = i0 + 1
-                v0 = piece_vertices[i0]
-                v1 = piece_vertices[i1]
-
-                # First triangle (v0 -r -> v1 -r -> v0 +r)
-                v_pos[out_vi] = verts_position[v0]
-                v_tan[out_vi] = tangents[i0]
-                v_col[out_vi][0] = int(verts_phase_offset[v0][0] * 255)
-                v_col[out_vi][1] = int(verts_phase_offset[v0][1] * 255)
-                v_col[out_vi][2] = 0  # unused
-                v_col[out_vi][3] = int(verts_diffuse_factor[v0] * 255)
-                v_tex[out_vi][0] = -verts_radius[v0]  # negative
-                v_tex[out_vi][1] = distances[i0] * verts_um_scale[v0]
-                output_vertex_materials_arr[out_vi] = verts_material[v0]
-
-                v_pos[out_vi + 1] = verts_position[v1]
-                v_tan[out_vi + 1] = tangents[i1]
-                v_col[out_vi + 1][0] = int(verts_phase_offset[v1][0] * 255)
-                v_col[out_vi + 1][1] = int(verts_phase_offset[v1][1] * 255)
-                v_col[out_vi + 1][2] = 0  # unused
-                v_col[out_vi + 1][3] = int(verts_diffuse_factor[v1] * 255)
-                v_tex[out_vi + 1][0] = -verts_radius[v1]  # negative
-                v_tex[out_vi + 1][1] = distances[i1] * verts_um_scale[v1]
-                output_vertex_materials_arr[out_vi + 1] = verts_material[v1]
-
-                #   same as first vertex but with positive radius
-                output_vertex_arr[out_vi + 2] = output_vertex_arr[out_vi]
-                v_tex[out_vi + 2][0] = verts_radius[v0]  # positive
-                output_vertex_materials_arr[out_vi + 2] = verts_material[v0]
-
-                # Second triangle (v0 +r -> v1 -r -> v1 +r)
-                output_vertex_arr[out_vi + 3] = output_vertex_arr[out_vi + 2]
-                output_vertex_arr[out_vi + 4] = output_vertex_arr[out_vi + 1]
-                output_vertex_arr[out_vi + 5] = output_vertex_arr[out_vi + 1]
-                v_tex[out_vi + 5][0] = verts_radius[v1]  # positive
-                output_vertex_materials_arr[out_vi + 3] = output_vertex_materials_arr[out_vi + 2]
-                output_vertex_materials_arr[out_vi + 4] = output_vertex_materials_arr[out_vi + 1]
-                output_vertex_materials_arr[out_vi + 5] = output_vertex_materials_arr[out_vi + 1]
+        output_vertex_arr["Position"] = verts_position[out_verts]
+        output_vertex_arr["Normal"] = points_tangent[out_points]
+        v_col[:, 0] = (verts_phase_offset[out_verts, 0] * 255).astype(np.int32)
+        v_col[:, 1] = (verts_phase_offset[out_verts, 1] * 255).astype(np.int32)
+        v_col[:, 2] = 0  # unused
+        v_col[:, 3] = (verts_diffuse_factor[out_verts] * 255).astype(np.int32)
+        v_tex[:, 0] = verts_radius[out_verts] * out_radius_sign
+        v_tex[:, 1] = points_distance[out_points] * verts_um_scale[out_verts]
 
-                out_vi += 6
+        output_vertex_materials_arr = verts_material[out_verts].astype(np.int32)
 
         return output_vertex_arr, output_vertex_materials_arr
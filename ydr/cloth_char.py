@@ -35,10 +35,14 @@ from ..ybn.ybnexport import (
     create_composite_xml,
 )
 from .cloth import (
-    mesh_get_cloth_attribute_values,
-    mesh_has_cloth_attribute,
     ClothAttr,
 )
+from .cloth_mesh_export import (
+    cloth_mesh_read_data,
+    cloth_mesh_pinned_first_vertex_map,
+    cloth_mesh_get_edges,
+    create_verlet_edges,
+)
 from .cloth_diagnostics import (
     ClothDiagMeshBindingError,
     cloth_export_context,
@@ -186,44 +190,12 @@ def cloth_char_export(
         )
         return None
 
-    pinned = np.array(mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PINNED)) != 0
-    num_pinned = np.sum(pinned)
-
-    mesh_to_cloth_vertex_map = [None] * num_vertices
-    cloth_to_mesh_vertex_map = [None] * num_vertices
-    vertices = [None] * num_vertices
-    normals = [None] * num_vertices
-    for v in cloth_mesh.vertices:
-        vi = v.index
-        vertices[vi] = Vector(v.co)
-        normals[vi] = Vector(v.normal)
-        mesh_to_cloth_vertex_map[vi] = vi
-        cloth_to_mesh_vertex_map[vi] = vi
-
-    cloth_pin_index = 0
-    for v in cloth_mesh.vertices:
-        if pinned[v.index]:
-            if v.index != cloth_pin_index:
-                # Swap vertices so the pinned vertices are placed at the start of the array
-                vA = vertices[cloth_pin_index]
-                vB = vertices[v.index]
-                nA = normals[cloth_pin_index]
-                nB = normals[v.index]
-
-                vertices[cloth_pin_index] = vB
-                vertices[v.index] = vA
-                normals[cloth_pin_index] = nB
-                normals[v.index] = nA
-
-                mesh_to_cloth_vertex_map[cloth_to_mesh_vertex_map[cloth_pin_index]] = mesh_to_cloth_vertex_map[v.index]
-                cloth_to_mesh_vertex_map[v.index] = cloth_to_mesh_vertex_map[cloth_pin_index]
-
-                mesh_to_cloth_vertex_map[v.index] = cloth_pin_index
-                cloth_to_mesh_vertex_map[cloth_pin_index] = v.index
-
-            cloth_pin_index += 1
-
-    triangles = cloth_mesh.loop_triangles
+    data = cloth_mesh_read_data(cloth_mesh)
+    num_pinned = np.count_nonzero(data.pinned)
+    cloth_to_mesh_vertex_map, mesh_to_cloth_vertex_map = cloth_mesh_pinned_first_vertex_map(data.pinned)
+
+    vertices = [Vector(v) for v in data.positions[cloth_to_mesh_vertex_map]]
+    normals = [Vector(n) for n in data.normals[cloth_to_mesh_vertex_map]]
 
     char_cloth_props = drawable_obj.drawable_properties.char_cloth
 
@@ -236,75 +208,29 @@ def cloth_char_export(
     controller.vertices = vertices
     bridge = controller.bridge
     bridge.vertex_count_high = num_vertices
-    if mesh_has_cloth_attribute(cloth_mesh, ClothAttr.PIN_RADIUS):
-        pin_radius = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PIN_RADIUS)
-        bridge.pin_radius_high = [
-            pin_radius[mi][set_idx]
-            for set_idx in range(char_cloth_props.num_pin_radius_sets)
-            for mi in cloth_to_mesh_vertex_map
-        ]
+    if data.pin_radius is not None:
+        num_pin_radius_sets = char_cloth_props.num_pin_radius_sets
+        bridge.pin_radius_high = data.pin_radius[cloth_to_mesh_vertex_map, :num_pin_radius_sets].T.ravel().tolist()
     else:
         bridge.pin_radius_high = None
-    vertex_weights = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.VERTEX_WEIGHT)
-    inflation_scale = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.INFLATION_SCALE)
-    bridge.vertex_weights_high = [vertex_weights[mi] for mi in cloth_to_mesh_vertex_map]
-    bridge.inflation_scale_high = [inflation_scale[mi] for mi in cloth_to_mesh_vertex_map]
-    bridge.display_map_high = mesh_to_cloth_vertex_map
+    bridge.vertex_weights_high = data.vertex_weights[cloth_to_mesh_vertex_map].tolist()
+    bridge.inflation_scale_high = data.inflation_scale[cloth_to_mesh_vertex_map].tolist()
+    bridge.display_map_high = mesh_to_cloth_vertex_map.tolist()
     # just need to allocate space for the pinnable list, unused
     bridge.pinnable_list = [0] * int(np.ceil(num_vertices / 32))
 
-    force_transform = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.FORCE_TRANSFORM)
-    if (force_transform != 0).any():
+    if (data.force_transform != 0).any():
         logger.warning(
             f"Character cloth mesh '{cloth_obj.name}' has {ClothAttr.FORCE_TRANSFORM.label} attribute, but this "
             "attribute is not supported in character cloth and will be ignored! Only fragment cloth support it."
         )
 
-    def _create_verlet_edge(mesh_v0: int, mesh_v1: int) -> VerletClothEdge:
-        verlet_edge = VerletClothEdge()
-        verlet_edge.vertex0 = mesh_to_cloth_vertex_map[mesh_v0]
-        verlet_edge.vertex1 = mesh_to_cloth_vertex_map[mesh_v1]
-        verlet_edge.length_sqr = Vector(vertices[verlet_edge.vertex0] -
-                                        vertices[verlet_edge.vertex1]).length_squared
-        verlet_edge.weight0 = 0.0 if pinned[mesh_v0] else 1.0 if pinned[mesh_v1] else 0.5
-        verlet_edge.compression_weight = 0.25  # TODO(cloth): compression_weight
-        return verlet_edge
-
-    indices = [None] * (len(triangles) * 3)
-    edges = []
-    edges_added = set()
-    for tri in triangles:
-        v0, v1, v2 = tri.vertices
-        indices[tri.index * 3 + 0] = mesh_to_cloth_vertex_map[v0]
-        indices[tri.index * 3 + 1] = mesh_to_cloth_vertex_map[v1]
-        indices[tri.index * 3 + 2] = mesh_to_cloth_vertex_map[v2]
-        for edge_v0, edge_v1 in ((v0, v1), (v1, v2), (v2, v0)):
-            if (edge_v0, edge_v1) in edges_added or (edge_v1, edge_v0) in edges_added:
-                continue
-
-            if pinned[edge_v0] and pinned[edge_v1]:
-                continue
-
-            verlet_edge = _create_verlet_edge(edge_v0, edge_v1)
-            edges.append(verlet_edge)
-            edges_added.add((edge_v0, edge_v1))
-
-    # Look for loose edges (not part of any triangle), these work as additional edges to keep the shape/structure
-    # of the object, stored in the custom edges array
-    custom_edges = []
-    for edge in cloth_mesh.edges:
-        v0, v1 = edge.vertices
-        if (v0, v1) in edges_added or (v1, v0) in edges_added:
-            continue
+    indices = mesh_to_cloth_vertex_map[data.triangles].ravel().tolist()
 
-        if pinned[v0] and pinned[v1]:
-            continue
-
-        verlet_edge = _create_verlet_edge(v0, v1)
-        custom_edges.append(verlet_edge)
-        edges_added.add((v0, v1))
-
-    del edges_added
+    edges_data, custom_edges_data = cloth_mesh_get_edges(data, mesh_to_cloth_vertex_map)
+    edges = create_verlet_edges(edges_data, _create_cwxml_verlet_edge)
+    custom_edges = create_verlet_edges(custom_edges_data, _create_cwxml_verlet_edge)
+    mesh_to_cloth_vertex_map = mesh_to_cloth_vertex_map.tolist()
 
     from .cloth_env import _cloth_sort_verlet_edges
     edges = _cloth_sort_verlet_edges(edges)
@@ -314,8 +240,8 @@ def cloth_char_export(
     verlet = controller.cloth_high
     verlet.vertex_positions = vertices
     verlet.vertex_normals = normals
-    verlet.bb_min = Vector(np.min(vertices, axis=0))
-    verlet.bb_max = Vector(np.max(vertices, axis=0))
+    verlet.bb_min = Vector(np.min(data.positions, axis=0))
+    verlet.bb_max = Vector(np.max(data.positions, axis=0))
     verlet.switch_distance_up = 9999.0
     verlet.switch_distance_down = 9999.0
     verlet.flags = 0
@@ -368,37 +294,42 @@ def cloth_char_export(
     return char_cloth
 
 
+def _create_cwxml_verlet_edge(
+    vertex0: int, vertex1: int, length_sqr: float, weight0: float, compression_weight: float
+) -> VerletClothEdge:
+    verlet_edge = VerletClothEdge()
+    verlet_edge.vertex0 = vertex0
+    verlet_edge.vertex1 = vertex1
+    verlet_edge.length_sqr = length_sqr
+    verlet_edge.weight0 = weight0
+    verlet_edge.compression_weight = compression_weight
+    return verlet_edge
+
+
 def _cloth_char_get_cloth_to_bone_bindings(
     cloth_mesh: Mesh,
     cloth_obj: Object,
     armature_obj: Object
 ) -> tuple[NDArray[np.float32], NDArray[np.uint32], list[int]]:
-    from .vertex_buffer_builder import normalize_weights, get_sorted_vertex_group_elements, try_get_bone_by_vgroup
+    from .vertex_buffer_builder import normalize_weights, try_get_bone_by_vgroup, VGROUP_INVALID_BONE_ID
+    from .cloth_mesh_export import cloth_mesh_get_vertex_group_weights
 
     bone_by_vgroup = try_get_bone_by_vgroup(cloth_obj, armature_obj)
     assert bone_by_vgroup is not None
 
-    num_verts = len(cloth_mesh.vertices)
-
-    ind_arr = np.zeros((num_verts, 4), dtype=np.uint32)
-    weights_arr = np.zeros((num_verts, 4), dtype=np.float32)
-    bone_index_map = {}
-
-    ungrouped_verts = 0
-
-    for i, vert in enumerate(cloth_mesh.vertices):
-        groups = get_sorted_vertex_group_elements(vert, bone_by_vgroup)
-        if not groups:
-            ungrouped_verts += 1
-            continue
-
-        for j, grp in enumerate(groups):
-            if j > 3:
-                break
+    weights_arr, bones_arr, num_groups = cloth_mesh_get_vertex_group_weights(
+        cloth_mesh, bone_by_vgroup, VGROUP_INVALID_BONE_ID
+    )
+    ungrouped_verts = np.count_nonzero(num_groups == 0)
 
-            weights_arr[i][j] = grp.weight
-            bone_index = bone_by_vgroup[grp.group]
-            ind_arr[i][j] = bone_index_map.setdefault(bone_index, len(bone_index_map))
+    # Remap bone indices to the cloth bone list, bones are numbered in the order they are first used
+    used = np.arange(bones_arr.shape[1]) < num_groups[:, np.newaxis]
+    used_bones = bones_arr[used]
+    unique_bones, first_occurrence = np.unique(used_bones, return_index=True)
+    unique_bones = unique_bones[np.argsort(first_occurrence)]
+    bone_to_cloth_bone = {b: i for i, b in enumerate(unique_bones.tolist())}
+    ind_arr = np.zeros(bones_arr.shape, dtype=np.uint32)
+    ind_arr[used] = [bone_to_cloth_bone[b] for b in used_bones.tolist()]
 
     if ungrouped_verts != 0:
         logger.warning(
@@ -409,7 +340,7 @@ def _cloth_char_get_cloth_to_bone_bindings(
         )
 
     weights_arr = normalize_weights(weights_arr)
-    return weights_arr, ind_arr, list(bone_index_map.keys())
+    return weights_arr, ind_arr, list(bone_to_cloth_bone.keys())
 
 
 def cloth_char_get_mesh_to_cloth_bindings(
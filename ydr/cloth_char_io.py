@@ -12,7 +12,6 @@ from mathutils import (
 from szio.gta5 import (
     AssetClothDictionary,
     VerletCloth,
-    VerletClothEdge,
     ClothBridgeSimGfx,
     CharacterClothBinding,
     CharacterClothController,
@@ -34,11 +33,15 @@ from ..ybn.ybnimport_io import create_bound_composite
 from ..ybn.ybnexport_io import create_bound_composite_asset
 from ..iecontext import export_context
 from .cloth import (
-    mesh_get_cloth_attribute_values,
-    mesh_has_cloth_attribute,
     mesh_add_cloth_attribute,
     ClothAttr,
 )
+from .cloth_mesh_export import (
+    cloth_mesh_read_data,
+    cloth_mesh_pinned_first_vertex_map,
+    cloth_mesh_get_edges,
+    create_verlet_edges,
+)
 from .cloth_diagnostics import (
     ClothDiagMeshBindingError,
     cloth_export_context,
@@ -163,114 +166,35 @@ def cloth_char_export(
         )
         return None
 
-    pinned = np.array(mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PINNED)) != 0
-    num_pinned = np.sum(pinned)
-
-    mesh_to_cloth_vertex_map = [None] * num_vertices
-    cloth_to_mesh_vertex_map = [None] * num_vertices
-    vertices = [None] * num_vertices
-    normals = [None] * num_vertices
-    for v in cloth_mesh.vertices:
-        vi = v.index
-        vertices[vi] = Vector(v.co)
-        normals[vi] = Vector(v.normal)
-        mesh_to_cloth_vertex_map[vi] = vi
-        cloth_to_mesh_vertex_map[vi] = vi
-
-    cloth_pin_index = 0
-    for v in cloth_mesh.vertices:
-        if pinned[v.index]:
-            if v.index != cloth_pin_index:
-                # Swap vertices so the pinned vertices are placed at the start of the array
-                vA = vertices[cloth_pin_index]
-                vB = vertices[v.index]
-                nA = normals[cloth_pin_index]
-                nB = normals[v.index]
-
-                vertices[cloth_pin_index] = vB
-                vertices[v.index] = vA
-                normals[cloth_pin_index] = nB
-                normals[v.index] = nA
-
-                mesh_to_cloth_vertex_map[cloth_to_mesh_vertex_map[cloth_pin_index]] = mesh_to_cloth_vertex_map[v.index]
-                cloth_to_mesh_vertex_map[v.index] = cloth_to_mesh_vertex_map[cloth_pin_index]
-
-                mesh_to_cloth_vertex_map[v.index] = cloth_pin_index
-                cloth_to_mesh_vertex_map[cloth_pin_index] = v.index
-
-            cloth_pin_index += 1
-
-    triangles = cloth_mesh.loop_triangles
+    data = cloth_mesh_read_data(cloth_mesh)
+    num_pinned = np.count_nonzero(data.pinned)
+    cloth_to_mesh_vertex_map, mesh_to_cloth_vertex_map = cloth_mesh_pinned_first_vertex_map(data.pinned)
+
+    vertices = [Vector(v) for v in data.positions[cloth_to_mesh_vertex_map]]
+    normals = [Vector(n) for n in data.normals[cloth_to_mesh_vertex_map]]
 
     char_cloth_props = drawable_obj.drawable_properties.char_cloth
 
-    if mesh_has_cloth_attribute(cloth_mesh, ClothAttr.PIN_RADIUS):
-        pin_radius = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PIN_RADIUS)
-        pin_radius = [
-            pin_radius[mi][set_idx]
-            for set_idx in range(char_cloth_props.num_pin_radius_sets)
-            for mi in cloth_to_mesh_vertex_map
-        ]
+    if data.pin_radius is not None:
+        num_pin_radius_sets = char_cloth_props.num_pin_radius_sets
+        pin_radius = data.pin_radius[cloth_to_mesh_vertex_map, :num_pin_radius_sets].T.ravel().tolist()
     else:
         pin_radius = []
-    vertex_weights = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.VERTEX_WEIGHT)
-    vertex_weights = [vertex_weights[mi] for mi in cloth_to_mesh_vertex_map]
-    inflation_scale = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.INFLATION_SCALE)
-    inflation_scale = [inflation_scale[mi] for mi in cloth_to_mesh_vertex_map]
+    vertex_weights = data.vertex_weights[cloth_to_mesh_vertex_map].tolist()
+    inflation_scale = data.inflation_scale[cloth_to_mesh_vertex_map].tolist()
 
-    force_transform = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.FORCE_TRANSFORM)
-    if (force_transform != 0).any():
+    if (data.force_transform != 0).any():
         logger.warning(
             f"Character cloth mesh '{cloth_obj.name}' has {ClothAttr.FORCE_TRANSFORM.label} attribute, but this "
             "attribute is not supported in character cloth and will be ignored! Only fragment cloth support it."
         )
 
-    def _create_verlet_edge(mesh_v0: int, mesh_v1: int) -> VerletClothEdge:
-        vertex0 = mesh_to_cloth_vertex_map[mesh_v0]
-        vertex1 = mesh_to_cloth_vertex_map[mesh_v1]
-        return VerletClothEdge(
-            vertex0=vertex0,
-            vertex1=vertex1,
-            length_sqr=Vector(vertices[vertex0] - vertices[vertex1]).length_squared,
-            weight0=0.0 if pinned[mesh_v0] else 1.0 if pinned[mesh_v1] else 0.5,
-            compression_weight=0.25,
-        )
-
-    indices = [None] * (len(triangles) * 3)
-    edges = []
-    edges_added = set()
-    for tri in triangles:
-        v0, v1, v2 = tri.vertices
-        indices[tri.index * 3 + 0] = mesh_to_cloth_vertex_map[v0]
-        indices[tri.index * 3 + 1] = mesh_to_cloth_vertex_map[v1]
-        indices[tri.index * 3 + 2] = mesh_to_cloth_vertex_map[v2]
-        for edge_v0, edge_v1 in ((v0, v1), (v1, v2), (v2, v0)):
-            if (edge_v0, edge_v1) in edges_added or (edge_v1, edge_v0) in edges_added:
-                continue
-
-            if pinned[edge_v0] and pinned[edge_v1]:
-                continue
-
-            verlet_edge = _create_verlet_edge(edge_v0, edge_v1)
-            edges.append(verlet_edge)
-            edges_added.add((edge_v0, edge_v1))
-
-    # Look for loose edges (not part of any triangle), these work as additional edges to keep the shape/structure
-    # of the object, stored in the custom edges array
-    custom_edges = []
-    for edge in cloth_mesh.edges:
-        v0, v1 = edge.vertices
-        if (v0, v1) in edges_added or (v1, v0) in edges_added:
-            continue
-
-        if pinned[v0] and pinned[v1]:
-            continue
-
-        verlet_edge = _create_verlet_edge(v0, v1)
-        custom_edges.append(verlet_edge)
-        edges_added.add((v0, v1))
+    indices = mesh_to_cloth_vertex_map[data.triangles].ravel().tolist()
 
-    del edges_added
+    edges_data, custom_edges_data = cloth_mesh_get_edges(data, mesh_to_cloth_vertex_map)
+    edges = create_verlet_edges(edges_data)
+    custom_edges = create_verlet_edges(custom_edges_data)
+    mesh_to_cloth_vertex_map = mesh_to_cloth_vertex_map.tolist()
 
     from .cloth_env_io import _cloth_sort_verlet_edges
     edges = _cloth_sort_verlet_edges(edges)
@@ -279,8 +203,8 @@ def cloth_char_export(
     verlet = VerletCloth(
         vertex_positions=vertices,
         vertex_normals=normals,
-        bb_min=Vector(np.min(vertices, axis=0)),
-        bb_max=Vector(np.max(vertices, axis=0)),
+        bb_min=Vector(np.min(data.positions, axis=0)),
+        bb_max=Vector(np.max(data.positions, axis=0)),
         switch_distance_up=9999.0,
         switch_distance_down=9999.0,
         flags=0,
@@ -44,6 +44,12 @@ from .ydrexport_io import (
 from .cloth_env import (
     cloth_env_find_mesh_objects,
 )
+from .cloth_mesh_export import (
+    cloth_mesh_read_data,
+    cloth_mesh_pinned_first_vertex_map,
+    cloth_mesh_get_edges,
+    create_verlet_edges,
+)
 from .cloth_diagnostics import (
     ClothDiagMeshBindingError,
     cloth_export_context,
@@ -134,8 +140,6 @@ def _cloth_env_export(frag_obj: Object, cloth_obj: Object, drawable: AssetDrawab
         )
         return None
 
-    from .cloth import mesh_get_cloth_attribute_values, mesh_has_cloth_attribute, ClothAttr
-
     cloth_obj_eval = get_evaluated_obj(cloth_obj)
     cloth_mesh = cloth_obj_eval.to_mesh()
     cloth_mesh.calc_loop_triangles()
@@ -150,82 +154,15 @@ def _cloth_env_export(frag_obj: Object, cloth_obj: Object, drawable: AssetDrawab
         )
         return None
 
-    pinned = np.array(mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PINNED)) != 0
-    num_pinned = np.sum(pinned)
-
-    mesh_to_cloth_vertex_map = [None] * num_vertices
-    cloth_to_mesh_vertex_map = [None] * num_vertices
-    vertices = [None] * num_vertices
-    for v in cloth_mesh.vertices:
-        vi = v.index
-        vertices[vi] = Vector(v.co)
-        mesh_to_cloth_vertex_map[vi] = vi
-        cloth_to_mesh_vertex_map[vi] = vi
-
-    cloth_pin_index = 0
-    for v in cloth_mesh.vertices:
-        if pinned[v.index]:
-            if v.index != cloth_pin_index:
-                # Swap vertices so the pinned vertices are placed at the start of the array
-                vA = vertices[cloth_pin_index]
-                vB = vertices[v.index]
-
-                vertices[cloth_pin_index] = vB
-                vertices[v.index] = vA
-
-                mesh_to_cloth_vertex_map[cloth_to_mesh_vertex_map[cloth_pin_index]] = mesh_to_cloth_vertex_map[v.index]
-                cloth_to_mesh_vertex_map[v.index] = cloth_to_mesh_vertex_map[cloth_pin_index]
-
-                mesh_to_cloth_vertex_map[v.index] = cloth_pin_index
-                cloth_to_mesh_vertex_map[cloth_pin_index] = v.index
-
-            cloth_pin_index += 1
-
-    def _create_verlet_edge(mesh_v0: int, mesh_v1: int) -> VerletClothEdge:
-        vertex0 = mesh_to_cloth_vertex_map[mesh_v0]
-        vertex1 = mesh_to_cloth_vertex_map[mesh_v1]
-        return VerletClothEdge(
-            vertex0=vertex0,
-            vertex1=vertex1,
-            length_sqr=Vector(vertices[vertex0] - vertices[vertex1]).length_squared,
-            weight0=0.0 if pinned[mesh_v0] else 1.0 if pinned[mesh_v1] else 0.5,
-            compression_weight=0.25,
-        )
-
-    triangles = cloth_mesh.loop_triangles
-
-    edges = []
-    edges_added = set()
-    for tri in triangles:
-        v0, v1, v2 = tri.vertices
-        for edge_v0, edge_v1 in ((v0, v1), (v1, v2), (v2, v0)):
-            if (edge_v0, edge_v1) in edges_added or (edge_v1, edge_v0) in edges_added:
-                continue
-
-            if pinned[edge_v0] and pinned[edge_v1]:
-                continue
-
-            verlet_edge = _create_verlet_edge(edge_v0, edge_v1)
-            edges.append(verlet_edge)
-            edges_added.add((edge_v0, edge_v1))
-
-    # Look for loose edges (not part of any triangle), these work as additional edges to keep the shape/structure
-    # of the object, stored in the custom edges array
-    custom_edges = []
-    for edge in cloth_mesh.edges:
-        v0, v1 = edge.vertices
-        if (v0, v1) in edges_added or (v1, v0) in edges_added:
-            continue
-
-        if pinned[v0] and pinned[v1]:
-            continue
+    data = cloth_mesh_read_data(cloth_mesh)
+    num_pinned = np.count_nonzero(data.pinned)
+    cloth_to_mesh_vertex_map, mesh_to_cloth_vertex_map = cloth_mesh_pinned_first_vertex_map(data.pinned)
 
-        verlet_edge = _create_verlet_edge(v0, v1)
-        custom_edges.append(verlet_edge)
-        edges_added.add((v0, v1))
-        # cloth_obj.data.edges[edge.index].select = True
+    vertices = [Vector(v) for v in data.positions[cloth_to_mesh_vertex_map]]
 
-    del edges_added
+    edges_data, custom_edges_data = cloth_mesh_get_edges(data, mesh_to_cloth_vertex_map)
+    edges = create_verlet_edges(edges_data)
+    custom_edges = create_verlet_edges(custom_edges_data)
 
     edges = _cloth_sort_verlet_edges(edges)
     custom_edges = _cloth_sort_verlet_edges(custom_edges)
@@ -254,8 +191,8 @@ def _cloth_env_export(frag_obj: Object, cloth_obj: Object, drawable: AssetDrawab
     verlet = VerletCloth(
         vertex_positions=vertices,
         vertex_normals=[],  # env cloth never has vertex normals
-        bb_min=Vector(np.min(vertices, axis=0)),
-        bb_max=Vector(np.max(vertices, axis=0)),
+        bb_min=Vector(np.min(data.positions, axis=0)),
+        bb_max=Vector(np.max(data.positions, axis=0)),
         switch_distance_up=500.0,  # TODO(cloth): switch distance? think it is only needed with multiple lods
         switch_distance_down=0.0,
         cloth_weight=cloth_props.weight,
@@ -266,25 +203,21 @@ def _cloth_env_export(frag_obj: Object, cloth_obj: Object, drawable: AssetDrawab
         flags=2 if world_bounds else 0,
     )
 
-    if mesh_has_cloth_attribute(cloth_mesh, ClothAttr.PIN_RADIUS):
-        pin_radius = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PIN_RADIUS)
-        pin_radius = [
-            pin_radius[mi][0]  # env cloth only ever has 1 pin radius set
-            for mi in cloth_to_mesh_vertex_map
-        ]
+    if data.pin_radius is not None:
+        pin_radius = data.pin_radius[cloth_to_mesh_vertex_map, 0].tolist()  # env cloth only ever has 1 pin radius set
     else:
         pin_radius = []
-    vertex_weights = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.VERTEX_WEIGHT)
-    vertex_weights = [vertex_weights[mi] for mi in cloth_to_mesh_vertex_map]
-    inflation_scale = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.INFLATION_SCALE)
-    inflation_scale = [inflation_scale[mi] for mi in cloth_to_mesh_vertex_map]
-
-    force_transform = mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.FORCE_TRANSFORM)
-    if (force_transform != 0).any():
-        user_data = [force_transform[mi] for mi in cloth_to_mesh_vertex_map]
+    vertex_weights = data.vertex_weights[cloth_to_mesh_vertex_map].tolist()
+    inflation_scale = data.inflation_scale[cloth_to_mesh_vertex_map].tolist()
+
+    if (data.force_transform != 0).any():
+        user_data = data.force_transform[cloth_to_mesh_vertex_map].tolist()
     else:
         user_data = []
 
+    cloth_to_mesh_vertex_map = cloth_to_mesh_vertex_map.tolist()
+    mesh_to_cloth_vertex_map = mesh_to_cloth_vertex_map.tolist()
+
     bridge = ClothBridgeSimGfx(
         vertex_count_high=num_vertices,
         pin_radius_high=pin_radius,
@@ -298,7 +231,7 @@ def _cloth_env_export(frag_obj: Object, cloth_obj: Object, drawable: AssetDrawab
         flags=3,   # owns morph controller + owns bridge
         bridge=bridge,
         cloth_high=verlet,
-        morph_high_poly_count=len(triangles),
+        morph_high_poly_count=len(data.triangles),
     )
 
     cloth_drawable = create_asset_drawable(export_context().settings.targets, is_frag=True)
@@ -0,0 +1,231 @@
+"""Columnar reading of cloth meshes for export. All per-vertex and per-edge data needed to build the verlet cloth is
+gathered into NumPy arrays in one go, instead of iterating the mesh vertices and triangles multiple times.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+from bpy.types import (
+    Mesh,
+)
+from typing import NamedTuple, Optional, TypeVar
+from collections.abc import Callable
+from szio.gta5 import VerletClothEdge
+from .cloth import (
+    mesh_get_cloth_attribute_values,
+    mesh_has_cloth_attribute,
+    ClothAttr,
+)
+
+
+class ClothMeshData(NamedTuple):
+    positions: NDArray[np.float32]
+    normals: NDArray[np.float32]
+    pinned: NDArray[np.bool_]
+    vertex_weights: NDArray[np.float32]
+    inflation_scale: NDArray[np.float32]
+    force_transform: NDArray[np.int32]
+    pin_radius: Optional[NDArray[np.float32]]
+    """``None`` if the mesh doesn't have the pin radius attribute."""
+    triangles: NDArray[np.uint32]
+    edges: NDArray[np.uint32]
+
+
+class ClothEdgesData(NamedTuple):
+    """Verlet edges in the cloth vertex order (i.e. after remapping with ``mesh_to_cloth``)."""
+    vertex0: NDArray[np.uint32]
+    vertex1: NDArray[np.uint32]
+    length_sqr: NDArray[np.float32]
+    weight0: NDArray[np.float32]
+
+    def __len__(self) -> int:
+        return len(self.vertex0)
+
+    def iter_rows(self):
+        """Iterates each edge as a tuple of Python values ``(vertex0, vertex1, length_sqr, weight0)``."""
+        return zip(self.vertex0.tolist(), self.vertex1.tolist(), self.length_sqr.tolist(), self.weight0.tolist())
+
+
+def cloth_mesh_read_data(cloth_mesh: Mesh) -> ClothMeshData:
+    """Reads all the data of the cloth mesh needed for export. ``cloth_mesh.calc_loop_triangles`` must have been
+    called before.
+    """
+    num_verts = len(cloth_mesh.vertices)
+    positions = np.empty(num_verts * 3, dtype=np.float32)
+    normals = np.empty(num_verts * 3, dtype=np.float32)
+    cloth_mesh.vertices.foreach_get("co", positions)
+    cloth_mesh.vertices.foreach_get("normal", normals)
+
+    triangles = np.empty(len(cloth_mesh.loop_triangles) * 3, dtype=np.uint32)
+    cloth_mesh.loop_triangles.foreach_get("vertices", triangles)
+
+    edges = np.empty(len(cloth_mesh.edges) * 2, dtype=np.uint32)
+    cloth_mesh.edges.foreach_get("vertices", edges)
+
+    return ClothMeshData(
+        positions=positions.reshape((num_verts, 3)),
+        normals=normals.reshape((num_verts, 3)),
+        pinned=mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PINNED) != 0,
+        vertex_weights=mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.VERTEX_WEIGHT),
+        inflation_scale=mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.INFLATION_SCALE),
+        force_transform=mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.FORCE_TRANSFORM),
+        pin_radius=(
+            mesh_get_cloth_attribute_values(cloth_mesh, ClothAttr.PIN_RADIUS)
+            if mesh_has_cloth_attribute(cloth_mesh, ClothAttr.PIN_RADIUS)
+            else None
+        ),
+        triangles=triangles.reshape((-1, 3)),
+        edges=edges.reshape((-1, 2)),
+    )
+
+
+def cloth_mesh_pinned_first_vertex_map(pinned: NDArray[np.bool_]) -> tuple[NDArray[np.uint32], NDArray[np.uint32]]:
+    """Gets the vertex order used by the cloth, pinned vertices must be placed at the start of the array. Pinned
+    vertices are swapped into place in mesh order, so the order matches the one of previous Sollumz versions.
+
+    Returns a tuple ``(cloth_to_mesh, mesh_to_cloth)`` with the maps between mesh vertex indices and cloth vertex
+    indices.
+    """
+    num_verts = len(pinned)
+    cloth_to_mesh = np.arange(num_verts, dtype=np.uint32)
+    for cloth_pin_index, mesh_index in enumerate(np.flatnonzero(pinned).tolist()):
+        # Slots after the current pinned vertex have not been touched yet, so `mesh_index` is still in its own slot
+        if mesh_index != cloth_pin_index:
+            cloth_to_mesh[[cloth_pin_index, mesh_index]] = cloth_to_mesh[[mesh_index, cloth_pin_index]]
+
+    mesh_to_cloth = np.empty(num_verts, dtype=np.uint32)
+    mesh_to_cloth[cloth_to_mesh] = np.arange(num_verts, dtype=np.uint32)
+    return cloth_to_mesh, mesh_to_cloth
+
+
+def cloth_mesh_get_edges(
+    data: ClothMeshData,
+    mesh_to_cloth: NDArray[np.uint32],
+) -> tuple[ClothEdgesData, ClothEdgesData]:
+    """Gets the verlet edges of the cloth mesh.
+
+    Returns a tuple ``(edges, custom_edges)``. ``edges`` are the unique edges of the triangles, in the order they are
+    first found. ``custom_edges`` are the loose edges, not part of any triangle, which are used as additional edges to
+    keep the shape/structure of the cloth. Edges between two pinned vertices are ignored.
+    """
+    num_verts = len(data.positions)
+    pinned = data.pinned
+
+    # Triangle edges: (v0, v1), (v1, v2), (v2, v0) of each triangle, in triangle order
+    tris = data.triangles.astype(np.int64)
+    tri_edges = np.stack((tris, np.roll(tris, -1, axis=1)), axis=2).reshape((-1, 2))
+    tri_edges_keys = _edge_keys(tri_edges, num_verts)
+    _, first_occurrence = np.unique(tri_edges_keys, return_index=True)
+    first_occurrence.sort()
+    tri_edges = tri_edges[first_occurrence]
+    tri_edges_keys = tri_edges_keys[first_occurrence]
+    tri_edges = tri_edges[~(pinned[tri_edges[:, 0]] & pinned[tri_edges[:, 1]])]
+
+    loose_edges = data.edges.astype(np.int64)
+    loose_edges_keys = _edge_keys(loose_edges, num_verts)
+    _, first_occurrence = np.unique(loose_edges_keys, return_index=True)
+    first_occurrence.sort()
+    loose_edges = loose_edges[first_occurrence]
+    loose_edges_keys = loose_edges_keys[first_occurrence]
+    loose_edges = loose_edges[~np.isin(loose_edges_keys, tri_edges_keys)]
+    loose_edges = loose_edges[~(pinned[loose_edges[:, 0]] & pinned[loose_edges[:, 1]])]
+
+    return (
+        _edges_data_from_mesh_edges(data, mesh_to_cloth, tri_edges),
+        _edges_data_from_mesh_edges(data, mesh_to_cloth, loose_edges),
+    )
+
+
+# TODO(cloth): compression_weight
+VERLET_EDGE_COMPRESSION_WEIGHT = 0.25
+
+T = TypeVar("T")
+
+
+def create_verlet_edges(
+    edges: ClothEdgesData,
+    create_edge: Callable[[int, int, float, float, float], T] = VerletClothEdge,
+) -> list[T]:
+    """Creates a verlet edge for each edge in ``edges``. ``create_edge`` is called with the arguments ``(vertex0,
+    vertex1, length_sqr, weight0, compression_weight)`` of each edge, by default it creates szio ``VerletClothEdge``s.
+    """
+    return [
+        create_edge(vertex0, vertex1, length_sqr, weight0, VERLET_EDGE_COMPRESSION_WEIGHT)
+        for vertex0, vertex1, length_sqr, weight0 in edges.iter_rows()
+    ]
+
+
+def _edge_keys(edges: NDArray[np.int64], num_verts: int) -> NDArray[np.int64]:
+    """Packs each edge in a single integer, independent of the vertices order."""
+    return np.minimum(edges[:, 0], edges[:, 1]) * num_verts + np.maximum(edges[:, 0], edges[:, 1])
+
+
+def _edges_data_from_mesh_edges(
+    data: ClothMeshData,
+    mesh_to_cloth: NDArray[np.uint32],
+    edges: NDArray[np.int64],
+) -> ClothEdgesData:
+    v0 = edges[:, 0]
+    v1 = edges[:, 1]
+    pinned0 = data.pinned[v0]
+    pinned1 = data.pinned[v1]
+    diff = data.positions[v0] - data.positions[v1]
+    return ClothEdgesData(
+        vertex0=mesh_to_cloth[v0],
+        vertex1=mesh_to_cloth[v1],
+        length_sqr=np.einsum("ij,ij->i", diff, diff),
+        weight0=np.where(pinned0, 0.0, np.where(pinned1, 1.0, 0.5)).astype(np.float32),
+    )
+
+
+def cloth_mesh_get_vertex_group_weights(
+    cloth_mesh: Mesh,
+    bone_by_vgroup: dict[int, int],
+    invalid_bone_id: int,
+    max_weights: int = 4,
+) -> tuple[NDArray[np.float32], NDArray[np.int64], NDArray[np.int64]]:
+    """Gets the highest ``max_weights`` vertex group weights of each vertex, sorted by weight in descending order.
+    Vertex groups that map to ``invalid_bone_id`` are ignored.
+
+    Returns a tuple ``(weights, bone_indices, num_groups)``, where ``num_groups`` is the number of valid vertex groups
+    of each vertex, clamped to ``max_weights``.
+    """
+    num_verts = len(cloth_mesh.vertices)
+
+    # Vertex groups are not exposed as attributes, so flatten them in a single pass
+    elem_vert = []
+    elem_group = []
+    elem_weight = []
+    for vert in cloth_mesh.vertices:
+        vi = vert.index
+        for elem in vert.groups:
+            elem_vert.append(vi)
+            elem_group.append(elem.group)
+            elem_weight.append(elem.weight)
+
+    elem_vert = np.array(elem_vert, dtype=np.int64)
+    elem_weight = np.array(elem_weight, dtype=np.float32)
+    elem_bone = np.array([bone_by_vgroup.get(g, invalid_bone_id) for g in elem_group], dtype=np.int64)
+
+    valid = elem_bone != invalid_bone_id
+    elem_vert = elem_vert[valid]
+    elem_weight = elem_weight[valid]
+    elem_bone = elem_bone[valid]
+
+    # Sort by vertex, then by weight descending. Stable, so vertex groups with equal weights keep their order
+    order = np.lexsort((-elem_weight, elem_vert))
+    elem_vert = elem_vert[order]
+    elem_weight = elem_weight[order]
+    elem_bone = elem_bone[order]
+
+    # Rank of each element within its vertex
+    vert_starts = np.searchsorted(elem_vert, elem_vert, side="left")
+    elem_rank = np.arange(len(elem_vert)) - vert_starts
+    keep = elem_rank < max_weights
+
+    weights = np.zeros((num_verts, max_weights), dtype=np.float32)
+    bones = np.zeros((num_verts, max_weights), dtype=np.int64)
+    weights[elem_vert[keep], elem_rank[keep]] = elem_weight[keep]
+    bones[elem_vert[keep], elem_rank[keep]] = elem_bone[keep]
+
+    num_groups = np.minimum(np.bincount(elem_vert, minlength=num_verts), max_weights)
+    return weights, bones, num_groups
@@ -6,9 +6,16 @@ from bpy.types import (
 import gpu
 from gpu_extras import batch
 import blf
-from mathutils import Vector
+import numpy as np
 from collections.abc import Sequence
 from ..sollumz_preferences import get_theme_settings
+from ..shared.viewport_overlays import (
+    OverlayCache,
+    mesh_update_tick,
+    read_attribute_values,
+    project_points_to_region,
+    cull_labels,
+)
 from .cloth import (
     ClothAttr,
     is_cloth_mesh_object,
@@ -18,7 +25,6 @@ from .cloth_diagnostics import (
     ClothDiagnosticsOverlayFlags,
     cloth_last_export_contexts,
 )
-import bmesh
 
 if bpy.app.version >= (4, 5, 0):
     POINT_UNIFORM_COLOR_SHADER_NAME = "POINT_UNIFORM_COLOR"
@@ -32,6 +38,8 @@ class ClothOverlaysDrawHandler:
     def __init__(self):
         self.handler_text = None
         self.handler_geometry = None
+        self.cache_attribute_values = OverlayCache()
+        self.cache_pinned_batch = OverlayCache()
 
     def register(self):
         self.handler_text = SpaceView3D.draw_handler_add(self.draw_text, (), "WINDOW", "POST_PIXEL")
@@ -40,6 +48,8 @@ class ClothOverlaysDrawHandler:
     def unregister(self):
         SpaceView3D.draw_handler_remove(self.handler_text, "WINDOW")
         SpaceView3D.draw_handler_remove(self.handler_geometry, "WINDOW")
+        self.cache_attribute_values.clear()
+        self.cache_pinned_batch.clear()
 
     def can_draw_anything(self) -> bool:
         context = bpy.context
@@ -99,12 +109,27 @@ class ClothOverlaysDrawHandler:
         if wm.sz_ui_cloth_pinned_visualize:
             self.draw_pinned_geometry(obj)
 
+    def get_attribute_values(self, cloth_obj: Object, attrs: Sequence[ClothAttr]) -> tuple[np.ndarray, list]:
+        """Gets the local-space vertex positions and the values of ``attrs`` at each vertex. Cached until the mesh
+        changes.
+        """
+        mesh = cloth_obj.data
+        is_edit = cloth_obj.mode == "EDIT"
+        key = (mesh_update_tick(mesh), is_edit, tuple(attrs))
+        return self.cache_attribute_values.get(
+            mesh, key, lambda: read_attribute_values(mesh, attrs, is_edit, mesh_get_cloth_attribute_values)
+        )
+
     def draw_attribute_values(self, cloth_obj: Object, attrs: Sequence[ClothAttr]):
         context = bpy.context
         wm = context.window_manager
         region = context.region
         rv3d = context.region_data
-        mesh = cloth_obj.data
+
+        coords, all_attr_values = self.get_attribute_values(cloth_obj, attrs)
+        positions, indices = project_points_to_region(region, rv3d, cloth_obj.matrix_world, coords)
+        if len(indices) == 0:
+            return
 
         font_id = 0
         blf.size(font_id, 11)
@@ -113,85 +138,59 @@ class ClothOverlaysDrawHandler:
         blf.shadow(font_id, 3, 0.0, 0.0, 0.0, 1.0)
         blf.shadow_offset(font_id, 2, -2)
 
-        matrix_world = cloth_obj.matrix_world
+        _, line_height = blf.dimensions(font_id, "0")
+        num_attrs = len(attrs)
+        positions, indices = cull_labels(
+            positions, indices,
+            cell_size=line_height * 2 * num_attrs,
+            max_labels=get_theme_settings().cloth_overlay_max_labels
+        )
 
         pin_radius_set_index = wm.sz_ui_cloth_pin_radius_set - 1
 
-        def _draw_vertex_attributes(pos: Vector, attr_values):
-            from bpy_extras.view3d_utils import location_3d_to_region_2d
-            pos = matrix_world @ pos
-            pos = location_3d_to_region_2d(region, rv3d, pos)
-            if pos:
-                for i, attr_value in enumerate(attr_values):
-                    attr_type = attrs[i].type
-                    if attrs[i] == ClothAttr.PIN_RADIUS:
-                        attr_str = f"{attr_value[pin_radius_set_index]:.2g}"
-                    elif attr_type == "FLOAT_VECTOR":
-                        attr_str = f"{attr_value[0]:.2g}  {attr_value[1]:.2g}"
-                    elif attr_type == "FLOAT_COLOR":
-                        attr_str = f"{attr_value[0]:.2g}  {attr_value[1]:.2g}  {attr_value[2]:.2g}  {attr_value[3]:.2g}"
-                    elif attr_type == "INT":
-                        attr_str = f"{attr_value}"
-                    else:  # FLOAT
-                        attr_str = f"{attr_value:.6g}"
-                    w, h = blf.dimensions(font_id, attr_str)
-                    attr_pos = pos - Vector((w * 0.5, h * i * 2 - (h * len(attr_values) / 2)))
-                    blf.position(font_id, attr_pos.x, attr_pos.y, 0.0)
-                    blf.draw(font_id, attr_str)
-
-        if cloth_obj.mode == "EDIT":
-            edit_mesh = bmesh.from_edit_mesh(mesh)
-            try:
-                attr_layers = [(
-                    edit_mesh.verts.layers.float_vector if attr.type == "FLOAT_VECTOR"
-                    else edit_mesh.verts.layers.int if attr.type == "INT"
-                    else edit_mesh.verts.layers.float_color if attr.type == "FLOAT_COLOR"
-                    else edit_mesh.verts.layers.float
-                ).get(attr, None) for attr in attrs]
-                for v in edit_mesh.verts:
-                    attr_values = [attr.default_value if attr_layers[i] is None else v[attr_layers[i]]
-                                   for i, attr in enumerate(attrs)]
-                    _draw_vertex_attributes(v.co, attr_values)
-            finally:
-                edit_mesh.free()
-        else:
-            all_attr_values = [mesh_get_cloth_attribute_values(mesh, attr) for attr in attrs]
-            for v in mesh.vertices:
-                attr_values = [all_attr_values[i][v.index] for i, attr in enumerate(attrs)]
-                _draw_vertex_attributes(v.co, attr_values)
+        for pos, vertex_index in zip(positions.tolist(), indices.tolist()):
+            x, y = pos
+            for i, attr in enumerate(attrs):
+                attr_value = all_attr_values[i][vertex_index]
+                attr_type = attr.type
+                if attr == ClothAttr.PIN_RADIUS:
+                    attr_str = f"{attr_value[pin_radius_set_index]:.2g}"
+                elif attr_type == "FLOAT_VECTOR":
+                    attr_str = f"{attr_value[0]:.2g}  {attr_value[1]:.2g}"
+                elif attr_type == "FLOAT_COLOR":
+                    attr_str = f"{attr_value[0]:.2g}  {attr_value[1]:.2g}  {attr_value[2]:.2g}  {attr_value[3]:.2g}"
+                elif attr_type == "INT":
+                    attr_str = f"{attr_value}"
+                else:  # FLOAT
+                    attr_str = f"{attr_value:.6g}"
+                w, h = blf.dimensions(font_id, attr_str)
+                blf.position(font_id, x - w * 0.5, y - (h * i * 2 - (h * num_attrs / 2)), 0.0)
+                blf.draw(font_id, attr_str)
 
         blf.disable(font_id, blf.SHADOW)
 
     def draw_pinned_geometry(self, cloth_obj: Object):
-        transform = cloth_obj.matrix_world
         mesh = cloth_obj.data
+        is_edit = cloth_obj.mode == "EDIT"
+
+        shader = gpu.shader.from_builtin(POINT_UNIFORM_COLOR_SHADER_NAME)
 
-        coords = []
-
-        if cloth_obj.mode == "EDIT":
-            edit_mesh = bmesh.from_edit_mesh(mesh)
-            try:
-                pinned_layer = edit_mesh.verts.layers.int.get(ClothAttr.PINNED, None)
-                for v in edit_mesh.verts:
-                    is_pinned = ClothAttr.PINNED.default_value if pinned_layer is None else v[pinned_layer]
-                    if is_pinned:
-                        coords.append(transform @ v.co)
-            finally:
-                edit_mesh.free()
-        else:
-            pinned_values = mesh_get_cloth_attribute_values(mesh, ClothAttr.PINNED)
-            for v in mesh.vertices:
-                is_pinned = pinned_values[v.index] != 0
-                if is_pinned:
-                    coords.append(transform @ v.co)
+        def _build_batch():
+            coords, (pinned_values,) = read_attribute_values(
+                mesh, (ClothAttr.PINNED,), is_edit, mesh_get_cloth_attribute_values
+            )
+            return batch.batch_for_shader(shader, "POINTS", {"pos": coords[pinned_values != 0]})
+
+        key = (mesh_update_tick(mesh), is_edit)
+        pinned_verts_batch = self.cache_pinned_batch.get(mesh, key, _build_batch)
 
         theme = get_theme_settings()
         gpu.state.point_size_set(theme.cloth_overlay_pinned_size)
         gpu.state.blend_set("ALPHA")
-        shader = gpu.shader.from_builtin(POINT_UNIFORM_COLOR_SHADER_NAME)
-        pinned_verts_batch = batch.batch_for_shader(shader, "POINTS", {"pos": coords})
-        shader.uniform_float("color", theme.cloth_overlay_pinned)
-        pinned_verts_batch.draw(shader)
+        with gpu.matrix.push_pop():
+            gpu.matrix.multiply_matrix(cloth_obj.matrix_world)
+            shader.uniform_float("color", theme.cloth_overlay_pinned)
+            pinned_verts_batch.draw(shader)
 
     def draw_diagnostics_overlays(self):
         last = cloth_last_export_contexts()
@@ -0,0 +1,120 @@
+"""
+Index of the light objects in the view layer, used by the light gizmos to avoid iterating all the objects in the scene
+on every redraw.
+
+The index is only rebuilt when light objects may have been added or removed. Changes to the lights themselves are
+detected with per-object update ticks that are bumped from a depsgraph handler, so the gizmos only need to recompute
+their shapes for the lights that changed. Frame changes update all the lights, as any of them may be animated.
+"""
+
+import bpy
+from bpy.types import (
+    Scene,
+    Depsgraph,
+    Object,
+    ViewLayer,
+)
+from typing import Optional
+
+_light_objs: Optional[list[Object]] = None
+_light_obj_uids: set[int] = set()
+_light_objs_view_layer = 0
+_light_objs_num_objects = 0
+
+_light_update_ticks: dict[int, int] = {}
+_global_update_tick = 0
+
+
+def get_light_objects(view_layer: ViewLayer) -> list[Object]:
+    """Gets the light objects in the view layer. The index is rebuilt if the view layer or its number of objects
+    changed, or if a new light object was added since the last call.
+    """
+    global _light_objs, _light_obj_uids, _light_objs_view_layer, _light_objs_num_objects
+
+    objects = view_layer.objects
+    view_layer_ptr = view_layer.as_pointer()
+    num_objects = len(objects)
+    if (
+        _light_objs is None or
+        _light_objs_view_layer != view_layer_ptr or
+        _light_objs_num_objects != num_objects
+    ):
+        _light_objs = [obj for obj in objects if obj.type == "LIGHT"]
+        _light_obj_uids = {obj.session_uid for obj in _light_objs}
+        _light_objs_view_layer = view_layer_ptr
+        _light_objs_num_objects = num_objects
+        _prune_light_update_ticks()
+
+    return _light_objs
+
+
+def _prune_light_update_ticks():
+    """Removes the update ticks of objects and light data that are no longer in the index."""
+    uids = _light_obj_uids | {obj.data.session_uid for obj in _light_objs}
+    for uid in _light_update_ticks.keys() - uids:
+        del _light_update_ticks[uid]
+
+
+def invalidate_light_objects():
+    """Forces the index to be rebuilt on the next ``get_light_objects`` call."""
+    global _light_objs
+    _light_objs = None
+
+
+def light_update_tick(light_obj: Object) -> int:
+    """Gets a number that changes every time the transform of the object or its light data are updated."""
+    return (
+        _light_update_ticks.get(light_obj.session_uid, 0) +
+        _light_update_ticks.get(light_obj.data.session_uid, 0) +
+        _global_update_tick
+    )
+
+
+@bpy.app.handlers.persistent
+def depsgraph_update_post_handler(scene: Scene, depsgraph: Depsgraph):
+    for update in depsgraph.updates:
+        id = update.id.original
+        if isinstance(id, bpy.types.Object):
+            if id.type != "LIGHT":
+                continue
+
+            if id.session_uid not in _light_obj_uids:
+                # New light object, the index doesn't know about it yet
+                invalidate_light_objects()
+        elif not isinstance(id, bpy.types.Light):
+            continue
+
+        uid = id.session_uid
+        _light_update_ticks[uid] = _light_update_ticks.get(uid, 0) + 1
+
+
+@bpy.app.handlers.persistent
+def frame_change_post_handler(scene: Scene, depsgraph: Depsgraph):
+    # Animation playback and frame changes don't go through the depsgraph updates we track, but they can move any light,
+    # directly or through its parent or constraints
+    global _global_update_tick
+    _global_update_tick += 1
+
+
+@bpy.app.handlers.persistent
+def invalidate_all_handler(*args):
+    # Undo/redo and file loads replace the objects without going through the depsgraph updates we track
+    global _global_update_tick
+    _global_update_tick += 1
+    invalidate_light_objects()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post_handler)
+    bpy.app.handlers.frame_change_post.append(frame_change_post_handler)
+    bpy.app.handlers.undo_post.append(invalidate_all_handler)
+    bpy.app.handlers.redo_post.append(invalidate_all_handler)
+    bpy.app.handlers.load_post.append(invalidate_all_handler)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_post_handler)
+    bpy.app.handlers.frame_change_post.remove(frame_change_post_handler)
+    bpy.app.handlers.undo_post.remove(invalidate_all_handler)
+    bpy.app.handlers.redo_post.remove(invalidate_all_handler)
+    bpy.app.handlers.load_post.remove(invalidate_all_handler)
@@ -2,7 +2,9 @@ import bpy
 from bpy.types import (
     Gizmo,
     GizmoGroup,
+    Object,
     Operator,
+    OperatorProperties,
 )
 import gpu
 import functools
@@ -10,6 +12,7 @@ import math
 from mathutils import Matrix, Vector
 from ...sollumz_properties import SollumType, LightType
 from .light_manipulators import CapsuleLightManipulator, CullingPlaneLightManipulator
+from .light_registry import get_light_objects, invalidate_light_objects, light_update_tick
 
 
 class SOLLUMZ_OT_object_select(Operator):
@@ -266,8 +269,10 @@ class SOLLUMZ_GGT_lights(GizmoGroup):
 
         self.active_light_obj = None
 
-        self.capsule_gizmos = []
-        self.culling_plane_gizmos = []
+        # Gizmos of each light object, keyed by the object session UID. Each entry stores the gizmo, the properties of
+        # its select operator and the update tick of the light when its shape was last computed
+        self.capsule_gizmos: dict[int, tuple[Gizmo, OperatorProperties, int]] = {}
+        self.culling_plane_gizmos: dict[int, tuple[Gizmo, OperatorProperties, int]] = {}
 
     def refresh(self, context):
         pass
@@ -280,13 +285,15 @@ class SOLLUMZ_GGT_lights(GizmoGroup):
 
         active_obj = context.view_layer.objects.active
         self.active_light_obj = None
-        capsule_gz_idx = 0
-        culling_plane_gz_idx = 0
-        for light_obj in context.view_layer.objects:
-            if light_obj.type != "LIGHT" or light_obj.sollum_type != SollumType.LIGHT:
-                continue
-
-            if not light_obj.visible_get():
+        capsule_gizmos = {}
+        culling_plane_gizmos = {}
+        for light_obj in get_light_objects(context.view_layer):
+            try:
+                if light_obj.sollum_type != SollumType.LIGHT or not light_obj.visible_get():
+                    continue
+            except ReferenceError:
+                # The object was removed, rebuild the index on next redraw
+                invalidate_light_objects()
                 continue
 
             light = light_obj.data
@@ -301,72 +308,77 @@ class SOLLUMZ_GGT_lights(GizmoGroup):
                 color_default
             )
 
+            # The active light can be edited through the manipulators, which don't go through the depsgraph, so always
+            # recompute its shapes
+            uid = light_obj.session_uid
+            tick = -1 if light_active else light_update_tick(light_obj)
+
             if light.sollum_type == LightType.CAPSULE:
-                length = light.light_properties.extent[0]
-                radius = light.cutoff_distance  # falloff
-
-                if capsule_gz_idx < len(self.capsule_gizmos):
-                    gz = self.capsule_gizmos[capsule_gz_idx]
-                else:
-                    gz = self.gizmos.new(SOLLUMZ_GT_capsule.bl_idname)
-                    self.capsule_gizmos.append(gz)
-                    gz.alpha = 0.9
-
-                gz.use_event_handle_all = False
-                gz.matrix_basis = light_obj.matrix_world.normalized()
-                gz.length = length
-                gz.radius = radius
-                gz.color = gz_color
-                gz.color_highlight = gz_color
-                gz.alpha_highlight = gz.alpha
-                op = gz.target_set_operator(SOLLUMZ_OT_object_select.bl_idname)
-                op.object_name = light_obj.name
-
-                capsule_gz_idx += 1
+                gz, op, gz_tick = self.capsule_gizmos.pop(uid, (None, None, None))
+                if gz is None:
+                    gz, op = self.new_light_gizmo(SOLLUMZ_GT_capsule.bl_idname)
+
+                if gz_tick != tick or tick == -1:
+                    gz.matrix_basis = light_obj.matrix_world.normalized()
+                    gz.length = light.light_properties.extent[0]
+                    gz.radius = light.cutoff_distance  # falloff
+
+                self.update_light_gizmo(gz, op, light_obj, gz_color)
+                capsule_gizmos[uid] = (gz, op, tick)
 
             if light.light_flags.enable_culling_plane:
-                if culling_plane_gz_idx < len(self.culling_plane_gizmos):
-                    gz = self.culling_plane_gizmos[culling_plane_gz_idx]
-                else:
-                    gz = self.gizmos.new(SOLLUMZ_GT_culling_plane.bl_idname)
-                    self.culling_plane_gizmos.append(gz)
-                    gz.alpha = 0.9
-
-                light_translation_mat = Matrix.Translation(light_obj.matrix_world.translation)
-
-                parent_rot_mat = (
-                    parent_obj.matrix_world.to_3x3().to_4x4()
-                    if (parent_obj := light_obj.parent)
-                    else Matrix.Identity(4)
-                )
-
-                plane_normal = light.light_properties.culling_plane_normal
-                if plane_normal == Vector((0.0, 0.0, 0.0)):
-                    plane_normal = Vector((0.0, 0.0, 1.0))
-
-                plane_rot_mat = plane_normal.to_track_quat("Z", "Y").to_matrix().to_4x4()
-                plane_offset_mat = Matrix.Translation((0.0, 0.0, -light.light_properties.culling_plane_offset))
-                plane_mat = light_translation_mat @ parent_rot_mat @ plane_rot_mat @ plane_offset_mat
-
-                gz.use_event_handle_all = False
-                gz.matrix_basis = plane_mat
-                gz.extend = light_active and light_selected
-                gz.color = gz_color
-                gz.color_highlight = gz_color
-                gz.alpha_highlight = gz.alpha
-                op = gz.target_set_operator(SOLLUMZ_OT_object_select.bl_idname)
-                op.object_name = light_obj.name
+                gz, op, gz_tick = self.culling_plane_gizmos.pop(uid, (None, None, None))
+                if gz is None:
+                    gz, op = self.new_light_gizmo(SOLLUMZ_GT_culling_plane.bl_idname)
 
-                culling_plane_gz_idx += 1
+                if gz_tick != tick or tick == -1:
+                    gz.matrix_basis = self.get_culling_plane_matrix(light_obj)
 
-        # Remove unused gizmos
-        for i in range(capsule_gz_idx, len(self.capsule_gizmos)):
-            self.gizmos.remove(self.capsule_gizmos[i])
-        del self.capsule_gizmos[capsule_gz_idx:]
+                gz.extend = light_active and light_selected
+                self.update_light_gizmo(gz, op, light_obj, gz_color)
+                culling_plane_gizmos[uid] = (gz, op, tick)
+
+        # Remove gizmos of lights no longer visible
+        for gz, _, _ in self.capsule_gizmos.values():
+            self.gizmos.remove(gz)
+        for gz, _, _ in self.culling_plane_gizmos.values():
+            self.gizmos.remove(gz)
 
-        for i in range(culling_plane_gz_idx, len(self.culling_plane_gizmos)):
-            self.gizmos.remove(self.culling_plane_gizmos[i])
-        del self.culling_plane_gizmos[culling_plane_gz_idx:]
+        self.capsule_gizmos = capsule_gizmos
+        self.culling_plane_gizmos = culling_plane_gizmos
 
         self.capsule_manipulator.draw_prepare(context, self.active_light_obj)
         self.culling_plane_manipulator.draw_prepare(context, self.active_light_obj)
+
+    def new_light_gizmo(self, idname: str) -> tuple[Gizmo, OperatorProperties]:
+        gz = self.gizmos.new(idname)
+        gz.alpha = 0.9
+        gz.alpha_highlight = gz.alpha
+        gz.use_event_handle_all = False
+        op = gz.target_set_operator(SOLLUMZ_OT_object_select.bl_idname)
+        return gz, op
+
+    def update_light_gizmo(self, gz: Gizmo, op: OperatorProperties, light_obj: Object, color):
+        gz.color = color
+        gz.color_highlight = color
+        if op.object_name != light_obj.name:
+            op.object_name = light_obj.name
+
+    @staticmethod
+    def get_culling_plane_matrix(light_obj: Object) -> Matrix:
+        light = light_obj.data
+        light_translation_mat = Matrix.Translation(light_obj.matrix_world.translation)
+
+        parent_rot_mat = (
+            parent_obj.matrix_world.to_3x3().to_4x4()
+            if (parent_obj := light_obj.parent)
+            else Matrix.Identity(4)
+        )
+
+        plane_normal = light.light_properties.culling_plane_normal
+        if plane_normal == Vector((0.0, 0.0, 0.0)):
+            plane_normal = Vector((0.0, 0.0, 1.0))
+
+        plane_rot_mat = plane_normal.to_track_quat("Z", "Y").to_matrix().to_4x4()
+        plane_offset_mat = Matrix.Translation((0.0, 0.0, -light.light_properties.culling_plane_offset))
+        return light_translation_mat @ parent_rot_mat @ plane_rot_mat @ plane_offset_mat
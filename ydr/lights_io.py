@@ -2,11 +2,14 @@ import bpy
 from bpy.types import (
     Object
 )
+import numpy as np
+from numpy.typing import NDArray
 from math import radians, degrees
 from typing import Optional
 from mathutils import Matrix, Vector
 from .light_flashiness import LightFlashiness
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType, LightType
+from ..shared.math import normalize_vectors
 from ..tools.blenderhelper import create_empty_object, create_blender_object, add_child_of_bone_constraint, get_child_of_bone
 from szio.gta5 import (
     Light,
@@ -18,37 +21,109 @@ from .. import logger
 INTENSITY_SCALE_FACTOR = 500
 
 
+# Fields of ``Light`` stored in the light datablock. The rest (position, direction, tangent and bone) are stored in
+# the light object. Lights with the same values in these fields share the same datablock.
+LIGHT_DATA_FIELDS = (
+    "light_type",
+    "extent",
+    "color",
+    "flashiness",
+    "intensity",
+    "flags",
+    "time_flags",
+    "group_id",
+    "light_hash",
+    "falloff",
+    "falloff_exponent",
+    "culling_plane_normal",
+    "culling_plane_offset",
+    "volume_intensity",
+    "volume_size_scale",
+    "volume_outer_color",
+    "volume_outer_intensity",
+    "volume_outer_exponent",
+    "corona_size",
+    "corona_intensity",
+    "corona_z_bias",
+    "projected_texture_hash",
+    "light_fade_distance",
+    "shadow_fade_distance",
+    "specular_fade_distance",
+    "volumetric_fade_distance",
+    "shadow_near_clip",
+    "shadow_blur",
+    "cone_inner_angle",
+    "cone_outer_angle",
+)
+
+
 def create_light_objs(lights: list[Light], armature_obj: Optional[Object] = None, name: Optional[str] = None) -> Object:
+    """Creates the light objects parented to a new empty object. Light datablocks are shared between lights with the
+    same parameters, so their game properties are only set once for each distinct light.
+    """
     lights_parent = create_empty_object(SollumType.NONE, name if name else "Lights")
+    if not lights:
+        return lights_parent
 
-    for light in lights:
-        lobj = create_light(light, armature_obj)
-        lobj.parent = lights_parent
+    matrices = get_lights_matrices(lights)
+    bone_names = get_bone_names_by_tag(armature_obj) if armature_obj is not None else {}
 
-    return lights_parent
+    light_datas: dict[tuple, bpy.types.Light] = {}
+    for light, matrix in zip(lights, matrices):
+        light_type = convert_light_type(light)
+        light_name = SOLLUMZ_UI_NAMES[light_type]
+
+        key = get_light_data_key(light, light_type)
+        light_data = light_datas.get(key, None)
+        if light_data is None:
+            light_data = create_light_data(light_type, light_name)
+            light_data.sollum_type = light_type
+            set_light_properties(light, light_data)
+            light_datas[key] = light_data
 
+        light_obj = create_blender_object(SollumType.LIGHT, light_name, light_data)
+        light_obj.matrix_basis = Matrix(matrix)
 
-def create_light(light: Light, armature_obj: Optional[Object] = None) -> Object:
-    light_type = convert_light_type(light)
+        if (bone_name := bone_names.get(light.bone_id, None)) is not None:
+            add_child_of_bone_constraint(light_obj, armature_obj, bone_name)
 
-    name = SOLLUMZ_UI_NAMES[light_type]
+        light_obj.parent = lights_parent
+
+    return lights_parent
 
-    light_data = create_light_data(light_type, name)
-    light_obj = create_blender_object(SollumType.LIGHT, name, light_data)
 
-    if armature_obj is not None:
-        create_light_bone_constraint(light, light_obj, armature_obj)
+def get_light_data_key(light: Light, light_type: LightType) -> tuple:
+    """Gets a hashable key with the parameters of ``light`` stored in the light datablock."""
+    return (light_type,) + tuple(
+        tuple(value) if isinstance(value, Vector) else value
+        for value in (getattr(light, field) for field in LIGHT_DATA_FIELDS[1:])
+    )
 
-    set_light_rotation(light, light_obj)
 
-    light_obj.data.sollum_type = light_type
-    light_obj.name = name
-    light_data.name = name
-    light_obj.location = light.position
+def get_lights_matrices(lights: list[Light]) -> NDArray[np.float64]:
+    """Gets the basis matrices of the light objects, as an array of shape (N, 4, 4). The Z axis points in the opposite
+    direction of the light, and the X axis is the light tangent.
+    """
+    num_lights = len(lights)
+    positions = np.array([light.position for light in lights], dtype=np.float64).reshape((num_lights, 3))
+    directions = -np.array([light.direction for light in lights], dtype=np.float64).reshape((num_lights, 3))
+    tangents = np.array([light.tangent for light in lights], dtype=np.float64).reshape((num_lights, 3))
 
-    set_light_properties(light, light_data)
+    matrices = np.zeros((num_lights, 4, 4), dtype=np.float64)
+    matrices[:, :3, 0] = tangents
+    matrices[:, :3, 1] = normalize_vectors(np.cross(directions, tangents))
+    matrices[:, :3, 2] = directions
+    matrices[:, :3, 3] = positions
+    matrices[:, 3, 3] = 1.0
+    return matrices
 
-    return light_obj
+
+def get_bone_names_by_tag(armature_obj: Object) -> dict[int, str]:
+    """Gets the name of the first bone with each tag."""
+    bone_names = {}
+    for bone in armature_obj.data.bones:
+        bone_names.setdefault(bone.bone_properties.tag, bone.name)
+    return bone_names
 
 
 def convert_light_type(light: Light) -> LightType:
@@ -75,27 +150,6 @@ def create_light_data(light_type: LightType, name: str):
     return bpy.data.lights.new(name=name, type=bpy_light_type)
 
 
-def create_light_bone_constraint(light: Light, light_obj: Object, armature_obj: Object):
-    armature = armature_obj.data
-
-    for bone in armature.bones:
-        if bone.bone_properties.tag != light.bone_id:
-            continue
-
-        add_child_of_bone_constraint(light_obj, armature_obj, bone.name)
-        break
-
-
-def set_light_rotation(light: Light, light_obj: bpy.types.Object):
-    light.direction.negate()
-    bitangent = light.direction.cross(light.tangent).normalized()
-    mat = Matrix().to_3x3()
-    mat.col[0] = light.tangent
-    mat.col[1] = bitangent
-    mat.col[2] = light.direction
-    light_obj.matrix_basis = mat.to_4x4()
-
-
 def set_light_properties(light: Light, light_data: bpy.types.Light):
     """Set the game properties of ``light_data`` based on ``light``."""
     light_data.color = [channel / 255 for channel in light.color]
@@ -137,53 +191,88 @@ def set_light_properties(light: Light, light_data: bpy.types.Light):
     light_props.corona_z_bias = light.corona_z_bias
 
 
-def export_lights(parent_obj: Object) -> list[Light]:
-    lights = []
+def export_lights(parent_obj: Object, light_params_cache: Optional[dict[int, dict]] = None) -> list[Light]:
+    """Creates the ``Light``s of the light objects in the hierarchy of ``parent_obj``.
+
+    The properties of each light datablock are only read once, even if shared by multiple light objects. Pass the same
+    ``light_params_cache`` dictionary to reuse them between calls, for example between the drawables of a drawable
+    dictionary.
+    """
+    light_objs = [
+        child for child in parent_obj.children_recursive
+        if child.type == "LIGHT" and child.data.sollum_type != LightType.NONE
+    ]
+    if not light_objs:
+        return []
+
+    if light_params_cache is None:
+        light_params_cache = {}
+
+    # Lights are exported relative to the parent, or to the bone they are attached to
+    parent_mat = parent_obj.matrix_world
+    root_mats_inv = {None: np.array(parent_mat.inverted())}
+    bone_ids = np.zeros(len(light_objs), dtype=np.int64)
+    light_root_mats_inv = np.empty((len(light_objs), 4, 4), dtype=np.float64)
+    for i, light_obj in enumerate(light_objs):
+        bone = get_child_of_bone(light_obj)
+        bone_name = None
+        if bone is not None:
+            bone_name = bone.name
+            bone_ids[i] = bone.bone_properties.tag
+            if bone_name not in root_mats_inv:
+                root_mats_inv[bone_name] = np.array((parent_mat @ bone.matrix_local).inverted())
+
+        light_root_mats_inv[i] = root_mats_inv[bone_name]
+
+    world_mats = np.array([light_obj.matrix_world for light_obj in light_objs], dtype=np.float64)
+    mats = light_root_mats_inv @ world_mats
+    positions = mats[:, :3, 3]
+    directions = -normalize_vectors(mats[:, :3, 2])
+    tangents = normalize_vectors(mats[:, :3, 0])
 
-    for child in parent_obj.children_recursive:
-        if child.type == "LIGHT" and child.data.sollum_type != LightType.NONE:
-            lights.append(export_light(child, parent_obj))
+    lights = []
+    for i, light_obj in enumerate(light_objs):
+        light_data = light_obj.data
+        params = light_params_cache.get(light_data.session_uid, None)
+        if params is None:
+            params = get_light_params(light_data)
+            light_params_cache[light_data.session_uid] = params
+
+        lights.append(Light(
+            position=Vector(positions[i]),
+            direction=Vector(directions[i]),
+            tangent=Vector(tangents[i]),
+            bone_id=int(bone_ids[i]),
+            extent=Vector(params["extent"]),
+            culling_plane_normal=Vector(params["culling_plane_normal"]),
+            **{field: value for field, value in params.items() if field not in ("extent", "culling_plane_normal")},
+        ))
 
     return lights
 
 
-def export_light(light_obj: Object, parent_obj: Object) -> Light:
-    root_mat = parent_obj.matrix_world
-    bone_id = 0
-    bone = get_child_of_bone(light_obj)
-    if bone is not None:
-        root_mat = root_mat @ bone.matrix_local
-        bone_id = bone.bone_properties.tag
-
-    mat = root_mat.inverted() @ light_obj.matrix_world
-    position = mat.to_translation()
-    direction = Vector((mat[0][2], mat[1][2], mat[2][2])).normalized()
-    direction.negate()
-    tangent = Vector((mat[0][0], mat[1][0], mat[2][0])).normalized()
-
-    light_data = light_obj.data
+def get_light_params(light_data: bpy.types.Light) -> dict:
+    """Gets the parameters of the ``Light`` stored in ``light_data``, keyed by field name (see ``LIGHT_DATA_FIELDS``).
+    Vectors are returned as tuples.
+    """
     light_props: LightProperties = light_data.light_properties
 
     light_type = LightType(light_data.sollum_type)
     is_spot = light_type == LightType.SPOT
 
-    return Light(
+    return dict(
         light_type=light_type.to_io(),
-        position=position,
-        direction=direction,
-        tangent=tangent,
-        extent=Vector(light_props.extent),
+        extent=tuple(light_props.extent),
         color=tuple(map(int, light_data.color * 255)),
         flashiness=LightFlashiness[light_props.flashiness],
         intensity=light_props.intensity,
         flags=int(light_data.light_flags.total),
         time_flags=int(light_data.time_flags.total),
-        bone_id=bone_id,
         group_id=light_props.group_id,
         light_hash=light_props.light_hash,
         falloff=light_props.falloff,
         falloff_exponent=light_props.falloff_exponent,
-        culling_plane_normal=Vector(light_props.culling_plane_normal),
+        culling_plane_normal=tuple(light_props.culling_plane_normal),
         culling_plane_offset=light_props.culling_plane_offset,
         volume_intensity=light_props.volume_intensity,
         volume_size_scale=light_props.volume_size_scale,
@@ -203,4 +292,3 @@ def export_light(light_obj: Object, parent_obj: Object) -> Light:
         cone_inner_angle=degrees(light_props.cone_inner_angle) if is_spot else 0.0,
         cone_outer_angle=degrees(light_props.cone_outer_angle) if is_spot else 0.0,
     )
-
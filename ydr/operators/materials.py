@@ -27,7 +27,7 @@ from ...tools.meshhelper import (
     mesh_rename_color_attrs_by_order,
 )
 from ...shared.shader_nodes import SzShaderNodeParameter
-from ..properties import get_shader_presets_path, load_shader_presets, shader_presets
+from ..properties import get_shader_presets_path, load_shader_presets, shader_presets, ui_collections
 from ..shader_materials import (
     create_shader,
     create_tinted_shader_graph,
@@ -189,6 +189,7 @@ class SOLLUMZ_OT_load_shader_preset(SOLLUMZ_OT_base, bpy.types.Operator):
             cls.poll_message_set("No Sollumz shader material selected.")
             return False
 
+        ui_collections.ensure_loaded()
         wm = context.window_manager
         if not (0 <= wm.sz_shader_preset_index < len(wm.sz_shader_presets)):
             cls.poll_message_set("No shader preset available.")
@@ -218,6 +219,7 @@ class SOLLUMZ_OT_delete_shader_preset(SOLLUMZ_OT_base, bpy.types.Operator):
 
     @classmethod
     def poll(cls, context):
+        ui_collections.ensure_loaded()
         wm = context.window_manager
         return 0 <= wm.sz_shader_preset_index < len(wm.sz_shader_presets)
 
@@ -24,7 +24,6 @@ from ..sollumz_properties import SOLLUMZ_UI_NAMES, items_from_enums, LODLevel, S
 from ..ydr.shader_materials import shadermats, shadermats_by_filename
 from .render_bucket import RenderBucket, RenderBucketEnumItems
 from .light_flashiness import LightFlashiness, LightFlashinessEnumItems
-from bpy.app.handlers import persistent
 from bpy.path import basename
 
 
@@ -721,9 +720,7 @@ def refresh_ui_collections():
     load_shader_presets()
 
 
-@persistent
-def on_blend_file_loaded(_):
-    refresh_ui_collections()
+ui_collections = UICollections(refresh_ui_collections)
 
 
 def register():
@@ -918,8 +915,7 @@ def register():
     #     default=False
     # )
 
-    bpy.app.handlers.load_post.append(on_blend_file_loaded)
-    refresh_ui_collections()
+    ui_collections.register()
 
 
 def unregister():
@@ -977,4 +973,4 @@ def unregister():
     del bpy.types.WindowManager.sz_ui_cloth_diag_binding_errors_visualize
     # del bpy.types.WindowManager.sz_ui_cloth_diag_bindings_visualize
 
-    bpy.app.handlers.load_post.remove(on_blend_file_loaded)
+    ui_collections.unregister()
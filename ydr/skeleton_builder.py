@@ -0,0 +1,202 @@
+import bpy
+import numpy as np
+from numpy.typing import NDArray
+from collections.abc import Hashable, Iterable
+from ..asset_cache import get_session_value, set_session_value
+
+# Length of the bones created on import, the skeleton data only has the bone transforms
+BONE_LENGTH = 0.05
+
+
+class SkeletonBuilder:
+    """Builds the bones of an armature from a skeleton. The bone transforms are computed in NumPy and all bones are
+    created in a single edit mode session.
+
+    Within an asset cache session, armatures built from identical skeletons are copied instead of built again.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.tags: list[int] = []
+        self.parent_indices: list[int] = []
+        self.positions: list[tuple[float, float, float]] = []
+        self.rotations: list[tuple[float, float, float, float]] = []
+        self.flags: list[tuple[str, ...]] = []
+
+    def add_bone(
+        self,
+        name: str,
+        tag: int,
+        parent_index: int,
+        position: Iterable[float],
+        rotation: Iterable[float],
+        flags: Iterable[str],
+    ):
+        """Adds a bone. ``rotation`` is a quaternion in WXYZ order. Parents must be added before their children."""
+        self.names.append(name)
+        self.tags.append(tag)
+        self.parent_indices.append(parent_index)
+        self.positions.append(tuple(position))
+        self.rotations.append(tuple(rotation))
+        self.flags.append(tuple(flags))
+
+    @property
+    def num_bones(self) -> int:
+        return len(self.names)
+
+    @property
+    def signature(self) -> Hashable:
+        return (
+            "skeleton",
+            tuple(self.names),
+            tuple(self.tags),
+            tuple(self.parent_indices),
+            tuple(self.positions),
+            tuple(self.rotations),
+            tuple(self.flags),
+        )
+
+    def build(self, armature_obj: bpy.types.Object) -> dict[str, bpy.types.Bone]:
+        """Creates the bones in the armature of ``armature_obj``, which should not have any bones yet. Returns the
+        created bones by the name of the skeleton bone.
+        """
+        if self.num_bones == 0:
+            return {}
+
+        signature = self.signature
+        cached = get_session_value(signature)
+        if cached is not None:
+            cached_armature, bone_names = cached
+            try:
+                armature = cached_armature.copy()
+            except ReferenceError:
+                # The armature was deleted since it was cached
+                armature = None
+
+            if armature is not None:
+                old_armature = armature_obj.data
+                name = old_armature.name
+                armature_obj.data = armature
+                if old_armature.users == 0:
+                    bpy.data.armatures.remove(old_armature)
+                armature.name = name
+
+                return self._get_bones_by_name(armature, bone_names)
+
+        bone_names = self._create_edit_bones(armature_obj)
+        bones_by_name = self._get_bones_by_name(armature_obj.data, bone_names)
+        self._set_bone_properties(bones_by_name)
+        set_session_value(signature, (armature_obj.data, bone_names))
+        return bones_by_name
+
+    def compute_bone_matrices(self) -> NDArray[np.float64]:
+        """Gets the transform of each bone in armature space, as a (N, 4, 4) array."""
+        num_bones = self.num_bones
+        local_matrices = np.zeros((num_bones, 4, 4), dtype=np.float64)
+        local_matrices[:, :3, :3] = quaternions_to_matrices(np.array(self.rotations, dtype=np.float64))
+        local_matrices[:, :3, 3] = self.positions
+        local_matrices[:, 3, 3] = 1.0
+
+        # Resolve the hierarchy one depth level at a time, all bones in the same level are independent
+        parent_indices = np.array(self.parent_indices, dtype=np.int64)
+        depths = np.zeros(num_bones, dtype=np.int64)
+        for i, parent_index in enumerate(self.parent_indices):
+            if parent_index != -1:
+                depths[i] = depths[parent_index] + 1
+
+        matrices = local_matrices.copy()
+        for depth in range(1, depths.max() + 1):
+            level = np.flatnonzero(depths == depth)
+            matrices[level] = matrices[parent_indices[level]] @ local_matrices[level]
+
+        return matrices
+
+    def _create_edit_bones(self, armature_obj: bpy.types.Object) -> list[str]:
+        matrices = self.compute_bone_matrices()
+        heads = matrices[:, :3, 3]
+        tails = heads + matrices[:, :3, 1] * BONE_LENGTH
+        rolls = matrices_to_bone_rolls(matrices)
+
+        armature = armature_obj.data
+        bpy.context.view_layer.objects.active = armature_obj
+
+        # Need to go into edit mode to modify edit bones
+        bpy.ops.object.mode_set(mode="EDIT")
+
+        edit_bones = armature.edit_bones
+        created_bones = [edit_bones.new(name) for name in self.names]
+        for edit_bone, parent_index in zip(created_bones, self.parent_indices):
+            if parent_index != -1:
+                edit_bone.parent = created_bones[parent_index]
+
+        edit_bones.foreach_set("head", heads.astype(np.float32).ravel())
+        edit_bones.foreach_set("tail", tails.astype(np.float32).ravel())
+        edit_bones.foreach_set("roll", rolls.astype(np.float32))
+
+        # Names can differ from the skeleton if it has duplicate bone names
+        bone_names = [edit_bone.name for edit_bone in created_bones]
+
+        bpy.ops.object.mode_set(mode="OBJECT")
+
+        return bone_names
+
+    def _set_bone_properties(self, bones_by_name: dict[str, bpy.types.Bone]):
+        for name, tag, flags in zip(self.names, self.tags, self.flags):
+            bone_properties = bones_by_name[name].bone_properties
+            bone_properties.tag = tag
+            for flag_name in flags:
+                flag = bone_properties.flags.add()
+                flag.name = flag_name
+
+    def _get_bones_by_name(self, armature: bpy.types.Armature, bone_names: list[str]) -> dict[str, bpy.types.Bone]:
+        bones = armature.bones
+        return {name: bones[bone_name] for name, bone_name in zip(self.names, bone_names)}
+
+
+def quaternions_to_matrices(quaternions: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Converts a (N, 4) array of WXYZ quaternions to a (N, 3, 3) array of rotation matrices. The quaternions are
+    normalized first.
+    """
+    norms = np.linalg.norm(quaternions, axis=1)
+    norms[norms == 0.0] = 1.0
+    w, x, y, z = (quaternions / norms[:, None]).T
+
+    matrices = np.empty((len(quaternions), 3, 3), dtype=np.float64)
+    matrices[:, 0, 0] = 1.0 - 2.0 * (y * y + z * z)
+    matrices[:, 0, 1] = 2.0 * (x * y - z * w)
+    matrices[:, 0, 2] = 2.0 * (x * z + y * w)
+    matrices[:, 1, 0] = 2.0 * (x * y + z * w)
+    matrices[:, 1, 1] = 1.0 - 2.0 * (x * x + z * z)
+    matrices[:, 1, 2] = 2.0 * (y * z - x * w)
+    matrices[:, 2, 0] = 2.0 * (x * z - y * w)
+    matrices[:, 2, 1] = 2.0 * (y * z + x * w)
+    matrices[:, 2, 2] = 1.0 - 2.0 * (x * x + y * y)
+    return matrices
+
+
+def matrices_to_bone_rolls(matrices: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Gets the roll of bones with the given armature space matrices, the same roll ``EditBone.matrix`` would set.
+
+    The roll is the angle around the bone Y axis between the bone X axis and the X axis Blender computes for a bone
+    with zero roll pointing in the same direction (see ``vec_roll_to_mat3_normalized`` in Blender).
+    """
+    y_axes = matrices[:, :3, 1]
+    y_axes = y_axes / np.linalg.norm(y_axes, axis=1)[:, None]
+    x_axes = matrices[:, :3, 0]
+    x, y, z = y_axes.T
+
+    safe_threshold = 6.1e-3
+    critical_threshold_sq = 2.5e-4 * 2.5e-4
+    theta = 1.0 + y
+    theta_alt = x * x + z * z
+    # Close to the negative Y axis, theta loses precision so it is computed from X and Z instead
+    theta = np.where(theta <= safe_threshold, theta_alt * 0.5 + theta_alt * theta_alt * 0.125, theta)
+    aligned_to_neg_y = (1.0 + y <= safe_threshold) & (theta_alt <= critical_threshold_sq)
+    theta[aligned_to_neg_y] = 1.0  # avoid dividing by zero, overwritten below
+
+    zero_roll_x_axes = np.column_stack((1.0 - x * x / theta, -x, -x * z / theta))
+    zero_roll_x_axes[aligned_to_neg_y] = (-1.0, 0.0, 0.0)
+
+    sin = np.einsum("ij,ij->i", np.cross(zero_roll_x_axes, x_axes), y_axes)
+    cos = np.einsum("ij,ij->i", zero_roll_x_axes, x_axes)
+    return np.arctan2(sin, cos)
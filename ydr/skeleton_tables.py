@@ -0,0 +1,49 @@
+import bpy
+
+
+class SkeletonTables:
+    """Bone hierarchy of an armature as index tables. Bone indices are the positions of the bones in
+    ``armature.bones``, as used by the exported skeleton.
+
+    The tables are built in a single pass over the bones, instead of searching the bones for the parent and sibling of
+    each bone. Exports that share the same armature, like the drawables of a drawable dictionary, can build them once
+    and pass them to each skeleton export.
+    """
+
+    def __init__(self, armature: bpy.types.Armature):
+        bones = armature.bones
+        self.names: list[str] = [bone.name for bone in bones]
+        self.index_by_name: dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        num_bones = len(self.names)
+        self.parent_indices: list[int] = [-1] * num_bones
+        self.first_child_indices: list[int] = [-1] * num_bones
+        self.next_sibling_indices: list[int] = [-1] * num_bones
+
+        for bone_index, bone in enumerate(bones):
+            children = bone.children
+            if not children:
+                continue
+
+            child_indices = [self.index_by_name[child.name] for child in children]
+            self.first_child_indices[bone_index] = child_indices[0]
+            for child_index, next_sibling_index in zip(child_indices, child_indices[1:] + [-1]):
+                self.parent_indices[child_index] = bone_index
+                self.next_sibling_indices[child_index] = next_sibling_index
+
+    @property
+    def num_bones(self) -> int:
+        return len(self.names)
+
+    def get_bone_index(self, bone_name: str) -> int:
+        """Gets the index of the bone. Raises ``KeyError`` if the bone is not in the armature the tables were built
+        from.
+        """
+        index = self.index_by_name.get(bone_name, None)
+        if index is None:
+            raise KeyError(f"Bone '{bone_name}' not found in the skeleton tables.")
+
+        return index
+
+    def has_children(self, bone_index: int) -> bool:
+        return self.first_child_indices[bone_index] != -1
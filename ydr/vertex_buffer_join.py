@@ -0,0 +1,52 @@
+import numpy as np
+from numpy.typing import NDArray
+from functools import lru_cache
+from szio.gta5.cwxml import VertexBuffer
+
+
+def join_vert_arrs(vert_arrs: list[NDArray]) -> NDArray:
+    """Join vertex buffer structured arrays. Works with arrays that have different layouts, attributes missing in
+    some of the arrays are zero-filled.
+    """
+    layouts = tuple(dict.fromkeys(vert_arr.dtype.names for vert_arr in vert_arrs))
+    struct_dtype = get_joined_vert_arr_dtype(layouts)
+    num_verts = sum(len(vert_arr) for vert_arr in vert_arrs)
+    joined_arr = np.empty(num_verts, dtype=struct_dtype)
+
+    for attr_name in struct_dtype.names:
+        attr_dtype = struct_dtype.fields[attr_name][0]
+        attr_zero = np.zeros(1, dtype=attr_dtype.base)
+        attr_shape = attr_dtype.shape
+        # Single copy per attribute. Arrays without this attribute contribute a zero-strided view instead of
+        # allocating a block of zeros
+        attr_parts = [
+            vert_arr[attr_name] if attr_name in vert_arr.dtype.names
+            else np.broadcast_to(attr_zero, (len(vert_arr), *attr_shape))
+            for vert_arr in vert_arrs
+        ]
+        np.concatenate(attr_parts, out=joined_arr[attr_name], casting="unsafe")
+
+    return joined_arr
+
+
+@lru_cache(maxsize=64)
+def get_joined_vert_arr_dtype(layouts: tuple[tuple[str, ...], ...]) -> np.dtype:
+    """Create a new structured dtype containing all vertex attrs present in all layouts. Cached, as the same few
+    vertex layouts are joined over and over during export.
+    """
+    attr_names = list(dict.fromkeys(name for layout in layouts for name in layout))
+    return np.dtype([VertexBuffer.VERT_ATTR_DTYPES[name] for name in attr_names])
+
+
+def join_ind_arrs(ind_arrs: list[NDArray[np.uint32]], vert_counts: list[int]) -> NDArray[np.uint32]:
+    """Join vertex index arrays by concatenating and offsetting indices based on vertex counts."""
+    if not ind_arrs:
+        return np.empty(0, dtype=np.uint32)
+
+    offsets = np.zeros(len(vert_counts), dtype=np.uint32)
+    np.cumsum(vert_counts[:-1], out=offsets[1:])
+    ind_counts = [len(ind_arr) for ind_arr in ind_arrs]
+
+    joined_arr = np.concatenate(ind_arrs).astype(np.uint32, copy=False)
+    joined_arr += np.repeat(offsets, ind_counts)
+    return joined_arr
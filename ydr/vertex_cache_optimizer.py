@@ -0,0 +1,142 @@
+"""
+Reordering of index and vertex buffers to improve the GPU post-transform vertex cache usage.
+
+Triangles are reordered with the Tipsify algorithm ("Fast Triangle Reordering for Vertex Locality and Reduced
+Overdraw", Sander et al. 2007), which runs in linear time. Then vertices are reordered in the order they are first
+referenced by the index buffer, so vertex fetches are mostly sequential.
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Size of the FIFO post-transform cache targeted by the optimization and used to compute the statistics
+VERTEX_CACHE_SIZE = 16
+
+
+def get_vertex_cache_stats(
+    indices: NDArray[np.uint32],
+    num_vertices: int,
+    cache_size: int = VERTEX_CACHE_SIZE,
+) -> tuple[float, float]:
+    """Simulates a FIFO vertex cache of ``cache_size`` entries drawing the triangle list ``indices``.
+
+    Returns a tuple with the ACMR (average cache miss ratio, transformed vertices per triangle) and the ATVR (average
+    transformed vertex ratio, transformed vertices per vertex). Lower is better, the ATVR is 1.0 at best.
+    """
+    num_triangles = len(indices) // 3
+    if num_triangles == 0 or num_vertices == 0:
+        return 0.0, 0.0
+
+    # Timestamp of when each vertex was added to the cache. A vertex is still in the cache if less than `cache_size`
+    # vertices were added after it
+    cache_time = [-cache_size - 1] * num_vertices
+    time = 0
+    misses = 0
+    for v in indices.tolist():
+        if time - cache_time[v] > cache_size:
+            cache_time[v] = time
+            time += 1
+            misses += 1
+
+    return misses / num_triangles, misses / num_vertices
+
+
+def optimize_vertex_cache(
+    indices: NDArray[np.uint32],
+    num_vertices: int,
+    cache_size: int = VERTEX_CACHE_SIZE,
+) -> NDArray[np.uint32]:
+    """Reorders the triangles of the triangle list ``indices`` to improve the vertex cache hit rate. The triangles
+    themselves are not modified, including their winding, only their order in the index buffer.
+    """
+    num_triangles = len(indices) // 3
+    if num_triangles == 0:
+        return indices
+
+    triangles = indices.reshape((num_triangles, 3))
+
+    # Triangles adjacent to each vertex, as CSR arrays: the triangles of vertex `v` are
+    # `adjacent_triangles[adjacency_offsets[v]:adjacency_offsets[v + 1]]`
+    flat_indices = triangles.ravel()
+    adjacent_triangles = (np.argsort(flat_indices, kind="stable") // 3).tolist()
+    valence = np.bincount(flat_indices, minlength=num_vertices)
+    adjacency_offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(valence, out=adjacency_offsets[1:])
+    adjacency_offsets = adjacency_offsets.tolist()
+
+    triangles_list = triangles.tolist()
+    live_triangles = valence.tolist()
+    cache_time = [0] * num_vertices
+    emitted = bytearray(num_triangles)
+    dead_end_stack = []
+    output = []
+
+    time = cache_size + 1
+    cursor = 0
+    fanning_vertex = int(flat_indices[0])
+    while fanning_vertex >= 0:
+        candidates = []
+        for t in adjacent_triangles[adjacency_offsets[fanning_vertex]:adjacency_offsets[fanning_vertex + 1]]:
+            if emitted[t]:
+                continue
+
+            emitted[t] = 1
+            tri = triangles_list[t]
+            output.append(t)
+            for v in tri:
+                dead_end_stack.append(v)
+                candidates.append(v)
+                live_triangles[v] -= 1
+                if time - cache_time[v] > cache_size:
+                    cache_time[v] = time
+                    time += 1
+
+        # Choose as next fanning vertex the candidate that will still be in the cache after emitting its triangles
+        # and that was added to the cache the earliest
+        fanning_vertex = -1
+        best_priority = -1
+        for v in candidates:
+            if live_triangles[v] <= 0:
+                continue
+
+            priority = 0
+            if time - cache_time[v] + 2 * live_triangles[v] <= cache_size:
+                priority = time - cache_time[v]
+            if priority > best_priority:
+                best_priority = priority
+                fanning_vertex = v
+
+        if fanning_vertex == -1:
+            # Dead end, continue from a recently used vertex that still has triangles
+            while dead_end_stack:
+                v = dead_end_stack.pop()
+                if live_triangles[v] > 0:
+                    fanning_vertex = v
+                    break
+
+        if fanning_vertex == -1:
+            # Otherwise continue from the next vertex, in input order, that still has triangles
+            while cursor < num_vertices:
+                if live_triangles[cursor] > 0:
+                    fanning_vertex = cursor
+                    break
+                cursor += 1
+
+    return triangles[output].ravel()
+
+
+def optimize_vertex_fetch(vertex_arr: NDArray, indices: NDArray[np.uint32]) -> tuple[NDArray, NDArray[np.uint32]]:
+    """Reorders the vertices in the order they are first referenced by ``indices``. Vertices not referenced by any
+    triangle are moved to the end. Returns the new vertex and index arrays.
+    """
+    num_vertices = len(vertex_arr)
+    used_vertices, first_use = np.unique(indices, return_index=True)
+    new_order = used_vertices[np.argsort(first_use)]
+    if len(new_order) < num_vertices:
+        unused = np.ones(num_vertices, dtype=bool)
+        unused[new_order] = False
+        new_order = np.concatenate((new_order, np.flatnonzero(unused)))
+
+    remap = np.empty(num_vertices, dtype=np.uint32)
+    remap[new_order] = np.arange(num_vertices, dtype=np.uint32)
+    return vertex_arr[new_order], remap[indices]
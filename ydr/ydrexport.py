@@ -12,6 +12,7 @@ from mathutils import Quaternion, Vector, Matrix
 
 from ..lods import operates_on_lod_level
 from .model_data import get_faces_subset
+from .skeleton_tables import SkeletonTables
 
 from szio.gta5.cwxml import (
     BoneLimit,
@@ -28,7 +29,6 @@ from szio.gta5.cwxml import (
     ArrayShaderParameter,
     VectorShaderParameter,
     TextureShaderParameter,
-    VertexBuffer,
 )
 from szio.gta5.shader import (
     ShaderManager,
@@ -65,6 +65,7 @@ from ..ybn.ybnexport import create_composite_xml, create_bound_xml
 from .properties import get_model_properties
 from .render_bucket import RenderBucket
 from .vertex_buffer_builder import VertexBufferBuilder, VBBuilderDomain, dedupe_and_get_indices, remove_arr_field, remove_unused_colors, try_get_bone_by_vgroup, remove_unused_uvs
+from .vertex_buffer_join import join_vert_arrs, join_ind_arrs
 from .cable_vertex_buffer_builder import CableVertexBufferBuilder
 from .cable import is_cable_mesh
 from .cloth_diagnostics import cloth_export_context
@@ -89,8 +90,10 @@ def create_drawable_xml(
     materials: Optional[list[bpy.types.Material]] = None,
     apply_transforms: bool = False,
     char_cloth_xml: Optional[CharacterCloth] = None,
+    skeleton_tables: Optional[SkeletonTables] = None,
 ):
-    """Create a ``Drawable`` cwxml object. Optionally specify an external ``armature_obj`` if ``drawable_obj`` is not an armature."""
+    """Create a ``Drawable`` cwxml object. Optionally specify an external ``armature_obj`` if ``drawable_obj`` is not an armature.
+    ``skeleton_tables`` can be passed to reuse the bone hierarchy tables of the armature between drawables."""
     drawable_xml = Drawable()
     drawable_xml.frag_bound_matrix = None
 
@@ -110,7 +113,7 @@ def create_drawable_xml(
     if armature_obj or drawable_obj.type == "ARMATURE":
         armature_obj = armature_obj or drawable_obj
 
-        drawable_xml.skeleton = create_skeleton_xml(armature_obj, apply_transforms)
+        drawable_xml.skeleton = create_skeleton_xml(armature_obj, apply_transforms, skeleton_tables)
         drawable_xml.joints = create_joints_xml(armature_obj)
 
         original_pose = armature_obj.data.pose_position
@@ -543,55 +546,6 @@ def get_valid_ind_arrs(geometry_xmls: list[Geometry]):
     return [geom.index_buffer.data for geom in geometry_xmls if geom.vertex_buffer.data is not None and geom.index_buffer.data is not None]
 
 
-def join_vert_arrs(vert_arrs: list[NDArray]):
-    """Join vertex buffer structured arrays. Works with arrays that have different layouts."""
-    num_verts = sum(len(vert_arr) for vert_arr in vert_arrs)
-    struct_dtype = get_joined_vert_arr_dtype(vert_arrs)
-    joined_arr = np.zeros(num_verts, dtype=struct_dtype)
-
-    for attr_name in joined_arr.dtype.names:
-        row_start = 0
-
-        for vert_arr in vert_arrs:
-            if attr_name not in vert_arr.dtype.names:
-                continue
-
-            attr = vert_arr[attr_name]
-            num_attr_verts = len(attr)
-            row_end = row_start + num_attr_verts
-
-            joined_arr[attr_name][row_start:row_end] = attr
-
-            row_start = row_end
-
-    return joined_arr
-
-
-def get_joined_vert_arr_dtype(vert_arrs: list[NDArray]):
-    """Create a new structured dtype containing all vertex attrs present in all vert_arrs"""
-    attr_names = []
-
-    for vert_arr in vert_arrs:
-        attr_names.extend(
-            name for name in vert_arr.dtype.names if name not in attr_names)
-
-    return [VertexBuffer.VERT_ATTR_DTYPES[name] for name in attr_names]
-
-
-def join_ind_arrs(ind_arrs: list[NDArray[np.uint32]], vert_counts: list[int]) -> NDArray[np.uint32]:
-    """Join vertex index arrays by simply concatenating and offsetting indices based on vertex counts"""
-    def get_vert_ind_offset(arr_ind: int) -> int:
-        if arr_ind == 0:
-            return 0
-
-        return sum(num_verts for num_verts in vert_counts[:arr_ind])
-
-    offset_ind_arrs = [
-        ind_arr + get_vert_ind_offset(i) for i, ind_arr in enumerate(ind_arrs)]
-
-    return np.concatenate(offset_ind_arrs)
-
-
 def split_drawable_by_vert_count(drawable_xml: Drawable):
     split_models_by_vert_count(drawable_xml.drawable_models_high)
     split_models_by_vert_count(drawable_xml.drawable_models_med)
@@ -720,12 +674,17 @@ def texture_from_img_node(node: bpy.types.ShaderNodeTexImage):
     return texture
 
 
-def create_skeleton_xml(armature_obj: bpy.types.Object, apply_transforms: bool = False):
+def create_skeleton_xml(
+    armature_obj: bpy.types.Object,
+    apply_transforms: bool = False,
+    skeleton_tables: Optional[SkeletonTables] = None,
+):
     if armature_obj.type != "ARMATURE" or not armature_obj.pose.bones:
         return None
 
     skeleton_xml = Skeleton()
     bones = armature_obj.pose.bones
+    skeleton_tables = skeleton_tables or SkeletonTables(armature_obj.data)
 
     if apply_transforms:
         matrix = armature_obj.matrix_world.copy()
@@ -735,7 +694,7 @@ def create_skeleton_xml(armature_obj: bpy.types.Object, apply_transforms: bool =
 
     for bone_index, pose_bone in enumerate(bones):
 
-        bone_xml = create_bone_xml(pose_bone, bone_index, armature_obj.data, matrix)
+        bone_xml = create_bone_xml(pose_bone, bone_index, skeleton_tables, matrix)
 
         skeleton_xml.bones.append(bone_xml)
 
@@ -744,7 +703,7 @@ def create_skeleton_xml(armature_obj: bpy.types.Object, apply_transforms: bool =
     return skeleton_xml
 
 
-def create_bone_xml(pose_bone: bpy.types.PoseBone, bone_index: int, armature: bpy.types.Armature, armature_matrix: Matrix):
+def create_bone_xml(pose_bone: bpy.types.PoseBone, bone_index: int, skeleton_tables: SkeletonTables, armature_matrix: Matrix):
     bone = pose_bone.bone
 
     bone_xml = Bone()
@@ -752,41 +711,17 @@ def create_bone_xml(pose_bone: bpy.types.PoseBone, bone_index: int, armature: bp
     bone_xml.index = bone_index
     bone_xml.tag = bone.bone_properties.tag
 
-    bone_xml.parent_index = get_bone_parent_index(bone, armature)
-    bone_xml.sibling_index = get_bone_sibling_index(bone, armature)
+    table_index = skeleton_tables.get_bone_index(bone.name)
+    bone_xml.parent_index = skeleton_tables.parent_indices[table_index]
+    bone_xml.sibling_index = skeleton_tables.next_sibling_indices[table_index]
 
-    set_bone_xml_flags(bone_xml, pose_bone)
+    set_bone_xml_flags(bone_xml, pose_bone, skeleton_tables.has_children(table_index))
     set_bone_xml_transforms(bone_xml, bone, armature_matrix)
 
     return bone_xml
 
 
-def get_bone_parent_index(bone: bpy.types.Bone, armature: bpy.types.Armature):
-    if bone.parent is None:
-        return -1
-
-    return get_bone_index(armature, bone.parent)
-
-
-def get_bone_sibling_index(bone: bpy.types.Bone, armature: bpy.types.Armature):
-    sibling_index = -1
-
-    if bone.parent is None:
-        return sibling_index
-
-    children = bone.parent.children
-
-    for i, child_bone in enumerate(children):
-        if child_bone != bone or i + 1 >= len(children):
-            continue
-
-        sibling_index = get_bone_index(armature, children[i + 1])
-        break
-
-    return sibling_index
-
-
-def set_bone_xml_flags(bone_xml: Bone, pose_bone: bpy.types.PoseBone):
+def set_bone_xml_flags(bone_xml: Bone, pose_bone: bpy.types.PoseBone, has_children: bool):
     bone = pose_bone.bone
 
     for flag in bone.bone_properties.flags:
@@ -802,7 +737,7 @@ def set_bone_xml_flags(bone_xml: Bone, pose_bone: bpy.types.PoseBone):
         if constraint.type == "LIMIT_LOCATION":
             bone_xml.flags.append("LimitTranslation")
 
-    if bone.children:
+    if has_children:
         bone_xml.flags.append("Unk0")
 
 
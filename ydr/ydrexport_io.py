@@ -71,19 +71,24 @@ from ..ybn.ybnexport_io import (
 )
 from .properties import get_model_properties
 from .render_bucket import RenderBucket
+from .vertex_cache_optimizer import get_vertex_cache_stats, optimize_vertex_cache, optimize_vertex_fetch
 from .vertex_buffer_builder import VertexBufferBuilder, VBBuilderDomain, dedupe_and_get_indices, remove_arr_field, remove_unused_colors, try_get_bone_by_vgroup, remove_unused_uvs
+from .vertex_buffer_join import join_vert_arrs, join_ind_arrs
 from .cable_vertex_buffer_builder import CableVertexBufferBuilder
 from .cable import is_cable_mesh
 from .cloth_diagnostics import cloth_export_context
 from .lights_io import export_lights
+from .skeleton_tables import SkeletonTables
 
 from ..iecontext import export_context, ExportBundle
 from .. import logger
+from .. import profiler
 
 
 def export_ydr(obj: Object) -> ExportBundle:
     embedded_tex = []
-    d = create_drawable_asset(obj, out_embedded_textures=embedded_tex)
+    with profiler.scope("ydr.export"):
+        d = create_drawable_asset(obj, out_embedded_textures=embedded_tex)
     return export_context().make_bundle(d, files_to_copy=[t.source_filepath for t in embedded_tex])
 
 
@@ -96,15 +101,20 @@ def create_drawable_asset(
     out_embedded_textures: list[EmbeddedTexture] | None = None,
     hi: bool = False,
     char_cloth: CharacterCloth | None = None,
+    skeleton_tables: SkeletonTables | None = None,
+    light_params_cache: dict[int, dict] | None = None,
 ) -> Optional[AssetDrawable]:
-    """Create a ``Drawable`` cwxml object. Optionally specify an external ``armature_obj`` if ``drawable_obj`` is not an armature."""
+    """Create a ``Drawable`` cwxml object. Optionally specify an external ``armature_obj`` if ``drawable_obj`` is not an armature.
+    ``skeleton_tables`` can be passed to reuse the bone hierarchy tables of the armature between drawables, and
+    ``light_params_cache`` to reuse the parameters read from shared light datablocks."""
 
     materials = materials or get_sollumz_materials(drawable_obj)
 
     if parent_drawable is not None:
         shader_group = None
     else:
-        shader_group = create_shader_group(materials)
+        with profiler.scope("ydr.shader_group"):
+            shader_group = create_shader_group(materials)
         if not shader_group.shaders:
             logger.warning(
                 f"{drawable_obj.name} has no Sollumz materials! Aborting..."
@@ -126,7 +136,10 @@ def create_drawable_asset(
 
     if armature_obj or drawable_obj.type == "ARMATURE":
         armature_obj = armature_obj or drawable_obj
-        drawable.skeleton = create_skeleton(armature_obj, export_context().settings.apply_transforms)
+        with profiler.scope("ydr.skeleton"):
+            drawable.skeleton = create_skeleton(
+                armature_obj, export_context().settings.apply_transforms, skeleton_tables
+            )
 
         original_pose = armature_obj.data.pose_position
         armature_obj.data.pose_position = "REST"
@@ -136,10 +149,13 @@ def create_drawable_asset(
         armature_obj = None
         original_pose = None
 
-    drawable.models = create_models(drawable, drawable_obj, materials, armature_obj, hi=hi, char_cloth=char_cloth)
+    with profiler.scope("ydr.models"):
+        drawable.models = create_models(drawable, drawable_obj, materials, armature_obj, hi=hi, char_cloth=char_cloth)
     if not is_frag:
-        drawable.lights = export_lights(drawable_obj)
-        drawable.bounds = create_embedded_bounds_asset(drawable_obj)
+        with profiler.scope("ydr.lights"):
+            drawable.lights = export_lights(drawable_obj, light_params_cache)
+        with profiler.scope("ydr.bounds"):
+            drawable.bounds = create_embedded_bounds_asset(drawable_obj)
 
     if armature_obj is not None:
         armature_obj.data.pose_position = original_pose
@@ -181,11 +197,13 @@ def create_models(
 
     # Drawables only ever have 1 skinned drawable model per LOD level. Since, the skinned portion of the
     # drawable can be split by vertex group, we have to join each separate part into a single object.
-    for lod_level in models.keys():
-        models[lod_level] = join_skinned_models(models[lod_level])
+    with profiler.scope("ydr.join_skinned_models"):
+        for lod_level in models.keys():
+            models[lod_level] = join_skinned_models(models[lod_level])
 
-    for lod_level in models.keys():
-        models[lod_level] = split_models_by_vert_count(models[lod_level])
+    with profiler.scope("ydr.split_models"):
+        for lod_level in models.keys():
+            models[lod_level] = split_models_by_vert_count(models[lod_level])
 
     return models
 
@@ -210,12 +228,13 @@ def create_model(
     char_cloth: CharacterCloth | None = None,
     mesh_domain_override: Optional[VBBuilderDomain] = None,
 ) -> Model:
-    obj_eval = get_evaluated_obj(model_obj)
-    mesh_eval = obj_eval.to_mesh()
-    triangulate_mesh(mesh_eval)
+    with profiler.scope("ydr.evaluate_mesh"):
+        obj_eval = get_evaluated_obj(model_obj)
+        mesh_eval = obj_eval.to_mesh()
+        triangulate_mesh(mesh_eval)
 
-    if transforms_to_apply is not None:
-        mesh_eval.transform(transforms_to_apply)
+        if transforms_to_apply is not None:
+            mesh_eval.transform(transforms_to_apply)
 
     if char_cloth:
         cloth_export_context().diagnostics.drawable_model_obj_name = model_obj.name
@@ -278,11 +297,15 @@ def create_geometries(
         return []
 
     if is_cable:
-        cable_total_vert_buffer, cable_vert_materials = CableVertexBufferBuilder(mesh_eval).build()
+        with profiler.scope("ydr.cable_vertex_buffer"):
+            cable_total_vert_buffer, cable_vert_materials = CableVertexBufferBuilder(mesh_eval).build()
         cable_geometries = []
         for cable_material_index in range(len(mesh_eval.materials)):
             cable_vert_buffer = cable_total_vert_buffer[cable_vert_materials == cable_material_index]
-            cable_vert_buffer, cable_ind_buffer = dedupe_and_get_indices(cable_vert_buffer)
+            with profiler.scope("ydr.dedupe"):
+                cable_vert_buffer, cable_ind_buffer = dedupe_and_get_indices(cable_vert_buffer)
+            profiler.count("ydr.vertices", len(cable_vert_buffer))
+            profiler.count("ydr.indices", len(cable_ind_buffer))
 
             cable_material = mesh_eval.materials[cable_material_index].original
             cable_material_index_in_drawable = materials.index(cable_material)
@@ -335,7 +358,8 @@ def create_geometries(
     del colors_missing
     del colors_incorrect_format
 
-    loop_inds_by_mat = get_loop_inds_by_material(mesh_eval, materials)
+    with profiler.scope("ydr.loops_by_material"):
+        loop_inds_by_mat = get_loop_inds_by_material(mesh_eval, materials)
 
     geometries: list[Geometry] = []
 
@@ -343,8 +367,11 @@ def create_geometries(
     bone_by_vgroup = try_get_bone_by_vgroup(model_obj, armature_obj)
 
     domain = export_context().settings.mesh_domain if mesh_domain_override is None else mesh_domain_override
+    optimize_cache = export_context().settings.optimize_vertex_cache
     vb_builder = VertexBufferBuilder(mesh_eval, bone_by_vgroup, domain, materials, char_cloth)
-    total_vert_buffer = vb_builder.build()
+    with profiler.scope("ydr.vertex_buffer"):
+        total_vert_buffer = vb_builder.build()
+    profiler.count("ydr.source_vertices", len(total_vert_buffer))
     if domain == VBBuilderDomain.VERTEX:
         # bit dirty to use private data of the builder class, but we need this array here and it is already computed
         loop_to_vert_inds = vb_builder._loop_to_vert_inds
@@ -370,7 +397,17 @@ def create_geometries(
         if not normal_required:
             vert_buffer = remove_arr_field("Normal", vert_buffer)
 
-        vert_buffer, ind_buffer = dedupe_and_get_indices(vert_buffer)
+        with profiler.scope("ydr.dedupe"):
+            vert_buffer, ind_buffer = dedupe_and_get_indices(vert_buffer)
+        profiler.count("ydr.vertices", len(vert_buffer))
+        profiler.count("ydr.indices", len(ind_buffer))
+
+        # Skipped with the vertex domain, which is used when the vertex order needs to be kept
+        if optimize_cache and domain != VBBuilderDomain.VERTEX:
+            with profiler.scope("ydr.vertex_cache"):
+                vert_buffer, ind_buffer = optimize_geometry_vertex_cache(
+                    vert_buffer, ind_buffer, f"'{mesh_eval.original.name}' ({material.name})"
+                )
 
         if bones and "BlendWeights" in vert_buffer.dtype.names:
             bone_ids = get_bone_ids(bones)
@@ -391,6 +428,27 @@ def create_geometries(
     return geometries
 
 
+def optimize_geometry_vertex_cache(
+    vert_buffer: NDArray,
+    ind_buffer: NDArray[np.uint32],
+    geometry_name: str,
+) -> tuple[NDArray, NDArray[np.uint32]]:
+    """Reorders the triangles and vertices of the geometry for the GPU vertex cache, and logs the cache statistics
+    before and after."""
+    num_vertices = len(vert_buffer)
+    acmr_before, atvr_before = get_vertex_cache_stats(ind_buffer, num_vertices)
+
+    ind_buffer = optimize_vertex_cache(ind_buffer, num_vertices)
+    vert_buffer, ind_buffer = optimize_vertex_fetch(vert_buffer, ind_buffer)
+
+    acmr_after, atvr_after = get_vertex_cache_stats(ind_buffer, num_vertices)
+    logger.info(
+        f"Optimized vertex cache of {geometry_name}: "
+        f"ACMR {acmr_before:.3f} -> {acmr_after:.3f}, ATVR {atvr_before:.3f} -> {atvr_after:.3f}"
+    )
+    return vert_buffer, ind_buffer
+
+
 def sort_geoms_by_shader(geometries: list[Geometry]) -> list[Geometry]:
     return sorted(geometries, key=lambda g: g.shader_index)
 
@@ -451,55 +509,6 @@ def join_geometries(geometries: list[Geometry], shader_index: int) -> Geometry:
     )
 
 
-def join_vert_arrs(vert_arrs: list[NDArray]) -> NDArray:
-    """Join vertex buffer structured arrays. Works with arrays that have different layouts."""
-    num_verts = sum(len(vert_arr) for vert_arr in vert_arrs)
-    struct_dtype = get_joined_vert_arr_dtype(vert_arrs)
-    joined_arr = np.zeros(num_verts, dtype=struct_dtype)
-
-    for attr_name in joined_arr.dtype.names:
-        row_start = 0
-
-        for vert_arr in vert_arrs:
-            if attr_name not in vert_arr.dtype.names:
-                continue
-
-            attr = vert_arr[attr_name]
-            num_attr_verts = len(attr)
-            row_end = row_start + num_attr_verts
-
-            joined_arr[attr_name][row_start:row_end] = attr
-
-            row_start = row_end
-
-    return joined_arr
-
-
-def get_joined_vert_arr_dtype(vert_arrs: list[NDArray]):
-    """Create a new structured dtype containing all vertex attrs present in all vert_arrs"""
-    attr_names = []
-
-    for vert_arr in vert_arrs:
-        attr_names.extend(
-            name for name in vert_arr.dtype.names if name not in attr_names)
-
-    from szio.gta5.cwxml import VertexBuffer
-    return [VertexBuffer.VERT_ATTR_DTYPES[name] for name in attr_names]
-
-
-def join_ind_arrs(ind_arrs: list[NDArray[np.uint32]], vert_counts: list[int]) -> NDArray[np.uint32]:
-    """Join vertex index arrays by simply concatenating and offsetting indices based on vertex counts"""
-    def get_vert_ind_offset(arr_ind: int) -> int:
-        if arr_ind == 0:
-            return 0
-
-        return sum(num_verts for num_verts in vert_counts[:arr_ind])
-
-    offset_ind_arrs = [ind_arr + get_vert_ind_offset(i) for i, ind_arr in enumerate(ind_arrs)]
-
-    return np.concatenate(offset_ind_arrs)
-
-
 def split_models_by_vert_count(models: list[Model]) -> list[Model]:
     models_split = []
     for model in models:
@@ -700,10 +709,15 @@ def get_embedded_texture_nodes_from_materials(materials: list[Material]) -> list
     return nodes
 
 
-def create_skeleton(armature_obj: bpy.types.Object, apply_transforms: bool = False) -> Skeleton:
+def create_skeleton(
+    armature_obj: bpy.types.Object,
+    apply_transforms: bool = False,
+    skeleton_tables: Optional[SkeletonTables] = None,
+) -> Skeleton:
     assert armature_obj.type == "ARMATURE" and armature_obj.pose.bones
 
     bones = armature_obj.pose.bones
+    skeleton_tables = skeleton_tables or SkeletonTables(armature_obj.data)
 
     if apply_transforms:
         matrix = armature_obj.matrix_world.copy()
@@ -713,18 +727,19 @@ def create_skeleton(armature_obj: bpy.types.Object, apply_transforms: bool = Fal
 
     skel_bones = []
     for bone_index, pose_bone in enumerate(bones):
-        skel_bone = create_bone(pose_bone, armature_obj.data, matrix)
+        skel_bone = create_bone(pose_bone, skeleton_tables, matrix)
         skel_bones.append(skel_bone)
 
     return Skeleton(skel_bones)
 
 
-def create_bone(pose_bone: PoseBone, armature: Armature, armature_matrix: Matrix) -> SkelBone:
+def create_bone(pose_bone: PoseBone, skeleton_tables: SkeletonTables, armature_matrix: Matrix) -> SkelBone:
     bone = pose_bone.bone
 
-    parent_index = get_bone_parent_index(bone, armature)
+    table_index = skeleton_tables.get_bone_index(bone.name)
+    parent_index = skeleton_tables.parent_indices[table_index]
 
-    flags = get_bone_flags(pose_bone)
+    flags = get_bone_flags(pose_bone, skeleton_tables.has_children(table_index))
     pos, rot, scale = get_bone_transforms(bone, armature_matrix)
 
     return SkelBone(
@@ -740,14 +755,7 @@ def create_bone(pose_bone: PoseBone, armature: Armature, armature_matrix: Matrix
     )
 
 
-def get_bone_parent_index(bone: Bone, armature: Armature) -> int:
-    if bone.parent is None:
-        return -1
-
-    return get_bone_index(armature, bone.parent)
-
-
-def get_bone_flags(pose_bone: PoseBone) -> SkelBoneFlags:
+def get_bone_flags(pose_bone: PoseBone, has_children: bool) -> SkelBoneFlags:
     bone = pose_bone.bone
 
     flags = SkelBoneFlags(0)
@@ -765,7 +773,7 @@ def get_bone_flags(pose_bone: PoseBone) -> SkelBoneFlags:
     if find_bone_constraint_translation_limit(pose_bone):
         flags |= SkelBoneFlags.HAS_TRANSLATE_LIMITS
 
-    if bone.children:
+    if has_children:
         flags |= SkelBoneFlags.HAS_CHILD
 
     return flags
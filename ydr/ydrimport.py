@@ -2,7 +2,6 @@ import os
 import traceback
 import bpy
 from typing import Optional
-from mathutils import Matrix
 from pathlib import Path
 from ..tools.drawablehelper import get_model_xmls_by_lod
 from .shader_materials import create_shader, get_detail_extra_sampler, create_tinted_shader_graph
@@ -25,8 +24,10 @@ from szio.gta5.cwxml import (
 from ..tools.blenderhelper import add_child_of_bone_constraint, create_empty_object, create_blender_object, join_objects, add_armature_modifier, parent_objs
 from ..tools.utils import get_filename
 from ..shared.shader_nodes import SzShaderNodeParameter
+from ..shared.xml_streaming import stream_xml_file
 from .model_data import ModelData, get_model_data, get_model_data_split_by_group
 from .mesh_builder import MeshBuilder
+from .skeleton_builder import SkeletonBuilder
 from .cable_mesh_builder import CableMeshBuilder
 from .cable import CABLE_SHADER_NAME
 from ..lods import LODLevels
@@ -40,7 +41,7 @@ def import_ydr(filepath: str):
     import_settings = get_import_settings()
 
     name = get_filename(filepath)
-    ydr_xml = YDR.from_xml_file(filepath)
+    ydr_xml = stream_xml_file(Drawable, filepath) if import_settings.stream_xml_files else YDR.from_xml_file(filepath)
 
     if import_settings.import_as_asset:
         return create_drawable_as_asset(ydr_xml, name, filepath)
@@ -219,11 +220,15 @@ def create_armature_obj_from_skel(skeleton: Skeleton, name: str, sollum_type: So
 
 
 def create_joint_constraints(armature_obj: bpy.types.Object, joints: Joints):
+    if not joints.rotation_limits and not joints.translation_limits:
+        return
+
+    bone_by_tag = get_bone_by_tag(armature_obj)
     if joints.rotation_limits:
-        apply_rotation_limits(joints.rotation_limits, armature_obj)
+        apply_rotation_limits(joints.rotation_limits, armature_obj, bone_by_tag)
 
     if joints.translation_limits:
-        apply_translation_limits(joints.translation_limits, armature_obj)
+        apply_translation_limits(joints.translation_limits, armature_obj, bone_by_tag)
 
 
 def create_drawable_empty(name: str, drawable_xml: Drawable):
@@ -374,60 +379,32 @@ def shader_item_to_material(shader: Shader, shader_group: ShaderGroup, filepath:
 
 
 def create_drawable_skel(skeleton_xml: Skeleton, armature_obj: bpy.types.Object):
-    bpy.context.view_layer.objects.active = armature_obj
-    bones = skeleton_xml.bones
-
-    # Need to go into edit mode to modify edit bones
-    bpy.ops.object.mode_set(mode="EDIT")
-
-    for bone_xml in bones:
-        create_bpy_bone(bone_xml, armature_obj.data)
+    # LimitRotation and Unk0 have their special meanings, can be deduced if needed when exporting
+    flags_restricted = {"LimitRotation", "Unk0"}
 
-    bpy.ops.object.mode_set(mode="OBJECT")
+    builder = SkeletonBuilder()
+    for bone_xml in skeleton_xml.bones:
+        builder.add_bone(
+            bone_xml.name,
+            bone_xml.tag,
+            bone_xml.parent_index,
+            bone_xml.translation,
+            bone_xml.rotation,
+            (f for f in bone_xml.flags if f not in flags_restricted),
+        )
 
-    for bone_xml in bones:
-        set_bone_properties(bone_xml, armature_obj.data)
+    builder.build(armature_obj)
 
     return armature_obj
 
 
-def create_bpy_bone(bone_xml: Bone, armature: bpy.types.Armature):
-    # bpy.context.view_layer.objects.active = armature
-    edit_bone = armature.edit_bones.new(bone_xml.name)
-    if bone_xml.parent_index != -1:
-        edit_bone.parent = armature.edit_bones[bone_xml.parent_index]
-
-    # https://github.com/LendoK/Blender_GTA_V_model_importer/blob/master/importer.py
-    mat_rot = bone_xml.rotation.to_matrix().to_4x4()
-    mat_loc = Matrix.Translation(bone_xml.translation)
-    mat_sca = Matrix.Scale(1, 4, bone_xml.scale)
-
-    edit_bone.head = (0, 0, 0)
-    edit_bone.tail = (0, 0.05, 0)
-    edit_bone.matrix = mat_loc @ mat_rot @ mat_sca
-
-    if edit_bone.parent is not None:
-        edit_bone.matrix = edit_bone.parent.matrix @ edit_bone.matrix
-
-    return bone_xml.name
-
-
-def set_bone_properties(bone_xml: Bone, armature: bpy.types.Armature):
-    bl_bone = armature.bones[bone_xml.name]
-    bl_bone.bone_properties.tag = bone_xml.tag
-
-    # LimitRotation and Unk0 have their special meanings, can be deduced if needed when exporting
-    flags_restricted = set(["LimitRotation", "Unk0"])
-    for _flag in bone_xml.flags:
-        if _flag in flags_restricted:
-            continue
-
-        flag = bl_bone.bone_properties.flags.add()
-        flag.name = _flag
-
-
-def apply_rotation_limits(rotation_limits: list[RotationLimit], armature_obj: bpy.types.Object):
-    bone_by_tag: dict[str, bpy.types.PoseBone] = get_bone_by_tag(armature_obj)
+def apply_rotation_limits(
+    rotation_limits: list[RotationLimit],
+    armature_obj: bpy.types.Object,
+    bone_by_tag: Optional[dict[int, bpy.types.PoseBone]] = None,
+):
+    if bone_by_tag is None:
+        bone_by_tag = get_bone_by_tag(armature_obj)
 
     for rot_limit in rotation_limits:
         if rot_limit.bone_id not in bone_by_tag:
@@ -439,8 +416,13 @@ def apply_rotation_limits(rotation_limits: list[RotationLimit], armature_obj: bp
         create_limit_rot_bone_constraint(rot_limit, bone)
 
 
-def apply_translation_limits(translation_limits: list[BoneLimit], armature_obj: bpy.types.Object):
-    bone_by_tag: dict[str, bpy.types.PoseBone] = get_bone_by_tag(armature_obj)
+def apply_translation_limits(
+    translation_limits: list[BoneLimit],
+    armature_obj: bpy.types.Object,
+    bone_by_tag: Optional[dict[int, bpy.types.PoseBone]] = None,
+):
+    if bone_by_tag is None:
+        bone_by_tag = get_bone_by_tag(armature_obj)
 
     for trans_limit in translation_limits:
         if trans_limit.bone_id not in bone_by_tag:
@@ -452,8 +434,8 @@ def apply_translation_limits(translation_limits: list[BoneLimit], armature_obj:
         create_limit_pos_bone_constraint(trans_limit, bone)
 
 
-def get_bone_by_tag(armature_obj: bpy.types.Object):
-    bone_by_tag: dict[str, bpy.types.PoseBone] = {}
+def get_bone_by_tag(armature_obj: bpy.types.Object) -> dict[int, bpy.types.PoseBone]:
+    bone_by_tag: dict[int, bpy.types.PoseBone] = {}
 
     for pose_bone in armature_obj.pose.bones:
         bone_tag = pose_bone.bone.bone_properties.tag
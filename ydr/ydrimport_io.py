@@ -4,14 +4,12 @@ import bpy
 from bpy.types import (
     Object,
     Material,
-    Armature,
     PoseBone,
     Bone,
     LimitLocationConstraint,
     LimitRotationConstraint,
 )
 from typing import Optional
-from mathutils import Matrix
 from pathlib import Path
 from .shader_materials import create_shader, get_detail_extra_sampler, create_tinted_shader_graph
 from ..ybn.ybnimport_io import create_bound_composite, create_bound_object
@@ -36,6 +34,7 @@ from ..tools.blenderhelper import add_child_of_bone_constraint, create_empty_obj
 from ..shared.shader_nodes import SzShaderNodeParameter
 from .model_data_io import ModelData, get_model_data, get_model_data_split_by_group
 from .mesh_builder import MeshBuilder
+from .skeleton_builder import SkeletonBuilder
 from .cable_mesh_builder import CableMeshBuilder
 from .cable import CABLE_SHADER_NAME
 from ..lods import LODLevels, LODLevel
@@ -407,60 +406,35 @@ def is_non_color_texture(shader_filename: str, param_name: str) -> bool:
 
 
 def create_drawable_skel(armature_obj: Object, skeleton: Skeleton):
-    bpy.context.view_layer.objects.active = armature_obj
-    bones = skeleton.bones
-
-    # Need to go into edit mode to modify edit bones
-    bpy.ops.object.mode_set(mode="EDIT")
-
-    for b in bones:
-        add_bone(armature_obj.data, b)
-
-    bpy.ops.object.mode_set(mode="OBJECT")
-
-    for b in bones:
-        set_bone_properties(armature_obj.data, b)
-        add_bone_constraints(armature_obj, b)
+    # flags still use the CW names for backwards compatibility
+    from szio.gta5.cwxml.adapters.drawable import CW_BONE_FLAGS_INVERSE_MAP
+
+    builder = SkeletonBuilder()
+    for b in skeleton.bones:
+        builder.add_bone(
+            b.name,
+            b.tag,
+            b.parent_index,
+            b.position,
+            b.rotation,
+            # LimitRotation and Unk0 have their special meanings, can be deduced if needed when exporting
+            (
+                CW_BONE_FLAGS_INVERSE_MAP[f] for f in b.flags
+                if not f & (SkelBoneFlags.HAS_ROTATE_LIMITS | SkelBoneFlags.HAS_CHILD)
+            ),
+        )
+
+    bones_by_name = builder.build(armature_obj)
+
+    pose_bones = armature_obj.pose.bones
+    for b in skeleton.bones:
+        if b.translation_limit or b.rotation_limit:
+            add_bone_constraints(pose_bones[bones_by_name[b.name].name], b)
 
     return armature_obj
 
 
-def add_bone(armature: Armature, bone: SkelBone):
-    edit_bone = armature.edit_bones.new(bone.name)
-    if bone.parent_index != -1:
-        edit_bone.parent = armature.edit_bones[bone.parent_index]
-
-    # https://github.com/LendoK/Blender_GTA_V_model_importer/blob/master/importer.py
-    mat_rot = bone.rotation.to_matrix().to_4x4()
-    mat_loc = Matrix.Translation(bone.position)
-    mat_sca = Matrix.Scale(1, 4, bone.scale)
-
-    edit_bone.head = (0, 0, 0)
-    edit_bone.tail = (0, 0.05, 0)
-    edit_bone.matrix = mat_loc @ mat_rot @ mat_sca
-
-    if edit_bone.parent is not None:
-        edit_bone.matrix = edit_bone.parent.matrix @ edit_bone.matrix
-
-
-def set_bone_properties(armature: Armature, bone: SkelBone):
-    bl_bone = armature.bones[bone.name]
-    bl_bone.bone_properties.tag = bone.tag
-
-    for _flag in bone.flags:
-        # LimitRotation and Unk0 have their special meanings, can be deduced if needed when exporting
-        if _flag & (SkelBoneFlags.HAS_ROTATE_LIMITS | SkelBoneFlags.HAS_CHILD):
-            continue
-
-        # flags still use the CW names for backwards compatibility
-        from szio.gta5.cwxml.adapters.drawable import CW_BONE_FLAGS_INVERSE_MAP
-        flag = bl_bone.bone_properties.flags.add()
-        flag.name = CW_BONE_FLAGS_INVERSE_MAP[_flag]
-
-
-def add_bone_constraints(armature_obj: Object, bone: SkelBone):
-    pose_bone = armature_obj.pose.bones[bone.name]
-
+def add_bone_constraints(pose_bone: PoseBone, bone: SkelBone):
     if bone.translation_limit:
         add_bone_constraint_translation_limit(pose_bone, bone.translation_limit)
 
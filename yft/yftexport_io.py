@@ -59,6 +59,7 @@ from ..ydr.cloth_env_io import cloth_env_export, cloth_env_find_mesh_objects
 
 from ..iecontext import export_context, ExportBundle
 from .. import logger
+from .. import profiler
 
 from .properties import (
     LODProperties,
@@ -72,7 +73,8 @@ from .yftexport import locate_fragment_objects, FragmentObjects
 
 def export_yft(obj: Object) -> ExportBundle:
     embedded_tex = []
-    frag, hi_frag = create_fragment_asset(obj, out_embedded_textures=embedded_tex)
+    with profiler.scope("yft.export"):
+        frag, hi_frag = create_fragment_asset(obj, out_embedded_textures=embedded_tex)
     return export_context().make_bundle(frag, ("_hi", hi_frag), files_to_copy=[t.source_filepath for t in embedded_tex])
 
 
@@ -174,20 +176,23 @@ def create_fragment_asset_core(
             hi_frag.physics = hi_physics
             hi_frag.flags |= frag_flags
 
-        vehicle_windows = (
-            generate_frag_vehicle_windows(frag)
-            if gen_vehicle_windows
-            else create_frag_vehicle_windows(frag_obj, drawable, physics.lod1.children, materials)
-        )
+        with profiler.scope("yft.vehicle_windows"):
+            vehicle_windows = (
+                generate_frag_vehicle_windows(frag)
+                if gen_vehicle_windows
+                else create_frag_vehicle_windows(frag_obj, drawable, physics.lod1.children, materials)
+            )
         frag.vehicle_windows = vehicle_windows
     else:
         frag.physics = None
         if hi_frag:
             hi_frag.physics = None
 
-    frag.lights = export_lights(frag_obj)
+    with profiler.scope("yft.lights"):
+        frag.lights = export_lights(frag_obj)
 
-    env_cloth = cloth_env_export(frag_obj, drawable, materials)
+    with profiler.scope("yft.cloth"):
+        env_cloth = cloth_env_export(frag_obj, drawable, materials)
     if env_cloth is not None:
         main_drawable_is_empty = all(not v for v in drawable.models.values())
         if main_drawable_is_empty:
@@ -233,6 +238,7 @@ def has_hi_lods(frag_obj: Object) -> bool:
     return False
 
 
+@profiler.profiled("yft.drawable")
 def create_frag_drawable(
     frag_objs: FragmentObjects,
     materials: list[Material],
@@ -253,6 +259,7 @@ def create_frag_drawable(
     return drawable
 
 
+@profiler.profiled("yft.damaged_drawable")
 def create_frag_damaged_drawable(frag_objs: FragmentObjects, main_drawable: AssetDrawable, materials: list[Material]) -> Optional[AssetDrawable]:
     assert frag_objs.damaged_drawable is not None, "Caller must ensure that there is a damaged drawable"
     drawable = create_drawable_asset(frag_objs.damaged_drawable, frag_objs.fragment, materials,
@@ -289,6 +296,7 @@ def create_bone_transforms_set(drawable: AssetDrawable) -> MatrixSet:
     return MatrixSet(is_skinned, bones_transforms)
 
 
+@profiler.profiled("yft.physics")
 def create_frag_physics(
     frag_objs: FragmentObjects,
     main_drawable: AssetDrawable,
@@ -390,6 +398,7 @@ def create_frag_phys_lod(
     return lod, hi_lod, frag_flags, glass_windows
 
 
+@profiler.profiled("yft.physics.collisions")
 def create_frag_phys_collisions(
     frag_objs: FragmentObjects,
     col_obj_to_bound_index: dict[Object, int]
@@ -417,6 +426,7 @@ def create_frag_phys_collisions(
     return composite, damaged_composite
 
 
+@profiler.profiled("yft.physics.groups")
 def create_frag_phys_groups(
     frag_objs: FragmentObjects,
     materials: list[Material]
@@ -519,6 +529,7 @@ def init_frag_phys_group(name: str, group_props: GroupProperties) -> PhysGroup:
     )
 
 
+@profiler.profiled("yft.physics.children")
 def create_frag_phys_children(
     frag_objs: FragmentObjects,
     main_drawable: AssetDrawable,
@@ -764,6 +775,7 @@ def create_child_mat_arrays(
             first.damaged_drawable.frag_extra_bound_matrices = damaged_extra_matrices
 
 
+@profiler.profiled("yft.physics.archetypes")
 def create_frag_phys_archetypes(
     frag_objs: FragmentObjects,
     phys_children: list[PhysChild],
@@ -21,7 +21,6 @@ from szio.gta5 import (
     AssetDrawable,
     PhysGroup,
     FragVehicleWindow,
-    try_load_asset,
     AssetFormat,
     LodLevel,
 )
@@ -31,6 +30,7 @@ from ..ydr.lights_io import create_light_objs
 from .properties import LODProperties, GroupFlagBit, GlassTypes
 from ..tools.blenderhelper import get_child_of_bone
 from ..iecontext import import_context
+from ..asset_cache import load_asset
 from .. import logger
 
 
@@ -87,7 +87,7 @@ def try_load_non_hi_frag(name: str, prefers_xml: bool) -> AssetFragment | None:
     for ext in possible_exts:
         non_hi_path = d / f"{name}{ext}"
         if non_hi_path.is_file():
-            non_hi_frag = try_load_asset(non_hi_path)
+            non_hi_frag = load_asset(non_hi_path)
             if non_hi_frag:
                 break
 
@@ -106,7 +106,7 @@ def try_load_hi_frag(name: str, prefers_xml: bool) -> AssetFragment | None:
     for ext in possible_exts:
         hi_path = d / f"{name}_hi{ext}"
         if hi_path.is_file():
-            hi_frag = try_load_asset(hi_path)
+            hi_frag = load_asset(hi_path)
             if hi_frag:
                 break
 
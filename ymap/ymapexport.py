@@ -2,6 +2,8 @@ import bpy
 import re
 import math
 import numpy as np
+from numpy.typing import NDArray
+from typing import Optional
 from mathutils import Vector
 from struct import pack
 from szio.gta5.cwxml.ymap import *
@@ -38,47 +40,107 @@ def box_from_obj(obj):
     return box
 
 
-def triangulate_obj(obj):
-    """Convert mesh from n-polygons to triangles"""
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.quads_convert_to_tris()
-    bpy.ops.object.mode_set(mode="OBJECT")
+OCCLUDE_MODEL_MAX_VERTS = 255
+"""Maximum number of vertices in a single ``OccludeModel``, face indices are stored as 8-bit integers."""
 
 
-def occlusion_model_obj_get_data_buffer(obj) -> bytes:
+def occlusion_model_obj_get_triangles(
+    obj: bpy.types.Object, depsgraph: Optional[bpy.types.Depsgraph] = None
+) -> tuple[NDArray[np.float32], NDArray[np.uint32]]:
     """
-    For each vertex get its coordinates in global space (this way we don't need to apply transfroms) as 32-bit floats
-    and for each face get its indices as 8-bit integers. Then convert them to bytes and append them together.
+    Get the vertex coordinates in global space (this way we don't need to apply transforms) and the triangles of the
+    evaluated mesh of ``obj``. The mesh is triangulated with ``loop_triangles`` on an evaluated copy, so the object data
+    is left untouched and no mode switching is needed.
 
-    :return verts: Bytes buffer containing the vertex coordinates and face indices
-    :rtype bytes:
+    :return positions: Array of shape (N, 3) with the vertex coordinates
+    :return tris: Array of shape (M, 3) with the vertex indices of each triangle
     """
-    # TODO: should validate that the mesh is within <256 verts
-    mesh = obj.data
-    verts = np.array([obj.matrix_world @ v.co for v in mesh.vertices], dtype=np.float32)
-    indices = np.array([i for p in mesh.polygons for i in p.vertices], dtype=np.uint8)
-    return verts.tobytes() + indices.tobytes()
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+
+    obj_eval = obj.evaluated_get(depsgraph)
+    mesh = obj_eval.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", positions)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.uint32)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+        matrix = np.array(obj_eval.matrix_world, dtype=np.float32)
+    finally:
+        obj_eval.to_mesh_clear()
+
+    positions = positions.reshape((-1, 3)) @ matrix[:3, :3].T + matrix[:3, 3]
+    return positions, tris.reshape((-1, 3))
+
+
+def occlusion_model_split_triangles(
+    tris: NDArray[np.uint32], max_verts: int = OCCLUDE_MODEL_MAX_VERTS
+) -> list[NDArray[np.uint32]]:
+    """
+    Split the triangles in consecutive chunks that reference at most ``max_verts`` unique vertices each. Triangles are
+    kept in order, so chunks of meshes with spatially coherent faces stay compact.
+    """
+    if len(tris) == 0:
+        return []
+
+    if len(np.unique(tris)) <= max_verts:
+        return [tris]
 
+    chunks = []
+    chunk_start = 0
+    chunk_verts = set()
+    for i, tri in enumerate(tris.tolist()):
+        new_verts = set(tri) - chunk_verts
+        if len(chunk_verts) + len(new_verts) > max_verts:
+            chunks.append(tris[chunk_start:i])
+            chunk_start = i
+            chunk_verts = set(tri)
+        else:
+            chunk_verts |= new_verts
 
-def model_from_obj(obj):
-    triangulate_obj(obj)
+    chunks.append(tris[chunk_start:])
+    return chunks
+
+
+def model_from_triangles(positions: NDArray[np.float32], tris: NDArray[np.uint32], flags: int) -> OccludeModel:
+    """
+    Create an ``OccludeModel`` with the vertices referenced by ``tris``. The data buffer contains the vertex
+    coordinates as 32-bit floats followed by the face indices as 8-bit integers.
+    """
+    vert_indices, local_tris = np.unique(tris, return_inverse=True)
+    assert len(vert_indices) <= OCCLUDE_MODEL_MAX_VERTS, "Too many vertices for an occlude model"
+
+    verts = positions[vert_indices].astype(np.float32)
+    local_tris = local_tris.reshape(tris.shape).astype(np.uint8)
 
     model = OccludeModel()
-    model.bmin, model.bmax = get_extents(obj)
-    model.verts = occlusion_model_obj_get_data_buffer(obj)
-    model.num_verts_in_bytes = len(obj.data.vertices) * 12
-    face_count = len(obj.data.polygons)
-    model.num_tris = face_count | 0x8000  # add float vertex format marker
+    model.bmin = Vector(verts.min(axis=0))
+    model.bmax = Vector(verts.max(axis=0))
+    model.verts = verts.tobytes() + local_tris.tobytes()
+    model.num_verts_in_bytes = len(verts) * 12
+    model.num_tris = len(local_tris) | 0x8000  # add float vertex format marker
     model.data_size = len(model.verts)
-    model.flags = obj.ymap_model_occl_properties.model_occl_flags
+    model.flags = flags
 
-    assert model.data_size == (model.num_verts_in_bytes + face_count * 3)
+    assert model.data_size == (model.num_verts_in_bytes + len(local_tris) * 3)
 
     return model
 
 
+def models_from_obj(obj: bpy.types.Object, depsgraph: Optional[bpy.types.Depsgraph] = None) -> list[OccludeModel]:
+    """Create the occlude models of ``obj``. Meshes with too many vertices are split in multiple models."""
+    positions, tris = occlusion_model_obj_get_triangles(obj, depsgraph)
+    chunks = occlusion_model_split_triangles(tris)
+    if len(chunks) > 1:
+        logger.info(
+            f"Object {obj.name} has more than {OCCLUDE_MODEL_MAX_VERTS} vertices, it was split in {len(chunks)} "
+            "occlude models.")
+
+    flags = obj.ymap_model_occl_properties.model_occl_flags
+    return [model_from_triangles(positions, chunk, flags) for chunk in chunks]
+
+
 def entity_from_obj(obj):
     # Removing " (not found)" suffix, created when importing ymaps while entity was not found in the view layer
     obj.name = re.sub(" \(not found\)", "", obj.name.lower())
@@ -165,15 +227,15 @@ def ymap_from_object(obj):
         if export_settings.ymap_model_occluders == False and child.sollum_type == SollumType.YMAP_MODEL_OCCLUDER_GROUP:
             obj.ymap_properties.content_flags_toggle.has_occl = True
 
+            depsgraph = bpy.context.evaluated_depsgraph_get()
             for model_obj in child.children:
                 if model_obj.sollum_type == SollumType.YMAP_MODEL_OCCLUDER:
-                    if len(model_obj.data.vertices) > 256:
-                        logger.warning(
-                            f"Object {model_obj.name} has too many vertices and will be skipped. It can not have more than 256 vertices.")
+                    models = models_from_obj(model_obj, depsgraph)
+                    if not models:
+                        logger.warning(f"Object {model_obj.name} will be skipped because it has no faces.")
                         continue
 
-                    ymap.occlude_models.append(
-                        model_from_obj(model_obj))
+                    ymap.occlude_models.extend(models)
                 else:
                     logger.warning(
                         f"Object {model_obj.name} will be skipped because it is not a {SOLLUMZ_UI_NAMES[SollumType.YMAP_MODEL_OCCLUDER]} type.")
@@ -12,8 +12,9 @@ from szio.gta5.cwxml import (
     OccludeModel,
     YMAP,
 )
-from ..tools.blenderhelper import create_blender_object, create_empty_object
+from ..tools.blenderhelper import create_blender_object, create_empty_object, get_object_with_children
 from ..tools.meshhelper import create_box
+from ..shared.xml_streaming import stream_xml_file
 from .. import logger
 
 # TODO: Make better?
@@ -63,13 +64,19 @@ def entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     bpy.context.collection.objects.link(group_obj)
     bpy.context.view_layer.objects.active = group_obj
 
-    found = False
     if ymap.entities:
-        for obj in bpy.context.collection.all_objects:
-            for entity in ymap.entities:
-                if entity.archetype_name == obj.name and obj.name in bpy.context.view_layer.objects:
-                    found = True
-                    apply_entity_properties(obj, entity)
+        view_layer_obj_names = {obj.name for obj in bpy.context.view_layer.objects}
+        objs_by_name = {
+            obj.name: obj for obj in bpy.context.collection.all_objects if obj.name in view_layer_obj_names
+        }
+
+        found = False
+        for entity in ymap.entities:
+            obj = objs_by_name.get(entity.archetype_name, None)
+            if obj is not None:
+                found = True
+                apply_entity_properties(obj, entity)
+
         if found:
             logger.info(f"Succesfully imported: {ymap.name}.ymap")
             return True
@@ -82,6 +89,58 @@ def entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
         return False
 
 
+def is_valid_entity_archetype_obj(obj: bpy.types.Object) -> bool:
+    # TODO: requiring ymap entities to be drawable or fragment in blender seems like an unnecessary limitation
+    # Need to special case assets because their type when imported by sollumz is drawable model
+    return obj.sollum_type == SollumType.DRAWABLE or obj.sollum_type == SollumType.FRAGMENT or obj.asset_data is not None
+
+
+def can_instance_archetype_collection(obj: bpy.types.Object) -> bool:
+    """Get whether the archetype object can be used through a collection instance. The collection instance offset
+    only cancels the translation of the archetype, so it must not be rotated or scaled.
+    """
+    rotation_scale = obj.matrix_world.to_3x3()
+    return all(
+        math.isclose(rotation_scale[row][col], 1.0 if row == col else 0.0, abs_tol=1e-5)
+        for row in range(3) for col in range(3)
+    )
+
+
+def get_archetype_instance_collection(obj: bpy.types.Object) -> bpy.types.Collection:
+    """Get a collection with the archetype object and all its children, to be used by collection instances. The
+    collection origin is placed at the archetype object, so instances are positioned relative to it. The archetype
+    object must only be translated, see ``can_instance_archetype_collection``.
+    """
+    collection = bpy.data.collections.new(f"{obj.name}.instance")
+    for o in get_object_with_children(obj):
+        collection.objects.link(o)
+    collection.instance_offset = obj.matrix_world.translation
+    return collection
+
+
+def create_collection_instance_obj(name: str, collection: bpy.types.Collection) -> bpy.types.Object:
+    instance_obj = bpy.data.objects.new(name, None)
+    instance_obj.instance_type = "COLLECTION"
+    instance_obj.instance_collection = collection
+    instance_obj.sollum_type = SollumType.DRAWABLE
+    return instance_obj
+
+
+def create_missing_entity_objs(group_obj: bpy.types.Object, entities: list):
+    """Create empty drawables as placeholders for entities whose archetype is missing in the scene."""
+    missing_archetypes = set()
+    for entity in entities:
+        empty_obj = bpy.data.objects.new(entity.archetype_name + " (not found)", None)
+        bpy.context.collection.objects.link(empty_obj)
+        empty_obj.parent = group_obj
+        empty_obj.sollum_type = SollumType.DRAWABLE
+        apply_entity_properties(empty_obj, entity)
+        missing_archetypes.add(entity.archetype_name)
+
+    for archetype_name in sorted(missing_archetypes):
+        logger.error(f"'{archetype_name}' is missing in scene, creating an empty drawable instead.")
+
+
 def instanced_entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     group_obj = bpy.data.objects.new("Entities", None)
     group_obj.sollum_type = SollumType.YMAP_ENTITY_GROUP
@@ -93,40 +152,57 @@ def instanced_entity_to_obj(ymap_obj: bpy.types.Object, ymap: CMapData):
     bpy.context.view_layer.objects.active = group_obj
 
     if ymap.entities:
+        import_settings = get_import_settings()
+        use_collection_instances = import_settings.ymap_instance_mode == "COLLECTION"
+
         entities_amount = len(ymap.entities)
         count = 0
 
+        archetype_names = {entity.archetype_name for entity in ymap.entities}
+        archetype_objs = {obj.name: obj for obj in bpy.data.objects if obj.name in archetype_names}
+        for name, obj in list(archetype_objs.items()):
+            if not is_valid_entity_archetype_obj(obj):
+                logger.error(
+                    f"Cannot use your '{obj.name}' object because it is not a 'Drawable' type!")
+                del archetype_objs[name]
+
+        instance_collections = {}
+        missing_entities = []
         for entity in ymap.entities:
-            obj = bpy.data.objects.get(entity.archetype_name, None)
+            obj = archetype_objs.get(entity.archetype_name, None)
             if obj is None:
-                # No object with the given archetype name found
+                # No valid object with the given archetype name found
+                missing_entities.append(entity)
                 continue
 
-            # TODO: requiring ymap entities to be drawable or fragment in blender seems like an unnecessary limitation
-            # Need to special case assets because their type when imported by sollumz is drawable model
-            if obj.sollum_type == SollumType.DRAWABLE or obj.sollum_type == SollumType.FRAGMENT or obj.asset_data is not None:
-                new_obj = duplicate_object_with_children(obj)
-                apply_entity_properties(new_obj, entity)
-                new_obj.parent = group_obj
-                count += 1
-                entity.found = True
+            collection = None
+            if use_collection_instances:
+                if obj.name in instance_collections:
+                    collection = instance_collections[obj.name]
+                elif can_instance_archetype_collection(obj):
+                    collection = get_archetype_instance_collection(obj)
+                    instance_collections[obj.name] = collection
+                else:
+                    logger.warning(
+                        f"Cannot use a collection instance for '{obj.name}' because the object is rotated or scaled! "
+                        "Copying the object instead."
+                    )
+                    instance_collections[obj.name] = None
+
+            if collection is not None:
+                new_obj = create_collection_instance_obj(obj.name, collection)
+                bpy.context.collection.objects.link(new_obj)
             else:
-                logger.error(
-                    f"Cannot use your '{obj.name}' object because it is not a 'Drawable' type!")
+                new_obj = duplicate_object_with_children(obj)
+
+            apply_entity_properties(new_obj, entity)
+            new_obj.parent = group_obj
+            count += 1
 
         # Creating empty entity if no object was found for reference, and notify user
-        import_settings = get_import_settings()
+        if not import_settings.ymap_skip_missing_entities and missing_entities:
+            create_missing_entity_objs(group_obj, missing_entities)
 
-        if not import_settings.ymap_skip_missing_entities:
-            for entity in ymap.entities:
-                if entity.found is None:
-                    empty_obj = bpy.data.objects.new(
-                        entity.archetype_name + " (not found)", None)
-                    empty_obj.parent = group_obj
-                    apply_entity_properties(empty_obj, entity)
-                    empty_obj.sollum_type = SollumType.DRAWABLE
-                    logger.error(
-                        f"'{entity.archetype_name}' is missing in scene, creating an empty drawable instead.")
         if count > 0:
             logger.info(
                 f"Succesfully placed {count}/{entities_amount} entities from scene!")
@@ -282,7 +358,10 @@ def ymap_to_obj(ymap: CMapData):
 
 
 def import_ymap(filepath):
-    ymap_xml: CMapData = YMAP.from_xml_file(filepath)
+    if get_import_settings().stream_xml_files:
+        ymap_xml: CMapData = stream_xml_file(CMapData, filepath)
+    else:
+        ymap_xml: CMapData = YMAP.from_xml_file(filepath)
     found = False
     for obj in bpy.context.scene.objects:
         if obj.sollum_type == SollumType.YMAP and obj.name == ymap_xml.name:
@@ -1,8 +1,11 @@
 from ..tools.meshhelper import create_box
 from szio.gta5.cwxml import (
     YNV,
+    Navmesh,
 )
 from ..sollumz_properties import SOLLUMZ_UI_NAMES, SollumType
+from ..sollumz_preferences import get_import_settings
+from ..shared.xml_streaming import stream_xml_file
 import os
 import bpy
 from ..tools.blenderhelper import find_bsdf_and_material_output
@@ -171,5 +174,8 @@ def navmesh_to_obj(navmesh, filepath):
 
 
 def import_ynv(filepath):
-    ynv_xml = YNV.from_xml_file(filepath)
+    if get_import_settings().stream_xml_files:
+        ynv_xml = stream_xml_file(Navmesh, filepath)
+    else:
+        ynv_xml = YNV.from_xml_file(filepath)
     navmesh_to_obj(ynv_xml, filepath)
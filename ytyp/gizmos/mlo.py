@@ -1,9 +1,12 @@
 import bpy
+from collections.abc import Callable
 from ...sollumz_properties import ArchetypeType
 from ...sollumz_preferences import get_theme_settings
-from mathutils import Vector, Matrix
-from ..utils import get_selected_archetype, get_selected_ytyp, get_selected_portal, get_selected_tcm
+from mathutils import Vector, Matrix, Quaternion
+from typing import NamedTuple
+from ..utils import get_selected_archetype, get_selected_ytyp
 from ...tools.blenderhelper import find_parent
+from ..properties.mlo import get_mlo_geometry_revision, get_mlo_item_geometry_revision
 
 
 def can_draw_gizmos(context):
@@ -18,12 +21,61 @@ def can_draw_gizmos(context):
     return False
 
 
+class MloGizmoGeometryCache:
+    """Caches the geometry drawn by the gizmos of an MLO collection (rooms, portals or timecycle modifiers), one entry
+    per item. When the revision of the collection is bumped, only the entries of the items whose own revision changed
+    are rebuilt, all of them if items were added or removed. Only the geometry of the last archetype is stored, as the
+    gizmos are only drawn for the selected archetype.
+    """
+
+    def __init__(self, collection_name: str, build_item: Callable[[bpy.types.PropertyGroup], object]):
+        self.collection_name = collection_name
+        self.build_item = build_item
+        self._key = None
+        # Item pointer -> (item revision, geometry)
+        self._entries: dict[int, tuple[int, object]] = {}
+        self._items = []
+
+    def get(self, archetype) -> list:
+        collection = getattr(archetype, self.collection_name)
+        key = (archetype.uuid, len(collection), get_mlo_geometry_revision(self.collection_name))
+        if key != self._key:
+            entries = {}
+            for item in collection:
+                ptr = item.as_pointer()
+                revision = get_mlo_item_geometry_revision(self.collection_name, item)
+                entry = self._entries.get(ptr, None)
+                if entry is None or entry[0] != revision:
+                    entry = (revision, self.build_item(item))
+                entries[ptr] = entry
+
+            # The geometry of replaced or removed items is released along with the old entries
+            self._entries = entries
+            self._items = [geometry for _, geometry in entries.values()]
+            self._key = key
+        return self._items
+
+
+def sync_gizmos_count(group: bpy.types.GizmoGroup, gizmo_idnames: tuple[str, ...], num_items: int):
+    """Makes sure the group has ``gizmo_idnames`` gizmos for each item, linked to the item index. Existing gizmos are
+    reused if the number of items didn't change.
+    """
+    if len(group.gizmos) == num_items * len(gizmo_idnames):
+        return
+
+    group.gizmos.clear()
+    for index in range(num_items):
+        for idname in gizmo_idnames:
+            gz = group.gizmos.new(idname)
+            gz.linked_index = index
+
+
 class RoomGizmo(bpy.types.Gizmo):
     bl_idname = "OBJECT_GT_room"
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.linked_room = None
+        self.linked_index = -1
 
     @staticmethod
     def get_verts(bbmin, bbmax):
@@ -68,16 +120,20 @@ class RoomGizmo(bpy.types.Gizmo):
             bbmax
         ]
 
+    @staticmethod
+    def build_shape(room):
+        return bpy.types.Gizmo.new_custom_shape("LINES", RoomGizmo.get_verts(room.bb_min, room.bb_max))
+
     def draw(self, context):
         theme = get_theme_settings(context)
         selected_ytyp = get_selected_ytyp(context)
         selected_archetype = selected_ytyp.selected_archetype
-        selected_room = selected_archetype.rooms.active_item
-        room = self.linked_room
+        shapes = room_shapes_cache.get(selected_archetype)
+        index = self.linked_index
 
         self.use_draw_scale = False
 
-        if room == selected_room:
+        if index == selected_archetype.rooms.active_index:
             r, g, b, a = theme.mlo_gizmo_room_selected
         else:
             r, g, b, a = theme.mlo_gizmo_room
@@ -86,11 +142,11 @@ class RoomGizmo(bpy.types.Gizmo):
         self.alpha = a
 
         asset = selected_archetype.asset
-        if asset and room:
-            self.custom_shape = self.new_custom_shape(
-                "LINES", RoomGizmo.get_verts(room.bb_min, room.bb_max))
-            self.draw_custom_shape(
-                self.custom_shape, matrix=asset.matrix_world)
+        if asset and 0 <= index < len(shapes):
+            self.draw_custom_shape(shapes[index], matrix=asset.matrix_world)
+
+
+room_shapes_cache = MloGizmoGeometryCache("rooms", RoomGizmo.build_shape)
 
 
 class RoomGizmoGroup(bpy.types.GizmoGroup):
@@ -114,12 +170,8 @@ class RoomGizmoGroup(bpy.types.GizmoGroup):
         pass
 
     def draw_prepare(self, context):
-        selected_ytyp = get_selected_ytyp(context)
-        selected_archetype = selected_ytyp.selected_archetype
-        self.gizmos.clear()
-        for room in selected_archetype.rooms:
-            gz = self.gizmos.new(RoomGizmo.bl_idname)
-            gz.linked_room = room
+        selected_archetype = get_selected_archetype(context)
+        sync_gizmos_count(self, (RoomGizmo.bl_idname,), len(selected_archetype.rooms))
 
 
 class PortalGizmo(bpy.types.Gizmo):
@@ -127,7 +179,7 @@ class PortalGizmo(bpy.types.Gizmo):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.linked_portal = None
+        self.linked_index = -1
 
     @staticmethod
     def get_verts(corners):
@@ -147,11 +199,11 @@ class PortalGizmo(bpy.types.Gizmo):
     def draw_select(self, context, select_id=None):
         theme = get_theme_settings(context)
         selected_archetype = get_selected_archetype(context)
-        selected_portal = get_selected_portal(context)
-        portal = self.linked_portal
+        portals_geometry = portals_geometry_cache.get(selected_archetype)
+        index = self.linked_index
         asset = selected_archetype.asset
 
-        if selected_portal == portal:
+        if index == selected_archetype.portals.active_index:
             r, g, b, a = theme.mlo_gizmo_portal_selected
         else:
             r, g, b, a = theme.mlo_gizmo_portal
@@ -162,24 +214,17 @@ class PortalGizmo(bpy.types.Gizmo):
         self.color_highlight = self.color * 0.9
         self.alpha_highlight = self.alpha
 
-        if portal and asset:
-            corners = [portal.corner1, portal.corner2,
-                       portal.corner3, portal.corner4]
-
-            self.portal_poly = self.new_custom_shape(
-                "TRIS", PortalGizmo.get_verts(corners))
-
+        if asset and 0 <= index < len(portals_geometry):
             self.draw_custom_shape(
-                self.portal_poly, matrix=asset.matrix_world, select_id=select_id)
+                portals_geometry[index].shape, matrix=asset.matrix_world, select_id=select_id)
 
     def invoke(self, context, event):
         selected_archetype = get_selected_archetype(context)
-        portals = list(selected_archetype.portals)
 
-        if self.linked_portal not in portals:
+        if not 0 <= self.linked_index < len(selected_archetype.portals):
             return
 
-        selected_archetype.portals.select(portals.index(self.linked_portal))
+        selected_archetype.portals.select(self.linked_index)
 
         return {'PASS_THROUGH'}
 
@@ -192,41 +237,49 @@ class PortalNormalGizmo(bpy.types.Gizmo):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.linked_portal = None
+        self.linked_index = -1
 
     def draw(self, context):
         theme = get_theme_settings(context)
         selected_archetype = get_selected_archetype(context)
-        selected_portal = get_selected_portal(context)
-        portal = self.linked_portal
+        index = self.linked_index
         asset = selected_archetype.asset
 
         r, g, b, a = theme.mlo_gizmo_portal_direction
         self.color = r, g, b
 
-        if selected_portal != portal:
+        if index != selected_archetype.portals.active_index:
             self.alpha = 0
+            return
 
-        if selected_portal == portal:
-            self.alpha = a
-
-            if portal and asset:
-                corners = [portal.corner1, portal.corner2,
-                           portal.corner3, portal.corner4]
-                x = [p[0] for p in corners]
-                y = [p[1] for p in corners]
-                z = [p[2] for p in corners]
-                centroid = Vector(
-                    (sum(x) / len(corners), sum(y) / len(corners), sum(z) / len(corners)))
-                normal = -(corners[2] - corners[0]
-                           ).cross(corners[1] - corners[0]).normalized()
-                default_axis = Vector((0, 0, 1))
-                rot = default_axis.rotation_difference(normal)
-                scale = theme.mlo_gizmo_portal_direction_size
-                arrow_mat = Matrix.LocRotScale(
-                    centroid, rot, Vector((scale, scale, scale)))
-                self.draw_preset_arrow(
-                    matrix=asset.matrix_world @ arrow_mat)
+        self.alpha = a
+
+        portals_geometry = portals_geometry_cache.get(selected_archetype)
+        if asset and 0 <= index < len(portals_geometry):
+            portal_geometry = portals_geometry[index]
+            scale = theme.mlo_gizmo_portal_direction_size
+            arrow_mat = Matrix.LocRotScale(
+                portal_geometry.centroid, portal_geometry.rotation, Vector((scale, scale, scale)))
+            self.draw_preset_arrow(
+                matrix=asset.matrix_world @ arrow_mat)
+
+
+class PortalGeometry(NamedTuple):
+    shape: object
+    centroid: Vector
+    rotation: Quaternion
+
+    @staticmethod
+    def build(portal) -> "PortalGeometry":
+        corners = [Vector(portal.corner1), Vector(portal.corner2), Vector(portal.corner3), Vector(portal.corner4)]
+        shape = bpy.types.Gizmo.new_custom_shape("TRIS", PortalGizmo.get_verts(corners))
+        centroid = (corners[0] + corners[1] + corners[2] + corners[3]) / 4
+        normal = -(corners[2] - corners[0]).cross(corners[1] - corners[0]).normalized()
+        rotation = Vector((0, 0, 1)).rotation_difference(normal)
+        return PortalGeometry(shape, centroid, rotation)
+
+
+portals_geometry_cache = MloGizmoGeometryCache("portals", PortalGeometry.build)
 
 
 class PortalGizmoGroup(bpy.types.GizmoGroup):
@@ -252,14 +305,9 @@ class PortalGizmoGroup(bpy.types.GizmoGroup):
         pass
 
     def refresh(self, context):
-        self.gizmos.clear()
         selected_archetype = get_selected_archetype(context)
-
-        for portal in selected_archetype.portals:
-            ngz = self.gizmos.new(PortalNormalGizmo.bl_idname)
-            ngz.linked_portal = portal
-            gz = self.gizmos.new(PortalGizmo.bl_idname)
-            gz.linked_portal = portal
+        sync_gizmos_count(
+            self, (PortalNormalGizmo.bl_idname, PortalGizmo.bl_idname), len(selected_archetype.portals))
 
 
 class TimecycleModifierGizmo(bpy.types.Gizmo):
@@ -267,7 +315,13 @@ class TimecycleModifierGizmo(bpy.types.Gizmo):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.linked_tcm = None
+        self.linked_index = -1
+
+    @staticmethod
+    def build_matrices(tcm) -> tuple[Matrix, Matrix]:
+        """Gets the local matrices of the sphere and range circles."""
+        t = Matrix.Translation(tcm.sphere_center)
+        return t @ Matrix.Scale(tcm.sphere_radius, 4), t @ Matrix.Scale(tcm.range, 4)
 
     def draw(self, context):
         self.draw_select(context)
@@ -275,11 +329,11 @@ class TimecycleModifierGizmo(bpy.types.Gizmo):
     def draw_select(self, context, select_id=None):
         theme = get_theme_settings(context)
         selected_archetype = get_selected_archetype(context)
-        selected_tcm = get_selected_tcm(context)
-        tcm = self.linked_tcm
+        tcms_matrices = tcm_matrices_cache.get(selected_archetype)
+        index = self.linked_index
         asset = selected_archetype.asset
 
-        if selected_tcm == tcm:
+        if index == selected_archetype.timecycle_modifiers.active_index:
             r, g, b, a = theme.mlo_gizmo_tcm_selected
         else:
             r, g, b, a = theme.mlo_gizmo_tcm
@@ -290,24 +344,23 @@ class TimecycleModifierGizmo(bpy.types.Gizmo):
         self.color_highlight = self.color * 0.9
         self.alpha_highlight = self.alpha
 
-        if tcm and asset:
+        if asset and 0 <= index < len(tcms_matrices):
             select_id = select_id if select_id is not None else -1
-            t = asset.matrix_world @ Matrix.Translation(tcm.sphere_center)
-            m = t @ Matrix.Scale(tcm.sphere_radius, 4)
+            sphere_mat, range_mat = tcms_matrices[index]
+            m = asset.matrix_world @ sphere_mat
             self.draw_preset_circle(m, axis="POS_X", select_id=select_id)
             self.draw_preset_circle(m, axis="POS_Y", select_id=select_id)
             self.draw_preset_circle(m, axis="POS_Z", select_id=select_id)
-            m = t @ Matrix.Scale(tcm.range, 4)
+            m = asset.matrix_world @ range_mat
             self.draw_preset_circle(m, axis="POS_Z", select_id=select_id)
 
     def invoke(self, context, event):
         selected_archetype = get_selected_archetype(context)
-        tcms = list(selected_archetype.timecycle_modifiers)
 
-        if self.linked_tcm not in tcms:
+        if not 0 <= self.linked_index < len(selected_archetype.timecycle_modifiers):
             return
 
-        selected_archetype.timecycle_modifiers.select(tcms.index(self.linked_tcm))
+        selected_archetype.timecycle_modifiers.select(self.linked_index)
 
         return {"PASS_THROUGH"}
 
@@ -315,6 +368,9 @@ class TimecycleModifierGizmo(bpy.types.Gizmo):
         return {"PASS_THROUGH"}
 
 
+tcm_matrices_cache = MloGizmoGeometryCache("timecycle_modifiers", TimecycleModifierGizmo.build_matrices)
+
+
 class TimecycleModifierGizmoGroup(bpy.types.GizmoGroup):
     bl_idname = "OBJECT_GGT_timecycle_modifier"
     bl_label = "MLO Timecycle Modifier"
@@ -338,9 +394,5 @@ class TimecycleModifierGizmoGroup(bpy.types.GizmoGroup):
         pass
 
     def refresh(self, context):
-        self.gizmos.clear()
         selected_archetype = get_selected_archetype(context)
-
-        for tcm in selected_archetype.timecycle_modifiers:
-            gz = self.gizmos.new(TimecycleModifierGizmo.bl_idname)
-            gz.linked_tcm = tcm
+        sync_gizmos_count(self, (TimecycleModifierGizmo.bl_idname,), len(selected_archetype.timecycle_modifiers))
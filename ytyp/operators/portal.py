@@ -5,7 +5,7 @@ from ...sollumz_operators import SOLLUMZ_OT_base, SearchEnumHelper
 from ...tools.blenderhelper import get_selected_vertices, get_selected_edit_vertices
 from ..utils import get_selected_archetype, get_selected_portal, get_selected_room, validate_dynamic_enums, validate_dynamic_enum
 from bpy_extras.view3d_utils import location_3d_to_region_2d
-from ..properties.mlo import PortalProperties, get_room_items_for_selected_archetype
+from ..properties.mlo import PortalProperties, get_room_items_for_selected_archetype, bump_mlo_geometry_revision
 
 
 class SOLLUMZ_OT_create_portal(SOLLUMZ_OT_base, bpy.types.Operator):
@@ -161,6 +161,7 @@ class SOLLUMZ_OT_delete_portal(SOLLUMZ_OT_base, bpy.types.Operator):
         for index_to_remove in indices_to_remove:
             selected_archetype.portals.remove(index_to_remove)
         selected_archetype.portals.select(new_active_index)
+        bump_mlo_geometry_revision("portals")
 
         # Force redraw of gizmos
         context.space_data.show_gizmo = context.space_data.show_gizmo
@@ -4,6 +4,7 @@ from ...sollumz_properties import ArchetypeType
 from ...tools.meshhelper import get_extents, get_min_vector_list, get_max_vector_list
 from ...tools.blenderhelper import get_selected_vertices
 from ..utils import get_selected_archetype, get_selected_room, validate_dynamic_enums, validate_dynamic_enum
+from ..properties.mlo import bump_mlo_geometry_revision
 
 
 class SOLLUMZ_OT_create_room(SOLLUMZ_OT_base, bpy.types.Operator):
@@ -99,6 +100,7 @@ class SOLLUMZ_OT_delete_room(SOLLUMZ_OT_base, bpy.types.Operator):
         for index_to_remove in indices_to_remove:
             selected_archetype.rooms.remove(index_to_remove)
         selected_archetype.rooms.select(new_active_index)
+        bump_mlo_geometry_revision("rooms")
 
         # Force redraw of gizmos
         context.space_data.show_gizmo = context.space_data.show_gizmo
@@ -16,6 +16,7 @@ from ...ydr.cloth_env import cloth_env_find_mesh_objects
 from ..utils import get_selected_ytyp, get_selected_archetype
 from ..ytypimport import import_ytyp
 from ..ytypexport import selected_ytyp_to_xml
+from ..properties.mlo import bump_mlo_geometry_revision
 from ...shared.multiselection import (
     MultiSelectOneOperator,
     MultiSelectAllOperator,
@@ -380,6 +381,7 @@ class SOLLUMZ_OT_delete_timecycle_modifier(SOLLUMZ_OT_base, bpy.types.Operator):
         for index_to_remove in indices_to_remove:
             selected_archetype.timecycle_modifiers.remove(index_to_remove)
         selected_archetype.timecycle_modifiers.select(new_active_index)
+        bump_mlo_geometry_revision("timecycle_modifiers")
 
         return True
 
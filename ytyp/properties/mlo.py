@@ -50,6 +50,59 @@ def get_entityset_items_for_selected_archetype(self, context: Optional[bpy.types
     return get_entityset_items_for_archetype(archetype)
 
 
+# Revision of the geometry of each MLO collection, bumped when the bounds of any room, portal or timecycle modifier
+# change or when items are added or removed. The MLO gizmos use it to know when to rebuild their cached geometry.
+_mlo_geometry_revisions: dict[str, int] = {"rooms": 0, "portals": 0, "timecycle_modifiers": 0}
+# Revision of the collection when all its items were last invalidated, and of each item modified since then, keyed by
+# item pointer. The MLO gizmos use them to rebuild only the geometry of the items that changed.
+_mlo_geometry_reset_revisions: dict[str, int] = {"rooms": 0, "portals": 0, "timecycle_modifiers": 0}
+_mlo_item_geometry_revisions: dict[str, dict[int, int]] = {"rooms": {}, "portals": {}, "timecycle_modifiers": {}}
+
+
+def get_mlo_geometry_revision(collection_name: str) -> int:
+    return _mlo_geometry_revisions[collection_name]
+
+
+def get_mlo_item_geometry_revision(collection_name: str, item: bpy.types.PropertyGroup) -> int:
+    return _mlo_item_geometry_revisions[collection_name].get(
+        item.as_pointer(), _mlo_geometry_reset_revisions[collection_name]
+    )
+
+
+def bump_mlo_geometry_revision(collection_name: Optional[str] = None):
+    """Invalidates the cached geometry of all the items of the collection, or of all collections if
+    ``collection_name`` is ``None``.
+    """
+    for name in (_mlo_geometry_revisions if collection_name is None else (collection_name,)):
+        _mlo_geometry_revisions[name] += 1
+        _mlo_geometry_reset_revisions[name] = _mlo_geometry_revisions[name]
+        _mlo_item_geometry_revisions[name].clear()
+
+
+def bump_mlo_item_geometry_revision(collection_name: str, item: bpy.types.PropertyGroup):
+    """Invalidates the cached geometry of a single item of the collection."""
+    _mlo_geometry_revisions[collection_name] += 1
+    _mlo_item_geometry_revisions[collection_name][item.as_pointer()] = _mlo_geometry_revisions[collection_name]
+
+
+def _update_rooms_geometry(self, context: Optional[bpy.types.Context]):
+    bump_mlo_item_geometry_revision("rooms", self)
+
+
+def _update_portals_geometry(self, context: Optional[bpy.types.Context]):
+    bump_mlo_item_geometry_revision("portals", self)
+
+
+def _update_timecycle_modifiers_geometry(self, context: Optional[bpy.types.Context]):
+    bump_mlo_item_geometry_revision("timecycle_modifiers", self)
+
+
+@bpy.app.handlers.persistent
+def _invalidate_mlo_geometry_handler(*args):
+    # Undo/redo and file loads replace the property values without calling the update callbacks
+    bump_mlo_geometry_revision()
+
+
 class MloArchetypeChild:
     def get_mlo_archetype(self):
         # TODO: this is incorrect if it gets called when the selected ytyp is not the owner of the MLO
@@ -112,8 +165,8 @@ class MloArchetypeChild:
 
 class RoomProperties(bpy.types.PropertyGroup, MloArchetypeChild):
     name: bpy.props.StringProperty(name="Name", update=MloArchetypeChild.update_mlo_archetype_caches)
-    bb_min: bpy.props.FloatVectorProperty(name="Bounds Min", subtype="XYZ")
-    bb_max: bpy.props.FloatVectorProperty(name="Bounds Max", subtype="XYZ")
+    bb_min: bpy.props.FloatVectorProperty(name="Bounds Min", subtype="XYZ", update=_update_rooms_geometry)
+    bb_max: bpy.props.FloatVectorProperty(name="Bounds Max", subtype="XYZ", update=_update_rooms_geometry)
     blend: bpy.props.FloatProperty(name="Blend", default=1)
     timecycle: bpy.props.StringProperty(name="Timecycle", default="int_gasstation")
     secondary_timecycle: bpy.props.StringProperty(name="Secondary Timecycle")
@@ -222,10 +275,10 @@ class PortalProperties(bpy.types.PropertyGroup, MloArchetypeChild):
         elif value > max_val:
             self.audio_occlusion = "0"
 
-    corner1: bpy.props.FloatVectorProperty(name="Corner 1", subtype="XYZ")
-    corner2: bpy.props.FloatVectorProperty(name="Corner 2", subtype="XYZ")
-    corner3: bpy.props.FloatVectorProperty(name="Corner 3", subtype="XYZ")
-    corner4: bpy.props.FloatVectorProperty(name="Corner 4", subtype="XYZ")
+    corner1: bpy.props.FloatVectorProperty(name="Corner 1", subtype="XYZ", update=_update_portals_geometry)
+    corner2: bpy.props.FloatVectorProperty(name="Corner 2", subtype="XYZ", update=_update_portals_geometry)
+    corner3: bpy.props.FloatVectorProperty(name="Corner 3", subtype="XYZ", update=_update_portals_geometry)
+    corner4: bpy.props.FloatVectorProperty(name="Corner 4", subtype="XYZ", update=_update_portals_geometry)
 
     room_from_id: bpy.props.EnumProperty(
         name="Room From", items=MloArchetypeChild.get_room_items, update=update_room_names, default=-1)
@@ -255,9 +308,10 @@ class TimecycleModifierProperties(bpy.types.PropertyGroup, MloArchetypeChild):
     name: bpy.props.StringProperty(name="Name")
     # NOTE: [0] = radius, [1,2,3] = center, changing it would break backwards compatibility or require new versioning.
     # Use the wrapper properties sphere_center and sphere_radius
-    sphere: bpy.props.FloatVectorProperty(name="Sphere", subtype="QUATERNION", size=4)
+    sphere: bpy.props.FloatVectorProperty(
+        name="Sphere", subtype="QUATERNION", size=4, update=_update_timecycle_modifiers_geometry)
     percentage: bpy.props.FloatProperty(name="Percentage", min=0.0, max=100.0, step=100)
-    range: bpy.props.FloatProperty(name="Range")
+    range: bpy.props.FloatProperty(name="Range", update=_update_timecycle_modifiers_geometry)
     start_hour: bpy.props.IntProperty(name="Start Hour")
     end_hour: bpy.props.IntProperty(name="End Hour")
 
@@ -436,6 +490,10 @@ class EntitySetProperties(bpy.types.PropertyGroup, MloArchetypeChild):
 
 
 def register():
+    bpy.app.handlers.undo_post.append(_invalidate_mlo_geometry_handler)
+    bpy.app.handlers.redo_post.append(_invalidate_mlo_geometry_handler)
+    bpy.app.handlers.load_post.append(_invalidate_mlo_geometry_handler)
+
     bpy.types.Scene.sollumz_add_entity_portal = bpy.props.EnumProperty(
         name="Portal", items=get_portal_items_for_selected_archetype, default=-1)
     bpy.types.Scene.sollumz_add_entity_room = bpy.props.EnumProperty(
@@ -468,6 +526,10 @@ def register():
 
 
 def unregister():
+    bpy.app.handlers.undo_post.remove(_invalidate_mlo_geometry_handler)
+    bpy.app.handlers.redo_post.remove(_invalidate_mlo_geometry_handler)
+    bpy.app.handlers.load_post.remove(_invalidate_mlo_geometry_handler)
+
     del bpy.types.Scene.sollumz_add_entity_portal
     del bpy.types.Scene.sollumz_add_entity_room
     del bpy.types.Scene.sollumz_add_entity_entityset
@@ -14,7 +14,14 @@ from ...sollumz_preferences import get_addon_preferences
 from ...tools.blenderhelper import get_children_recursive, tag_redraw
 from ...sollumz_properties import SollumType, items_from_enums, ArchetypeType, AssetType, TimeFlagsMixin, SOLLUMZ_UI_NAMES
 from ...tools.utils import get_list_item
-from .mlo import EntitySetProperties, RoomProperties, PortalProperties, MloEntityProperties, TimecycleModifierProperties
+from .mlo import (
+    EntitySetProperties,
+    RoomProperties,
+    PortalProperties,
+    MloEntityProperties,
+    TimecycleModifierProperties,
+    bump_mlo_geometry_revision,
+)
 from .flags import ArchetypeFlags, MloFlags
 from .extensions import ExtensionsContainer, ExtensionType
 from ...shared.multiselection import (
@@ -325,6 +332,7 @@ class ArchetypeProperties(bpy.types.PropertyGroup, ExtensionsContainer):
             item.flags.total = str(preferences.default_flags_portal)
 
         ArchetypeProperties.update_cached_portal_enum_items(self.uuid)
+        bump_mlo_geometry_revision("portals")
 
         return item
 
@@ -347,6 +355,7 @@ class ArchetypeProperties(bpy.types.PropertyGroup, ExtensionsContainer):
             item.flags.total = str(preferences.default_flags_room)
 
         ArchetypeProperties.update_cached_room_enum_items(self.uuid)
+        bump_mlo_geometry_revision("rooms")
 
         return item
 
@@ -377,6 +386,8 @@ class ArchetypeProperties(bpy.types.PropertyGroup, ExtensionsContainer):
         item.mlo_archetype_id = self.id
         item.mlo_archetype_uuid = self.uuid
 
+        bump_mlo_geometry_revision("timecycle_modifiers")
+
         return item
 
     def new_entity_set(self) -> EntitySetProperties: